@@ -1,3 +1,6 @@
-from .biofilter import Biofilter
+from biofilter.utils.lazy_import import lazy_exports
+
+# The facade pulls in the DB/ETL stack; import it on first access only
+__getattr__ = lazy_exports(__name__, {"Biofilter": "biofilter.biofilter"})
 
 __all__ = ["Biofilter"]
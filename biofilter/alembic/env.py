@@ -51,6 +51,7 @@ from biofilter.modules.db.models.model_variants import (
     map_variant_masters,
     map_variant_molecular_effects,
     map_variant_effect_predictions,
+    map_variant_predictor_summary,
     map_variant_regulatory_elements,
     map_variant_gene_regulatory_evidence,
 )  # noqa: E402
@@ -78,6 +79,7 @@ def _ensure_metadata_loaded(connection) -> None:
     map_variant_masters(engine, Base.metadata)
     map_variant_molecular_effects(engine, Base.metadata)
     map_variant_effect_predictions(engine, Base.metadata)
+    map_variant_predictor_summary(engine, Base.metadata)
     map_variant_regulatory_elements(engine, Base.metadata)
     map_variant_gene_regulatory_evidence(engine, Base.metadata)
 
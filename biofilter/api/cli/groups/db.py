@@ -5,7 +5,6 @@ import time
 from pathlib import Path
 
 import click
-from sqlalchemy import text
 
 from biofilter.biofilter import Biofilter
 from biofilter.api.cli.common import require_db_uri, local_db_uri_option
@@ -68,7 +67,7 @@ def ping(ctx, db_uri, debug: bool):
     Exits with status 0 on success, 1 on failure.
     """
     import os
-    from sqlalchemy import create_engine, make_url
+    from sqlalchemy import create_engine, make_url, text
     from sqlalchemy.exc import SQLAlchemyError
 
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
@@ -323,6 +322,21 @@ def restore_cmd(ctx, db_uri, in_path: Path):
     multiple=True,
     help="Table name to exclude (repeatable or comma-separated).",
 )
+@click.option(
+    "--jobs",
+    "workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Tables exported concurrently (Postgres; SQLite runs one at a time).",
+)
+@click.option(
+    "--base",
+    "base_bundle",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="Write a differential bundle with the ETL packages newer than this bundle.",
+)
 @click.pass_context
 def export_cmd(
     ctx,
@@ -333,6 +347,8 @@ def export_cmd(
     chunksize: int,
     tables,
     exclude_tables,
+    workers: int,
+    base_bundle: Path | None,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
     bf = Biofilter(db_uri=db_uri, debug_mode=False)
@@ -345,6 +361,8 @@ def export_cmd(
         chunksize=chunksize,
         tables=_to_list_or_none(tables),
         exclude_tables=_to_list_or_none(exclude_tables),
+        workers=workers,
+        base_bundle=base_bundle,
     )
     click.echo(f"✅ Bundle exported: {bundle}")
 
@@ -381,6 +399,19 @@ def export_cmd(
     is_flag=True,
     help="Allow bundle missing schema tables and import only shared tables.",
 )
+@click.option(
+    "--jobs",
+    "workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Tables imported concurrently (Postgres; SQLite runs one at a time).",
+)
+@click.option(
+    "--no-defer-indexes",
+    is_flag=True,
+    help="(Postgres) Keep indexes and FK constraints in place during the load.",
+)
 @click.pass_context
 def import_cmd(
     ctx,
@@ -390,6 +421,8 @@ def import_cmd(
     no_rebuild_indexes: bool,
     no_reset_sequences: bool,
     allow_missing_tables: bool,
+    workers: int,
+    no_defer_indexes: bool,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
     bf = Biofilter(db_uri=db_uri, debug_mode=False)
@@ -401,5 +434,7 @@ def import_cmd(
         rebuild_indexes=not no_rebuild_indexes,
         reset_postgres_sequences=not no_reset_sequences,
         allow_missing_tables=allow_missing_tables,
+        workers=workers,
+        defer_indexes=not no_defer_indexes,
     )
     click.echo("✅ Bundle import completed.")
@@ -5,11 +5,9 @@ import difflib
 from pathlib import Path
 
 import click
-import pandas as pd
 
 from biofilter.api.cli.common import local_db_uri_option, require_db_uri
 from biofilter.biofilter import Biofilter
-from biofilter.modules.db.models import ETLDataSource, ETLSourceSystem
 
 
 @click.group()
@@ -24,6 +22,8 @@ def _to_list_or_none(values):
 
 
 def _classify_load_result(status: object) -> str:
+    import pandas as pd
+
     if status is None or pd.isna(status):
         return "never"
     value = str(status or "").strip().lower()
@@ -37,6 +37,8 @@ def _classify_load_result(status: object) -> str:
 
 
 def _format_ts(value: object) -> str | None:
+    import pandas as pd
+
     if value is None:
         return None
     if pd.isna(value):
@@ -175,6 +177,20 @@ def update(ctx, db_uri, source_system, data_source, run_step, force_step, debug)
     is_flag=True,
     help="Stop update-all at first failed data source.",
 )
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for extract/transform (dependency-aware).",
+)
+@click.option(
+    "--load-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Max concurrent load steps when --jobs > 1.",
+)
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
 def update_all(
@@ -185,6 +201,8 @@ def update_all(
     drop_files,
     only_active,
     stop_on_error,
+    jobs,
+    load_jobs,
     debug,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
@@ -197,6 +215,8 @@ def update_all(
         drop_files_on_success=drop_files,
         only_active=only_active,
         stop_on_error=stop_on_error,
+        jobs=jobs,
+        load_jobs=load_jobs,
     )
     click.echo(
         (
@@ -249,6 +269,11 @@ def restart(ctx, db_uri, data_source, source_system, delete_files, debug):
     is_flag=True,
     help="Delete downloaded/processed files when rolling back data sources.",
 )
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Only report the purge plan and estimated rows per table.",
+)
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
 def rollback(
@@ -258,6 +283,7 @@ def rollback(
     data_source,
     source_system,
     delete_files,
+    dry_run,
     debug,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
@@ -269,6 +295,7 @@ def rollback(
         data_source=_to_list_or_none(data_source),
         source_system=_to_list_or_none(source_system),
         delete_files=delete_files,
+        dry_run=dry_run,
     )
     if not ok:
         raise click.ClickException("Rollback finished with errors.")
@@ -286,6 +313,8 @@ def rollback(
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
 def status(ctx, db_uri, source_system, data_source, only_active, debug):
+    import pandas as pd
+
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
     bf = Biofilter(db_uri=db_uri, debug_mode=debug)
     bf.db.connect()
@@ -483,6 +512,8 @@ def explain(
 
     if data_sources:
         db_uri = require_db_uri(ctx, local_db_uri=db_uri)
+        from biofilter.modules.db.models import ETLDataSource, ETLSourceSystem
+
         bf = Biofilter(db_uri=db_uri, debug_mode=debug)
         bf.db.connect()
 
@@ -525,9 +556,15 @@ def explain(
             raise click.ClickException(
                 f"No DTP explain documents found under: {explain_dir}"
             )
+        from biofilter.utils.registry_manifest import dtp_registry
+
+        descriptions = {e["module"]: e["description"] for e in dtp_registry()}
         click.echo("📘 Available DTP explain documents:\n")
         for script_name, path in sorted(docs_by_script.items()):
-            click.echo(f"- {script_name} ({path.name})")
+            line = f"- {script_name} ({path.name})"
+            if descriptions.get(script_name):
+                line += f": {descriptions[script_name]}"
+            click.echo(line)
         click.echo(
             "\nUse `biofilter etl explain --data-source <name>` "
             "or `--dtp-script <script>`."
@@ -570,10 +607,31 @@ def explain(
     "--no-write-mode", is_flag=True, help="Disable DB write-mode tuning hooks."
 )
 @click.option("--no-read-mode", is_flag=True, help="Disable DB read-mode tuning hooks.")  # noqa E501
+@click.option(
+    "--parallel",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Build indexes over N database connections (PostgreSQL).",
+)
+@click.option(
+    "--concurrently",
+    is_flag=True,
+    help="Use CREATE INDEX CONCURRENTLY (slower, does not block writes).",
+)
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
 def index(
-    ctx, db_uri, groups, drop_only, no_drop_first, no_write_mode, no_read_mode, debug  # noqa E501
+    ctx,
+    db_uri,
+    groups,
+    drop_only,
+    no_drop_first,
+    no_write_mode,
+    no_read_mode,
+    parallel,
+    concurrently,
+    debug,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
 
@@ -586,6 +644,8 @@ def index(
         drop_first=not no_drop_first,
         set_write_mode=not no_write_mode,
         set_read_mode=not no_read_mode,
+        parallel=parallel,
+        concurrently=concurrently,
     )
 
     if not ok:
@@ -450,7 +450,18 @@ def refresh(ctx, db_uri, debug):
 @click.option(
     "--output",
     type=click.Path(dir_okay=False),
-    help="Output CSV file path. If provided, exports instead of printing.",
+    help="Output file path. If provided, exports instead of printing.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["csv", "parquet", "arrow"], case_sensitive=False),
+    help="Output file format (default: from the --output suffix, else csv).",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Write the report chunk by chunk to --output instead of building it in memory.",  # noqa E501
 )
 @click.option("--debug", is_flag=True, help="Enable debug logging.")
 @click.pass_context
@@ -466,10 +477,15 @@ def run(
     params_json,
     params_file,
     output,
+    output_format,
+    stream,
     debug,
 ):
     db_uri = require_db_uri(ctx, local_db_uri=db_uri)
 
+    if (stream or output_format) and not output:
+        raise click.UsageError("--format and --stream require --output.")
+
     bf = Biofilter(db_uri=db_uri, debug_mode=debug)
 
     if params_template:
@@ -496,13 +512,37 @@ def run(
         params_file=params_file,
     )
 
+    if output:
+        from biofilter.modules.report.report_sinks import infer_sink_format
+
+        output_format = (output_format or infer_sink_format(output)).lower()
+
+    if stream:
+        try:
+            summary = bf.report.run_to_sink(
+                identifier, output, fmt=output_format, **report_kwargs
+            )
+        except Exception as e:
+            _raise_report_cli_error(bf, identifier, e, action="run")
+        click.echo(
+            f"✅ Report streamed to: {output} "
+            f"({summary['rows']:,} rows in {summary['chunks']} chunk(s))"
+        )
+        return
+
     try:
         df = bf.report.run(identifier, **report_kwargs)
     except Exception as e:
         _raise_report_cli_error(bf, identifier, e, action="run")
 
-    if output:
+    if output and output_format == "csv":
         df.to_csv(output, index=False)
         click.echo(f"✅ Report exported to: {output}")
+    elif output:
+        from biofilter.modules.report.report_sinks import open_sink
+
+        with open_sink(output, output_format) as sink:
+            sink.write(df)
+        click.echo(f"✅ Report exported to: {output}")
     else:
         click.echo(df.to_string(index=False))
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlsplit, urlunsplit
 
-from biofilter.core.components import (
-    DBComponent,
-    ETLComponent,
-    ReportComponent,
-    SettingsComponent,
-)
-from biofilter.modules.db.database import Database
 from biofilter.utils.config import BiofilterConfig
+from biofilter.utils.lazy_import import lazy_attr
 from biofilter.utils.logger import Logger
 from biofilter.utils.version import __version__
 
+if TYPE_CHECKING:
+    from biofilter.modules.db.database import Database
+
+# Components (and SQLAlchemy behind them) load when a facade is built, so
+# importing the CLI or `biofilter` stays cheap
+DBComponent = lazy_attr("biofilter.core.components.db_component", "DBComponent")  # noqa E501
+ETLComponent = lazy_attr("biofilter.core.components.etl_component", "ETLComponent")  # noqa E501
+ReportComponent = lazy_attr("biofilter.core.components.report_component", "ReportComponent")  # noqa E501
+SettingsComponent = lazy_attr("biofilter.core.components.settings_component", "SettingsComponent")  # noqa E501
+
 
 @dataclass
 class BiofilterCore:
@@ -86,21 +90,21 @@ class BiofilterCore:
         self.etl = None
         self.report = None
 
-        # Boot banner
-        self.logger.log("════════════════════════════════════", "INFO")
-        self.logger.log("🚀 Initializing Biofilter", "INFO")
-        self.logger.log(f"   • Version: {self.version}", "INFO")
-        self.logger.log(f"   • Debug mode: {self.debug_mode}", "INFO")
+        # Boot banner (debug only: the CLI is called once per pipeline task)
+        self.logger.log("════════════════════════════════════", "DEBUG")
+        self.logger.log("🚀 Initializing Biofilter", "DEBUG")
+        self.logger.log(f"   • Version: {self.version}", "DEBUG")
+        self.logger.log(f"   • Debug mode: {self.debug_mode}", "DEBUG")
         self.logger.log(
             (
                 f"   • Config: {self.config_path}"
                 if self.config_path
                 else "   • Config: <none>"
             ),
-            "INFO",
+            "DEBUG",
         )
-        self.logger.log(f"   • DB URI: {self._safe_db_uri(self.db_uri)}", "INFO")  # noqa E501
-        self.logger.log("════════════════════════════════════", "INFO")
+        self.logger.log(f"   • DB URI: {self._safe_db_uri(self.db_uri)}", "DEBUG")  # noqa E501
+        self.logger.log("════════════════════════════════════", "DEBUG")
 
     def require_db(self) -> Database:
         if not self.db:
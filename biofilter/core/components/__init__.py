@@ -1,7 +1,14 @@
-from biofilter.core.components.db_component import DBComponent
-from biofilter.core.components.settings_component import SettingsComponent
-from biofilter.core.components.etl_component import ETLComponent
-from biofilter.core.components.report_component import ReportComponent
+from biofilter.utils.lazy_import import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "DBComponent": "biofilter.core.components.db_component",
+        "SettingsComponent": "biofilter.core.components.settings_component",
+        "ETLComponent": "biofilter.core.components.etl_component",
+        "ReportComponent": "biofilter.core.components.report_component",
+    },
+)
 
 
 __all__ = [
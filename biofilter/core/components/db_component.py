@@ -5,13 +5,17 @@ from typing import Iterable, Literal, Optional
 
 from biofilter.core.components.base_component import BaseComponent
 from biofilter.modules.db.database import Database
-from biofilter.modules.db.migrate import run_migration
-from biofilter.modules.db.transfer import (
-    backup_db,
-    export_full_clone,
-    import_full_clone,
-    restore_db,
-)
+from biofilter.utils.lazy_import import lazy_attr
+
+# Alembic and the transfer stack (pandas/pyarrow) load on first use
+run_migration = lazy_attr("biofilter.modules.db.migrate", "run_migration")
+backup_db = lazy_attr("biofilter.modules.db.transfer", "backup_db")
+bundle_type = lazy_attr("biofilter.modules.db.transfer", "bundle_type")
+export_diff_clone = lazy_attr("biofilter.modules.db.transfer", "export_diff_clone")  # noqa E501
+export_full_clone = lazy_attr("biofilter.modules.db.transfer", "export_full_clone")  # noqa E501
+import_diff_clone = lazy_attr("biofilter.modules.db.transfer", "import_diff_clone")  # noqa E501
+import_full_clone = lazy_attr("biofilter.modules.db.transfer", "import_full_clone")  # noqa E501
+restore_db = lazy_attr("biofilter.modules.db.transfer", "restore_db")
 
 ExportFormat = Literal["parquet", "csv"]
 
@@ -62,7 +66,9 @@ class DBComponent(BaseComponent):
 
         self.core.db = db
 
-        self.core.logger.log(f"🏗️ Database created at: {self.core.db_uri}", "INFO")  # noqa E501
+        from biofilter.modules.db.database import redact_uri
+
+        self.core.logger.log(f"🏗️ Database created at: {redact_uri(self.core.db_uri)}", "INFO")  # noqa E501
         return True
 
     def upgrade(self, *, seed_dir: str = "seed") -> bool:
@@ -182,9 +188,17 @@ class DBComponent(BaseComponent):
         chunksize: int = 250_000,
         tables: Iterable[str] | None = None,
         exclude_tables: Iterable[str] | None = None,
+        workers: int = 4,
+        base_bundle: str | Path | None = None,
     ) -> Path:
         """
         Export a logical full-clone bundle (manifest + one file per table).
+
+        `workers` tables are exported concurrently (PostgreSQL only).
+
+        With `base_bundle`, a differential bundle is written instead: only
+        the rows of ETL packages newer than that bundle, plus tombstones
+        for rollbacks since (parquet only; table filters do not apply).
         """
         db = self.core.require_db()
         if not db.engine:
@@ -195,6 +209,25 @@ class DBComponent(BaseComponent):
 
         bf_ver = biofilter_version or getattr(self.core, "version", "unknown")
 
+        if base_bundle is not None:
+            if fmt != "parquet":
+                raise ValueError("Differential bundles are parquet only.")
+            self.core.logger.log(
+                f"📦 Exporting differential bundle → {out} (base={base_bundle})",  # noqa E501
+                "INFO",
+            )
+            bundle_dir = export_diff_clone(
+                db.engine,
+                out,
+                base_bundle=base_bundle,
+                biofilter_version=bf_ver,
+                schema_version=schema_version,
+                chunksize=chunksize,
+                workers=workers,
+            )
+            self.core.logger.log(f"✅ Bundle exported: {bundle_dir}", "INFO")
+            return bundle_dir
+
         self.core.logger.log(
             f"📦 Exporting full clone bundle → {out} (fmt={fmt})", "INFO"
         )
@@ -208,6 +241,7 @@ class DBComponent(BaseComponent):
             chunksize=chunksize,
             include_tables=tables,
             exclude_tables=exclude_tables,
+            workers=workers,
         )
 
         self.core.logger.log(f"✅ Bundle exported: {bundle_dir}", "INFO")
@@ -221,6 +255,8 @@ class DBComponent(BaseComponent):
         rebuild_indexes: bool = True,
         reset_postgres_sequences: bool = True,
         allow_missing_tables: bool = False,
+        workers: int = 4,
+        defer_indexes: bool = True,
     ) -> None:
         """
         Import a logical full-clone bundle into the current DB schema.
@@ -228,12 +264,33 @@ class DBComponent(BaseComponent):
         Expectations:
         - Schema already exists (project create / migrations done)
         - This will truncate all tables and re-insert preserving PKs.
+        - A differential bundle (see `export(base_bundle=...)`) is applied in
+          place on top of its base instead.
+
+        On PostgreSQL, `workers` independent tables load concurrently and,
+        with `defer_indexes`, indexes and FK constraints are recreated
+        after the data is in.
         """
         db = self.core.require_db()
         if not db.engine:
             raise RuntimeError("Database engine not initialized. Connect first.")  # noqa E501
 
         inp = Path(in_dir).expanduser().resolve()
+
+        if bundle_type(inp) == "differential":
+            # Applied in place; indexes are maintained by the upserts
+            self.core.logger.log(
+                f"📥 Applying differential bundle ← {inp}", "WARNING"
+            )
+            import_diff_clone(
+                db=db,
+                in_dir=inp,
+                logger=self.core.logger,
+                reset_sequences=reset_postgres_sequences,
+            )
+            self.core.logger.log("✅ Bundle import completed.", "INFO")
+            return
+
         self.core.logger.log(
             f"📥 Importing full clone bundle ← {inp} (fmt={fmt})", "WARNING"
         )
@@ -244,6 +301,8 @@ class DBComponent(BaseComponent):
             fmt=fmt,
             reset_sequences=reset_postgres_sequences,
             allow_missing_tables=allow_missing_tables,
+            workers=workers,
+            defer_indexes=defer_indexes,
         )
 
         self.core.logger.log("✅ Bundle import completed.", "INFO")
@@ -3,7 +3,10 @@ from __future__ import annotations
 from typing import Iterable, Optional, Union
 
 from biofilter.core.components.base_component import BaseComponent
-from biofilter.modules.etl.etl_manager import ETLManager
+from biofilter.utils.lazy_import import lazy_attr
+
+# Imported on first ETL call: the ETL stack is heavy for plain CLI calls
+ETLManager = lazy_attr("biofilter.modules.etl.etl_manager", "ETLManager")
 
 
 class ETLComponent(BaseComponent):
@@ -51,6 +54,8 @@ class ETLComponent(BaseComponent):
         drop_files_on_success: bool = False,
         only_active: bool = True,
         stop_on_error: bool = False,
+        jobs: int = 1,
+        load_jobs: int = 1,
     ) -> dict:
         self.core.logger.log("🚀 Starting ETL update-all process...", "INFO")
         manager = self._manager()
@@ -63,6 +68,8 @@ class ETLComponent(BaseComponent):
             drop_files_on_success=drop_files_on_success,
             only_active=only_active,
             stop_on_error=stop_on_error,
+            jobs=jobs,
+            load_jobs=load_jobs,
         )
 
         self.core.logger.log("✅ ETL update-all process finished.", "INFO")
@@ -91,6 +98,7 @@ class ETLComponent(BaseComponent):
         data_source: list[str] | None = None,
         source_system: list[str] | None = None,
         delete_files: bool = False,
+        dry_run: bool = False,
     ):
         self.core.logger.log("↩️ Rolling back ETL data...", "INFO")
         manager = self._manager()
@@ -102,6 +110,7 @@ class ETLComponent(BaseComponent):
             download_path=self.core.settings.get("download_path", "./downloads"),  # noqa E501
             processed_path=self.core.settings.get("processed_path", "./processed"),  # noqa E501
             delete_files=delete_files,
+            dry_run=dry_run,
         )
 
     def index(
@@ -111,6 +120,8 @@ class ETLComponent(BaseComponent):
         drop_first: bool = True,
         set_write_mode: bool = True,
         set_read_mode: bool = True,
+        parallel: int = 1,
+        concurrently: bool = False,
     ) -> tuple[bool, str]:
         if groups is None:
             index_group = None
@@ -128,6 +139,8 @@ class ETLComponent(BaseComponent):
             drop_first=drop_first,
             set_write_mode=set_write_mode,
             set_read_mode=set_read_mode,
+            parallel=parallel,
+            concurrently=concurrently,
         )
 
         self.core.logger.log(msg, "INFO" if ok else "WARNING")
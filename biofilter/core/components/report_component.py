@@ -10,6 +10,7 @@ class ReportComponent(BaseComponent):
     Usage:
         bf.reports.list()
         bf.reports.run("gene_to_snp", input_data=...)
+        bf.reports.run_to_sink("gene_to_snp", "out.parquet", input_data=...)
         bf.reports.explain("gene_to_snp")
     """
 
@@ -51,6 +52,9 @@ class ReportComponent(BaseComponent):
     def run(self, identifier: str, **kwargs):
         return self._get_manager().run(identifier, **kwargs)
 
+    def run_to_sink(self, identifier: str, output, fmt=None, **kwargs):
+        return self._get_manager().run_to_sink(identifier, output, fmt=fmt, **kwargs)
+
     def run_example(self, identifier: str, **kwargs):
         return self._get_manager().run_example(identifier, **kwargs)
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from biofilter.core.components.base_component import BaseComponent
-from biofilter.core.settings_manager import SettingsManager
+from biofilter.utils.lazy_import import lazy_attr
+
+SettingsManager = lazy_attr("biofilter.core.settings_manager", "SettingsManager")
 
 
 class SettingsComponent(BaseComponent):
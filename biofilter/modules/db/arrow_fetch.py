@@ -0,0 +1,110 @@
+"""
+Columnar fetch for large SELECTs.
+
+Reports used to run `session.execute(...).mappings().all()` and then
+`pd.DataFrame([dict(r) for r in rows])`: every row lived three times in
+Python (Row, dict, DataFrame cell) before the frame existed. The helpers
+here stream the result instead:
+
+- the statement runs with `stream_results` / `yield_per`, i.e. a
+  server-side named cursor on PostgreSQL (psycopg2) and an incremental
+  cursor on SQLite;
+- each partition of `batch_size` rows is transposed straight into one
+  Arrow record batch (one typed array per column), so at most one batch
+  of Python tuples is alive at a time;
+- `fetch_arrow` concatenates the batches into a `pyarrow.Table` (types
+  promoted across batches, e.g. an all-NULL first batch), and
+  `fetch_frame` converts that table to pandas once.
+
+`bind` is anything with `execute()`: a Session (so temp tables created on
+it stay visible), a Connection, or `Database.fetch_*` which opens its own
+connection.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Mapping, Optional
+
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import text
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def _statement(sql):
+    return text(sql) if isinstance(sql, str) else sql
+
+
+def _record_batch(columns: list[str], rows: list) -> pa.RecordBatch:
+    arrays = []
+    for name, values in zip(columns, zip(*rows)):
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Column '{name}' has values Arrow cannot type together: {e}"
+            ) from e
+    return pa.RecordBatch.from_arrays(arrays, names=columns)
+
+
+def _execute_streaming(bind, sql, params, batch_size: int):
+    return bind.execute(
+        _statement(sql),
+        dict(params or {}),
+        execution_options={"stream_results": True, "yield_per": int(batch_size)},
+    )
+
+
+def _batches(result, batch_size: int) -> Iterator[pa.RecordBatch]:
+    try:
+        columns = list(result.keys())
+        for rows in result.partitions(int(batch_size)):
+            if rows:
+                yield _record_batch(columns, rows)
+    finally:
+        result.close()
+
+
+def iter_record_batches(
+    bind,
+    sql,
+    params: Optional[Mapping[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yield the result of `sql` as Arrow record batches of up to
+    `batch_size` rows. Types are inferred per batch; use `fetch_arrow`
+    for one consistent schema.
+    """
+    result = _execute_streaming(bind, sql, params, batch_size)
+    yield from _batches(result, batch_size)
+
+
+def fetch_arrow(
+    bind,
+    sql,
+    params: Optional[Mapping[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pa.Table:
+    """Whole result of `sql` as one `pyarrow.Table` (no rows: null columns)."""
+    result = _execute_streaming(bind, sql, params, batch_size)
+    columns = list(result.keys())
+    tables = [pa.Table.from_batches([b]) for b in _batches(result, batch_size)]
+    if not tables:
+        return pa.Table.from_arrays(
+            [pa.array([], type=pa.null()) for _ in columns], names=columns
+        )
+    if len(tables) == 1:
+        return tables[0]
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def fetch_frame(
+    bind,
+    sql,
+    params: Optional[Mapping[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pd.DataFrame:
+    """Whole result of `sql` as a DataFrame, built from Arrow batches."""
+    return fetch_arrow(bind, sql, params, batch_size).to_pandas()
@@ -0,0 +1,382 @@
+"""
+Parallel, COPY-based engine behind the full-clone bundle
+(`transfer.export_full_clone` / `transfer.import_full_clone`).
+
+The row-by-row path (pandas chunk -> dict records -> INSERT) still works
+for any engine, but restoring a large PostgreSQL bundle with it takes
+days. On PostgreSQL this module moves the data with COPY instead:
+
+- export: `COPY (SELECT ...) TO STDOUT (FORMAT csv)` is piped into the
+  pyarrow CSV reader, which parses it with column types taken from the
+  reflected table and writes Parquet row groups; tables run concurrently,
+  one connection each;
+- import: Parquet row groups are streamed (never the whole file) into
+  `COPY ... FROM STDIN` through `biofilter.utils.pg_copy`;
+- tables are imported in FK-dependency waves (`fk_waves`): tables of one
+  wave have no FK path between them and load concurrently;
+- `deferred_constraints` drops secondary indexes and FK constraints
+  before the load and recreates them afterwards (indexes in parallel), so
+  COPY does not maintain them row by row.
+
+Partition children are skipped (`partition_children`): their rows are
+exported and imported through the partitioned parent.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from sqlalchemy import Table, text
+from sqlalchemy import types as sa_types
+from sqlalchemy.engine import Engine
+
+from biofilter.utils.pg_copy import copy_batches_to_postgres
+
+T = TypeVar("T")
+
+COPY_BATCH_ROWS = 100_000
+ROW_GROUP_ROWS = 250_000
+CSV_BLOCK_SIZE = 16 << 20  # bytes of COPY output parsed per batch
+
+
+def is_postgres(engine: Engine) -> bool:
+    return (engine.dialect.name or "").lower() in ("postgresql", "postgres")
+
+
+# =============================================================================
+# Scheduling
+# =============================================================================
+
+
+def run_parallel(jobs: Sequence[Callable[[], T]], workers: int) -> list[T]:
+    """Run jobs on up to `workers` threads; results in job order."""
+    workers = max(1, int(workers or 1))
+    if workers == 1 or len(jobs) <= 1:
+        return [job() for job in jobs]
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(lambda job: job(), jobs))
+
+
+def fk_waves(tables: Sequence[Table]) -> list[list[Table]]:
+    """
+    Split `tables` (parents first, e.g. MetaData.sorted_tables) into waves:
+    every FK target inside the set is in an earlier wave. Self references
+    are ignored; tables on an FK cycle get one wave each, in input order.
+    """
+    names = {t.name for t in tables}
+    pending: dict[str, set[str]] = {}
+    for t in tables:
+        pending[t.name] = {
+            fk.constraint.referred_table.name
+            for fk in t.foreign_keys
+            if fk.constraint.referred_table.name in names
+            and fk.constraint.referred_table.name != t.name
+        }
+
+    by_name = {t.name: t for t in tables}
+    order = [t.name for t in tables]
+    done: set[str] = set()
+    waves: list[list[Table]] = []
+    while len(done) < len(order):
+        ready = [n for n in order if n not in done and not (pending[n] - done)]
+        if not ready:
+            # FK cycle: fall back to the input order, one table at a time
+            waves.extend([by_name[n]] for n in order if n not in done)
+            break
+        waves.append([by_name[n] for n in ready])
+        done.update(ready)
+    return waves
+
+
+def partition_children(conn) -> set[str]:
+    """PostgreSQL partitions in the current schema (empty elsewhere)."""
+    if not is_postgres(conn.engine):
+        return set()
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relispartition AND n.nspname = current_schema()"
+        )
+    )
+    return {r[0] for r in rows}
+
+
+# =============================================================================
+# Export: COPY TO -> Parquet
+# =============================================================================
+
+
+def arrow_type_for(sa_type) -> pa.DataType:
+    """
+    Parquet type for a reflected column. Anything COPY prints in a form
+    Arrow cannot parse losslessly (numeric, tz-aware timestamps, JSON,
+    arrays, ...) is kept as its text representation.
+    """
+    if isinstance(sa_type, sa_types.Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, sa_types.Integer):
+        return pa.int64()
+    if isinstance(sa_type, sa_types.Float):
+        return pa.float64()
+    if isinstance(sa_type, sa_types.DateTime) and not getattr(sa_type, "timezone", False):  # noqa E501
+        return pa.timestamp("us")
+    if isinstance(sa_type, sa_types.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def copy_table_to_parquet(
+    engine: Engine,
+    table: Table,
+    out_path: Path,
+    *,
+    row_group_rows: int = ROW_GROUP_ROWS,
+) -> int:
+    """
+    Stream `table` through COPY TO STDOUT into one Parquet file. Returns
+    the number of rows written.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    columns = [c.name for c in table.columns]
+    schema = pa.schema([pa.field(c.name, arrow_type_for(c.type)) for c in table.columns])  # noqa E501
+    sql = (
+        f"COPY (SELECT {', '.join(quote(c) for c in columns)} "
+        f"FROM {quote(table.name)}) TO STDOUT WITH (FORMAT csv)"
+    )
+
+    read_fd, write_fd = os.pipe()
+    errors: list[BaseException] = []
+    raw = engine.raw_connection()
+
+    def produce() -> None:
+        try:
+            with os.fdopen(write_fd, "wb") as sink:
+                cur = raw.cursor()
+                try:
+                    cur.copy_expert(sql, sink)
+                finally:
+                    cur.close()
+        except BaseException as e:  # surfaced by the consumer below
+            errors.append(e)
+
+    producer = threading.Thread(target=produce, name=f"copy-{table.name}", daemon=True)  # noqa E501
+    producer.start()
+
+    rows = 0
+    try:
+        with os.fdopen(read_fd, "rb") as source, pq.ParquetWriter(str(out_path), schema) as writer:  # noqa E501
+            pending: list[pa.RecordBatch] = []
+            pending_rows = 0
+            for batch in _read_copy_csv(source, columns, schema):
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                if pending_rows >= row_group_rows:
+                    writer.write_table(pa.Table.from_batches(pending, schema))
+                    rows += pending_rows
+                    pending, pending_rows = [], 0
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema))
+                rows += pending_rows
+    finally:
+        producer.join()
+        raw.close()
+
+    if errors:
+        raise RuntimeError(f"COPY export of '{table.name}' failed: {errors[0]}") from errors[0]  # noqa E501
+    return rows
+
+
+def _read_copy_csv(source, columns: list[str], schema: pa.Schema) -> Iterator[pa.RecordBatch]:  # noqa E501
+    convert = pacsv.ConvertOptions(
+        column_types={f.name: f.type for f in schema},
+        true_values=["t"],
+        false_values=["f"],
+        # COPY csv: NULL is an unquoted empty field, '' is quoted
+        null_values=[""],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+    )
+    read = pacsv.ReadOptions(column_names=columns, block_size=CSV_BLOCK_SIZE)
+    # COPY quotes text with embedded newlines; without this the chunker
+    # splits such a value across blocks and the parser gets out of sync
+    parse = pacsv.ParseOptions(newlines_in_values=True)
+    try:
+        reader = pacsv.open_csv(
+            source,
+            read_options=read,
+            parse_options=parse,
+            convert_options=convert,
+        )
+    except pa.ArrowInvalid as e:
+        if "Empty CSV file" in str(e):
+            return
+        raise
+    for batch in reader:
+        yield batch
+
+
+# =============================================================================
+# Import: Parquet row groups -> COPY FROM STDIN
+# =============================================================================
+
+
+def iter_parquet_batches(path: Path, batch_size: int = COPY_BATCH_ROWS) -> Iterator[pa.RecordBatch]:  # noqa E501
+    """Record batches of a Parquet file, read one row group at a time."""
+    pf = pq.ParquetFile(str(path))
+    if pf.metadata.num_columns == 0:
+        return
+    yield from pf.iter_batches(batch_size=batch_size)
+
+
+def copy_compatible(schema: pa.Schema) -> bool:
+    """True when every column can be written as CSV for COPY."""
+    for field in schema:
+        t = field.type
+        if pa.types.is_dictionary(t):
+            t = t.value_type
+        if pa.types.is_nested(t) or pa.types.is_binary(t) or pa.types.is_large_binary(t):  # noqa E501
+            return False
+    return True
+
+
+def conform_batch(batch: pa.RecordBatch, table: Table) -> pa.RecordBatch:
+    """
+    Align a bundle batch with the target table: integer columns read back
+    as float (pandas exports with NULLs) are cast to int64, integer flags
+    to bool. Columns the table does not have are an error, as with INSERT.
+    """
+    target = {c.name: c for c in table.columns}
+    unknown = [n for n in batch.schema.names if n not in target]
+    if unknown:
+        raise RuntimeError(
+            f"Bundle columns not in table '{table.name}': {', '.join(unknown)}"
+        )
+    arrays = []
+    for name, array in zip(batch.schema.names, batch.columns):
+        sa_type = target[name].type
+        if isinstance(sa_type, sa_types.Boolean) and pa.types.is_integer(array.type):  # noqa E501
+            array = pc.cast(array, pa.bool_())
+        elif (
+            isinstance(sa_type, sa_types.Integer)
+            and not isinstance(sa_type, sa_types.Boolean)
+            and pa.types.is_floating(array.type)
+        ):
+            array = pc.cast(array, pa.int64())  # safe: fails on fractions
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def copy_batches_into(
+    engine: Engine,
+    table: Table,
+    columns: list[str],
+    batches: Iterable[pa.RecordBatch],
+) -> int:
+    """
+    COPY record batches (all with `columns`) into `table` as one COPY
+    statement on a dedicated connection. Returns the number of rows copied.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        return copy_batches_to_postgres(
+            conn,
+            quote(table.name),
+            [quote(c) for c in columns],
+            (conform_batch(b, table) for b in batches),
+        )
+
+
+# =============================================================================
+# Deferred indexes / FK constraints (PostgreSQL)
+# =============================================================================
+
+_SECONDARY_INDEXES_SQL = text(
+    """
+    SELECT ct.relname, ci.relname, pg_get_indexdef(ix.indexrelid)
+    FROM pg_index ix
+    JOIN pg_class ci ON ci.oid = ix.indexrelid
+    JOIN pg_class ct ON ct.oid = ix.indrelid
+    JOIN pg_namespace n ON n.oid = ct.relnamespace
+    WHERE n.nspname = current_schema()
+      AND ct.relname = ANY(:tables)
+      AND NOT ix.indisprimary
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_constraint con WHERE con.conindid = ix.indexrelid
+      )
+    ORDER BY ct.relname, ci.relname
+    """
+)
+
+_FOREIGN_KEYS_SQL = text(
+    """
+    SELECT ct.relname, con.conname, pg_get_constraintdef(con.oid)
+    FROM pg_constraint con
+    JOIN pg_class ct ON ct.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = ct.relnamespace
+    WHERE con.contype = 'f'
+      AND con.conparentid = 0
+      AND n.nspname = current_schema()
+      AND ct.relname = ANY(:tables)
+    ORDER BY ct.relname, con.conname
+    """
+)
+
+
+@contextmanager
+def deferred_constraints(engine: Engine, table_names: Sequence[str], workers: int = 1):  # noqa E501
+    """
+    Drop secondary indexes and FK constraints of `table_names` for the
+    duration of the block and recreate them afterwards. Primary keys and
+    unique constraints stay. No-op outside PostgreSQL.
+
+    Yields (indexes, foreign_keys) counts. If the block fails, the objects
+    are restored best-effort and the original error is raised.
+    """
+    if not is_postgres(engine) or not table_names:
+        yield (0, 0)
+        return
+
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        indexes = conn.execute(_SECONDARY_INDEXES_SQL, {"tables": list(table_names)}).all()  # noqa E501
+        fks = conn.execute(_FOREIGN_KEYS_SQL, {"tables": list(table_names)}).all()  # noqa E501
+        for table_name, name, _ in fks:
+            conn.execute(text(f"ALTER TABLE {quote(table_name)} DROP CONSTRAINT {quote(name)}"))  # noqa E501
+        for _, name, _ in indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {quote(name)}"))
+
+    # Partitioned parents report "ON ONLY"; recreate for all partitions
+    index_ddl = [ddl.replace(" ON ONLY ", " ON ", 1) for _, _, ddl in indexes]
+    fk_ddl = [
+        f"ALTER TABLE {quote(t)} ADD CONSTRAINT {quote(name)} {definition}"
+        for t, name, definition in fks
+    ]
+
+    def _execute(sql: str, strict: bool) -> None:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(sql))
+        except Exception:
+            if strict:
+                raise
+
+    try:
+        yield (len(indexes), len(fks))
+    except BaseException:
+        for sql in index_ddl + fk_ddl:
+            _execute(sql, strict=False)
+        raise
+
+    run_parallel([lambda s=s: _execute(s, True) for s in index_ddl], workers)
+    for sql in fk_ddl:
+        _execute(sql, strict=True)
@@ -168,6 +168,28 @@ def ddl_variant_effect_predictions() -> str:
     """.strip()
 
 
+def ddl_variant_predictor_summary() -> str:
+    return """
+    CREATE TABLE IF NOT EXISTS variant_predictor_summary (
+        chromosome integer NOT NULL,
+        variant_id bigint NOT NULL,
+
+        predictor_name varchar(64) NOT NULL,  -- lower-cased, e.g. alphamissense
+
+        max_score double precision NULL,      -- MAX(score) over all transcripts
+        max_classification varchar(64) NULL,  -- MAX(classification)
+        prediction_count integer NOT NULL,    -- raw rows summarized
+
+        data_source_id integer NULL,
+        etl_package_id integer NULL,
+
+        CONSTRAINT pk_variant_predictor_summary PRIMARY KEY
+            (chromosome, variant_id, predictor_name)
+
+    ) PARTITION BY LIST (chromosome);
+    """.strip()
+
+
 def ddl_variant_regulatory_elements() -> str:
     return """
     CREATE TABLE IF NOT EXISTS variant_regulatory_elements (
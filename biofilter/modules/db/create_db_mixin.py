@@ -18,15 +18,15 @@ from biofilter.modules.db.core_ddl import (
     ddl_variant_gene_regulatory_evidence,
     ddl_variant_masters,
     ddl_variant_molecular_effect,
+    ddl_variant_predictor_summary,
     ddl_variant_regulatory_elements,
 )
-from biofilter.modules.db.migrate import get_repo_heads, get_script_location
-from biofilter.utils.db_loader import bootstrap_models
 
 CORE_PARTITIONED = {
     "variant_masters",
     "variant_molecular_effects",
     "variant_effect_predictions",
+    "variant_predictor_summary",
     "variant_regulatory_elements",
     "variant_gene_regulatory_evidence",
 }
@@ -115,7 +115,7 @@ class CreateDBMixin:
         # 1) Now we can connect safely
         # If overwrite=False and DB exists -> short-circuit
         if self.exists_db(new_db=True) and not overwrite:
-            msn = f"Database already exists at {self.db_uri}"
+            msn = f"Database already exists at {self.safe_uri()}"
             self.logger.log(msn, "WARNING")
             return False
 
@@ -139,7 +139,7 @@ class CreateDBMixin:
 
         try:
             self.logger.log("📦 Bootstrapping models...", "INFO")
-            bootstrap_models(self.engine)  # single call is enough
+            self.ensure_models()  # single call is enough
 
             self.logger.log("🏗️  Creating tables...", "INFO")
             self._create_tables()
@@ -147,7 +147,7 @@ class CreateDBMixin:
             self.logger.log("🌱 Seeding initial data...", "INFO")
             self._seed_all(seed_dir)
 
-            self.logger.log(f"✅ Database created at {self.db_uri}", "SUCCESS")
+            self.logger.log(f"✅ Database created at {self.safe_uri()}", "SUCCESS")
             return True
 
         except Exception as e:
@@ -164,7 +164,7 @@ class CreateDBMixin:
         """
         # ensure connected, bootstrap models if needed, then seed
         self.connect(check_exists=True)
-        bootstrap_models(self.engine)
+        self.ensure_models()
         self._seed_all(seed_dir)
 
     # ---------------------------------------------------------------------
@@ -220,6 +220,7 @@ class CreateDBMixin:
                 text(ddl_variant_molecular_effect())
             )  # renomeie para plural se quiser
             conn.execute(text(ddl_variant_effect_predictions()))
+            conn.execute(text(ddl_variant_predictor_summary()))
             conn.execute(
                 text(ddl_variant_regulatory_elements())
             )  # corrigir typo no import/func
@@ -343,6 +344,12 @@ class CreateDBMixin:
 
                 # --- Special: BiofilterMetadata schema_revision comes from Alembic heads ---  # noqa E501
                 if model_name == "BiofilterMetadata":
+                    # Alembic is only needed here, not on every connect
+                    from biofilter.modules.db.migrate import (
+                        get_repo_heads,
+                        get_script_location,
+                    )
+
                     script_location = get_script_location()
                     schema_revision = ",".join(get_repo_heads(script_location))
                     item["schema_revision"] = schema_revision
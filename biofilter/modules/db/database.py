@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional
 
 from sqlalchemy import Table, create_engine, text
 from sqlalchemy.engine import Engine
@@ -15,6 +15,19 @@ from biofilter.modules.db.create_db_mixin import CreateDBMixin
 from biofilter.utils.db_loader import bootstrap_models
 from biofilter.utils.logger import Logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+
+def redact_uri(db_uri: Optional[str]) -> str:
+    """Database URI with its password replaced by ***."""
+    try:
+        return make_url(db_uri).render_as_string(hide_password=True)
+    except Exception:
+        return "<db_uri_redacted>"
+
 
 class Database(CreateDBMixin):
     """
@@ -24,7 +37,7 @@ class Database(CreateDBMixin):
     - Normalize & validate DB URI
     - Create SQLAlchemy Engine + Session factory
     - Bootstrap models (declarative + imperative Core tables) into
-    Base.metadata
+    Base.metadata, on the first session/table request after connect()
     - Provide a unified Table resolver (Core) via db.table("name")
     """
 
@@ -35,6 +48,8 @@ class Database(CreateDBMixin):
         self.engine: Optional[Engine] = None
         self.SessionLocal = None
         self.connected: bool = False
+        # Set by connect(); bootstrap_models runs on first DB use
+        self._models_pending: bool = False
 
         # Cache of resolved SQLAlchemy Core Table objects
         self._tables: Dict[str, Table] = {}
@@ -88,6 +103,10 @@ class Database(CreateDBMixin):
 
         return kwargs
 
+    def safe_uri(self) -> str:
+        """db_uri with the password redacted, for logs and errors."""
+        return redact_uri(self.db_uri)
+
     def _normalize_uri(self, uri: str) -> str:
         """
         If user passes a filesystem path (no scheme), treat it as sqlite:///path.  # noqa E501
@@ -98,8 +117,9 @@ class Database(CreateDBMixin):
 
     def connect(self, new_uri: Optional[str] = None, check_exists: bool = True) -> None:  # noqa E501
         """
-        Connect to database, bootstrap all models for this dialect, and prepare
-        a session factory.
+        Connect to database and prepare a session factory. Models for this
+        dialect are bootstrapped lazily (see ensure_models), so commands
+        that never open a session do not import every model module.
 
         - check_exists=True will attempt a lightweight connectivity check
         before finalizing the connection.
@@ -125,7 +145,7 @@ class Database(CreateDBMixin):
 
         # Optional connectivity check BEFORE bootstrapping
         if check_exists and not self.exists_db():
-            msg = f"❌ Database not found at {self.db_uri}"
+            msg = f"❌ Database not found at {self.safe_uri()}"
             self.logger.log(msg, "ERROR")
             raise ValueError(msg)
 
@@ -137,8 +157,8 @@ class Database(CreateDBMixin):
         # CRITICAL: clear metadata AFTER we know we're switching engines
         # Base.metadata.clear()
 
-        # Re-register everything for this engine/dialect
-        bootstrap_models(self.engine)
+        # Re-register everything for this engine/dialect on first use
+        self._models_pending = True
 
         self.SessionLocal = sessionmaker(
             bind=self.engine,
@@ -162,12 +182,12 @@ class Database(CreateDBMixin):
         except Exception:
             pass
 
-        self.logger.log("🔌 Database connection established", "INFO")
-        self.logger.log(f"   • Engine: {engine_name}", "INFO")
-        self.logger.log(f"   • Host:   {host}", "INFO")
-        self.logger.log(f"   • DB:     {db_name}", "INFO")
-        self.logger.log(f"   • Time:   {elapsed_ms:.1f} ms", "INFO")
-        self.logger.log("════════════════════════════════════", "INFO")
+        self.logger.log("🔌 Database connection established", "DEBUG")
+        self.logger.log(f"   • Engine: {engine_name}", "DEBUG")
+        self.logger.log(f"   • Host:   {host}", "DEBUG")
+        self.logger.log(f"   • DB:     {db_name}", "DEBUG")
+        self.logger.log(f"   • Time:   {elapsed_ms:.1f} ms", "DEBUG")
+        self.logger.log("════════════════════════════════════", "DEBUG")
 
         self.connected = True
 
@@ -220,12 +240,23 @@ class Database(CreateDBMixin):
     # -------------------------------------------------------------------------
     # Sessions / Tables
     # -------------------------------------------------------------------------
+    def ensure_models(self) -> None:
+        """
+        Register all models for the connected engine (bootstrap_models),
+        once per connect().
+        """
+        if not self._models_pending:
+            return
+        bootstrap_models(self._require_engine())
+        self._models_pending = False
+
     def get_session(self):
         if not self.SessionLocal:
             self.logger.log(
                 "⚠️ Database not connected. Call connect() first.", "WARNING"
             )
             return None
+        self.ensure_models()
         return self.SessionLocal()
 
     def table(self, name: str) -> Table:
@@ -241,6 +272,7 @@ class Database(CreateDBMixin):
         if name in self._tables:
             return self._tables[name]
 
+        self.ensure_models()
         if name in Base.metadata.tables:
             t = Base.metadata.tables[name]
         else:
@@ -249,3 +281,54 @@ class Database(CreateDBMixin):
 
         self._tables[name] = t
         return t
+
+    # -------------------------------------------------------------------------
+    # Columnar fetch
+    # -------------------------------------------------------------------------
+    def _require_engine(self) -> Engine:
+        if not self.engine:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        return self.engine
+
+    def fetch_arrow(
+        self,
+        sql,
+        params: Optional[Mapping[str, Any]] = None,
+        batch_size: Optional[int] = None,
+    ) -> pa.Table:
+        """
+        Run a SELECT on its own connection with a server-side cursor and
+        return a pyarrow Table built batch by batch (see arrow_fetch).
+        """
+        from biofilter.modules.db import arrow_fetch
+
+        with self._require_engine().connect() as conn:
+            return arrow_fetch.fetch_arrow(
+                conn, sql, params, batch_size or arrow_fetch.DEFAULT_BATCH_SIZE
+            )
+
+    def fetch_frame(
+        self,
+        sql,
+        params: Optional[Mapping[str, Any]] = None,
+        batch_size: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Like fetch_arrow, converted to pandas once at the end."""
+        return self.fetch_arrow(sql, params, batch_size).to_pandas()
+
+    def iter_arrow_batches(
+        self,
+        sql,
+        params: Optional[Mapping[str, Any]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream a SELECT as Arrow record batches; the connection stays open
+        until the iterator is exhausted or closed.
+        """
+        from biofilter.modules.db import arrow_fetch
+
+        with self._require_engine().connect() as conn:
+            yield from arrow_fetch.iter_record_batches(
+                conn, sql, params, batch_size or arrow_fetch.DEFAULT_BATCH_SIZE
+            )
@@ -327,6 +327,47 @@ def map_variant_effect_predictions(engine, metadata):
     return variant_effect_predictions
 
 
+def map_variant_predictor_summary(engine, metadata):
+    """
+    VariantPredictorSummary:
+    - One row per (variant × predictor), aggregated from
+      variant_effect_predictions (MAX score / classification over transcripts)
+    - Derived table, rebuilt per chromosome by
+      biofilter.modules.etl.predictor_summary after prediction loads
+    - Partitioned by chromosome on Postgres
+    """
+    dialect = engine.dialect.name
+    is_sqlite = dialect == "sqlite"
+
+    if "variant_predictor_summary" in metadata.tables:
+        return metadata.tables["variant_predictor_summary"]
+
+    common_cols = [
+        Column("chromosome", Integer, nullable=False),
+        Column("predictor_name", String(64), nullable=False),
+        Column("max_score", Float, nullable=True),
+        Column("max_classification", String(64), nullable=True),
+        Column("prediction_count", Integer, nullable=False),
+        Column("data_source_id", Integer, nullable=True),
+        Column("etl_package_id", Integer, nullable=True),
+    ]
+
+    variant_predictor_summary = Table(
+        "variant_predictor_summary",
+        metadata,
+        Column("variant_id", Integer if is_sqlite else BigInteger, nullable=False),
+        *common_cols,
+        PrimaryKeyConstraint(
+            "chromosome",
+            "variant_id",
+            "predictor_name",
+            name="pk_variant_predictor_summary",
+        ),
+    )
+
+    return variant_predictor_summary
+
+
 def map_variant_regulatory_elements(engine, metadata):
     """
     VariantRegulatoryElements (BF4 4.1.0):
@@ -14,11 +14,29 @@ import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
-from sqlalchemy import MetaData, Table, inspect, text
+from sqlalchemy import MetaData, Table, bindparam, inspect, text
 from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.engine import Engine
-
+from sqlalchemy.orm import Session
+
+from biofilter.modules.db.clone_engine import (
+    copy_batches_into,
+    copy_compatible,
+    copy_table_to_parquet,
+    deferred_constraints,
+    fk_waves,
+    iter_parquet_batches,
+    partition_children,
+    run_parallel,
+)
 from biofilter.modules.db.database import Database
+from biofilter.modules.etl.alias_search_index import (
+    KEYS_TABLE as ALIAS_KEYS_TABLE,
+    QGRAMS_TABLE as ALIAS_QGRAMS_TABLE,
+    has_alias_search_index,
+    refresh_alias_search_index,
+)
+from biofilter.modules.etl.etl_purge import PurgeEngine
 
 # =============================================================================
 # Types / Manifest
@@ -520,6 +538,7 @@ def export_full_clone(
     chunksize: int = 250_000,
     include_tables: Iterable[str] | None = None,
     exclude_tables: Iterable[str] | None = None,
+    workers: int = 1,
 ) -> Path:
     """
     Export a full-clone bundle:
@@ -529,6 +548,11 @@ def export_full_clone(
           <table>.parquet  (or .csv)
 
     Includes all tables (except alembic_version) and preserves PKs.
+
+    Tables are exported concurrently on up to `workers` connections. On
+    PostgreSQL, parquet tables are streamed with COPY TO (see
+    clone_engine) and partitions are exported through their parent table.
+    SQLite always exports one table at a time.
     """
     out = Path(out_dir).expanduser().resolve()
     tables_dir = out / "tables"
@@ -554,7 +578,10 @@ def export_full_clone(
             )
         table_names = sorted(selected)
     else:
-        table_names = sorted(all_table_names)
+        # Partition rows are exported (and re-routed on import) by the parent
+        with engine.connect() as conn:
+            children = partition_children(conn)
+        table_names = sorted(t for t in all_table_names if t not in children)
 
     if excluded:
         unknown_excluded = sorted(excluded - available)
@@ -568,13 +595,25 @@ def export_full_clone(
     if not table_names:
         raise RuntimeError("No tables selected for export.")
 
-    rows_meta: list[dict] = []
+    is_pg = detect_engine_name(engine) in ("postgresql", "postgres")
+    reflected: dict[str, Table] = {}
+    if is_pg and fmt != "csv":
+        meta = MetaData()
+        meta.reflect(bind=engine, only=table_names)
+        reflected = dict(meta.tables)
 
-    with engine.connect() as conn:
-        for t in table_names:
+    def export_one(t: str) -> dict:
+        file_name = f"{t}.{fmt}"
+        file_path = tables_dir / file_name
+
+        if t in reflected:
+            cnt = copy_table_to_parquet(engine, reflected[t], file_path)
+            return {"name": t, "rows": cnt, "file": f"tables/{file_name}"}
+
+        with engine.connect() as conn:
             # row count (best-effort)
             try:
-                if detect_engine_name(engine) in ("postgresql", "postgres"):
+                if is_pg:
                     cnt = (
                         conn.execute(text(f'SELECT COUNT(*) FROM "{t}"')).scalar() or 0  # noqa E501
                     )
@@ -583,21 +622,29 @@ def export_full_clone(
             except Exception:
                 cnt = None
 
-            file_name = f"{t}.{fmt}"
-            file_path = tables_dir / file_name
-
             if fmt == "csv":
                 _export_table_csv(conn, engine, t, file_path, chunksize=chunksize)  # noqa E501
             else:
                 _export_table_parquet(conn, engine, t, file_path, chunksize=chunksize)  # noqa E501
 
-            rows_meta.append({"name": t, "rows": cnt, "file": f"tables/{file_name}"})  # noqa E501
+        return {"name": t, "rows": cnt, "file": f"tables/{file_name}"}
+
+    # Taken before the rows: packages loading meanwhile are re-sent by
+    # the next differential bundle
+    high_water = etl_package_high_water(engine)
+
+    rows_meta = run_parallel(
+        [lambda t=t: export_one(t) for t in table_names],
+        workers if is_pg else 1,
+    )
 
     manifest = {
         "biofilter_version": biofilter_version,
         "schema_version": schema_version,
         "engine": detect_engine_name(engine),
         "created_at": utc_now_iso(),
+        "bundle_type": "full",
+        "etl_package_high_water": high_water,
         "tables": rows_meta,
     }
     (out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")  # noqa E501
@@ -611,15 +658,23 @@ def import_full_clone(
     reset_sequences: bool = True,
     chunksize: int = 50_000,
     allow_missing_tables: bool = False,
+    workers: int = 1,
+    defer_indexes: bool = True,
 ) -> None:
     """
     Import a full-clone bundle into an existing schema.
 
     Steps:
-    1) Reflect schema and compute dependency order (MetaData.sorted_tables).
+    1) Reflect schema and split it into FK-dependency waves.
     2) Truncate all tables (except alembic_version).
-    3) Import parents->children, preserving PKs.
+    3) Import wave by wave, preserving PKs; tables of one wave load
+       concurrently on up to `workers` connections.
     4) Reset Postgres sequences (recommended).
+
+    Parquet files are streamed one row group at a time. On PostgreSQL the
+    batches are loaded with COPY FROM STDIN and, with `defer_indexes`,
+    secondary indexes and FK constraints are dropped for the load and
+    recreated afterwards. SQLite always loads one table at a time.
     """
     engine = db.engine
     if engine is None:
@@ -640,8 +695,14 @@ def import_full_clone(
     # Reflect full schema for dependency order
     meta = MetaData()
     meta.reflect(bind=engine)
+    with engine.connect() as conn:
+        # Partitions are filled through their parent
+        children = partition_children(conn)
 
-    insert_order = [t for t in meta.sorted_tables if t.name != "alembic_version"]  # noqa E501
+    insert_order = [
+        t for t in meta.sorted_tables
+        if t.name != "alembic_version" and t.name not in children
+    ]
     delete_order = list(reversed(insert_order))
 
     name_to_file = {e["name"]: e["file"] for e in entries}
@@ -669,10 +730,26 @@ def import_full_clone(
     if not tables_to_import:
         raise RuntimeError("No common tables between bundle and current schema.")
 
+    # Resolve files and target tables up front (fail before truncating)
+    jobs_by_name: dict[str, tuple[Table, Path]] = {}
+    for reflected_table in tables_to_import:
+        rel_file = name_to_file.get(reflected_table.name)
+        if not rel_file:
+            raise RuntimeError(
+                f"Bundle manifest missing table entry for: {reflected_table.name}"
+            )
+
+        file_path = base / rel_file
+        if not file_path.exists():
+            raise FileNotFoundError(str(file_path))
+
+        jobs_by_name[reflected_table.name] = (db.table(reflected_table.name), file_path)  # noqa E501
+
+    is_pg = detect_engine_name(engine) in ("postgresql", "postgres")
+
     # 1) Truncate relevant tables
     with engine.begin() as conn:
-        d = detect_engine_name(engine)
-        if d in ("postgresql", "postgres"):
+        if is_pg:
             for table in tables_to_truncate:
                 conn.execute(
                     text(f'TRUNCATE TABLE "{table.name}" RESTART IDENTITY CASCADE')  # noqa E501
@@ -685,31 +762,479 @@ def import_full_clone(
         # Extra tables in bundle are ignored (useful across schema versions).
         pass
 
-    # 2) Import in dependency order
-    for reflected_table in tables_to_import:
-        rel_file = name_to_file.get(reflected_table.name)
-        if not rel_file:
-            raise RuntimeError(
-                f"Bundle manifest missing table entry for: {reflected_table.name}"
-            )
-
-        file_path = base / rel_file
-        if not file_path.exists():
-            raise FileNotFoundError(str(file_path))
-
-        target_table = db.table(reflected_table.name)
-
+    def import_one(name: str) -> None:
+        target_table, file_path = jobs_by_name[name]
         if fmt == "csv":
             for chunk in pd.read_csv(file_path, chunksize=200_000):
                 _insert_df(engine, target_table, chunk, chunksize=chunksize)
         else:
-            df = pd.read_parquet(file_path)
-            _insert_df(engine, target_table, df, chunksize=chunksize)
+            _import_table_parquet(engine, target_table, file_path, chunksize=chunksize)  # noqa E501
+
+    # 2) Import in dependency waves
+    deferred = [t.name for t in tables_to_import] if defer_indexes else []
+    with deferred_constraints(engine, deferred, workers=workers):
+        for wave in fk_waves(tables_to_import):
+            run_parallel(
+                [lambda n=t.name: import_one(n) for t in wave],
+                workers if is_pg else 1,
+            )
 
     # 3) Postgres sequences
+    if reset_sequences and is_pg:
+        reset_postgres_sequences(engine)
+
+
+# =============================================================================
+# Differential clone bundle (rows of ETL packages newer than a base bundle)
+# =============================================================================
+
+PACKAGE_KEY = "etl_package_id"
+# Site-local settings and derived indexes never travel in a differential
+DIFF_SKIP_TABLES = {
+    "alembic_version",
+    "system_config",
+    "biofilter_metadata",
+    ALIAS_KEYS_TABLE,
+    ALIAS_QGRAMS_TABLE,
+}
+
+
+def etl_package_high_water(engine: Engine) -> int | None:
+    """
+    Highest etl_packages.id whose rows are final: below the oldest package
+    still running, if any. None when the database has no ETL tables.
+    """
+    if not inspect(engine).has_table("etl_packages"):
+        return None
+    with engine.connect() as conn:
+        max_id, running_min = conn.execute(
+            text(
+                "SELECT MAX(id), MIN(CASE WHEN status = 'running' THEN id END) "
+                "FROM etl_packages"
+            )
+        ).one()
+    if max_id is None:
+        return 0
+    if running_min is not None:
+        return int(running_min) - 1
+    return int(max_id)
+
+
+def read_manifest(bundle: str | Path) -> dict:
+    """manifest.json of a bundle directory (or the manifest file itself)."""
+    path = Path(bundle).expanduser().resolve()
+    if path.is_dir():
+        path = path / "manifest.json"
+    if not path.exists():
+        raise FileNotFoundError(str(path))
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def bundle_type(in_dir: str | Path) -> str:
+    """'differential' or 'full' (also for bundles without a manifest)."""
+    try:
+        return read_manifest(in_dir).get("bundle_type") or "full"
+    except FileNotFoundError:
+        return "full"
+
+
+def _diff_table_modes(meta: MetaData, skip: set[str]) -> dict[str, tuple]:
+    """
+    How each table travels in a differential bundle:
+    - ("package",): rows carry etl_package_id; newer packages are shipped;
+    - ("dependent", fk_col, parent, parent_pk): no etl_package_id, but a
+      single-column FK to a package table; children of shipped parents are
+      shipped (and replaced on import);
+    - ("reference",): everything else (lookup/config/ETL bookkeeping),
+      small enough to ship whole and upsert.
+    """
+    modes: dict[str, tuple] = {}
+    for table in meta.sorted_tables:
+        if table.name in skip:
+            continue
+        if PACKAGE_KEY in table.columns:
+            modes[table.name] = ("package",)
+            continue
+        parent_fk = next(
+            (
+                fk for fk in table.foreign_keys
+                if PACKAGE_KEY in fk.column.table.columns
+                and fk.column.table.name not in skip
+            ),
+            None,
+        )
+        if parent_fk is not None:
+            modes[table.name] = (
+                "dependent",
+                parent_fk.parent.name,
+                parent_fk.column.table.name,
+                parent_fk.column.name,
+            )
+        else:
+            modes[table.name] = ("reference",)
+    return modes
+
+
+def _replaced_data_sources(engine: Engine, base: int, high_water: int) -> list[int]:  # noqa E501
+    """
+    Data sources with a load package in (base, high_water] that actually
+    ran. DTP reloads delete a data source's rows before reinserting them
+    (DELETE ... WHERE data_source_id, TRUNCATE), so the destination must
+    replace those data sources instead of upserting over them.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT DISTINCT data_source_id FROM etl_packages "
+                "WHERE operation_type = 'load' "
+                "AND status NOT IN ('not-applicable', 'up-to-date') "
+                "AND id > :base AND id <= :hw ORDER BY data_source_id"
+            ),
+            {"base": base, "hw": high_water},
+        ).scalars().all()
+    return [int(ds_id) for ds_id in rows if ds_id is not None]
+
+
+def _replaced_rows_sql(engine: Engine, table: Table, replaced: list[int]) -> str | None:  # noqa E501
+    """WHERE condition matching the rows of `table` owned by replaced data sources."""  # noqa E501
+    if not replaced:
+        return None
+    q = engine.dialect.identifier_preparer.quote
+    ids = ", ".join(str(int(ds_id)) for ds_id in replaced)
+    if "data_source_id" in table.columns:
+        return f"{q('data_source_id')} IN ({ids})"
+    return (
+        f"{q(PACKAGE_KEY)} IN (SELECT {q('id')} FROM {q('etl_packages')} "
+        f"WHERE {q('data_source_id')} IN ({ids}))"
+    )
+
+
+def _diff_select_sql(
+    engine: Engine, meta: MetaData, name: str, mode: tuple, replaced: list[int]  # noqa E501
+) -> str:
+    q = engine.dialect.identifier_preparer.quote
+    sql = f"SELECT * FROM {q(name)}"
+
+    def package_rows(table: Table) -> str:
+        cond = f"{q(PACKAGE_KEY)} > :base"
+        owned = _replaced_rows_sql(engine, table, replaced)
+        return f"({cond} OR {owned})" if owned else cond
+
+    if mode[0] == "package":
+        return sql + f" WHERE {package_rows(meta.tables[name])}"
+    if mode[0] == "dependent":
+        _, fk_col, parent, parent_pk = mode
+        return sql + (
+            f" WHERE {q(fk_col)} IN (SELECT {q(parent_pk)} FROM {q(parent)} "
+            f"WHERE {package_rows(meta.tables[parent])})"
+        )
+    return sql
+
+
+def _rollback_tombstones(engine: Engine, base: int, high_water: int) -> list[dict]:  # noqa E501
+    """Completed rollback packages in (base, high_water], oldest first."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT id, data_source_id, stats FROM etl_packages "
+                "WHERE operation_type = 'rollback' AND status = 'completed' "
+                "AND id > :base AND id <= :hw ORDER BY id"
+            ),
+            {"base": base, "hw": high_water},
+        ).all()
+
+    tombstones = []
+    for pkg_id, ds_id, stats in rows:
+        if isinstance(stats, str):
+            stats = json.loads(stats or "{}")
+        stats = stats or {}
+        if stats.get("mode") == "package" and stats.get("target_package_id"):
+            key = {"key_name": PACKAGE_KEY, "key_value": int(stats["target_package_id"])}  # noqa E501
+        else:
+            target_ds = stats.get("target_data_source_id") or ds_id
+            key = {"key_name": "data_source_id", "key_value": int(target_ds)}
+        tombstones.append({"rollback_package_id": int(pkg_id), **key})
+    return tombstones
+
+
+def export_diff_clone(
+    engine: Engine,
+    out_dir: str | Path,
+    *,
+    base_bundle: str | Path,
+    biofilter_version: str,
+    schema_version: str,
+    chunksize: int = 250_000,
+    workers: int = 1,
+) -> Path:
+    """
+    Export a differential bundle on top of `base_bundle` (a full or
+    differential bundle already applied at the destination):
+
+    - rows of ETL packages newer than the base high-water mark, plus the
+      rows of tables hanging off them (see `_diff_table_modes`);
+    - every row of the data sources reloaded since the base, with a
+      replace marker per data source (see `_replaced_data_sources`);
+    - reference tables (ETL bookkeeping, lookups) in full;
+    - tombstones for the rollbacks run since the base.
+
+    The manifest records the new high-water mark, so the bundle can be the
+    base of the next one. Payloads are parquet.
+    """
+    base_manifest = read_manifest(base_bundle)
+    base = base_manifest.get("etl_package_high_water")
+    if base is None:
+        raise RuntimeError(
+            "Base bundle has no etl_package_high_water; re-export it with this "  # noqa E501
+            "version of Biofilter before building differential bundles."
+        )
+    base = int(base)
+
+    high_water = etl_package_high_water(engine)
+    if high_water is None:
+        raise RuntimeError("Database has no etl_packages table.")
+    if high_water < base:
+        raise RuntimeError(
+            f"Base bundle high-water mark ({base}) is ahead of this database "
+            f"({high_water}); was it exported from another database?"
+        )
+
+    out = Path(out_dir).expanduser().resolve()
+    tables_dir = out / "tables"
+    tables_dir.mkdir(parents=True, exist_ok=True)
+
+    meta = MetaData()
+    meta.reflect(bind=engine)
+    with engine.connect() as conn:
+        skip = DIFF_SKIP_TABLES | partition_children(conn)
+    modes = _diff_table_modes(meta, skip)
+    replaced = _replaced_data_sources(engine, base, high_water)
+
+    def export_one(name: str) -> dict:
+        file_name = f"{name}.parquet"
+        sql = _diff_select_sql(engine, meta, name, modes[name], replaced)
+        params = {"base": base} if modes[name][0] != "reference" else None
+        with engine.connect() as conn:
+            count_sql = f"SELECT COUNT(*) FROM ({sql}) AS diff_rows"
+            cnt = int(conn.execute(text(count_sql), params or {}).scalar() or 0)  # noqa E501
+            _export_query_parquet(
+                conn, sql, tables_dir / file_name, chunksize=chunksize, params=params  # noqa E501
+            )
+        return {
+            "name": name,
+            "rows": cnt,
+            "file": f"tables/{file_name}",
+            "mode": modes[name][0],
+        }
+
+    is_pg = detect_engine_name(engine) in ("postgresql", "postgres")
+    rows_meta = run_parallel(
+        [lambda n=n: export_one(n) for n in modes], workers if is_pg else 1
+    )
+
+    manifest = {
+        "biofilter_version": biofilter_version,
+        "schema_version": schema_version,
+        "engine": detect_engine_name(engine),
+        "created_at": utc_now_iso(),
+        "bundle_type": "differential",
+        "base_high_water": base,
+        "etl_package_high_water": high_water,
+        "tombstones": _rollback_tombstones(engine, base, high_water),
+        "replaced_data_sources": replaced,
+        "tables": rows_meta,
+    }
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")  # noqa E501
+    return out
+
+
+def _upsert_statement(engine: Engine, table: Table):
+    dialect = detect_engine_name(engine)
+    if dialect in ("postgresql", "postgres"):
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(
+            f"Differential import not implemented for engine: {dialect}"
+        )
+
+    stmt = dialect_insert(table)
+    pk = [c.name for c in table.primary_key.columns]
+    if not pk:
+        raise RuntimeError(f"Table '{table.name}' has no primary key to upsert on.")  # noqa E501
+    updates = {
+        c.name: stmt.excluded[c.name] for c in table.columns if c.name not in pk
+    }
+    if not updates:
+        return stmt.on_conflict_do_nothing(index_elements=pk)
+    return stmt.on_conflict_do_update(index_elements=pk, set_=updates)
+
+
+def import_diff_clone(
+    db: Database,
+    in_dir: str | Path,
+    *,
+    logger=None,
+    chunksize: int = 50_000,
+    reset_sequences: bool = True,
+) -> dict:
+    """
+    Apply a differential bundle in place, in one transaction:
+
+    1) tombstones: rows of rolled-back packages / data sources are purged
+       with the ETL purge engine, oldest rollback first;
+    2) replace markers: rows of data sources reloaded at the source are
+       removed (the bundle ships all of their rows), so rows a reload
+       dropped do not linger;
+    3) dependent tables: children of the shipped parent rows are removed,
+       so children dropped at the source do not linger;
+    4) shipped rows are upserted on their primary key, parents first;
+    5) the alias search index, if built, picks up the shipped data sources.
+
+    The destination must already hold the base bundle (its newest ETL
+    package is at least the bundle's base high-water mark). Re-applying
+    the same bundle is harmless. Returns {"tombstones": n, "rows": n}.
+    """
+    engine = db.engine
+    if engine is None:
+        raise RuntimeError(
+            "Database engine is not initialized (db.engine is None). Connect first."  # noqa E501
+        )
+
+    base_dir = Path(in_dir).expanduser().resolve()
+    manifest = read_manifest(base_dir)
+    if manifest.get("bundle_type") != "differential":
+        raise RuntimeError("Not a differential bundle; use import_full_clone.")
+
+    base = int(manifest["base_high_water"])
+    current = etl_package_high_water(engine)
+    if current is None or current < base:
+        raise RuntimeError(
+            f"Destination is behind the bundle base (ETL package high-water "
+            f"{current}, bundle needs >= {base}). Import the base bundle first."  # noqa E501
+        )
+
+    meta = MetaData()
+    meta.reflect(bind=engine)
+    entries = {e["name"]: e for e in manifest.get("tables", [])}
+    ordered = [t for t in meta.sorted_tables if t.name in entries]
+    unknown = sorted(set(entries) - {t.name for t in ordered})
+    if unknown:
+        raise RuntimeError(
+            "Differential bundle has tables missing from this schema: "
+            + ", ".join(unknown)
+        )
+
+    q = engine.dialect.identifier_preparer.quote
+    purge = PurgeEngine(logger=logger or _NullLogger())
+    totals = {"tombstones": 0, "rows": 0}
+
+    with Session(bind=engine) as session:
+        try:
+            for stone in manifest.get("tombstones", []):
+                deleted = purge.purge(session, stone["key_name"], int(stone["key_value"]))  # noqa E501
+                totals["tombstones"] += int(sum(deleted.values()))
+
+            conn = session.connection()
+            replaced = [int(ds) for ds in manifest.get("replaced_data_sources", [])]  # noqa E501
+            # Clear what the shipped rows replace, children first, before
+            # any upsert: rows of reloaded data sources, and the children
+            # of every shipped parent (keyed by the parent rows in the
+            # bundle, whatever package they now belong to)
+            for reflected in reversed(ordered):
+                entry = entries[reflected.name]
+                if entry.get("mode") == "dependent":
+                    fk = next(
+                        fk for fk in reflected.foreign_keys
+                        if PACKAGE_KEY in fk.column.table.columns
+                    )
+                    owned = _replaced_rows_sql(engine, fk.column.table, replaced)  # noqa E501
+                    if owned:
+                        conn.execute(
+                            text(
+                                f"DELETE FROM {q(reflected.name)} WHERE {q(fk.parent.name)} IN "  # noqa E501
+                                f"(SELECT {q(fk.column.name)} FROM {q(fk.column.table.name)} "  # noqa E501
+                                f"WHERE {owned})"
+                            )
+                        )
+                    parent_entry = entries.get(fk.column.table.name)
+                    if parent_entry is None:
+                        continue
+                    stmt = text(
+                        f"DELETE FROM {q(reflected.name)} WHERE {q(fk.parent.name)} IN :keys"  # noqa E501
+                    ).bindparams(bindparam("keys", expanding=True))
+                    for keys in _shipped_keys(
+                        base_dir / parent_entry["file"], fk.column.name
+                    ):
+                        conn.execute(stmt, {"keys": keys})
+                elif entry.get("mode") == "package":
+                    owned = _replaced_rows_sql(engine, reflected, replaced)
+                    if owned:
+                        conn.execute(
+                            text(f"DELETE FROM {q(reflected.name)} WHERE {owned}")  # noqa E501
+                        )
+
+            for reflected in ordered:
+                entry = entries[reflected.name]
+                table = db.table(reflected.name)
+
+                path = base_dir / entry["file"]
+                if not len(pq.read_schema(str(path))):
+                    continue
+                stmt = _upsert_statement(engine, table)
+                for batch in iter_parquet_batches(path, batch_size=chunksize):
+                    records = _df_to_db_records(batch.to_pandas(), table)
+                    if records:
+                        conn.execute(stmt, records)
+                        totals["rows"] += len(records)
+
+            if has_alias_search_index(conn):
+                ds_ids = conn.execute(
+                    text(
+                        "SELECT DISTINCT data_source_id FROM etl_packages "
+                        "WHERE id > :base"
+                    ),
+                    {"base": base},
+                ).scalars().all()
+                if ds_ids:
+                    refresh_alias_search_index(conn, data_source_ids=ds_ids, logger=logger)  # noqa E501
+
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
     if reset_sequences and detect_engine_name(engine) in ("postgresql", "postgres"):  # noqa E501
         reset_postgres_sequences(engine)
 
+    if logger is not None:
+        logger.log(
+            f"🧩 Differential bundle applied (packages {base + 1}.."
+            f"{manifest.get('etl_package_high_water')}): {totals['rows']} row(s) "  # noqa E501
+            f"upserted, {totals['tombstones']} row(s) removed by tombstones",
+            "INFO",
+        )
+    return totals
+
+
+def _shipped_keys(path: Path, column: str, chunk: int = 1_000) -> Iterable[list]:  # noqa E501
+    """Values of `column` in a bundle payload, in chunks for IN (...) lists."""
+    if not path.exists():
+        return
+    pf = pq.ParquetFile(str(path))
+    if column not in pf.schema_arrow.names:
+        return
+    for batch in pf.iter_batches(batch_size=chunk, columns=[column]):
+        keys = [k for k in batch.column(0).to_pylist() if k is not None]
+        if keys:
+            yield keys
+
+
+class _NullLogger:
+    def log(self, message, level="INFO"):
+        pass
+
 
 # =============================================================================
 # Bundle helpers
@@ -746,11 +1271,17 @@ def _export_table_parquet(
     destination parquet file (single file output).
     """
     sql = _select_all_sql(engine, table_name)
+    _export_query_parquet(conn, sql, out_path, chunksize=chunksize)
+
+
+def _export_query_parquet(
+    conn, sql: str, out_path: Path, *, chunksize: int, params: dict | None = None  # noqa E501
+) -> None:
     writer: pq.ParquetWriter | None = None
     schema: pa.Schema | None = None
 
     try:
-        for chunk in pd.read_sql(text(sql), conn, chunksize=chunksize):
+        for chunk in pd.read_sql(text(sql), conn, params=params, chunksize=chunksize):  # noqa E501
             table = pa.Table.from_pandas(chunk, preserve_index=False)
 
             if writer is None:
@@ -769,6 +1300,26 @@ def _export_table_parquet(
         pd.DataFrame().to_parquet(out_path, index=False)
 
 
+def _import_table_parquet(
+    engine: Engine, table: Table, path: Path, *, chunksize: int
+) -> None:
+    """
+    Load one parquet file row group by row group: COPY on PostgreSQL when
+    every column can travel as CSV, chunked inserts otherwise.
+    """
+    schema = pq.read_schema(str(path))
+    if not len(schema):
+        # Empty table exported as a column-less file
+        return
+
+    if detect_engine_name(engine) in ("postgresql", "postgres") and copy_compatible(schema):  # noqa E501
+        copy_batches_into(engine, table, schema.names, iter_parquet_batches(path))  # noqa E501
+        return
+
+    for batch in iter_parquet_batches(path):
+        _insert_df(engine, table, batch.to_pandas(), chunksize=chunksize)
+
+
 def reset_postgres_sequences(engine: Engine) -> None:
     """
     Reset SERIAL/IDENTITY sequences after importing explicit PK values.
@@ -0,0 +1,323 @@
+"""
+Q-gram search index over entity alias keys (`entity_alias_search_keys`,
+`entity_alias_qgrams`).
+
+The fuzzy match modes of the entity reports score the input words against
+alias keys (`LOWER(COALESCE(alias_norm, alias_value))`) with rapidfuzz's
+`token_sort_ratio`. Scoring every distinct key on every call does not
+scale, so this module keeps an inverted index of padded trigrams of the
+token-sorted keys and answers "which keys can still reach the similarity
+threshold" with one indexed lookup per input:
+
+- `entity_alias_search_keys`: one row per distinct alias key with the
+  length and trigram count of its token-sorted form;
+- `entity_alias_qgrams`: (qgram, key_id) postings, primary key first on
+  the trigram so each lookup is a B-tree range scan on both SQLite and
+  PostgreSQL.
+
+`alias_search_candidates` only drops keys that cannot score above the
+threshold (length and shared-trigram bounds of the Indel ratio), so the
+rapidfuzz results on the candidates are the same as on the full key list.
+
+The tables are created by the first `refresh_alias_search_index` call,
+which indexes every alias; ETL loads then add the keys of the loaded data
+source only. Their existence therefore means "complete as of the last
+load", and they are intentionally not part of the ORM metadata. Keys of
+purged aliases stay in the index until the next full refresh; callers
+join candidates back to `entity_aliases`, so they are never reported.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    bindparam,
+    inspect,
+    text,
+)
+
+KEYS_TABLE = "entity_alias_search_keys"
+QGRAMS_TABLE = "entity_alias_qgrams"
+Q = 3
+PAD = " " * (Q - 1)
+BATCH_SIZE = 10_000
+
+# Alias key as matched by the reports (see report_entity_filter)
+ALIAS_KEY_SQL = "LOWER(COALESCE(alias_norm, alias_value))"
+
+
+def alias_search_tables(metadata: MetaData) -> tuple[Table, Table]:
+    keys = Table(
+        KEYS_TABLE,
+        metadata,
+        Column("key_id", Integer, primary_key=True, autoincrement=False),
+        Column("alias_key", String(1000), nullable=False, unique=True),
+        Column("key_length", Integer, nullable=False, index=True),
+        Column("qgram_count", Integer, nullable=False),
+    )
+    qgrams = Table(
+        QGRAMS_TABLE,
+        metadata,
+        Column("qgram", String(Q), nullable=False),
+        Column("key_id", Integer, nullable=False),
+        PrimaryKeyConstraint("qgram", "key_id"),
+    )
+    return keys, qgrams
+
+
+# -------------------------------------------------------------------------
+# Q-grams
+# -------------------------------------------------------------------------
+def sorted_tokens(value: str) -> str:
+    """Token-sorted form compared by rapidfuzz's token_sort_ratio."""
+    return " ".join(sorted(value.split()))
+
+
+def qgrams(value: str) -> set[str]:
+    """Distinct padded trigrams of an already token-sorted string."""
+    if not value:
+        return set()
+    padded = f"{PAD}{value}{PAD}"
+    return {padded[i:i + Q] for i in range(len(padded) - Q + 1)}
+
+
+def _max_distance(total_length: int, threshold: float) -> int:
+    # token_sort_ratio = 100 * (1 - indel_distance / total_length)
+    return math.floor((1 - threshold / 100.0) * total_length + 1e-9)
+
+
+def _length_range(length: int, threshold: float) -> tuple[int, int]:
+    # |la - lb| <= indel distance, so ratio >= t bounds lb around la
+    if threshold >= 100:
+        return length, length
+    return (
+        max(math.ceil(length * threshold / (200 - threshold) - 1e-9), 0),
+        math.floor(length * (200 - threshold) / threshold + 1e-9),
+    )
+
+
+def can_reach_threshold(
+    query_length: int,
+    query_qgrams: int,
+    key_length: int,
+    key_qgrams: int,
+    shared_qgrams: int,
+    threshold: float,
+) -> bool:
+    """
+    True when a key may score >= threshold against the query.
+
+    Each insertion/deletion destroys at most Q trigrams, so two strings at
+    Indel distance d share at least max(|G(a)|, |G(b)|) - Q * d distinct
+    trigrams (padding included).
+    """
+    d = _max_distance(query_length + key_length, threshold)
+    if abs(query_length - key_length) > d:
+        return False
+    return shared_qgrams >= max(query_qgrams, key_qgrams) - Q * d
+
+
+# -------------------------------------------------------------------------
+# Build / refresh
+# -------------------------------------------------------------------------
+def has_alias_search_index(conn) -> bool:
+    """True when the index has been built on this connection's database."""
+    insp = inspect(conn)
+    return insp.has_table(KEYS_TABLE) and insp.has_table(QGRAMS_TABLE)
+
+
+def _new_keys(conn, data_source_ids: Optional[list[int]]) -> Iterator[str]:
+    sql = (
+        f"SELECT DISTINCT {ALIAS_KEY_SQL} AS alias_key FROM entity_aliases ea "
+        f"WHERE {ALIAS_KEY_SQL} IS NOT NULL "
+        f"AND NOT EXISTS (SELECT 1 FROM {KEYS_TABLE} k "
+        f"WHERE k.alias_key = {ALIAS_KEY_SQL})"
+    )
+    stmt = text(sql)
+    params = {}
+    if data_source_ids is not None:
+        stmt = text(sql + " AND ea.data_source_id IN :ds_ids").bindparams(
+            bindparam("ds_ids", expanding=True)
+        )
+        params = {"ds_ids": data_source_ids}
+    result = conn.execute(stmt, params)
+    while True:
+        rows = result.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield row[0]
+
+
+def refresh_alias_search_index(
+    conn,
+    data_source_ids: Optional[Iterable[int]] = None,
+    logger=None,
+) -> int:
+    """
+    Index the alias keys not yet in the index, inside the caller's
+    transaction. Returns the number of keys added.
+
+    With `data_source_ids`, only aliases of those data sources are
+    scanned (the post-load path). Without it, or when the index does not
+    exist yet, every alias is indexed and keys no longer present in
+    `entity_aliases` are pruned.
+    """
+    full = data_source_ids is None or not has_alias_search_index(conn)
+    keys_table, qgrams_table = alias_search_tables(MetaData())
+    keys_table.create(conn, checkfirst=True)
+    qgrams_table.create(conn, checkfirst=True)
+
+    if full:
+        stale = f"NOT EXISTS (SELECT 1 FROM entity_aliases ea WHERE {ALIAS_KEY_SQL} = {KEYS_TABLE}.alias_key)"  # noqa E501
+        conn.execute(
+            text(
+                f"DELETE FROM {QGRAMS_TABLE} WHERE key_id IN "
+                f"(SELECT key_id FROM {KEYS_TABLE} WHERE {stale})"
+            )
+        )
+        conn.execute(text(f"DELETE FROM {KEYS_TABLE} WHERE {stale}"))
+
+    next_id = int(
+        conn.execute(text(f"SELECT MAX(key_id) FROM {KEYS_TABLE}")).scalar() or 0
+    ) + 1
+    ds_ids = None if full else sorted({int(i) for i in data_source_ids})
+
+    # Materialized first: inserting while the SELECT cursor is open is not
+    # safe on every driver
+    new_keys = list(_new_keys(conn, ds_ids))
+    added = 0
+    key_rows: list[dict] = []
+    qgram_rows: list[dict] = []
+    for alias_key in new_keys:
+        sorted_key = sorted_tokens(alias_key)
+        grams = qgrams(sorted_key)
+        key_rows.append(
+            {
+                "key_id": next_id,
+                "alias_key": alias_key,
+                "key_length": len(sorted_key),
+                "qgram_count": len(grams),
+            }
+        )
+        qgram_rows.extend({"qgram": g, "key_id": next_id} for g in grams)
+        next_id += 1
+        added += 1
+        if len(key_rows) >= BATCH_SIZE:
+            _flush(conn, keys_table, qgrams_table, key_rows, qgram_rows)
+    _flush(conn, keys_table, qgrams_table, key_rows, qgram_rows)
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"ANALYZE {KEYS_TABLE}"))
+        conn.execute(text(f"ANALYZE {QGRAMS_TABLE}"))
+
+    if logger is not None:
+        scope = "all aliases" if full else f"data source(s) {ds_ids}"
+        logger.log(
+            f"🔎 Alias search index refreshed ({scope}): {added} new key(s)",
+            "INFO",
+        )
+    return added
+
+
+def _flush(conn, keys_table, qgrams_table, key_rows, qgram_rows) -> None:
+    if key_rows:
+        conn.execute(keys_table.insert(), key_rows)
+    if qgram_rows:
+        conn.execute(qgrams_table.insert(), qgram_rows)
+    key_rows.clear()
+    qgram_rows.clear()
+
+
+# -------------------------------------------------------------------------
+# Lookup
+# -------------------------------------------------------------------------
+_CANDIDATES_SQL = text(
+    f"""
+    SELECT k.alias_key, k.key_length, k.qgram_count, COUNT(*) AS shared
+    FROM {QGRAMS_TABLE} g
+    JOIN {KEYS_TABLE} k ON k.key_id = g.key_id
+    WHERE g.qgram IN :qgrams
+      AND k.key_length BETWEEN :min_length AND :max_length
+    GROUP BY k.key_id, k.alias_key, k.key_length, k.qgram_count
+    """
+).bindparams(bindparam("qgrams", expanding=True))
+
+
+def alias_search_candidates(
+    conn, queries: Iterable[str], threshold: float
+) -> Dict[str, set[str]]:
+    """
+    Candidate alias keys per query for `token_sort_ratio >= threshold`.
+
+    Requires 0 < threshold: at 0 every key matches and there is nothing
+    to filter. Keys sharing no trigram with a query are only dropped when
+    the bound proves they cannot match.
+    """
+    if threshold <= 0:
+        raise ValueError("alias_search_candidates requires a positive threshold.")
+
+    out: Dict[str, set[str]] = {}
+    for query in queries:
+        sorted_query = sorted_tokens(query)
+        grams = qgrams(sorted_query)
+        length = len(sorted_query)
+        min_length, max_length = _length_range(length, threshold)
+        found: set[str] = set()
+
+        # Keys that may match with no shared trigram at all (bound <= 0)
+        # never show up in the posting lists; score them by length instead
+        zero_shared_ok = any(
+            can_reach_threshold(length, len(grams), kl, 0, 0, threshold)
+            for kl in range(min_length, max_length + 1)
+        )
+        if zero_shared_ok:
+            rows = conn.execute(
+                text(
+                    f"SELECT alias_key, key_length, qgram_count FROM {KEYS_TABLE} "  # noqa E501
+                    "WHERE key_length BETWEEN :min_length AND :max_length"
+                ),
+                {"min_length": min_length, "max_length": max_length},
+            )
+            shared = _shared_counts(conn, grams, min_length, max_length)
+            for alias_key, key_length, qgram_count in rows:
+                if can_reach_threshold(
+                    length, len(grams), key_length, qgram_count,
+                    shared.get(alias_key, 0), threshold,
+                ):
+                    found.add(alias_key)
+        elif grams:
+            rows = conn.execute(
+                _CANDIDATES_SQL,
+                {
+                    "qgrams": sorted(grams),
+                    "min_length": min_length,
+                    "max_length": max_length,
+                },
+            )
+            for alias_key, key_length, qgram_count, shared_count in rows:
+                if can_reach_threshold(
+                    length, len(grams), key_length, qgram_count,
+                    shared_count, threshold,
+                ):
+                    found.add(alias_key)
+        out[query] = found
+    return out
+
+
+def _shared_counts(conn, grams, min_length, max_length) -> Dict[str, int]:
+    if not grams:
+        return {}
+    rows = conn.execute(
+        _CANDIDATES_SQL,
+        {"qgrams": sorted(grams), "min_length": min_length, "max_length": max_length},  # noqa E501
+    )
+    return {r.alias_key: int(r.shared) for r in rows}
@@ -6,7 +6,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
 from sqlalchemy import text
 
 from biofilter.modules.db.models import (  # noqa E501
@@ -16,7 +15,6 @@ from biofilter.modules.db.models import (  # noqa E501
     EntityRelationshipType,
 )
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase):
@@ -80,19 +78,16 @@ class DTP(DTPBase):
             msg = f"⬇️  Downloading file from: {source_url} ..."
             self.logger.log(msg, "INFO")
 
-            response = requests.get(source_url, stream=True)
-            if response.status_code != 200:
-                msg = f"❌ Failed to fetch data from BioGRID: {response.status_code}"  # noqa E501
+            status, msg = self.http_download(
+                source_url, landing_path, filename="BIOGRID-ALL-LATEST.mitab.zip"  # noqa E501
+            )
+            if not status:
+                msg = f"❌ Failed to fetch data from BioGRID: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            # Write file in binary mode
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
             # Compute hash
-            current_hash = compute_file_hash(file_path)
+            current_hash = self.last_download.sha256
 
             msg = f"✅ File downloaded to {file_path}"
             self.logger.log(msg, "INFO")
@@ -4,7 +4,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import (  # ChemicalData,; noqa E501
     ChemicalMaster,
@@ -13,7 +12,6 @@ from biofilter.modules.db.models import (  # ChemicalData,; noqa E501
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
 from biofilter.modules.etl.mixins.gene_query_mixin import GeneQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
@@ -74,25 +72,19 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             os.makedirs(landing_path, exist_ok=True)
 
             downloaded_files = []
+            current_hash = None
             for f in files:
                 url = base_url + f
-                out_file = landing_path + "/" + f
-                try:
-                    self.logger.log(f"⬇️ Downloading {url} ...", "INFO")
-                    r = requests.get(url, stream=True)
-                    r.raise_for_status()
-                    with open(out_file, "wb") as handle:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            handle.write(chunk)
-                    downloaded_files.append(str(out_file))
-                except Exception as e:
-                    msg = f"❌ Failed to download {f}: {e}"
+                status, msg = self.http_download(url, landing_path)
+                if not status:
+                    msg = f"❌ Failed to download {f}: {msg}"
                     self.logger.log(msg, "ERROR")
                     return False, msg, None
+                downloaded_files.append(str(self.last_download.path))
 
-            # Compute file hash to Compound File
-            file_path = landing_path + "/compounds.tsv.gz"
-            current_hash = compute_file_hash(file_path)
+                # Hash of the Compound File, computed while streaming
+                if f == "compounds.tsv.gz":
+                    current_hash = self.last_download.sha256
 
             msg = f"✅ CheBI files downloaded to {landing_path}"
             self.logger.log(msg, "INFO")
@@ -311,6 +303,56 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             self.logger.log(msg, "ERROR")
             return False, msg
 
+    def _extra_alias_frame(
+        self, df: pd.DataFrame, primary: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Secondary aliases from the `aliases_extra` dicts built in transform,
+        keyed to the row primary alias.
+        """
+        if "aliases_extra" not in df.columns or primary.empty:
+            return pd.DataFrame()
+
+        extras = df["aliases_extra"].map(
+            lambda v: v.tolist() if isinstance(v, np.ndarray) else v
+        )
+        extras = extras.map(lambda v: v if isinstance(v, list) else [])
+        extras = extras.explode().dropna()
+        extras = extras[extras.map(lambda a: isinstance(a, dict))]
+        if extras.empty:
+            return pd.DataFrame()
+
+        frame = pd.DataFrame(extras.tolist(), index=extras.index)
+        for col in ["alias_value", "alias_type", "xref_source", "alias_norm"]:
+            if col not in frame.columns:
+                frame[col] = None
+        frame = frame.loc[
+            frame["alias_value"].fillna("").astype(bool)
+            & frame["xref_source"].fillna("").astype(bool)
+        ]
+
+        by_row = primary.set_index("row_id")
+        frame["row_id"] = frame.index
+        frame["locale"] = frame.get("locale", "en")
+        frame["is_active"] = frame.index.map(by_row["is_active"])
+        frame["primary_value"] = frame.index.map(by_row["alias_value"])
+        frame["primary_type"] = frame.index.map(by_row["alias_type"])
+        frame["primary_source"] = frame.index.map(by_row["xref_source"])
+        return frame[
+            [
+                "row_id",
+                "alias_value",
+                "alias_type",
+                "xref_source",
+                "alias_norm",
+                "locale",
+                "is_active",
+                "primary_value",
+                "primary_type",
+                "primary_source",
+            ]
+        ].reset_index(drop=True)
+
     # -------------------------------------------------------------------------
     #                            LOAD METHOD
     # -------------------------------------------------------------------------
@@ -462,76 +504,59 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
                 )
             }
 
+            # --- Aliases / Entities (set-based) ---
+            loadable = df["chebi_id"].astype(bool)
+            entity_rows = df.loc[loadable]
+            status_ids = entity_rows.get(
+                "status_id", pd.Series(None, index=entity_rows.index)
+            )
+            is_active_entity = status_ids.ne(4)
+            primary, secondary = self.build_alias_frames(
+                entity_rows, is_active=is_active_entity
+            )
+            secondary = pd.concat(
+                [secondary, self._extra_alias_frame(entity_rows, primary)],
+                ignore_index=True,
+            )
+            # Drop Alias Invalids
+            secondary = secondary.loc[secondary["xref_source"] != "PubMed"]
+
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+
             failed_records = []
 
-            for row in df.itertuples(index=False):
+            for row in df.itertuples():
                 row_dict = {}
                 try:
                     row_dict = row._asdict()
+                    row_dict.pop("Index", None)
                     chebi_id = row_dict.get("chebi_id")
                     if not chebi_id:
                         continue
 
-                    # --- Aliases ---
-                    alias_dict = self.build_alias(row_dict)
-                    is_primary_alias = next(
-                        (a for a in alias_dict if a.get("is_primary")), None
-                    )
-                    not_primary_alias = [a for a in alias_dict if a != is_primary_alias]  # noqa E501
-
-                    aliases_extra = row_dict.get("aliases_extra", [])
-                    if isinstance(aliases_extra, np.ndarray):
-                        aliases_extra = aliases_extra.tolist()
-                    if not isinstance(aliases_extra, list):
-                        aliases_extra = []
-
-                    for alias in aliases_extra:
-                        if alias.get("alias_value") and alias.get("xref_source"):  # noqa E501
-                            not_primary_alias.append(alias)
-
-                    # Drop Alias Invalids
-                    not_primary_alias = [
-                        alias
-                        for alias in not_primary_alias
-                        if alias.get("xref_source") != "PubMed"
-                    ]
-
                     # --- Status ---
                     status_id = row_dict.get("status_id")
                     if status_id == 4:
                         omic_status_id = status_map["deactive"].id
-                        is_active_entity = False
                     else:
                         omic_status_id = status_map["active"].id
-                        is_active_entity = True
-
-                    # --- Entity ---
-                    entity_id, _ = self.get_or_create_entity(
-                        name=is_primary_alias["alias_value"],
-                        group_id=self.entity_group,
-                        data_source_id=self.data_source.id,
-                        package_id=self.package.id,
-                        alias_type=is_primary_alias["alias_type"],
-                        xref_source=is_primary_alias["xref_source"],
-                        alias_norm=is_primary_alias["alias_norm"],
-                        is_active=is_active_entity,
-                        auto_commit=False,
-                    )
 
-                    # if not _:
-                    #     print(f"Jump --> {chebi_id}")
-                    #     continue
-
-                    # --- Entity Aliases ---
-                    self.get_or_create_entity_name(
-                        group_id=self.entity_group,
-                        entity_id=entity_id,
-                        aliases=not_primary_alias,
-                        is_active=is_active_entity,
-                        data_source_id=self.data_source.id,
-                        package_id=self.package.id,
-                        auto_commit=False,
-                    )
+                    # --- Entity (resolved in bulk above) ---
+                    entity_id = entity_ids.get(row.Index)
+                    if pd.isna(entity_id):
+                        self.logger.log(
+                            f"⚠️ Entity not resolved for: {chebi_id}",
+                            "WARNING",
+                        )
+                        continue
+                    entity_id = int(entity_id)
 
                     # --- Chemical Master ---
                     if chebi_id not in existing_chemical_ids:
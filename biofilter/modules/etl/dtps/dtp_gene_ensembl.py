@@ -12,7 +12,6 @@ import os
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import (
     EntityGroup,
@@ -23,7 +22,6 @@ from biofilter.modules.db.models import (
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
 from biofilter.modules.etl.mixins.gene_query_mixin import GeneQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
@@ -113,19 +111,16 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             msg = f"⬇️  Downloading GFF3 file from: {source_url} ..."
             self.logger.log(msg, "INFO")
 
-            response = requests.get(source_url, stream=True)
-            if response.status_code != 200:
-                msg = f"❌ Failed to fetch data from Ensembl: {response.status_code}"  # noqa E501
+            status, msg = self.http_download(
+                source_url, landing_path, filename="Homo_sapiens.GRCh38.115.chr.gff3.gz"  # noqa E501
+            )
+            if not status:
+                msg = f"❌ Failed to fetch data from Ensembl: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            # Write file in binary mode
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
             # Compute hash
-            current_hash = compute_file_hash(file_path)
+            current_hash = self.last_download.sha256
 
             msg = f"✅ File downloaded to {file_path}"
             self.logger.log(msg, "INFO")
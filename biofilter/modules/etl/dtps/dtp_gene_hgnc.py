@@ -13,13 +13,11 @@ import time  # DEBUG MODE
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import OmicStatus
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
 from biofilter.modules.etl.mixins.gene_query_mixin import GeneQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
@@ -81,18 +79,17 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             self.logger.log(msg, "INFO")
 
             headers = {"Accept": "application/json"}
-            response = requests.get(source_url, headers=headers)
+            status, msg = self.http_download(
+                source_url, landing_path, filename="hgnc_data.json", headers=headers  # noqa E501
+            )
 
-            if response.status_code != 200:
-                msg = f"Failed to fetch data from HGNC: {response.status_code}"
+            if not status:
+                msg = f"Failed to fetch data from HGNC: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(file_path, "w") as f:
-                f.write(response.text)
-
-            # Compute hash and compare
-            current_hash = compute_file_hash(file_path)
+            # Hash computed while streaming
+            current_hash = self.last_download.sha256
 
             # Finish block
             msg = f"✅ HGNC file downloaded to {file_path}"
@@ -303,6 +300,26 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             self.logger.log(msg, "WARNING")
             return False, msg  # ⧮ Leaving with ERROR
 
+        # --- CREATE THE ENTITY RECORDS (SET-BASED) ---
+        # Primary aliases are resolved/created in one pass and secondary
+        # aliases added in bulk; the row loop below only handles genes.
+        try:
+            primary, secondary = self.build_alias_frames(
+                df, is_active=df["status"].eq("Approved")
+            )
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+        except Exception as e:
+            msg = f"⚠️  Failed to resolve Gene entities: {e}"
+            self.logger.log(msg, "ERROR")
+            return False, msg  # ⧮ Leaving with ERROR
+
         # NTERACTION WITH EACH MASTER DATA ROW
         # Row = HGNC Gene
         for _, row in df.iterrows():
@@ -310,12 +327,6 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             # Define the Gene Master
             gene_master = row.get("symbol")  # v3.0.1
             # gene_master = row.get("hgnc_id")  # v3.0.0
-            if row.get("status") == "Approved":
-                # is_deactive = False
-                is_active = True
-            else:
-                # is_deactive = True
-                is_active = False
 
             # NOTE: Use to debugging
             if gene_master == "FACL1":
@@ -339,43 +350,14 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
                 )  # noqa E501
                 self.logger.log(msg, "DEBUG")
 
-            # --- ALIASES STRUCTURE ---
-
-            # Create a dict of Aliases
-            alias_dict = self.build_alias(row)
-
-            # Only Primary Name
-            is_primary_alias = next(
-                (a for a in alias_dict if a.get("is_primary")), None
-            )
-            # Only Aliases Names
-            not_primary_alias = [
-                a for a in alias_dict if a != is_primary_alias
-            ]  # noqa E501
-
-            # --- CREATE THE ENTITY RECORDS ---
-
-            # Add or Get Entity
-            entity_id, _ = self.get_or_create_entity(
-                name=is_primary_alias["alias_value"],
-                group_id=self.entity_group,
-                data_source_id=self.data_source.id,
-                package_id=self.package.id,
-                alias_type=is_primary_alias["alias_type"],
-                xref_source=is_primary_alias["xref_source"],
-                alias_norm=is_primary_alias["alias_norm"],
-                is_active=is_active,
-            )
-
-            # Add or Get EntityName
-            self.get_or_create_entity_name(
-                group_id=self.entity_group,
-                entity_id=entity_id,
-                aliases=not_primary_alias,
-                is_active=is_active,
-                data_source_id=self.data_source.id,  # noqa E501
-                package_id=self.package.id,
-            )
+            # Entity resolved in bulk above
+            entity_id = entity_ids.get(row.name)
+            if pd.isna(entity_id):
+                msg = f"⚠️  Entity not resolved for: {gene_master}"
+                self.logger.log(msg, "WARNING")
+                total_warnings += 1
+                continue
+            entity_id = int(entity_id)
 
             # -- CREATE THE GENES RECORDS ---
 
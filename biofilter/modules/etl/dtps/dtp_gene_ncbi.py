@@ -15,13 +15,11 @@ import time  # DEBUG
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import GeneGroup, OmicStatus  # noqa E501
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
 from biofilter.modules.etl.mixins.gene_query_mixin import GeneQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 def extract_id(dbxrefs, prefix):
@@ -90,17 +88,14 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
             msg = f"⬇️  Fetching gzipped file from: {source_url}"
             self.logger.log(msg, "INFO")
 
-            response = requests.get(source_url, stream=True)
-
-            if response.status_code != 200:
-                msg = f"❌ Failed to fetch data: {response.status_code}"
+            status, msg = self.http_download(
+                source_url, landing_path, filename="gene_info.gz"
+            )
+            if not status:
+                msg = f"❌ Failed to fetch data: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(gz_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
             # Extract the gz file
             self.logger.log(f"🗜️  Unzipping to: {txt_path}", "INFO")
             with gzip.open(gz_path, "rb") as f_in, open(
@@ -109,11 +104,9 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
                 # Copy the decompressed content to the output file
                 shutil.copyfileobj(f_in, f_out)
 
-            # NOTE: We are checking the hash of the decompressed file to all
-            # tax_id. Maybe we should check only 9606
-
-            # Compute and compare hash
-            current_hash = compute_file_hash(txt_path)
+            # NOTE: The hash covers the archive for all tax_id (computed
+            # while streaming). Maybe we should check only 9606
+            current_hash = self.last_download.sha256
 
             # Drop descompressed gz file
             os.remove(txt_path)
@@ -459,6 +452,30 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
         # TODO: Check how to do this
         is_active = True
 
+        # --- CREATE THE ENTITY RECORDS (SET-BASED) ---
+        try:
+            primary, secondary = self.build_alias_frames(
+                df, is_active=is_active
+            )
+            # Drop Alias Values invalid
+            primary = primary.loc[~primary["alias_value"].str.strip().isin({"", "-"})]  # noqa E501
+            secondary = secondary.loc[
+                ~secondary["alias_value"].str.strip().isin({"", "-"})
+            ]
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=is_active,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+        except Exception as e:
+            msg = f"⚠️  Failed to resolve Gene entities: {e}"
+            self.logger.log(msg, "ERROR")
+            return False, msg  # ⧮ Leaving with ERROR
+
         for _, row in df.iterrows():
 
             gene_master = row.get("symbol", "").strip()
@@ -485,48 +502,14 @@ class DTP(DTPBase, EntityQueryMixin, GeneQueryMixin):
                 )  # noqa E501
                 self.logger.log(msg, "DEBUG")
 
-            # Create a dict of Aliases
-            alias_dict = self.build_alias(row)
-
-            # Drop Alias Values invalid
-            alias_dict = [
-                a
-                for a in alias_dict
-                if str(a.get("alias_value", "")).strip() not in {"", "-"}
-            ]
-
-            # Only Primary Name
-            is_primary_alias = next(
-                (a for a in alias_dict if a.get("is_primary")), None
-            )
-            # Only Aliases Names
-            not_primary_alias = [
-                a for a in alias_dict if a != is_primary_alias
-            ]  # noqa E501
-
-            # --- CREATE THE ENTITY RECORDS ---
-
-            # Add or Get Entity
-            entity_id, _ = self.get_or_create_entity(
-                name=is_primary_alias["alias_value"],
-                group_id=self.entity_group,
-                data_source_id=self.data_source.id,
-                package_id=self.package.id,
-                alias_type=is_primary_alias["alias_type"],
-                xref_source=is_primary_alias["xref_source"],
-                alias_norm=is_primary_alias["alias_norm"],
-                is_active=is_active,
-            )
-
-            # Add or Get EntityName
-            self.get_or_create_entity_name(
-                group_id=self.entity_group,
-                entity_id=entity_id,
-                aliases=not_primary_alias,
-                is_active=is_active,
-                data_source_id=self.data_source.id,  # noqa E501
-                package_id=self.package.id,
-            )
+            # Entity resolved in bulk above
+            entity_id = entity_ids.get(row.name)
+            if pd.isna(entity_id):
+                msg = f"⚠️  Entity not resolved for: {gene_master}"
+                self.logger.log(msg, "WARNING")
+                total_warnings += 1
+                continue
+            entity_id = int(entity_id)
 
             # -- CREATE THE GENES RECORDS ---
 
@@ -3,12 +3,10 @@ import re
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import GOMaster, GORelation
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin):
@@ -72,18 +70,16 @@ class DTP(DTPBase, EntityQueryMixin):
             headers = {
                 "Accept": "application/x-obo"
             }  # Optional, GO responds with OBO anyway
-            response = requests.get(source_url, headers=headers)
-
-            if response.status_code != 200:
-                msg = f"Failed to fetch data from GO: {response.status_code}"
+            status, msg = self.http_download(
+                source_url, landing_path, filename="geneontology.obo", headers=headers  # noqa E501
+            )
+            if not status:
+                msg = f"Failed to fetch data from GO: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-
-            # Compute hash
-            current_hash = compute_file_hash(file_path)
+            # Hash computed while streaming
+            current_hash = self.last_download.sha256
 
             msg = f"✅ GO file downloaded to {file_path}"
             self.logger.log(msg, "INFO")
@@ -348,80 +344,53 @@ class DTP(DTPBase, EntityQueryMixin):
 
         # RUN LOAD BY ROW
         try:
-            n = 0
-            # for _, row in df.iterrows():
+            # --- ALIASES STRUCTURE (SET-BASED) ---
+            # Entities are only created for terms that will be loaded:
+            # required fields present and not obsolete.
+            is_obsolete = (
+                df.get("is_obsolete", pd.Series("", index=df.index))
+                .astype(str)
+                .str.strip()
+                .str.lower()
+            )
+            loadable = (
+                df["go_id"].astype(bool)
+                & df["name"].astype(bool)
+                & is_obsolete.ne("true")
+            )
+            primary, secondary = self.build_alias_frames(df.loc[loadable])
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=True,
+                # Terms already known are kept as they are, aliases too
+                alias_existing=False,
+            )
+            entities = self.map_entity_ids(primary, resolved)
+
             for _, row in df.iterrows():
                 go_id = row.get("go_id")
-                name = row.get("name")
-                is_obsolete = (
-                    str(row.get("is_obsolete", "")).strip().lower() == "true"
-                )  # noqa E501
 
                 # if go_id == "GO:0000050":
                 #     pass
 
-                # Skip entries with missing required fields
-                if not go_id or not name:
+                # Skip entries with missing required fields and obsolete
+                # terms entirely (optional — configurable)
+                if not loadable.get(row.name, False):
                     skipped += 1
                     continue
 
-                # Skip obsolete terms entirely (optional — configurable)
-                if is_obsolete:
+                if row.name not in entities.index:
                     skipped += 1
                     continue
 
-                # --- ALIASES STRUCTURE ---
-                # Create a dict of Aliases
-                alias_dict = self.build_alias(row)
-                # Only primary Name
-                is_primary_alias = next(
-                    (a for a in alias_dict if a.get("is_primary")), None
-                )
-                # Only Aliases Names
-                not_primary_alias = [
-                    a for a in alias_dict if a != is_primary_alias
-                ]  # noqa E501
-
-                # Add or Get Entity
-                entity_id, _ = self.get_or_create_entity(
-                    name=is_primary_alias["alias_value"],
-                    group_id=self.entity_group,
-                    data_source_id=self.data_source.id,
-                    package_id=self.package.id,
-                    alias_type=is_primary_alias["alias_type"],
-                    xref_source=is_primary_alias["xref_source"],
-                    alias_norm=is_primary_alias["alias_norm"],
-                    is_active=True,
-                )
-
-                if not _:
-                    n += 1
-                    print(n)
+                # Terms already known are kept as they are
+                if not entities.at[row.name, "is_new"]:
                     continue
-
-                self.get_or_create_entity_name(
-                    group_id=self.entity_group,
-                    entity_id=entity_id,
-                    aliases=not_primary_alias,
-                    is_active=True,
-                    data_source_id=self.data_source.id,  # noqa E501
-                    package_id=self.package.id,
-                )
-                # # Additional names from synonyms, alt_ids, etc.
-                # names = set()
-
-                # # Alt IDs
-                # if row.get("alt_ids"):
-                #     for alt in row["alt_ids"].split(";"):
-                #         alt = alt.strip()
-                #         if alt:
-                #             names.add(alt)
-
-                # # Save all names for the entity
-                # for name in names:
-                #     self.get_or_create_entity_name(
-                #         entity_id, name, data_source_id=self.data_source.id
-                #     )
+                entity_id = int(entities.at[row.name, "entity_id"])
 
                 # Add GO term to GOMaster if it doesn't exist
                 go_master = (
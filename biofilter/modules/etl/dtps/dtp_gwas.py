@@ -7,13 +7,11 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
 from sqlalchemy import text
 
 from biofilter.modules.db.models import VariantGWAS, VariantGWASSNP  # noqa E501
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 # from sqlalchemy.orm import joinedload
 
@@ -77,17 +75,10 @@ class DTP(DTPBase, EntityQueryMixin):
 
             # 1) Download EFO mappings (TSV simples)
             efo_url = base_url + efo_tsv_name
-            efo_out = os.path.join(landing_path, efo_tsv_name)
 
-            try:
-                self.logger.log(f"⬇️ Downloading {efo_url} ...", "INFO")
-                r = requests.get(efo_url, stream=True)
-                r.raise_for_status()
-                with open(efo_out, "wb") as handle:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        handle.write(chunk)
-            except Exception as e:
-                msg = f"❌ Failed to download {efo_tsv_name}: {e}"
+            status, msg = self.http_download(efo_url, landing_path)
+            if not status:
+                msg = f"❌ Failed to download {efo_tsv_name}: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
@@ -95,18 +86,15 @@ class DTP(DTPBase, EntityQueryMixin):
             zip_url = base_url + associations_zip_name
             zip_path = os.path.join(landing_path, associations_zip_name)
 
-            try:
-                self.logger.log(f"⬇️ Downloading {zip_url} ...", "INFO")
-                r = requests.get(zip_url, stream=True)
-                r.raise_for_status()
-                with open(zip_path, "wb") as handle:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        handle.write(chunk)
-            except Exception as e:
-                msg = f"❌ Failed to download {associations_zip_name}: {e}"
+            status, msg = self.http_download(zip_url, landing_path)
+            if not status:
+                msg = f"❌ Failed to download {associations_zip_name}: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
+            # Hash of the associations ZIP, computed while streaming
+            current_hash = self.last_download.sha256
+
             # 3) Extract TSV and rename
             associations_tsv_final = os.path.join(
                 landing_path,
@@ -145,8 +133,6 @@ class DTP(DTPBase, EntityQueryMixin):
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            current_hash = compute_file_hash(associations_tsv_final)
-
             msg = f"✅ GWAS Catalog files downloaded to {landing_path}"
             self.logger.log(msg, "INFO")
 
@@ -2,12 +2,10 @@ import os
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import PathwayMaster  # noqa E501
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin):
@@ -71,20 +69,16 @@ class DTP(DTPBase, EntityQueryMixin):
             headers = {
                 "Accept": "text/plain"
             }  # Optional, KEGG responds with TXT anyway
-            response = requests.get(source_url, headers=headers)
-            # Case if the file grows too large, we can use streaming
-            # response = requests.get(source_url, headers=headers, stream=True)
-
-            if response.status_code != 200:
-                msg = f"Failed to fetch data from KEGG: {response.status_code}"
+            status, msg = self.http_download(
+                source_url, landing_path, filename="kegg_pathways.txt", headers=headers  # noqa E501
+            )
+            if not status:
+                msg = f"Failed to fetch data from KEGG: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-
-            # Compute hash
-            current_hash = compute_file_hash(file_path)
+            # Hash computed while streaming
+            current_hash = self.last_download.sha256
 
             msg = f"✅ GO file downloaded to {file_path}"
             self.logger.log(msg, "INFO")
@@ -262,6 +256,18 @@ class DTP(DTPBase, EntityQueryMixin):
 
         # RUN LOAD BY ROW
         try:
+            # --- ALIASES STRUCTURE (SET-BASED) ---
+            primary, secondary = self.build_alias_frames(df, is_active=True)
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=True,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+
             for _, row in df.iterrows():
 
                 pathway_master = row["pathway_id"]
@@ -272,38 +278,13 @@ class DTP(DTPBase, EntityQueryMixin):
                     self.logger.log(msg, "WARNING")
                     continue
 
-                # --- ALIASES STRUCTURE ---
-                # Create a dict of Aliases
-                alias_dict = self.build_alias(row)
-                # Only primary Name
-                is_primary_alias = next(
-                    (a for a in alias_dict if a.get("is_primary")), None
-                )
-                # Only Aliases Names
-                not_primary_alias = [
-                    a for a in alias_dict if a != is_primary_alias
-                ]  # noqa E501
-
-                # Add or Get Entity
-                entity_id, _ = self.get_or_create_entity(
-                    name=is_primary_alias["alias_value"],
-                    group_id=self.entity_group,
-                    data_source_id=self.data_source.id,
-                    package_id=self.package.id,
-                    alias_type=is_primary_alias["alias_type"],
-                    xref_source=is_primary_alias["xref_source"],
-                    alias_norm=is_primary_alias["alias_norm"],
-                    is_active=True,
-                )
-
-                self.get_or_create_entity_name(
-                    group_id=self.entity_group,
-                    entity_id=entity_id,
-                    aliases=not_primary_alias,
-                    is_active=True,
-                    data_source_id=self.data_source.id,  # noqa E501
-                    package_id=self.package.id,
-                )
+                # Entity resolved in bulk above
+                entity_id = entity_ids.get(row.name)
+                if pd.isna(entity_id):
+                    msg = f"Entity not resolved for: {pathway_master}"
+                    self.logger.log(msg, "WARNING")
+                    continue
+                entity_id = int(entity_id)
 
                 # Check if the pathway already exists
                 existing_pathway = (
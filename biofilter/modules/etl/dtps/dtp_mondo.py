@@ -6,7 +6,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models import (  # noqa E501
     DiseaseGroup,
@@ -16,7 +15,6 @@ from biofilter.modules.db.models import (  # noqa E501
 )
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin):
@@ -71,19 +69,16 @@ class DTP(DTPBase, EntityQueryMixin):
             msg = f"⬇️  Fetching MONDO JSON from: {source_url}"
             self.logger.log(msg, "INFO")
 
-            with requests.get(source_url, stream=True) as r:
-                if r.status_code != 200:
-                    msg = f"Failed to fetch MONDO: {r.status_code}"
-                    self.logger.log(msg, "ERROR")
-                    return False, msg, None
-
-                with open(file_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            status, msg = self.http_download(
+                source_url, landing_path, filename="mondo.json"
+            )
+            if not status:
+                msg = f"Failed to fetch MONDO: {msg}"
+                self.logger.log(msg, "ERROR")
+                return False, msg, None
 
             # Compute file hash
-            current_hash = compute_file_hash(file_path)
+            current_hash = self.last_download.sha256
 
             msg = f"✅ MONDO file downloaded to {file_path}"
             self.logger.log(msg, "INFO")
@@ -373,6 +368,49 @@ class DTP(DTPBase, EntityQueryMixin):
             self.logger.log(msg, "ERROR")
             return False, msg
 
+    def _xref_alias_frame(
+        self, df: pd.DataFrame, primary: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Secondary aliases from MONDO `xrefs` ("PREFIX:code" -> code with
+        PREFIX as xref_source), keyed to the row primary alias.
+        """
+        # TODO: Talvez aqui vou precisar manter o Prefix:codigo?
+        if "xrefs" not in df.columns or primary.empty:
+            return pd.DataFrame()
+
+        xrefs = df["xrefs"].map(
+            lambda v: v.tolist() if isinstance(v, np.ndarray) else v
+        )
+        xrefs = xrefs.map(lambda v: v if isinstance(v, list) else [])
+        xrefs = xrefs.explode().dropna().astype(str)
+        if xrefs.empty:
+            return pd.DataFrame()
+
+        parts = xrefs.str.split(":", n=1, expand=True)
+        if parts.shape[1] < 2:
+            return pd.DataFrame()
+        parts.columns = ["prefix", "code"]
+        parts = parts.loc[
+            parts["prefix"].fillna("").ne("") & parts["code"].fillna("").ne("")
+        ]
+
+        by_row = primary.set_index("row_id")
+        return pd.DataFrame(
+            {
+                "row_id": parts.index,
+                "alias_value": parts["code"].to_numpy(),
+                "alias_type": "code",
+                "xref_source": parts["prefix"].to_numpy(),
+                "alias_norm": parts["code"].str.lower().to_numpy(),
+                "locale": "en",
+                "is_active": parts.index.map(by_row["is_active"]),
+                "primary_value": parts.index.map(by_row["alias_value"]),
+                "primary_type": parts.index.map(by_row["alias_type"]),
+                "primary_source": parts.index.map(by_row["xref_source"]),
+            }
+        )
+
     # -------------------------------------------------------------------------
     #                            LOAD METHOD
     # -------------------------------------------------------------------------
@@ -517,6 +555,32 @@ class DTP(DTPBase, EntityQueryMixin):
             subset_map[subset] = group.id
 
         try:
+            # --- ALIASES STRUCTURE (SET-BASED) ---
+            # Skip root/dummy and rows without MONDO id
+            loadable = df["mondo_id"].astype(bool) & df["mondo_id"].ne(
+                "MONDO:0000001"
+            )
+            entity_rows = df.loc[loadable]
+            is_obsolete = entity_rows.get(
+                "is_obsolete", pd.Series(False, index=entity_rows.index)
+            )
+            is_active_entity = ~is_obsolete.fillna(False).astype(bool)
+            primary, secondary = self.build_alias_frames(
+                entity_rows, is_active=is_active_entity
+            )
+            secondary = pd.concat(
+                [secondary, self._xref_alias_frame(entity_rows, primary)],
+                ignore_index=True,
+            )
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+
             # Interaction to each Disease Entry
             for _, row in df.iterrows():
 
@@ -532,73 +596,20 @@ class DTP(DTPBase, EntityQueryMixin):
                     self.logger.log(msg, "WARNING")
                     continue
 
-                # --- ALIASES STRUCTURE ---
-                # Create a dict of Aliases
-                alias_dict = self.build_alias(row)
-                # Only primary Name
-                is_primary_alias = next(
-                    (a for a in alias_dict if a.get("is_primary")), None
-                )
-                # Only Aliases Names
-                not_primary_alias = [
-                    a for a in alias_dict if a != is_primary_alias
-                ]  # noqa E501
-
-                # --- Extend with Xrefs ----
-                # TODO: Talvez aqui vou precisar manter o Prefix:codigo?
-                xrefs = row.get("xrefs", [])
-                # Normalize to Python list
-                if isinstance(xrefs, np.ndarray):
-                    xrefs = xrefs.tolist()
-                elif not isinstance(xrefs, list):
-                    xrefs = []
-                if isinstance(xrefs, list):
-                    for x in xrefs:
-                        try:
-                            prefix, code = x.split(":", 1)
-                        except ValueError:
-                            prefix, code = None, x
-
-                        if prefix and code:
-                            not_primary_alias.append(
-                                {
-                                    "alias_value": code,
-                                    "alias_type": "code",
-                                    "xref_source": prefix,
-                                    "alias_norm": code.lower(),
-                                    "is_primary": False,
-                                }
-                            )
-
                 # --- Determine OmicStatus ---
                 omic_status_id = (
                     status_map["deactive"].id
                     if row.get("is_obsolete")
                     else status_map["active"].id
                 )
-                is_active_entity = False if row.get("is_obsolete") else True
 
-                # --- Create Entity ---
-                entity_id, _ = self.get_or_create_entity(
-                    name=is_primary_alias["alias_value"],
-                    group_id=self.entity_group,
-                    data_source_id=self.data_source.id,
-                    package_id=self.package.id,
-                    alias_type=is_primary_alias["alias_type"],
-                    xref_source=is_primary_alias["xref_source"],
-                    alias_norm=is_primary_alias["alias_norm"],
-                    is_active=is_active_entity,
-                )
-
-                # --- Entity Names ---
-                self.get_or_create_entity_name(
-                    group_id=self.entity_group,
-                    entity_id=entity_id,
-                    aliases=not_primary_alias,
-                    is_active=is_active_entity,
-                    data_source_id=self.data_source.id,  # noqa E501
-                    package_id=self.package.id,
-                )
+                # --- Entity (resolved in bulk above) ---
+                entity_id = entity_ids.get(row.name)
+                if pd.isna(entity_id):
+                    msg = f"Entity not resolved for: {disease_master}"
+                    self.logger.log(msg, "WARNING")
+                    continue
+                entity_id = int(entity_id)
 
                 # --- Disease Master ---
                 disease_master_obj = (
@@ -4,12 +4,10 @@ import shutil
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from biofilter.modules.db.models.model_proteins import ProteinPfam
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin):
@@ -72,17 +70,14 @@ class DTP(DTPBase, EntityQueryMixin):
             msg = f"⬇️  Fetching gzipped file from: {source_url}"
             self.logger.log(msg, "INFO")
 
-            response = requests.get(source_url, stream=True)
-
-            if response.status_code != 200:
-                msg = f"❌ Failed to fetch data: {response.status_code}"
+            status, msg = self.http_download(
+                source_url, landing_path, filename="pfamA.txt.gz"
+            )
+            if not status:
+                msg = f"❌ Failed to fetch data: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(gz_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
             # Extract the gz file
             self.logger.log(f"🗜️  Unzipping to: {txt_path}", "INFO")
             with gzip.open(gz_path, "rb") as f_in, open(
@@ -90,8 +85,8 @@ class DTP(DTPBase, EntityQueryMixin):
             ) as f_out:  # noqa: E501
                 shutil.copyfileobj(f_in, f_out)
 
-            # Compute and compare hash
-            current_hash = compute_file_hash(txt_path)
+            # Hash of the downloaded archive, computed while streaming
+            current_hash = self.last_download.sha256
 
             # Drop descompressed gz file
             os.remove(txt_path)
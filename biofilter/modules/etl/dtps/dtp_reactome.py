@@ -7,7 +7,6 @@ import pandas as pd
 from biofilter.modules.db.models import PathwayMaster  # noqa E501
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
 
 
 class DTP(DTPBase, EntityQueryMixin):
@@ -73,14 +72,13 @@ class DTP(DTPBase, EntityQueryMixin):
             # Step 1: Download only the main file
             main_file = "ReactomePathways.txt"
             file_url = f"{source_url}{main_file}"
-            file_path = os.path.join(landing_path, main_file)
 
             status, msg = self.http_download(file_url, landing_path)
             if not status:
                 return False, msg, None
 
-            # Step 2: Compute hash and compare
-            current_hash = compute_file_hash(file_path)
+            # Step 2: Hash computed while streaming the main file
+            current_hash = self.last_download.sha256
 
             # Step 3: Download the remaining files
             for file_name in files_to_download:
@@ -403,6 +401,18 @@ class DTP(DTPBase, EntityQueryMixin):
 
         # RUN LOAD BY ROW
         try:
+            # --- ALIASES STRUCTURE (SET-BASED) ---
+            primary, secondary = self.build_alias_frames(df, is_active=True)
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=True,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+
             # Interaction to each Reactome Pathway
             for _, row in df.iterrows():
 
@@ -414,38 +424,13 @@ class DTP(DTPBase, EntityQueryMixin):
                     self.logger.log(msg, "WARNING")
                     continue
 
-                # --- ALIASES STRUCTURE ---
-                # Create a dict of Aliases
-                alias_dict = self.build_alias(row)
-                # Only primary Name
-                is_primary_alias = next(
-                    (a for a in alias_dict if a.get("is_primary")), None
-                )
-                # Only Aliases Names
-                not_primary_alias = [
-                    a for a in alias_dict if a != is_primary_alias
-                ]  # noqa E501
-
-                # Add or Get Entity
-                entity_id, _ = self.get_or_create_entity(
-                    name=is_primary_alias["alias_value"],
-                    group_id=self.entity_group,
-                    data_source_id=self.data_source.id,
-                    package_id=self.package.id,
-                    alias_type=is_primary_alias["alias_type"],
-                    xref_source=is_primary_alias["xref_source"],
-                    alias_norm=is_primary_alias["alias_norm"],
-                    is_active=True,
-                )
-
-                self.get_or_create_entity_name(
-                    group_id=self.entity_group,
-                    entity_id=entity_id,
-                    aliases=not_primary_alias,
-                    is_active=True,
-                    data_source_id=self.data_source.id,  # noqa E501
-                    package_id=self.package.id,
-                )
+                # Entity resolved in bulk above
+                entity_id = entity_ids.get(row.name)
+                if pd.isna(entity_id):
+                    msg = f"Entity not resolved for: {pathway_master}"
+                    self.logger.log(msg, "WARNING")
+                    continue
+                entity_id = int(entity_id)
 
                 # Check if the pathway already exists
                 existing_pathway = (
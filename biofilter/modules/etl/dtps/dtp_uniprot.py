@@ -5,7 +5,8 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import requests
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from biofilter.modules.db.models import (  # noqa E501
     ProteinEntity,
@@ -15,7 +16,58 @@ from biofilter.modules.db.models import (  # noqa E501
 )
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
-from biofilter.utils.file_hash import compute_file_hash
+
+
+UNIPROT_NS = "http://uniprot.org/uniprot"
+ENTRY_TAG = f"{{{UNIPROT_NS}}}entry"
+
+# Entries per parquet batch in transform
+UNIPROT_BATCH_SIZE = 20_000
+
+MASTER_COLUMNS = [
+    "uniprot_id",
+    "secondary_ids",
+    "uniprot_name",
+    "gene_symbol",
+    "full_name",
+    "ec_number",
+    "organism",
+    "tax_id",
+    "function",
+    "location",
+    "tissue",
+    "pseudogene_note",
+    "protein_length",
+    "isoforms",
+    "pfam_ids",
+]
+
+# Fixed schema so every batch appends to the same parquet file
+MASTER_SCHEMA = pa.schema(
+    [
+        (col, pa.list_(pa.string()))
+        if col in {"secondary_ids", "location", "isoforms", "pfam_ids"}
+        else (col, pa.string())
+        for col in MASTER_COLUMNS
+    ]
+)
+
+LINK_COLUMNS = [
+    "source_id",
+    "target_id",
+    "source_type",
+    "target_type",
+    "relation_type",
+]
+LINK_SCHEMA = pa.schema([(col, pa.string()) for col in LINK_COLUMNS])
+
+# master field -> (target_type, relation_type)
+LINK_TARGETS = [
+    ("go_terms", "Gene Ontology", "part_of"),
+    ("kegg", "Pathways", "in_pathway"),
+    ("hgnc", "Genes", "encodes"),
+    ("refseq", "Transcriptomics", "has_transcript"),
+]
 
 
 def get_text(element, path, ns, default=""):
@@ -46,6 +98,8 @@ class DTP(DTPBase, EntityQueryMixin):
         self.compatible_schema_min = "0.0.0"
         self.compatible_schema_max = "4.0.0"
 
+        self.transform_batch_size = UNIPROT_BATCH_SIZE
+
     # -------------------------------------------------------------------------
     #                            EXTRACT METHOD
     # -------------------------------------------------------------------------
@@ -82,18 +136,16 @@ class DTP(DTPBase, EntityQueryMixin):
             headers = {
                 "Accept": "application/xml"
             }  # Optional, UniProt responds with XML anyway
-            response = requests.get(source_url, headers=headers)
-
-            if response.status_code != 200:
-                msg = f"Failed to fetch data from UniProt: {response.status_code}"  # noqa: E501
+            status, msg = self.http_download(
+                source_url, landing_path, filename="proteins.xml", headers=headers  # noqa E501
+            )
+            if not status:
+                msg = f"Failed to fetch data from UniProt: {msg}"
                 self.logger.log(msg, "ERROR")
                 return False, msg, None
 
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-
-            # Compute hash
-            current_hash = compute_file_hash(file_path)
+            # Hash computed while streaming
+            current_hash = self.last_download.sha256
 
             msg = f"✅ UniProt file downloaded to {file_path}"
             self.logger.log(msg, "INFO")
@@ -112,6 +164,9 @@ class DTP(DTPBase, EntityQueryMixin):
         Transforms the xml data from Uniprot in two output files:
             - master_data.csv
             - relationship_data.csv.
+
+        The XML is streamed with iterparse and rows are flushed to parquet
+        every `transform_batch_size` entries.
         """
 
         msg = f"🔧 Transforming the {self.data_source.name} data ..."
@@ -163,182 +218,194 @@ class DTP(DTPBase, EntityQueryMixin):
             self.logger.log(msg, "ERROR")
             return False, msg
 
-        # Parse XML and extract data
-        ns = {"up": "http://uniprot.org/uniprot"}
-        data = []
-
-        try:
-            root = ET.parse(input_file).getroot()
-
-            for entry in root.findall("up:entry", ns):
-                row = {}
-                accessions = entry.findall("up:accession", ns)
-                row["uniprot_id"] = accessions[0].text if accessions else ""
-                row["secondary_ids"] = [a.text for a in accessions[1:]] or None
-
-                row["uniprot_name"] = get_text(entry, "up:name", ns)
-                row["gene_symbol"] = get_text(
-                    entry, "up:gene/up:name[@type='primary']", ns
-                )
-                row["full_name"] = get_text(
-                    entry, "up:protein/up:recommendedName/up:fullName", ns
-                )
-                row["ec_number"] = get_text(
-                    entry, "up:protein/up:recommendedName/up:ecNumber", ns
-                )
-
-                row["organism"] = get_text(
-                    entry, "up:organism/up:name[@type='scientific']", ns
+        # Stream <entry> elements and flush rows to parquet in batches
+        ns = {"up": UNIPROT_NS}
+        master_path = output_file_master.with_suffix(".parquet")
+        links_path = output_file_relationship.with_suffix(".parquet")
+        writers = {}
+        n_entries = 0
+        n_links = 0
+        master_rows = []
+        link_rows = []
+
+        def flush():
+            nonlocal master_rows, link_rows
+            if master_rows:
+                self._write_batch(
+                    writers,
+                    pd.DataFrame(master_rows)[MASTER_COLUMNS],
+                    MASTER_SCHEMA,
+                    output_file_master,
                 )
-                db_ref = entry.find(
-                    "up:organism/up:dbReference[@type='NCBI Taxonomy']", ns
+            if link_rows:
+                self._write_batch(
+                    writers,
+                    pd.DataFrame(link_rows)[LINK_COLUMNS],
+                    LINK_SCHEMA,
+                    output_file_relationship,
                 )
-                row["tax_id"] = (
-                    db_ref.attrib["id"] if db_ref is not None else ""
-                )  # noqa: E501
-
-                row["function"] = self._get_comment_text(entry, "function", ns)
-                row["location"] = self._get_subcellular_locations(entry, ns)
-                row["tissue"] = self._get_comment_text(
-                    entry, "tissue specificity", ns
-                )  # noqa: E501
-                row["pseudogene_note"] = self._get_comment_text(
-                    entry, "caution", ns
-                )  # noqa: E501
-
-                row["go_terms"] = self._get_db_ids(entry, "GO", ns)
-                row["kegg"] = self._get_db_id(entry, "KEGG", ns)
-                row["hgnc"] = self._get_db_id(entry, "HGNC", ns)
-                row["refseq"] = self._get_db_id(entry, "RefSeq", ns)
-
-                seq_tag = entry.find("up:sequence", ns)
-                row["protein_length"] = (
-                    seq_tag.attrib["length"] if seq_tag is not None else ""
-                )
-
-                # row["isoforms"] = self._get_isoform_ids(entry, ns)
-                row["isoforms"] = self._get_isoform_ids(entry, ns) or None
-                # row["pfam_ids"] = self._get_pfam_ids(entry, ns)
-                row["pfam_ids"] = self._get_pfam_ids(entry, ns) or None
-
-                data.append(row)
-
-            # DataFrame with fulldata results
-            df = pd.DataFrame(data)
-
-            # Split Master Data and Relationship Data
-            master_cols = [
-                "uniprot_id",
-                "secondary_ids",
-                "uniprot_name",
-                "gene_symbol",
-                "full_name",
-                "ec_number",
-                "organism",
-                "tax_id",
-                "function",
-                "location",
-                "tissue",
-                "pseudogene_note",
-                "protein_length",
-                "isoforms",
-                "pfam_ids",
-            ]  # noqa: E501
-
-            master_df = df[master_cols]
-
-            # SAVE FILES
-            if self.debug_mode:
-                master_df.to_csv(
-                    output_file_master.with_suffix(".csv"), index=False
-                )  # noqa: E501
-            master_df.to_parquet(
-                output_file_master.with_suffix(".parquet"), index=False
-            )
-
-            msg = f"✅ UniProt master data written with {len(df)} records)"
-            self.logger.log(msg, "INFO")
-
-            # Create long-form Relationship data file
+            master_rows = []
             link_rows = []
 
-            for row in df.itertuples():
-                source_id = row.uniprot_id
-
-                if row.go_terms:
-                    for go in str(row.go_terms).split(";"):
-                        link_rows.append(
-                            {
-                                "source_id": source_id,
-                                "target_id": go.strip(),
-                                "source_type": "Proteins",
-                                "target_type": "Gene Ontology",
-                                # "relation_type": "associated_with",
-                                "relation_type": "part_of",
-                            }
-                        )
-
-                if row.kegg:
-                    for k in str(row.kegg).split(";"):
-                        link_rows.append(
-                            {
-                                "source_id": source_id,
-                                "target_id": k.strip(),
-                                "source_type": "Proteins",
-                                "target_type": "Pathways",
-                                "relation_type": "in_pathway",
-                            }
-                        )
-
-                if row.hgnc:
-                    for h in str(row.hgnc).split(";"):
-                        link_rows.append(
-                            {
-                                "source_id": source_id,
-                                "target_id": h.strip(),
-                                "source_type": "Proteins",
-                                "target_type": "Genes",
-                                "relation_type": "encodes",
-                            }
-                        )
-
-                if row.refseq:
-                    for r in str(row.refseq).split(";"):
-                        link_rows.append(
-                            {
-                                "source_id": source_id,
-                                "target_id": r.strip(),
-                                "source_type": "Proteins",
-                                "target_type": "Transcriptomics",
-                                "relation_type": "has_transcript",
-                            }
-                        )
+        try:
+            try:
+                for entry in self._iter_entries(input_file):
+                    row = self._entry_to_row(entry, ns)
+                    links = self._link_rows(row)
+                    master_rows.append(row)
+                    link_rows.extend(links)
+                    n_entries += 1
+                    n_links += len(links)
+                    if len(master_rows) >= self.transform_batch_size:
+                        flush()
+                flush()
+            finally:
+                for writer in writers.values():
+                    writer.close()
+
+            if n_entries == 0:
+                msg = f"❌ No UniProt entries found in {input_file}"
+                self.logger.log(msg, "ERROR")
+                return False, msg
 
-            # Write links.csv
-            links_df = pd.DataFrame(link_rows)
+            msg = f"✅ UniProt master data written with {n_entries} records)"
+            self.logger.log(msg, "INFO")
 
-            # Save links data in both CSV and Parquet formats
-            # SAVE FILES
-            if self.debug_mode:
-                links_df.to_csv(
-                    output_file_relationship.with_suffix(".csv"), index=False
-                )  # noqa: E501
-            links_df.to_parquet(
-                output_file_relationship.with_suffix(".parquet"), index=False
-            )  # noqa: E501
+            if n_links == 0:
+                # Same empty file the in-memory transform produced
+                links_df = pd.DataFrame([])
+                if self.debug_mode:
+                    links_df.to_csv(
+                        output_file_relationship.with_suffix(".csv"),
+                        index=False,
+                    )
+                links_df.to_parquet(links_path, index=False)
 
             self.logger.log(
-                f"✅ UniProt links written with {len(link_rows)} links)", "INFO"
+                f"✅ UniProt links written with {n_links} links)", "INFO"
             )  # noqa: E501
 
             msg = f"✅ Finished transforming {self.data_source.name} data."
             return True, msg
 
         except Exception as e:
+            # Never leave a half-written master/links pair behind
+            for target_file in (
+                master_path,
+                links_path,
+                output_file_master.with_suffix(".csv"),
+                output_file_relationship.with_suffix(".csv"),
+            ):
+                if target_file.exists():
+                    target_file.unlink()
             msg = f"❌ ETL transform failed: {str(e)}"
             self.logger.log(msg, "ERROR")
             return False, msg
 
+    def _iter_entries(self, input_file):
+        """
+        Yield each <entry> element once fully parsed, then drop it from
+        the tree so memory stays flat regardless of the file size.
+        """
+        context = ET.iterparse(str(input_file), events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event == "end" and elem.tag == ENTRY_TAG:
+                yield elem
+                root.clear()
+
+    def _write_batch(self, writers, df, schema, output_file):
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        key = str(output_file)
+        first = key not in writers
+        if first:
+            writers[key] = pq.ParquetWriter(
+                str(output_file.with_suffix(".parquet")), table.schema
+            )
+        writers[key].write_table(table)
+
+        if self.debug_mode:
+            # The first batch of a run truncates, like the parquet writer
+            df.to_csv(
+                output_file.with_suffix(".csv"),
+                mode="w" if first else "a",
+                header=first,
+                index=False,
+            )
+
+    def _entry_to_row(self, entry, ns):
+        row = {}
+        accessions = entry.findall("up:accession", ns)
+        row["uniprot_id"] = accessions[0].text if accessions else ""
+        row["secondary_ids"] = [a.text for a in accessions[1:]] or None
+
+        row["uniprot_name"] = get_text(entry, "up:name", ns)
+        row["gene_symbol"] = get_text(
+            entry, "up:gene/up:name[@type='primary']", ns
+        )
+        row["full_name"] = get_text(
+            entry, "up:protein/up:recommendedName/up:fullName", ns
+        )
+        row["ec_number"] = get_text(
+            entry, "up:protein/up:recommendedName/up:ecNumber", ns
+        )
+
+        row["organism"] = get_text(
+            entry, "up:organism/up:name[@type='scientific']", ns
+        )
+        db_ref = entry.find(
+            "up:organism/up:dbReference[@type='NCBI Taxonomy']", ns
+        )
+        row["tax_id"] = (
+            db_ref.attrib["id"] if db_ref is not None else ""
+        )  # noqa: E501
+
+        row["function"] = self._get_comment_text(entry, "function", ns)
+        row["location"] = self._get_subcellular_locations(entry, ns)
+        row["tissue"] = self._get_comment_text(
+            entry, "tissue specificity", ns
+        )  # noqa: E501
+        row["pseudogene_note"] = self._get_comment_text(
+            entry, "caution", ns
+        )  # noqa: E501
+
+        row["go_terms"] = self._get_db_ids(entry, "GO", ns)
+        row["kegg"] = self._get_db_id(entry, "KEGG", ns)
+        row["hgnc"] = self._get_db_id(entry, "HGNC", ns)
+        row["refseq"] = self._get_db_id(entry, "RefSeq", ns)
+
+        seq_tag = entry.find("up:sequence", ns)
+        row["protein_length"] = (
+            seq_tag.attrib["length"] if seq_tag is not None else ""
+        )
+
+        row["isoforms"] = self._get_isoform_ids(entry, ns) or None
+        row["pfam_ids"] = self._get_pfam_ids(entry, ns) or None
+        return row
+
+    def _link_rows(self, row):
+        """
+        Long-form relationship rows for one master row.
+        """
+        link_rows = []
+        source_id = row["uniprot_id"]
+
+        for field, target_type, relation_type in LINK_TARGETS:
+            value = row[field]
+            if not value:
+                continue
+            for target in str(value).split(";"):
+                link_rows.append(
+                    {
+                        "source_id": source_id,
+                        "target_id": target.strip(),
+                        "source_type": "Proteins",
+                        "target_type": target_type,
+                        "relation_type": relation_type,
+                    }
+                )
+        return link_rows
+
     def _get_comment_text(self, entry, type_, ns):
         comment = entry.find(f"up:comment[@type='{type_}']", ns)
         if comment is not None:
@@ -494,6 +561,44 @@ class DTP(DTPBase, EntityQueryMixin):
         df["secondary_ids"] = df["secondary_ids"].fillna("")
 
         try:
+            # --- ALIASES STRUCTURE (SET-BASED) ---
+            # Canonical proteins
+            primary, secondary = self.build_alias_frames(df, is_active=True)
+            resolved = self.bulk_get_or_create_entities(
+                primary,
+                secondary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=True,
+            )
+            entity_ids = self.map_entity_ids(primary, resolved)["entity_id"]
+
+            # Isoforms are Entities on their own (no secondary aliases)
+            isoform_accs = (
+                df["isoforms"]
+                .map(lambda v: list(v) if len(v) > 0 else [])
+                .explode()
+                .dropna()
+                .astype(str)
+                .str.strip()
+            )
+            isoform_accs = isoform_accs[isoform_accs.ne("")].unique()
+            isoform_primary = pd.DataFrame(
+                {
+                    "alias_value": isoform_accs,
+                    "alias_type": "Isoform",
+                    "xref_source": "Uniprot",
+                    "alias_norm": [acc.lower() for acc in isoform_accs],
+                }
+            )
+            isoform_entity_ids = self.bulk_get_or_create_entities(
+                isoform_primary,
+                group_id=self.entity_group,
+                data_source_id=self.data_source.id,
+                package_id=self.package.id,
+                is_active=True,
+            )["entity_id"]
 
             if self.debug_mode:
                 start_total = time.time()
@@ -522,39 +627,13 @@ class DTP(DTPBase, EntityQueryMixin):
                     self.logger.log(msg, "WARNING")
                     continue
 
-                # --- ALIASES STRUCTURE ---
-                # Create a dict of Aliases
-                alias_dict = self.build_alias(row)
-                # Only primary Name
-                is_primary_alias = next(
-                    (a for a in alias_dict if a.get("is_primary")), None
-                )
-                # Only Aliases Names
-                not_primary_alias = [
-                    a for a in alias_dict if a != is_primary_alias
-                ]  # noqa E501
-
-                # Add or Get Entity
-                entity_id, _ = self.get_or_create_entity(
-                    name=is_primary_alias["alias_value"],
-                    group_id=self.entity_group,
-                    data_source_id=self.data_source.id,
-                    package_id=self.package.id,
-                    alias_type=is_primary_alias["alias_type"],
-                    xref_source=is_primary_alias["xref_source"],
-                    alias_norm=is_primary_alias["alias_norm"],
-                    is_active=True,
-                )
-
-                # Add or Get EntityName
-                self.get_or_create_entity_name(
-                    group_id=self.entity_group,
-                    entity_id=entity_id,
-                    aliases=not_primary_alias,
-                    is_active=True,
-                    data_source_id=self.data_source.id,  # noqa E501
-                    package_id=self.package.id,
-                )
+                # Entity resolved in bulk above
+                entity_id = entity_ids.get(row.name)
+                if pd.isna(entity_id):
+                    msg = f"Entity not resolved for: {protein_master}"
+                    self.logger.log(msg, "WARNING")
+                    continue
+                entity_id = int(entity_id)
 
                 # Create Protein Master object (This is the Canonical Protein)
                 protein_master_obj = (
@@ -651,17 +730,15 @@ class DTP(DTPBase, EntityQueryMixin):
                         if not isoform_acc:
                             continue
 
-                        # Add or Get Entity
-                        isoform_entity_id, _ = self.get_or_create_entity(
-                            name=isoform_acc,
-                            group_id=self.entity_group,
-                            data_source_id=self.data_source.id,
-                            package_id=self.package.id,
-                            alias_type="Isoform",
-                            xref_source="Uniprot",
-                            alias_norm=isoform_acc.lower(),
-                            is_active=True,
+                        # Entity resolved in bulk above (full alias key)
+                        isoform_entity_id = isoform_entity_ids.get(
+                            (isoform_acc, "Isoform", "Uniprot")
                         )
+                        if pd.isna(isoform_entity_id):
+                            msg = f"Entity not resolved for isoform: {isoform_acc}"  # noqa E501
+                            self.logger.log(msg, "WARNING")
+                            continue
+                        isoform_entity_id = int(isoform_entity_id)
 
                         # Registrar ProteinEntity com is_isoform=True
                         protein_entity_obj = (
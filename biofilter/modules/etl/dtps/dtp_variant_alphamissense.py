@@ -13,6 +13,7 @@ import pandas as pd
 from sqlalchemy import text
 
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
+from biofilter.modules.etl.predictor_summary import refresh_predictor_summary
 from biofilter.utils.file_hash import compute_file_hash
 
 
@@ -185,14 +186,16 @@ class DTP(DTPBase):
                 self.logger.log(msg, "INFO")
                 return True, msg, current_hash
 
-            status, dl_msg = self.http_download(source_url, str(landing_path))
+            status, dl_msg = self.http_download(
+                source_url, str(landing_path), expected_md5=current_hash
+            )
             if not status:
                 self.logger.log(dl_msg, "ERROR")
                 return False, dl_msg, current_hash
 
-            downloaded = landing_path / Path(source_url).name
-            if current_hash is None and downloaded.exists():
-                current_hash = compute_file_hash(downloaded)
+            if current_hash is None:
+                # hashed while streaming, no second pass over the file
+                current_hash = self.last_download.sha256
 
             msg = f"✅ {self.data_source.name} downloaded to {landing_path}"
             self.logger.log(msg, "INFO")
@@ -581,15 +584,7 @@ class DTP(DTPBase):
         if df.empty:
             return 0, 0
 
-        conn.execute(text(f"DROP TABLE IF EXISTS {stage_table}"))
-        df.to_sql(
-            stage_table,
-            con=conn,
-            if_exists="replace",
-            index=False,
-            method="multi",
-            chunksize=10_000,
-        )
+        self.copy_to_table(conn, stage_table, df, create=True)
 
         join_sql = f"""
             FROM {stage_table} s
@@ -749,6 +744,18 @@ class DTP(DTPBase):
 
         try:
             with self.db.engine.begin() as conn:
+                # Chromosomes whose predictor summary must be rebuilt: those
+                # holding this source's old rows plus those in the new parts
+                touched = {
+                    int(c)
+                    for c in conn.execute(
+                        text(
+                            "SELECT DISTINCT chromosome FROM variant_effect_predictions "  # noqa E501
+                            "WHERE data_source_id = :data_source_id"
+                        ),
+                        {"data_source_id": self.data_source.id},
+                    ).scalars()
+                }
                 conn.execute(
                     text(
                         "DELETE FROM variant_effect_predictions "
@@ -760,6 +767,7 @@ class DTP(DTPBase):
                 for part_file in part_files:
                     df = pd.read_parquet(part_file, engine="pyarrow")
                     df = self._prepare_load_df(df)
+                    touched.update(int(c) for c in df["chromosome"].dropna().unique())
                     matched, unmatched = self._load_part_via_stage(conn, df, stage_table)
                     total_matched += matched
                     total_unmatched += unmatched
@@ -769,6 +777,8 @@ class DTP(DTPBase):
                         "INFO",
                     )
 
+                refresh_predictor_summary(conn, touched, logger=self.logger)
+
         except Exception as exc:
             msg = f"❌ Load failed: {exc}"
             self.logger.log(msg, "ERROR")
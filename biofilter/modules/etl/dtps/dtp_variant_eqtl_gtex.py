@@ -255,14 +255,17 @@ class DTP(DTPBase):
                 self.logger.log(msg, "INFO")
                 return True, msg, current_hash
 
-            status, dl_msg = self.http_download(source_url, str(landing_path))
+            status, dl_msg = self.http_download(
+                source_url, str(landing_path), expected_md5=current_hash
+            )
             if not status:
                 self.logger.log(dl_msg, "ERROR")
                 return False, dl_msg, current_hash
 
             downloaded = landing_path / Path(source_url).name
-            if current_hash is None and downloaded.exists():
-                current_hash = compute_file_hash(downloaded)
+            if current_hash is None:
+                # hashed while streaming, no second pass over the file
+                current_hash = self.last_download.sha256
 
             self._unpack_brain_tissues(downloaded, landing_path)
             msg = f"✅ {self.data_source.name} downloaded to {landing_path}"
@@ -679,15 +682,7 @@ class DTP(DTPBase):
         if df.empty:
             return 0, 0
 
-        conn.execute(text(f"DROP TABLE IF EXISTS {stage_table}"))
-        df.to_sql(
-            stage_table,
-            con=conn,
-            if_exists="replace",
-            index=False,
-            method="multi",
-            chunksize=10_000,
-        )
+        self.copy_to_table(conn, stage_table, df, create=True)
 
         join_sql = f"""
             FROM {stage_table} s
@@ -1,16 +1,21 @@
 # dtp_variant_gnomad_cyvcf2.py
 from __future__ import annotations
 
-import csv
 import glob
-import io
+import multiprocessing
 import os
 import re
 import time
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -22,6 +27,12 @@ from sqlalchemy import select, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from biofilter.modules.db.models import ETLPackage
+from biofilter.modules.etl.index_builder import (
+    IndexBuildManager,
+    index_name_for,
+    partition_index_name,
+)
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 
 # from numpy.ma import var
@@ -30,6 +41,16 @@ from biofilter.modules.etl.mixins.base_dtp import DTPBase
 # -----------------------------------------------------------------------------
 # Config
 # -----------------------------------------------------------------------------
+def _default_transform_workers() -> int:
+    raw = os.getenv("BIOFILTER_GNOMAD_WORKERS")
+    if raw is not None:
+        try:
+            return max(1, int(str(raw).strip()))
+        except ValueError:
+            pass
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
 @dataclass
 class GnomadCyvcf2Config:
     """
@@ -135,6 +156,18 @@ class GnomadCyvcf2Config:
     postgres_fast_load: bool = True
     postgres_partition_refresh: bool = True
 
+    # Transform: region-parallel processes (needs a tabix/CSI index) and
+    # window size in bp
+    transform_workers: int = field(default_factory=_default_transform_workers)  # noqa E501
+    region_size: int = 5_000_000
+
+    # Load: chromosomes loaded in parallel, each on its own connection
+    load_workers: int = 1
+    # Load into detached copies of the chromosome partitions and swap them
+    # in at the end (full chromosome refresh; refused when other sources or
+    # variant_id-keyed tables depend on the partition)
+    postgres_partition_swap: bool = False
+
 
 # -----------------------------------------------------------------------------
 # Helpers
@@ -267,28 +300,6 @@ def _parse_vep_header_format(vcf: VCF, vep_key: str) -> List[str]:
     return []
 
 
-# transform
-def _parse_vep_rows(
-    vep_value: Optional[str],
-    vep_field_positions: List[Tuple[int, str]],
-) -> List[Dict[str, str]]:
-    """
-    Parse VEP value (comma-separated rows, pipe-separated fields) into list of dicts.  # noqa E501
-    """
-    if not vep_value or not vep_field_positions:
-        return []
-    rows: List[Dict[str, str]] = []
-    for chunk in str(vep_value).split(","):
-        parts = chunk.split("|")
-        rows.append(
-            {
-                field: parts[idx] if idx < len(parts) else ""
-                for idx, field in vep_field_positions
-            }
-        )
-    return rows
-
-
 VEP_CONSEQUENCE_SEVERITY_ORDER: List[str] = [
     "transcript_ablation",
     "splice_acceptor_variant",
@@ -345,28 +356,6 @@ IMPACT_RANK: Dict[str, int] = {
 }
 
 
-# transform._build_atomic_consequence_rows
-def _split_consequences(value: Optional[str]) -> List[str]:
-    if value is None:
-        return []
-    parts = [item.strip() for item in str(value).split("&") if item and item.strip()]  # noqa E501
-    return parts
-
-
-# transform._build_atomic_consequence_rows
-def _consequence_rank(term: Optional[str]) -> Optional[int]:
-    if not term:
-        return None
-    return VEP_CONSEQUENCE_RANK.get(term)
-
-
-# transform._build_atomic_consequence_rows
-def _impact_rank(value: Optional[str]) -> Optional[int]:
-    if not value:
-        return None
-    return IMPACT_RANK.get(str(value).strip().upper())
-
-
 # # transform._build_atomic_consequence_rows
 # def _classify_consequence(term: Optional[str]) -> Tuple[Optional[str], Optional[str]]:  # noqa E501
 #     if not term:
@@ -439,113 +428,154 @@ def _impact_rank(value: Optional[str]) -> Optional[int]:
 #     return "other", "structural_other"
 
 
-# transform
-def _build_atomic_consequence_rows(
-    *,
-    variant_key: str,
-    chrom: int,
-    pos: int,
-    ref: str,
-    alt: str,
-    vep_rows: List[Dict[str, str]],
-) -> List[Dict[str, Any]]:
-    atomic_rows: List[Dict[str, Any]] = []
-    per_annotation_min_rank: Dict[int, Optional[int]] = {}
-    per_annotation_min_term: Dict[int, Optional[str]] = {}
-    min_rank_for_variant: Optional[int] = None
-    min_term_for_variant: Optional[str] = None
-
-    for annotation_index, r in enumerate(vep_rows):
-        lof_conf = (r.get("LoF") or "").strip() or None
-        impact = r.get("IMPACT") or None
-        impact_rank = _impact_rank(impact)
-        consequence_raw = r.get("Consequence") or None
-        atomic_terms = _split_consequences(consequence_raw) or [None]
-
-        local_min_rank: Optional[int] = None
-        local_min_term: Optional[str] = None
-
-        for consequence in atomic_terms:
-            consequence_rank = _consequence_rank(consequence)
-            if consequence_rank is not None and (
-                local_min_rank is None or consequence_rank < local_min_rank
-            ):
-                local_min_rank = consequence_rank
-                local_min_term = consequence
-
-            # group, category = _classify_consequence(consequence)
-
-            atomic_rows.append(
-                {
-                    "annotation_index": annotation_index,
-                    "variant_key": variant_key,
-                    "chrom": chrom,
-                    "pos": pos,
-                    "ref": ref,
-                    "alt": alt,
-                    "allele": r.get("Allele") or None,
-                    "feature_type": r.get("Feature_type") or None,
-                    "gene_id_raw": r.get("Gene") or None,
-                    "gene_symbol_raw": r.get("SYMBOL") or None,
-                    "transcript_id_raw": r.get("Feature") or None,
-                    "gene_id": r.get("Gene") or None,
-                    "transcript_id": r.get("Feature") or None,
-                    # "consequence_raw": consequence_raw,
-                    "consequence": consequence,
-                    "impact": impact,
-                    "impact_rank": impact_rank,
-                    "biotype": r.get("BIOTYPE") or None,
-                    # "variant_class": r.get("VARIANT_CLASS") or None,
-                    # "consequence_group": group,
-                    # "consequence_category": category,
-                    "consequence_rank": consequence_rank,
-                    # "canonical": _truthy_vep_flag(r.get("CANONICAL")),
-                    # "mane_select": _truthy_vep_flag(r.get("MANE_SELECT")),
-                    # "mane_plus_clinical": _truthy_vep_flag(r.get("MANE_PLUS_CLINICAL")),  # noqa E501
-                    # "hgvsc": r.get("HGVSc") or None,
-                    # "hgvsp": r.get("HGVSp") or None,
-                    # "cdna_position": r.get("cDNA_position") or None,
-                    # "cds_position": r.get("CDS_position") or None,
-                    # "protein_position": r.get("Protein_position") or None,
-                    # "amino_acids": r.get("Amino_acids") or None,
-                    # "codons": r.get("Codons") or None,
-                    # "ensp": r.get("ENSP") or None,
-                    "lof_flag": lof_conf in {"HC", "LC"},
-                    "lof_confidence": lof_conf,
-                    "lof_filter": r.get("LoF_filter") or None,
-                    "lof_flags": r.get("LoF_flags") or None,
-                    "lof_info": r.get("LoF_info") or None,
-                }
-            )
+VEP_CONSEQUENCE_TERM_BY_RANK: Dict[int, str] = {
+    rank: term for term, rank in VEP_CONSEQUENCE_RANK.items()
+}
 
-        per_annotation_min_rank[annotation_index] = local_min_rank
-        per_annotation_min_term[annotation_index] = local_min_term
+CONSEQUENCE_COLUMNS: List[str] = [
+    "annotation_index",
+    "variant_key",
+    "chrom",
+    "pos",
+    "ref",
+    "alt",
+    "allele",
+    "feature_type",
+    "gene_id_raw",
+    "gene_symbol_raw",
+    "transcript_id_raw",
+    "gene_id",
+    "transcript_id",
+    "consequence",
+    "impact",
+    "impact_rank",
+    "biotype",
+    "consequence_rank",
+    "lof_flag",
+    "lof_confidence",
+    "lof_filter",
+    "lof_flags",
+    "lof_info",
+    "most_severe_consequence_per_annotation",
+    "most_severe_consequence_per_variant",
+    "is_most_severe_for_annotation",
+    "is_most_severe_for_variant",
+]
 
-        if local_min_rank is not None and (
-            min_rank_for_variant is None or local_min_rank < min_rank_for_variant  # noqa E501
-        ):
-            min_rank_for_variant = local_min_rank
-            min_term_for_variant = local_min_term
 
-    for row in atomic_rows:
-        annotation_index = row["annotation_index"]
-        annotation_rank = per_annotation_min_rank.get(annotation_index)
-        row["most_severe_consequence_per_annotation"] = per_annotation_min_term.get(  # noqa E501
-            annotation_index
-        )
-        row["most_severe_consequence_per_variant"] = min_term_for_variant
-        row["is_most_severe_for_annotation"] = (
-            row.get("consequence_rank") is not None
-            and annotation_rank is not None
-            and row["consequence_rank"] == annotation_rank
-        )
-        row["is_most_severe_for_variant"] = (
-            row.get("consequence_rank") is not None
-            and min_rank_for_variant is not None
-            and row["consequence_rank"] == min_rank_for_variant
-        )
+def _blank_to_none(s: pd.Series) -> pd.Series:
+    return s.where(s.notna() & (s != ""), None)
 
-    return atomic_rows
+
+# transform
+def _build_consequence_frame(
+    variants: pd.DataFrame,
+    vep_values: List[Optional[str]],
+    vep_field_positions: List[Tuple[int, str]],
+) -> pd.DataFrame:
+    """
+    Columnar VEP explode for a chunk of variants.
+
+    `variants` holds variant_key/chrom/pos/ref/alt aligned with
+    `vep_values` (raw INFO/vep strings). Rows come out one per atomic
+    consequence term ("&"-split), in variant / annotation / term order,
+    with the per-annotation and per-variant most severe terms resolved by
+    group-wise min over the consequence rank.
+    """
+    vep = pd.Series(vep_values, dtype=object)
+    vep = vep[vep.notna()].astype(str)
+    vep = vep[vep != ""]
+    if vep.empty or not vep_field_positions:
+        return pd.DataFrame(columns=CONSEQUENCE_COLUMNS)
+
+    # One row per annotation (comma-separated), index = variant row
+    ann = vep.str.split(",").explode()
+    row_idx = ann.index.to_numpy()
+    ann = ann.reset_index(drop=True)
+    parts = ann.str.split("|", expand=True)
+
+    frame = pd.DataFrame(
+        {
+            "_row": row_idx,
+            "annotation_index": ann.groupby(row_idx).cumcount().to_numpy(),
+        }
+    )
+    for idx, field_name in vep_field_positions:
+        if idx in parts.columns:
+            frame[field_name] = _blank_to_none(parts[idx])
+        else:
+            frame[field_name] = None
+    frame["_ann"] = np.arange(len(frame))
+
+    # One row per atomic consequence term ("&"-separated)
+    consequence = frame.get("Consequence")
+    if consequence is None:
+        consequence = pd.Series(None, index=frame.index, dtype=object)
+    frame["consequence"] = consequence.fillna("").str.split("&")
+    frame = frame.explode("consequence", ignore_index=True)
+    frame["consequence"] = _blank_to_none(frame["consequence"].str.strip())
+    no_term = frame["consequence"].isna()
+    has_term = (~no_term).groupby(frame["_ann"]).transform("any")
+    frame = frame[~no_term | ~has_term]
+    frame = frame[~(frame["consequence"].isna() & frame.duplicated("_ann"))]
+    frame = frame.reset_index(drop=True)
+
+    rank = frame["consequence"].map(VEP_CONSEQUENCE_RANK).astype("Int64")
+    ann_min = rank.groupby(frame["_ann"]).transform("min")
+    variant_min = rank.groupby(frame["_row"]).transform("min")
+
+    def _field(name: str) -> pd.Series:
+        if name in frame.columns:
+            return frame[name]
+        return pd.Series(None, index=frame.index, dtype=object)
+
+    impact = _field("IMPACT")
+    lof_conf = _blank_to_none(_field("LoF").fillna("").astype(str).str.strip())  # noqa E501
+    meta = variants.iloc[frame["_row"].to_numpy()].reset_index(drop=True)
+
+    out = pd.DataFrame(
+        {
+            "annotation_index": frame["annotation_index"].astype("int64"),
+            "variant_key": meta["variant_key"],
+            "chrom": meta["chrom"],
+            "pos": meta["pos"],
+            "ref": meta["ref"],
+            "alt": meta["alt"],
+            "allele": _field("Allele"),
+            "feature_type": _field("Feature_type"),
+            "gene_id_raw": _field("Gene"),
+            "gene_symbol_raw": _field("SYMBOL"),
+            "transcript_id_raw": _field("Feature"),
+            "gene_id": _field("Gene"),
+            "transcript_id": _field("Feature"),
+            "consequence": frame["consequence"],
+            "impact": impact,
+            "impact_rank": impact.str.strip()
+            .str.upper()
+            .map(IMPACT_RANK)
+            .astype("Int64"),
+            "biotype": _field("BIOTYPE"),
+            "consequence_rank": rank,
+            "lof_flag": lof_conf.isin(["HC", "LC"]),
+            "lof_confidence": lof_conf,
+            "lof_filter": _field("LoF_filter"),
+            "lof_flags": _field("LoF_flags"),
+            "lof_info": _field("LoF_info"),
+            "most_severe_consequence_per_annotation": ann_min.map(
+                VEP_CONSEQUENCE_TERM_BY_RANK
+            ).astype(object),
+            "most_severe_consequence_per_variant": variant_min.map(
+                VEP_CONSEQUENCE_TERM_BY_RANK
+            ).astype(object),
+            "is_most_severe_for_annotation": (rank == ann_min)
+            .fillna(False)
+            .astype(bool),
+            "is_most_severe_for_variant": (rank == variant_min)
+            .fillna(False)
+            .astype(bool),
+        }
+    )
+    return out
 
 
 # tranform
@@ -559,6 +589,273 @@ def _write_parquet_part(
     pq.write_table(table, out_path, compression=compression)
 
 
+@dataclass
+class GnomadTransformPlan:
+    """
+    Everything a transform worker needs besides the records (picklable).
+    """
+
+    chrom: int
+    config: GnomadCyvcf2Config
+    info_keys: List[str]
+    info_types: Dict[str, str]
+    vep_field_positions: List[Tuple[int, str]]
+    variants_dir: str
+    consequences_dir: str
+
+
+def _contig_chromosome(name: str) -> Optional[int]:
+    c = str(name).upper()
+    if c.startswith("CHR"):
+        c = c[3:]
+    if c == "X":
+        return 23
+    if c == "Y":
+        return 24
+    if c in {"M", "MT"}:
+        return 25
+    return int(c) if c.isdigit() else None
+
+
+def _vcf_regions(
+    vcf, chrom: int, region_size: int
+) -> List[Tuple[str, int, int]]:
+    """
+    Split the contig of `chrom` into 1-based inclusive windows of
+    `region_size` bp, using contig lengths from the VCF header.
+    """
+    regions: List[Tuple[str, int, int]] = []
+    for name, length in zip(vcf.seqnames, vcf.seqlens):
+        if _contig_chromosome(name) != chrom or not length:
+            continue
+        for start in range(1, int(length) + 1, region_size):
+            end = min(start + region_size - 1, int(length))
+            regions.append((name, start, end))
+    return regions
+
+
+def _transform_records(
+    records, plan: GnomadTransformPlan, part_tag: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Filter, flatten and write VCF records to parquet parts of
+    `chunk_size` variants. Consequences are exploded per chunk with
+    `_build_consequence_frame`. Returns row/skip/part counters.
+    """
+    cfg = plan.config
+    counts = {
+        "rows": 0,
+        "skipped": 0,
+        "skipped_by_ac": 0,
+        "skipped_by_filter": 0,
+        "skipped_by_qual": 0,
+        "skipped_by_alt_empty": 0,
+        "parts": 0,
+    }
+    variant_rows: List[Dict[str, Any]] = []
+    vep_values: List[Optional[str]] = []
+    prefix_tag = f"{part_tag}_" if part_tag else ""
+
+    # Save chunks
+    def flush():
+        nonlocal variant_rows, vep_values
+        if not variant_rows:
+            return
+        part_name = f"{prefix_tag}{counts['parts']:04d}.parquet"
+        _write_parquet_part(
+            variant_rows,
+            Path(plan.variants_dir) / f"{cfg.variants_prefix}{part_name}",
+            cfg.parquet_compression,
+        )
+        consequences = _build_consequence_frame(
+            pd.DataFrame(
+                variant_rows, columns=["variant_key", "chrom", "pos", "ref", "alt"]  # noqa E501
+            ),
+            vep_values,
+            plan.vep_field_positions,
+        )
+        if not consequences.empty:
+            pq.write_table(
+                pa.Table.from_pandas(consequences, preserve_index=False),
+                Path(plan.consequences_dir)
+                / f"{cfg.consequences_prefix}{part_name}",
+                compression=cfg.parquet_compression,
+            )
+        variant_rows = []
+        vep_values = []
+        counts["parts"] += 1
+
+    chrom = plan.chrom
+    for var in records:
+
+        # Filtering at the variant level (before parsing INFO/VEP):
+        # -----------------------------------------------------------------
+        # 0. Minimal AC filter: skip variants with AC=0 (not observed in gnomAD)  # noqa E501
+        # 1. Variants with failing FILTER are skipped
+        # 2. Variants below the configured QUAL threshold are skipped
+        # 3. Variants with multiple ALTs in the same record are rejected  # noqa E501
+
+        pos = int(var.POS)
+        ref = var.REF
+
+        # Filter 0: Skip variants with AC=0
+        if var.INFO.get("AC") < cfg.min_ac:
+            counts["skipped_by_ac"] += 1
+            counts["skipped"] += 1
+            continue
+
+        # Filter 1: No load variant with failing FILTER
+        var_filter = var.FILTER
+        if var_filter not in (None, "PASS", ".", ""):
+            counts["skipped_by_filter"] += 1
+            counts["skipped"] += 1
+            continue
+
+        var_qual = var.QUAL
+        try:
+            if var_qual is not None and float(var_qual) < cfg.min_qual:
+                counts["skipped_by_qual"] += 1
+                counts["skipped"] += 1
+                continue
+        except (TypeError, ValueError):
+            pass
+
+        # Filter 2: Skip multi-allelic records
+        # Assumption: gnomAD file already represents one ALT per record
+        if not var.ALT:
+            counts["skipped_by_alt_empty"] += 1
+            counts["skipped"] += 1
+            continue
+        if len(var.ALT) > 1:
+            raise ValueError(
+                f"Unexpected multi-allelic record found at {var.CHROM}:{var.POS}."  # noqa E501
+                "Current transform assumes one ALT per record."
+            )
+        alt = var.ALT[0]
+        if alt is None:
+            counts["skipped"] += 1
+            continue
+
+        # Clean rsID when missing or empty
+        rsid = var.ID if (var.ID and var.ID != ".") else None
+
+        # Create variant key (chrom:pos:ref:alt)
+        vkey = _variant_key(chrom, pos, ref, alt)
+
+        # MASTER VARIANT
+        # Construct base variant row with INFO fields
+        row: Dict[str, Any] = {
+            "chrom": chrom,
+            "pos": pos,
+            "ref": ref,
+            "alt": alt,
+            "rsid": rsid,
+            "variant_key": vkey,
+        }
+
+        for k in plan.info_keys:
+            row[k] = _cast_info_value(
+                var.INFO.get(k), plan.info_types.get(k, "String")
+            )  # noqa E501
+
+        variant_rows.append(row)
+
+        # MOLECULAR EFFECT (CONSEQUENCES FROM VEP)
+        # raw VEP payload, exploded per chunk in columnar form
+        vep_values.append(var.INFO.get(cfg.vep_info_key))
+
+        counts["rows"] += 1
+        # Save chunk files
+        if counts["rows"] % cfg.chunk_size == 0:
+            flush()
+    # Save remaining records
+    flush()
+    return counts
+
+
+def _gnomad_region_worker(
+    vcf_path: str,
+    region: Tuple[str, int, int],
+    region_idx: int,
+    plan: GnomadTransformPlan,
+) -> Dict[str, int]:
+    """
+    Process-pool entry point: transform the records starting inside one
+    window. Records overlapping the window but starting before it belong
+    to the previous window.
+    """
+    contig, start, end = region
+    vcf = VCF(vcf_path)
+    records = (
+        var for var in vcf(f"{contig}:{start}-{end}") if start <= var.POS <= end
+    )
+    return _transform_records(records, plan, part_tag=f"{region_idx:04d}")
+
+
+# -----------------------------------------------------------------------------
+# Load columns / partitioned targets
+# -----------------------------------------------------------------------------
+PARTITIONED_VARIANT_TABLES = ("variant_masters", "variant_molecular_effects")
+
+LOAD_VARIANT_COLUMNS = [
+    "chrom",
+    "chromosome",
+    "pos",
+    "position_start",
+    "position_end",
+    "ref",
+    "reference_allele",
+    "alt",
+    "alternate_allele",
+    "rsid",
+    "variant_key",
+    "variant_type",
+    "allele_type",
+    "AC",
+    "ac",
+    "AN",
+    "an",
+    "AF",
+    "af",
+    "grpmax",
+    "grpmax_af",
+    "cadd_raw_score",
+    "cadd_phred",
+    "revel_max",
+    "spliceai_ds_max",
+    "pangolin_largest_ds",
+    "polyphen_max",
+    "sift_max",
+]
+
+LOAD_CONSEQUENCE_COLUMNS = [
+    "chrom",
+    "chromosome",
+    "variant_key",
+    "gene_id_raw",
+    "gene_symbol_raw",
+    "gene_id",
+    "gene_symbol",
+    "transcript_id",
+    "transcript_id_raw",
+    "feature_type",
+    "consequence",
+    "consequence_rank",
+    "impact",
+    "impact_rank",
+    "biotype",
+    "most_severe_consequence_per_annotation",
+    "most_severe_consequence_per_variant",
+    "is_most_severe_for_annotation",
+    "is_most_severe_for_variant",
+    "lof_flag",
+    "lof_confidence",
+    "lof_filter",
+    "lof_flags",
+    "lof_info",
+]
+
+
 # -----------------------------------------------------------------------------
 # DTP
 # -----------------------------------------------------------------------------
@@ -642,11 +939,17 @@ class DTP(DTPBase):
                 self.logger.log(msg, "WARNING")
                 return True, msg, current_hash
 
-            status, dl_msg = self.http_download(source_url, landing_path)
+            status, dl_msg = self.http_download(
+                source_url, landing_path, expected_md5=current_hash
+            )
             if not status:
                 self.logger.log(dl_msg, "ERROR")
                 return False, dl_msg, current_hash
 
+            if current_hash is None:
+                # hashed while streaming, no second pass over the file
+                current_hash = self.last_download.sha256
+
             msg = f"✅ {self.data_source.name} downloaded to {landing_path}"
             self.logger.log(msg, "INFO")
             return True, msg, current_hash
@@ -709,50 +1012,15 @@ class DTP(DTPBase):
 
         # Extend config settings
         cfg = self.config
-        chunk_size = cfg.chunk_size
-
-        part = 0  # Manager chunk files sequences
-        n_rows = 0
-        n_skipped = 0
-        variant_rows: List[Dict[str, Any]] = []
-        consequence_rows: List[Dict[str, Any]] = []
 
         # Get Chrom from VCF FIles / Data Source
         # Without chrm, stop the process
         chrom = resolve_file_chromosome(vcf_path, self.data_source.name)
         if chrom is None:
-            self.logger.log(f"❌ Chromosome mismatch in file {vcf_path}", "ERROR")  # noqa E501
+            msg = f"❌ Chromosome mismatch in file {vcf_path}"
+            self.logger.log(msg, "ERROR")
             return False, msg
 
-        # Inside method to save chunks
-        def flush():
-            try:
-                nonlocal part, variant_rows, consequence_rows
-                if not variant_rows and not consequence_rows:
-                    return
-                if variant_rows:
-                    _write_parquet_part(
-                        variant_rows,
-                        variants_dir
-                        / f"{cfg.variants_prefix}{part:04d}.parquet",  # noqa E501
-                        cfg.parquet_compression,
-                    )
-                if consequence_rows:
-                    _write_parquet_part(
-                        consequence_rows,
-                        cons_dir
-                        / f"{cfg.consequences_prefix}{part:04d}.parquet",  # noqa E501
-                        cfg.parquet_compression,
-                    )
-                variant_rows = []
-                consequence_rows = []
-                part += 1
-            except Exception as e:
-                msg = f"❌ Flush error: {str(e)}"
-                self.logger.log(msg, "ERROR")
-                # return
-                raise
-
         try:
             # Read vcf with cyvcf2 software
             vcf = VCF(str(vcf_path))
@@ -811,9 +1079,27 @@ class DTP(DTPBase):
             ]
 
         except Exception as e:
-            self.logger.log(f"❌ Error to read {vcf_path}: {e}", "ERROR")
+            msg = f"❌ Error to read {vcf_path}: {e}"
+            self.logger.log(msg, "ERROR")
             return False, msg
 
+        plan = GnomadTransformPlan(
+            chrom=chrom,
+            config=cfg,
+            info_keys=info_keys,
+            info_types=info_types,
+            vep_field_positions=vep_field_positions,
+            variants_dir=str(variants_dir),
+            consequences_dir=str(cons_dir),
+        )
+
+        # Parts from an earlier run may use another numbering (serial vs
+        # regions); never mix them with the new ones
+        for old_part in list(
+            variants_dir.glob(f"{cfg.variants_prefix}*.parquet")
+        ) + list(cons_dir.glob(f"{cfg.consequences_prefix}*.parquet")):
+            old_part.unlink()
+
         # -------------------------------------------------------------------
         # Process variants and consequences, buffering in memory and flushing
         # to parquet in chunks
@@ -825,111 +1111,18 @@ class DTP(DTPBase):
             "reject multi-ALT records in same sample.",
             "INFO",
         )
-        skipped_by_ac = 0
-        skipped_by_filter = 0
-        skipped_by_qual = 0
-        skipped_by_alt_empty = 0
 
         try:
-            for var in vcf:
-
-                # Filtering at the variant level (before parsing INFO/VEP):
-                # -----------------------------------------------------------------
-                # 0. Minimal AC filter: skip variants with AC=0 (not observed in gnomAD)  # noqa E501
-                # 1. Variants with failing FILTER are skipped
-                # 2. Variants below the configured QUAL threshold are skipped
-                # 3. Variants with multiple ALTs in the same record are rejected  # noqa E501
-
-                pos = int(var.POS)
-                ref = var.REF
-
-                # Filter 0: Skip variants with AC=0
-                if var.INFO.get("AC") < cfg.min_ac:
-                    skipped_by_ac += 1
-                    n_skipped += 1
-                    continue
-
-                # Filter 1: No load variant with failing FILTER
-                var_filter = var.FILTER
-                if var_filter not in (None, "PASS", ".", ""):
-                    skipped_by_filter += 1
-                    n_skipped += 1
-                    continue
-
-                var_qual = var.QUAL
-                try:
-                    if var_qual is not None and float(var_qual) < cfg.min_qual:
-                        skipped_by_qual += 1
-                        n_skipped += 1
-                        continue
-                except (TypeError, ValueError):
-                    pass
-
-                # Filter 2: Skip multi-allelic records
-                # Assumption: gnomAD file already represents one ALT per record
-                if not var.ALT:
-                    skipped_by_alt_empty += 1
-                    n_skipped += 1
-                    continue
-                if len(var.ALT) > 1:
-                    raise ValueError(
-                        f"Unexpected multi-allelic record found in {vcf_path.name} at {var.CHROM}:{var.POS}."  # noqa E501
-                        "Current transform assumes one ALT per record."
-                    )
-                alt = var.ALT[0]
-                if alt is None:
-                    n_skipped += 1
-                    continue
-
-                # Clean rsID when missing or empty
-                rsid = var.ID if (var.ID and var.ID != ".") else None
-
-                # Create variant key (chrom:pos:ref:alt)
-                vkey = _variant_key(chrom, pos, ref, alt)
-
-                # MASTER VARIANT
-                # Construct base variant row with INFO fields
-                row: Dict[str, Any] = {
-                    "chrom": chrom,
-                    "pos": pos,
-                    "ref": ref,
-                    "alt": alt,
-                    "rsid": rsid,
-                    "variant_key": vkey,
-                }
-
-                for k in info_keys:
-                    row[k] = _cast_info_value(
-                        var.INFO.get(k), info_types.get(k, "String")
-                    )  # noqa E501
-
-                variant_rows.append(row)
-
-                # MOLECULAR EFFECT (CONSEQUENCES FROM VEP)
-                # preserve raw VEP fields and explode atomic conseq rows
-                vep_val = var.INFO.get(cfg.vep_info_key)
-
-                vep_rows = _parse_vep_rows(vep_val, vep_field_positions)
-
-                # This method could be a bottleneck.
-                consequence_rows.extend(
-                    _build_atomic_consequence_rows(
-                        variant_key=vkey,
-                        chrom=chrom,
-                        pos=pos,
-                        ref=ref,
-                        alt=alt,
-                        vep_rows=vep_rows,
-                    )
+            regions = self._transform_regions(vcf, vcf_path, chrom)
+            workers = min(int(cfg.transform_workers or 1), len(regions))
+            if workers > 1:
+                counts = self._transform_with_pool(
+                    str(vcf_path), regions, plan, workers
                 )
-
-                n_rows += 1
-                # Save chunk files
-                if n_rows % chunk_size == 0:
-                    flush()
-            # Save remaining records
-            flush()
-
+                mode = f"{workers} workers, {len(regions)} regions"
+            else:
+                counts = _transform_records(vcf, plan)
+                mode = "serial"
         except Exception as e:
             msg = f"❌ ETL transform failed: {str(e)}"
             self.logger.log(msg, "ERROR")
@@ -943,20 +1136,88 @@ class DTP(DTPBase):
         dt = time.time() - t0
         # self.logger.log(
         #     "⚠️ Variant filter summary: "
-        #     f"AC<{cfg.min_ac}={skipped_by_ac}, "
-        #     f"FILTER_FAIL={skipped_by_filter}, "
-        #     f"QUAL<{cfg.min_qual}={skipped_by_qual}, "
-        #     f"ALT_EMPTY={skipped_by_alt_empty}.",
+        #     f"AC<{cfg.min_ac}={counts['skipped_by_ac']}, "
+        #     f"FILTER_FAIL={counts['skipped_by_filter']}, "
+        #     f"QUAL<{cfg.min_qual}={counts['skipped_by_qual']}, "
+        #     f"ALT_EMPTY={counts['skipped_by_alt_empty']}.",
         #     "WARNING",
         # )
         msg = (
             f"✅ Transform done: {self.data_source.name} "
-            f"elapsed={dt:.1f}s out={out_base} parts={part} rows={n_rows} skipped={n_skipped}"  # noqa E501
+            f"elapsed={dt:.1f}s out={out_base} parts={counts['parts']} rows={counts['rows']} skipped={counts['skipped']} ({mode})"  # noqa E501
         )
         self.logger.log(msg, "INFO")
 
         return True, msg
 
+    def _transform_regions(
+        self, vcf, vcf_path: Path, chrom: int
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Genomic windows for the region-parallel transform, or [] to run
+        serially (one worker, no tabix/CSI index or no contig lengths).
+        """
+        workers = int(self.config.transform_workers or 1)
+        if workers <= 1:
+            return []
+
+        index_paths = [Path(f"{vcf_path}.tbi"), Path(f"{vcf_path}.csi")]
+        if not any(p.exists() for p in index_paths):
+            self.logger.log(
+                f"ℹ️ No tabix/CSI index next to {vcf_path.name}; "
+                "transforming serially.",
+                "INFO",
+            )
+            return []
+
+        try:
+            regions = _vcf_regions(vcf, chrom, self.config.region_size)
+        except Exception as e:
+            self.logger.log(
+                f"⚠️ Could not split {vcf_path.name} into regions ({e}); "
+                "transforming serially.",
+                "WARNING",
+            )
+            return []
+        return regions
+
+    def _transform_with_pool(
+        self,
+        vcf_path: str,
+        regions: List[Tuple[str, int, int]],
+        plan: "GnomadTransformPlan",
+        workers: int,
+    ) -> Dict[str, int]:
+        """
+        Transform each region in its own process; every region writes its
+        own parquet parts, so workers never share a file.
+        """
+        totals: Dict[str, int] = {}
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        try:
+            futures = {
+                pool.submit(
+                    _gnomad_region_worker, vcf_path, region, region_idx, plan
+                ): region
+                for region_idx, region in enumerate(regions)
+            }
+            for fut in as_completed(futures):
+                contig, start, end = futures[fut]
+                counts = fut.result()
+                for key, value in counts.items():
+                    totals[key] = totals.get(key, 0) + value
+                self.logger.log(
+                    f"🧩 Region {contig}:{start}-{end} done "
+                    f"(rows={counts['rows']}, parts={counts['parts']})",
+                    "DEBUG",
+                )
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+        return totals
+
     # -------------------------------------------------------------------------
     #                            LOAD METHOD
     # -------------------------------------------------------------------------
@@ -1053,14 +1314,6 @@ class DTP(DTPBase):
             )
         )
 
-    def _is_nullish(self, value: Any) -> bool:
-        if value is None:
-            return True
-        try:
-            return bool(pd.isna(value))
-        except Exception:
-            return False
-
     def _copy_dataframe_to_postgres_stage(
         self,
         conn,
@@ -1071,33 +1324,7 @@ class DTP(DTPBase):
     ) -> None:
         if df.empty:
             return
-
-        out = io.StringIO()
-        writer = csv.writer(out)
-
-        for row in df[columns].itertuples(index=False, name=None):
-            writer.writerow(
-                ["\\N" if self._is_nullish(value) else value for value in row]
-            )
-
-        out.seek(0)
-
-        raw_conn = getattr(conn.connection, "driver_connection", None)
-        if raw_conn is None:
-            raw_conn = getattr(conn.connection, "connection", None)
-        if raw_conn is None:
-            raise RuntimeError("Could not access the PostgreSQL driver connection.")  # noqa E501
-
-        copy_sql = (
-            f"COPY {table_name} ({', '.join(columns)}) "
-            "FROM STDIN WITH (FORMAT CSV, NULL '\\N')"
-        )
-
-        cursor = raw_conn.cursor()
-        try:
-            cursor.copy_expert(copy_sql, out)
-        finally:
-            cursor.close()
+        self.copy_to_table(conn, table_name, df, columns=columns)
 
     def _read_parquet_available_columns(
         self,
@@ -1486,11 +1713,22 @@ class DTP(DTPBase):
             )
         return out
 
-    def _bulk_insert_variant_masters_from_stage(self, conn) -> int:
+    def _bulk_insert_variant_masters_from_stage(
+        self, conn, table_name: str = "variant_masters"
+    ) -> int:
+        # Partitions (and swap tables) do not carry the parent's identity,
+        # so ids are drawn from the parent sequence explicitly.
+        id_column = ""
+        id_value = ""
+        if table_name != "variant_masters":
+            id_column = "variant_id,"
+            id_value = "nextval(pg_get_serial_sequence('variant_masters', 'variant_id')),"  # noqa E501
+
         result = conn.execute(
             text(
-                """
-                INSERT INTO variant_masters (
+                f"""
+                INSERT INTO {table_name} (
+                    {id_column}
                     chromosome,
                     position_start,
                     position_end,
@@ -1514,30 +1752,35 @@ class DTP(DTPBase):
                     data_source_id,
                     etl_package_id
                 )
-                SELECT DISTINCT
-                    chromosome,
-                    position_start,
-                    position_end,
-                    reference_allele,
-                    alternate_allele,
-                    rsid,
-                    variant_type,
-                    allele_type,
-                    ac,
-                    an,
-                    af,
-                    grpmax,
-                    grpmax_af,
-                    cadd_raw_score,
-                    cadd_phred,
-                    revel_max,
-                    spliceai_ds_max,
-                    pangolin_largest_ds,
-                    polyphen_max,
-                    sift_max,
+                SELECT
+                    {id_value}
+                    s.*,
                     :data_source_id,
                     :etl_package_id
-                FROM tmp_gnomad_variant_stage
+                FROM (
+                    SELECT DISTINCT
+                        chromosome,
+                        position_start,
+                        position_end,
+                        reference_allele,
+                        alternate_allele,
+                        rsid,
+                        variant_type,
+                        allele_type,
+                        ac,
+                        an,
+                        af,
+                        grpmax,
+                        grpmax_af,
+                        cadd_raw_score,
+                        cadd_phred,
+                        revel_max,
+                        spliceai_ds_max,
+                        pangolin_largest_ds,
+                        polyphen_max,
+                        sift_max
+                    FROM tmp_gnomad_variant_stage
+                ) s
                 ON CONFLICT (
                     chromosome,
                     position_start,
@@ -1554,16 +1797,18 @@ class DTP(DTPBase):
         )
         return result.rowcount or 0
 
-    def _resolve_variant_ids_from_stage(self, conn) -> pd.DataFrame:
+    def _resolve_variant_ids_from_stage(
+        self, conn, table_name: str = "variant_masters"
+    ) -> pd.DataFrame:
         result = conn.execute(
             text(
-                """
+                f"""
                 SELECT DISTINCT
                     s.variant_key,
                     vm.chromosome,
                     vm.variant_id
                 FROM tmp_gnomad_variant_stage s
-                JOIN variant_masters vm
+                JOIN {table_name} vm
                   ON vm.chromosome = s.chromosome
                  AND vm.position_start = s.position_start
                  AND vm.position_end = s.position_end
@@ -1591,11 +1836,13 @@ class DTP(DTPBase):
             ]
         )
 
-    def _bulk_insert_variant_molecular_effects_from_stage(self, conn) -> int:
+    def _bulk_insert_variant_molecular_effects_from_stage(
+        self, conn, table_name: str = "variant_molecular_effects"
+    ) -> int:
         result = conn.execute(
             text(
-                """
-                INSERT INTO variant_molecular_effects (
+                f"""
+                INSERT INTO {table_name} (
                     chromosome,
                     variant_id,
                     variant_key,
@@ -1666,7 +1913,22 @@ class DTP(DTPBase):
         df_variants: pd.DataFrame,
         df_consequences: Optional[pd.DataFrame],
         dim_caches: Dict[str, Dict[str, int]],
+        tables: Optional[Dict[str, str]] = None,
+        dim_conn=None,
     ) -> Tuple[int, int, int]:
+        """
+        Stage one part file and merge it into the variant tables.
+
+        `tables` maps parent table -> table actually written (a chromosome
+        partition or its swap table); parents are used when omitted.
+        `dim_conn` is used for dimension upserts (defaults to `conn`).
+        """
+        tables = tables or {}
+        masters_table = tables.get("variant_masters", "variant_masters")
+        effects_table = tables.get(
+            "variant_molecular_effects", "variant_molecular_effects"
+        )
+
         df_variants = self._prepare_variant_df(df_variants)
         if df_variants.empty:
             return 0, 0, 0
@@ -1705,8 +1967,10 @@ class DTP(DTPBase):
             columns=variant_stage_columns,
         )
 
-        processed_variant_rows = self._bulk_insert_variant_masters_from_stage(conn)  # noqa E501
-        variant_ids_df = self._resolve_variant_ids_from_stage(conn)
+        processed_variant_rows = self._bulk_insert_variant_masters_from_stage(
+            conn, masters_table
+        )
+        variant_ids_df = self._resolve_variant_ids_from_stage(conn, masters_table)  # noqa E501
         if variant_ids_df.empty:
             variant_ids_df = (
                 df_variants[["variant_key", "chromosome"]]
@@ -1719,7 +1983,9 @@ class DTP(DTPBase):
 
         loaded_effects = 0
         if df_consequences is not None and not df_consequences.empty:
-            self._prime_dimension_caches_from_df(df_consequences, conn, dim_caches)  # noqa E501
+            self._prime_dimension_caches_from_df(
+                df_consequences, dim_conn or conn, dim_caches
+            )
             df_consequences = self._map_dimension_ids_to_consequence_df(
                 df_consequences,
                 dim_caches,
@@ -1817,11 +2083,367 @@ class DTP(DTPBase):
                     columns=list(consequence_stage_df.columns),
                 )
                 loaded_effects = self._bulk_insert_variant_molecular_effects_from_stage(  # noqa E501
-                    conn
+                    conn, effects_table
                 )
 
         return processed_variant_rows, resolved_variant_ids, loaded_effects
 
+    # -------------------------------------------------------------------------
+    #                       PER-CHROMOSOME LOAD HELPERS
+    # -------------------------------------------------------------------------
+
+    def _resolve_part_chromosome(self, variant_file: str) -> int:
+        chrom = resolve_file_chromosome(
+            Path(variant_file), self.data_source.name
+        )
+        if chrom is not None:
+            return chrom
+
+        chrom_probe = self._read_parquet_available_columns(
+            variant_file, ["chrom", "chromosome"]
+        )
+        if chrom_probe.empty:
+            raise ValueError(
+                f"Could not resolve chromosome for {Path(variant_file).name}."
+            )
+        probe_col = (
+            "chromosome" if "chromosome" in chrom_probe.columns else "chrom"
+        )
+        return int(chrom_probe.iloc[0][probe_col])
+
+    def _group_part_files_by_chromosome(
+        self, variant_files: List[str]
+    ) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for variant_file in variant_files:
+            chrom = self._resolve_part_chromosome(variant_file)
+            groups.setdefault(chrom, []).append(variant_file)
+        return groups
+
+    def _previous_chromosome_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-chromosome stats of the latest earlier load of the same
+        processed data (same load_hash), used to skip chromosomes that
+        already completed.
+        """
+        if self.session is None or self.package is None:
+            return {}
+        load_hash = getattr(self.package, "load_hash", None)
+        if not load_hash:
+            return {}
+
+        previous = (
+            self.session.query(ETLPackage)
+            .filter(
+                ETLPackage.data_source_id == self.data_source.id,
+                ETLPackage.operation_type == "load",
+                ETLPackage.load_hash == load_hash,
+                ETLPackage.id != self.package.id,
+            )
+            .order_by(ETLPackage.id.desc())
+            .first()
+        )
+        if previous is None or not previous.stats:
+            return {}
+        return dict(previous.stats.get("chromosomes") or {})
+
+    def _record_chromosome_stats(
+        self, chrom: int, chrom_stats: Dict[str, Any]
+    ) -> None:
+        if self.package is None:
+            return
+        stats = dict(getattr(self.package, "stats", None) or {})
+        chromosomes = dict(stats.get("chromosomes") or {})
+        chromosomes[str(chrom)] = chrom_stats
+        stats["chromosomes"] = chromosomes
+        self.package.stats = stats
+        if self.session is not None:
+            self.session.commit()
+
+    def _check_partition_swap_allowed(self, conn, chrom: int) -> None:
+        """
+        A swap replaces the chromosome partitions wholesale and reissues
+        variant_ids. Refuse it when that would drop rows of other data
+        sources or orphan rows of other tables keyed by variant_id.
+        """
+        for parent_table in PARTITIONED_VARIANT_TABLES:
+            partition_table = self._partition_table_name(parent_table, chrom)
+            foreign = conn.execute(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM "{partition_table}" '
+                    "WHERE data_source_id IS DISTINCT FROM :data_source_id)"
+                ),
+                {"data_source_id": self.data_source.id},
+            ).scalar()
+            if foreign:
+                raise RuntimeError(
+                    f"Partition swap refused for chromosome {chrom}: "
+                    f"{partition_table} holds rows of other data sources. "
+                    "Load without postgres_partition_swap."
+                )
+
+        # Tables (not partitions) with a variant_id column, besides ours
+        dependents = conn.execute(
+            text(
+                """
+                SELECT string_agg(c.relname, ',' ORDER BY c.relname)
+                FROM pg_attribute a
+                JOIN pg_class c ON c.oid = a.attrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE a.attname = 'variant_id'
+                  AND NOT a.attisdropped
+                  AND c.relkind IN ('r', 'p')
+                  AND NOT c.relispartition
+                  AND n.nspname = current_schema()
+                  AND c.relname <> ALL(:own_tables)
+                """
+            ),
+            {"own_tables": list(PARTITIONED_VARIANT_TABLES)},
+        ).scalar()
+        masters = self._partition_table_name("variant_masters", chrom)
+        for table_name in (dependents or "").split(","):
+            if not table_name:
+                continue
+            referenced = conn.execute(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM "{masters}" vm '
+                    f'WHERE EXISTS (SELECT 1 FROM "{table_name}" d '
+                    "WHERE d.variant_id = vm.variant_id))"
+                )
+            ).scalar()
+            if referenced:
+                raise RuntimeError(
+                    f"Partition swap refused for chromosome {chrom}: "
+                    f"{table_name} references its variant_ids, which a swap "
+                    "would reissue. Load without postgres_partition_swap."
+                )
+
+    def _create_swap_partition(self, conn, parent_table: str, chrom: int) -> str:  # noqa E501
+        """
+        Detached copy of a chromosome partition, created without its
+        secondary indexes so the load does not maintain them row by row.
+        Only the primary / unique keys are added: ON CONFLICT needs them.
+        """
+        partition_table = self._partition_table_name(parent_table, chrom)
+        swap_table = f"{partition_table}_swap"
+        conn.execute(text(f'DROP TABLE IF EXISTS "{swap_table}"'))
+        conn.execute(
+            text(
+                f'CREATE TABLE "{swap_table}" (LIKE "{partition_table}" '
+                "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        keys = conn.execute(
+            text(
+                """
+                SELECT string_agg(pg_get_constraintdef(oid), ';' ORDER BY contype)
+                FROM pg_constraint
+                WHERE conrelid = to_regclass(:parent_table)
+                  AND contype IN ('p', 'u')
+                """  # noqa E501
+            ),
+            {"parent_table": parent_table},
+        ).scalar()
+        for key in (keys or "").split(";"):
+            if key:
+                conn.execute(text(f'ALTER TABLE "{swap_table}" ADD {key}'))
+        # Lets ATTACH skip the validation scan
+        conn.execute(
+            text(
+                f'ALTER TABLE "{swap_table}" ADD CONSTRAINT '
+                f'"ck_{swap_table}" CHECK (chromosome = {int(chrom)})'
+            )
+        )
+        return swap_table
+
+    def _build_swap_indexes(
+        self, parent_table: str, chrom: int, swap_table: str
+    ) -> Dict[str, str]:
+        """
+        Build the secondary indexes of a loaded swap table through
+        IndexBuildManager. Returns {built index: name the index gets once
+        the swap table is the partition}, the name IndexBuildManager uses
+        for partition indexes, so later index runs find and attach it.
+        """
+        partition_table = self._partition_table_name(parent_table, chrom)
+        specs = [
+            (swap_table, columns)
+            for table, columns in self.get_variant_master_index_specs
+            if table == parent_table
+        ]
+        if not specs:
+            return {}
+
+        records = IndexBuildManager(
+            engine=self.db.engine,
+            logger=self.logger,
+        ).build(specs)
+        failed = [r.index_name for r in records if r.status == "failed"]
+        if failed:
+            raise RuntimeError(
+                f"Index build failed on {swap_table}: {', '.join(failed)}"
+            )
+
+        return {
+            index_name_for(swap_table, columns): partition_index_name(
+                index_name_for(parent_table, columns), partition_table
+            )
+            for _, columns in specs
+        }
+
+    def _swap_partition(
+        self,
+        conn,
+        parent_table: str,
+        chrom: int,
+        swap_table: str,
+        indexes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        partition_table = self._partition_table_name(parent_table, chrom)
+        conn.execute(
+            text(
+                f'ALTER TABLE "{parent_table}" '
+                f'DETACH PARTITION "{partition_table}"'
+            )
+        )
+        conn.execute(text(f'DROP TABLE "{partition_table}"'))
+        conn.execute(
+            text(f'ALTER TABLE "{swap_table}" RENAME TO "{partition_table}"')
+        )
+        for built, final in (indexes or {}).items():
+            conn.execute(text(f'ALTER INDEX "{built}" RENAME TO "{final}"'))
+        # Matching indexes are attached to the parent indexes, not rebuilt
+        conn.execute(
+            text(
+                f'ALTER TABLE "{parent_table}" ATTACH PARTITION '
+                f'"{partition_table}" FOR VALUES IN ({int(chrom)})'
+            )
+        )
+
+    def _load_chromosome(
+        self,
+        chrom: int,
+        variant_files: List[str],
+        consequence_map: Dict[str, str],
+        dim_caches: Dict[str, Dict[str, int]],
+    ) -> Dict[str, Any]:
+        """
+        Load every part file of one chromosome in its own connection and
+        transaction, writing straight into the chromosome partitions.
+
+        With `postgres_partition_swap` the rows go to detached copies of
+        the partitions, which replace the live ones at the end. This is a
+        full refresh of the chromosome that reissues variant_ids, so it is
+        refused when the partitions hold rows of other data sources or
+        other tables reference their variant_ids. The copies are loaded
+        and committed first, indexed by IndexBuildManager, and swapped in
+        by a last transaction; a failure before the swap leaves the live
+        partitions untouched (the next run drops the stale copies).
+        """
+        t0 = time.time()
+        swap = bool(getattr(self.config, "postgres_partition_swap", False))
+        # Workers upsert dimensions concurrently: keep caches private
+        dim_caches = {k: dict(v) for k, v in dim_caches.items()}
+        chrom_stats: Dict[str, Any] = {
+            "mode": "swap" if swap else "partition",
+            "files": 0,
+            "variants": 0,
+            "effects": 0,
+        }
+
+        with self.db.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as dim_conn, self.db.engine.begin() as conn:
+            self._create_postgres_stage_tables(conn)
+
+            if swap:
+                self._check_partition_swap_allowed(conn, chrom)
+
+            tables: Dict[str, str] = {}
+            for parent_table in PARTITIONED_VARIANT_TABLES:
+                if swap:
+                    tables[parent_table] = self._create_swap_partition(
+                        conn, parent_table, chrom
+                    )
+                else:
+                    tables[parent_table] = self._partition_table_name(
+                        parent_table, chrom
+                    )
+
+            for variant_file in variant_files:
+                variant_name = Path(variant_file).name
+                consequence_file = consequence_map.get(variant_name)
+
+                df_variants = self._read_parquet_available_columns(
+                    variant_file,
+                    LOAD_VARIANT_COLUMNS,
+                )
+                if df_variants.empty:
+                    self.logger.log(
+                        f"⚠️ Empty variant file (skipped): {variant_name}",
+                        "WARNING",
+                    )
+                    continue
+
+                df_consequences = pd.DataFrame()
+                if consequence_file:
+                    df_consequences = self._read_parquet_available_columns(
+                        consequence_file,
+                        LOAD_CONSEQUENCE_COLUMNS,
+                    )
+
+                (
+                    processed_variant_rows,
+                    resolved_variant_ids,
+                    loaded_effects,
+                ) = self._load_postgres_part_file_fast(
+                    conn,
+                    df_variants,
+                    df_consequences,
+                    dim_caches,
+                    tables=tables,
+                    dim_conn=dim_conn,
+                )
+
+                chrom_stats["files"] += 1
+                chrom_stats["variants"] += processed_variant_rows
+                chrom_stats["effects"] += loaded_effects
+
+                self.logger.log(
+                    f"✅ Processed {variant_name} (chr {chrom}, "
+                    f"variants={processed_variant_rows}, "
+                    f"resolved_variant_ids={resolved_variant_ids}, "
+                    f"effects={loaded_effects})",
+                    "INFO",
+                )
+
+        if swap:
+            indexes = {
+                parent_table: self._build_swap_indexes(
+                    parent_table, chrom, swap_table
+                )
+                for parent_table, swap_table in tables.items()
+            }
+            with self.db.engine.begin() as conn:
+                # The partitions may have changed while the copies loaded
+                self._check_partition_swap_allowed(conn, chrom)
+                for parent_table, swap_table in tables.items():
+                    self._swap_partition(
+                        conn,
+                        parent_table,
+                        chrom,
+                        swap_table,
+                        indexes=indexes[parent_table],
+                    )
+            self.logger.log(
+                f"🔁 Swapped in new partitions for chromosome {chrom}",
+                "INFO",
+            )
+
+        chrom_stats["status"] = "completed"
+        chrom_stats["seconds"] = round(time.time() - t0, 1)
+        return chrom_stats
+
     # -------------------------------------------------------------------------
     #                            LOAD METHOD
     # -------------------------------------------------------------------------
@@ -1866,6 +2488,7 @@ class DTP(DTPBase):
                 Path(f).name.replace("consequences_", "variants_"): f
                 for f in consequence_files
             }
+            chrom_files = self._group_part_files_by_chromosome(variant_files)
         except Exception as e:
             msg = f"⚠️ Failed to prepare processed data paths: {e}"
             self.logger.log(msg, "ERROR")
@@ -1878,63 +2501,6 @@ class DTP(DTPBase):
             self.logger.log(msg, "WARNING")
             return False, msg
 
-        variant_columns = [
-            "chrom",
-            "chromosome",
-            "pos",
-            "position_start",
-            "position_end",
-            "ref",
-            "reference_allele",
-            "alt",
-            "alternate_allele",
-            "rsid",
-            "variant_key",
-            "variant_type",
-            "allele_type",
-            "AC",
-            "ac",
-            "AN",
-            "an",
-            "AF",
-            "af",
-            "grpmax",
-            "grpmax_af",
-            "cadd_raw_score",
-            "cadd_phred",
-            "revel_max",
-            "spliceai_ds_max",
-            "pangolin_largest_ds",
-            "polyphen_max",
-            "sift_max",
-        ]
-        consequence_columns = [
-            "chrom",
-            "chromosome",
-            "variant_key",
-            "gene_id_raw",
-            "gene_symbol_raw",
-            "gene_id",
-            "gene_symbol",
-            "transcript_id",
-            "transcript_id_raw",
-            "feature_type",
-            "consequence",
-            "consequence_rank",
-            "impact",
-            "impact_rank",
-            "biotype",
-            "most_severe_consequence_per_annotation",
-            "most_severe_consequence_per_variant",
-            "is_most_severe_for_annotation",
-            "is_most_severe_for_variant",
-            "lof_flag",
-            "lof_confidence",
-            "lof_filter",
-            "lof_flags",
-            "lof_info",
-        ]
-
         try:
             with self.db.engine.begin() as conn:
                 if not self._supports_postgres_fast_load(conn):
@@ -1951,84 +2517,93 @@ class DTP(DTPBase):
                     "impact": self._load_dimension_cache(conn, "variant_impacts"),  # noqa E501
                     "biotype": self._load_dimension_cache(conn, "variant_biotypes"),  # noqa E501
                 }
+        except Exception as e:
+            msg = f"❌ Load failed: {e}"
+            self.logger.log(msg, "ERROR")
+            return False, msg
 
-                self._create_postgres_stage_tables(conn)
-
-                load_chrom = resolve_file_chromosome(
-                    Path(variant_files[0]), self.data_source.name
-                )
-                if load_chrom is None:
-                    chrom_probe = self._read_parquet_available_columns(
-                        variant_files[0], ["chrom", "chromosome"]
-                    )
-                    if chrom_probe.empty:
-                        raise ValueError("Could not resolve chromosome for load.")  # noqa E501
-                    probe_col = (
-                        "chromosome"
-                        if "chromosome" in chrom_probe.columns
-                        else "chrom"
-                    )
-                    load_chrom = int(chrom_probe.iloc[0][probe_col])
-
-                # NOTE: Disable to permit incremental loading of multiple
-                # chromosomes in the future
-                # self._truncate_postgres_variant_partitions(conn, load_chrom)
+        # NOTE: Partition truncate stays disabled to permit incremental
+        # loading; use postgres_partition_swap for a full chromosome refresh
+        # self._truncate_postgres_variant_partitions(conn, load_chrom)
 
+        # Chromosomes completed by an earlier attempt on the same data
+        previous = self._previous_chromosome_stats()
+        pending: List[int] = []
+        for chrom in sorted(chrom_files):
+            prev = previous.get(str(chrom)) or {}
+            if prev.get("status") == "completed":
                 self.logger.log(
-                    (
-                        "🧹 Truncated PostgreSQL partitions disabled"
-                        f"variant_masters_chr_{load_chrom} and "
-                        f"variant_molecular_effects_chr_{load_chrom}"
-                    ),
+                    f"⏭️ Chromosome {chrom} already loaded for this data; skipping.",  # noqa E501
                     "INFO",
                 )
+                self._record_chromosome_stats(
+                    chrom, {**prev, "status": "completed", "reused": True}
+                )
+                continue
+            pending.append(chrom)
 
-                for variant_file in variant_files:
-                    variant_name = Path(variant_file).name
-                    consequence_file = consequence_map.get(variant_name)
+        workers = max(1, min(int(self.config.load_workers or 1), len(pending)))
+        self.logger.log(
+            f"🚚 Loading {len(pending)} chromosome(s) "
+            f"with {workers} worker(s)",
+            "INFO",
+        )
 
-                    df_variants = self._read_parquet_available_columns(
-                        variant_file,
-                        variant_columns,
-                    )
-                    if df_variants.empty:
-                        self.logger.log(
-                            f"⚠️ Empty variant file (skipped): {variant_name}",
-                            "WARNING",
-                        )
-                        continue
-
-                    df_consequences = pd.DataFrame()
-                    if consequence_file:
-                        df_consequences = self._read_parquet_available_columns(
-                            consequence_file,
-                            consequence_columns,
-                        )
-
-                    (
-                        processed_variant_rows,
-                        resolved_variant_ids,
-                        loaded_effects,
-                    ) = self._load_postgres_part_file_fast(
-                        conn,
-                        df_variants,
-                        df_consequences,
-                        dim_caches,
-                    )
+        failed: List[int] = []
 
-                    total_variants += processed_variant_rows
-                    total_effects += loaded_effects
+        def _finish(chrom: int, fut_result=None, error=None):
+            nonlocal total_variants, total_effects
+            if error is not None:
+                failed.append(chrom)
+                self.logger.log(
+                    f"❌ Load failed for chromosome {chrom}: {error}", "ERROR"
+                )
+                self._record_chromosome_stats(
+                    chrom, {"status": "failed", "error": str(error)}
+                )
+                return
+            total_variants += fut_result["variants"]
+            total_effects += fut_result["effects"]
+            self._record_chromosome_stats(chrom, fut_result)
 
-                    self.logger.log(
-                        f"✅ Processed {variant_name} "
-                        f"(variants={processed_variant_rows}, "
-                        f"resolved_variant_ids={resolved_variant_ids}, "
-                        f"effects={loaded_effects})",
-                        "INFO",
+        if workers == 1:
+            for chrom in pending:
+                try:
+                    result = self._load_chromosome(
+                        chrom, chrom_files[chrom], consequence_map, dim_caches
                     )
-
-        except Exception as e:
-            msg = f"❌ Load failed: {e}"
+                except Exception as e:
+                    _finish(chrom, error=e)
+                else:
+                    _finish(chrom, result)
+        else:
+            # Threads: the work is COPY / INSERT ... SELECT on separate
+            # connections, which releases the GIL
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._load_chromosome,
+                        chrom,
+                        chrom_files[chrom],
+                        consequence_map,
+                        dim_caches,
+                    ): chrom
+                    for chrom in pending
+                }
+                for fut in as_completed(futures):
+                    chrom = futures[fut]
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        _finish(chrom, error=e)
+                    else:
+                        _finish(chrom, result)
+
+        if failed:
+            msg = (
+                f"❌ Load failed for chromosome(s) {sorted(failed)}; "
+                "completed chromosomes are skipped on retry."
+            )
             self.logger.log(msg, "ERROR")
             return False, msg
 
@@ -1,11 +1,18 @@
 import bz2
 import glob
 import json
+import multiprocessing
 import os
 import re
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import pandas as pd
 from sqlalchemy import insert as generic_insert
@@ -13,8 +20,10 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Connection
 
+from biofilter.modules.etl.index_builder import IndexBuildManager
 from biofilter.modules.etl.mixins.base_dtp import DTPBase
 from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
+from biofilter.utils.config import BiofilterConfig
 
 
 def _map_seq_id_to_chrom(seq_id: str) -> int | None:
@@ -63,6 +72,210 @@ def _extract_merge_log(record: dict) -> list[str]:
     ]
 
 
+DBSNP_BATCH_SIZE = 200_000
+# Errors kept per batch for logging (the count is always reported)
+DBSNP_MAX_LOGGED_ERRORS = 20
+# Identifies the input that produced the parts in the output dir
+DBSNP_TRANSFORM_STAMP = ".transform_source.json"
+
+
+def _default_transform_workers() -> int:
+    """
+    dbSNP transform processes: BIOFILTER_DBSNP_WORKERS, else `dbsnp_workers`
+    in the [etl] section of .biofilter.toml (`biofilter config set
+    etl.dbsnp_workers N`), else 1 (serial).
+    """
+    raw = os.getenv("BIOFILTER_DBSNP_WORKERS")
+    if raw is None:
+        try:
+            raw = BiofilterConfig().get("etl", "dbsnp_workers")
+        except Exception:
+            raw = None
+    if raw is not None:
+        try:
+            return max(1, int(str(raw).strip()))
+        except ValueError:
+            pass
+    return 1
+
+
+def _extract_snp_positions(rec):
+    primary = rec.get("primary_snapshot_data") or {}
+    placements = primary.get("placements_with_allele") or []
+
+    position_37 = None
+    position_38 = None
+    ref = None
+    alt = None
+    alt_new = None
+    chrom = None  # int 1..25
+
+    for p in placements:
+        pan = p.get("placement_annot") or {}
+        seq_traits = pan.get("seq_id_traits_by_assembly") or []
+        if not seq_traits:
+            continue
+
+        assembly_name = (
+            seq_traits[0].get("assembly_name") or ""
+        ).upper()  # noqa E501
+        seq_type = pan.get("seq_type", "")
+
+        # only refseq_chromosome
+        if seq_type != "refseq_chromosome":
+            continue
+
+        # Retrieve the seq_id to map it to the chromosome later
+        # ex: "NC_000008.11" -> 8
+        alleles = p.get("alleles") or []
+
+        # Extract ref/alt from this placement
+        local_ref = None
+        local_alt = []
+        local_pos = None
+
+        for al in alleles:
+            spdi = (al.get("allele") or {}).get("spdi") or {}
+            hgvs = al.get("hgvs", "") or ""
+            pos0 = spdi.get("position")
+            if pos0 is None:
+                continue
+            pos1 = pos0 + 1  # 0-based -> 1-based
+
+            # sufix HGVS to know if is ref ou alt
+            # ex: "NC_000008.11:g.19956018="   -> ref
+            #     "NC_000008.11:g.19956018A>G" -> alt
+            #     "NC_000008.11:g.19956018A>T" -> alt
+            if hgvs.endswith("="):
+                local_ref = spdi.get("deleted_sequence") or spdi.get(
+                    "inserted_sequence"
+                )  # noqa E501
+                local_pos = pos1
+            elif ">" in hgvs:
+                local_alt.append(spdi.get("inserted_sequence"))
+                local_pos = pos1
+
+        # if not get ref/alt, ignore this placement
+        if local_pos is None or local_ref is None or local_alt is None:
+            continue
+
+        # map chromossome from seq_id (or by GenomeAssembly table)
+        seq_id = p.get("seq_id") or spdi.get("seq_id")
+        chrom = _map_seq_id_to_chrom(seq_id)
+        if chrom is None:
+            continue
+
+        # keep by build
+        if "GRCH38" in assembly_name:
+            position_38 = local_pos
+            ref = local_ref
+            alt = local_alt
+        elif "GRCH37" in assembly_name:
+            position_37 = local_pos
+            # ref/al must be same, but set it if not yet
+            if ref is None:
+                ref = local_ref
+            if alt is None:
+                alt = local_alt
+
+        # stop if both build were figure out
+        if position_37 is not None and position_38 is not None:
+            break
+
+    if ref is not None or alt is not None:
+        alt_new = "/".join(sorted(set(alt)))
+
+    return chrom, position_37, position_38, ref, alt_new
+
+
+def _dbsnp_batch_worker(
+    batch: List[str],
+    batch_id: int,
+    output_dir: str,
+    debug_mode: bool = False,
+) -> dict:
+    """
+    Parse one batch of refsnp JSON lines and write
+    `processed_part_{batch_id}.parquet`. Runs in the serial path and in
+    pool workers, so it only returns stats; the caller does the logging.
+
+    The part is written to a temp name and renamed, so a part file only
+    exists once complete (the skip-if-done resume relies on that).
+    """
+    rows = []
+    errors = []
+    n_errors = 0
+
+    for line in batch:
+        try:
+            rec = json.loads(line)
+
+            # Normalize rs_id as numeric (BigInteger)
+            raw_refsnp = rec.get("refsnp_id", None)
+            if raw_refsnp is None:
+                continue
+            try:
+                rs_numeric = int(raw_refsnp)
+            except (TypeError, ValueError):
+                continue
+
+            # Keep only SNVs
+            primary = rec.get("primary_snapshot_data") or {}
+            variant_type = primary.get("variant_type", "")
+            if variant_type != "snv":
+                continue
+
+            chrom, pos37, pos38, ref, alt = _extract_snp_positions(rec)
+            if chrom is None or (pos37 is None and pos38 is None):
+                # jump if do not have coordenates
+                continue
+
+            rows.append(
+                {
+                    "rs_id": rs_numeric,
+                    "chromosome": chrom,
+                    "position_37": pos37,
+                    "position_38": pos38,
+                    "reference_allele": ref,
+                    "alternate_allele": alt,
+                    "merge_log": _extract_merge_log(rec),
+                }
+            )
+
+        except Exception as e:
+            n_errors += 1
+            if len(errors) < DBSNP_MAX_LOGGED_ERRORS:
+                errors.append(str(e))
+            continue
+
+    result = {
+        "pid": os.getpid(),
+        "batch_id": batch_id,
+        "rows": len(rows),
+        "errors": errors,
+        "n_errors": n_errors,
+        "path": None,
+    }
+    if not rows:
+        return result
+
+    df = pd.DataFrame(rows)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    out_path = output_dir / f"processed_part_{batch_id}.parquet"
+    tmp_path = output_dir / f".processed_part_{batch_id}.parquet.tmp"
+
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+    if debug_mode:
+        # Save in CSV format to debug
+        df.to_csv(output_dir / f"processed_part_{batch_id}.csv", index=False)
+
+    result["path"] = str(out_path)
+    return result
+
+
 class DTP(DTPBase, EntityQueryMixin):
     def __init__(
         self,
@@ -86,6 +299,17 @@ class DTP(DTPBase, EntityQueryMixin):
         self.compatible_schema_min = "0.0.0"
         self.compatible_schema_max = "3.2.0"
 
+        # Transform parallelism (1 = serial, the default). Set it with
+        # BIOFILTER_DBSNP_WORKERS or [etl].dbsnp_workers in the config.
+        self.transform_workers = _default_transform_workers()
+        self.transform_batch_size = DBSNP_BATCH_SIZE
+        self.transform_max_pending = None  # default: workers + 1
+
+        # Load: leave the SNP indexes to `etl index --group snp --parallel N`
+        # (True) or build them in parallel right after the load (False)
+        self.defer_indexes = True
+        self.index_workers = self.transform_workers
+
     # -------------------------------------------------------------------------
     #                            EXTRACT METHOD
     # -------------------------------------------------------------------------
@@ -116,12 +340,18 @@ class DTP(DTPBase, EntityQueryMixin):
             current_hash = self.get_md5_from_url_file(url_md5)
 
             # Download the file
-            status, msg = self.http_download(source_url, landing_path)
+            status, msg = self.http_download(
+                source_url, landing_path, expected_md5=current_hash
+            )
 
             if not status:
                 self.logger.log(msg, "ERROR")
                 return False, msg, current_hash
 
+            if current_hash is None:
+                # no usable .md5 published: hashed while streaming
+                current_hash = self.last_download.sha256
+
             # Finish block
             msg = f"✅ {self.data_source.name} file downloaded to {landing_path}"  # noqa: E501
             self.logger.log(msg, "INFO")
@@ -153,56 +383,41 @@ class DTP(DTPBase, EntityQueryMixin):
 
             output_dir = self.get_path(processed_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
-            for f in output_dir.iterdir():
-                if f.name.endswith(".parquet"):
-                    f.unlink()
+            self._prepare_output_dir(input_file, output_dir)
 
         except Exception as e:
             msg = f"❌ Error constructing paths: {str(e)}"
             self.logger.log(msg, "ERROR")
             return False, msg
 
-        # parameters
-        batch_size = 200_000
-
         def already_done(pid: int) -> bool:
             return os.path.exists(
                 os.path.join(output_dir, f"processed_part_{pid}.parquet")
             )  # noqa E501
 
-        try:
-            batch, batch_id = [], 0
+        workers = max(1, int(self.transform_workers or 1))
 
+        try:
             with bz2.open(input_file, "rt", encoding="utf-8") as f:
-
-                for line in f:
-                    batch.append(line)
-                    if len(batch) >= batch_size:
-                        if not already_done(batch_id):
-                            self._process_batch(
-                                batch, batch_id, str(output_dir)
-                            )  # noqa E501
-                        else:
+                if workers == 1:
+                    n_batches = 0
+                    for batch_id, batch in self._iter_batches(f):
+                        n_batches = batch_id + 1
+                        if already_done(batch_id):
                             self.logger.log(
                                 f"⏭️  Skipping existing part {batch_id}",
-                                "DEBUG",  # noqa E501
-                            )  # noqa E501
-                        batch_id += 1
-                        batch = []
-
-                # Tail
-                if batch:
-                    if not already_done(batch_id):
+                                "DEBUG",
+                            )
+                            continue
                         self._process_batch(batch, batch_id, str(output_dir))
-                    else:
-                        self.logger.log(
-                            f"⏭️  Skipping existing part {batch_id}", "DEBUG"
-                        )  # noqa E501
-                    batch_id += 1
-                    batch = []
-
-            # msg = f"✅ Processing completed with {len(futures)} batches."
-            msg = f"✅ Processing completed with {batch_id} batches (serial)."
+                    mode = "serial"
+                else:
+                    n_batches = self._transform_with_pool(
+                        f, str(output_dir), already_done, workers
+                    )
+                    mode = f"{workers} workers"
+
+            msg = f"✅ Processing completed with {n_batches} batches ({mode})."
             self.logger.log(msg, "INFO")
             return True, msg
 
@@ -211,183 +426,152 @@ class DTP(DTPBase, EntityQueryMixin):
             self.logger.log(msg, "ERROR")
             return False, msg
 
-    #  Support functions to TRANSFORM FASE  #
-    # --------------------------------------#
-
-    def _extract_snp_positions(self, rec):
-        primary = rec.get("primary_snapshot_data") or {}
-        placements = primary.get("placements_with_allele") or []
-
-        position_37 = None
-        position_38 = None
-        ref = None
-        alt = None
-        alt_new = None
-        chrom = None  # int 1..25
-
+    def _prepare_output_dir(self, input_file: Path, output_dir: Path) -> None:
+        """
+        Keep finished parts so an interrupted transform resumes where it
+        stopped. Parts are only wiped on a forced transform or when the
+        input file (or batch size) differs from the one that produced them.
+        Stale `.tmp` files of an interrupted batch are always removed.
+        """
+        st = input_file.stat()
+        source = {
+            "input": input_file.name,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "batch_size": self.transform_batch_size,
+        }
+        stamp = output_dir / DBSNP_TRANSFORM_STAMP
         try:
-            for p in placements:
-                pan = p.get("placement_annot") or {}
-                seq_traits = pan.get("seq_id_traits_by_assembly") or []
-                if not seq_traits:
-                    continue
-
-                assembly_name = (
-                    seq_traits[0].get("assembly_name") or ""
-                ).upper()  # noqa E501
-                seq_type = pan.get("seq_type", "")
-
-                # only refseq_chromosome
-                if seq_type != "refseq_chromosome":
-                    continue
+            previous = json.loads(stamp.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous = None
+
+        fresh = self.force_transform or previous != source
+        for f in output_dir.iterdir():
+            if f.name.endswith(".parquet.tmp") or (
+                fresh
+                and f.name.startswith("processed_part_")
+                and f.suffix in (".parquet", ".csv")
+            ):
+                f.unlink()
+
+        if fresh:
+            stamp.write_text(json.dumps(source), encoding="utf-8")
+        else:
+            self.logger.log(
+                f"♻️  Resuming transform in {output_dir} (finished parts are kept)",  # noqa E501
+                "INFO",
+            )
 
-                # Retrieve the seq_id to map it to the chromosome later
-                # ex: "NC_000008.11" -> 8
-                alleles = p.get("alleles") or []
-
-                # Extract ref/alt from this placement
-                local_ref = None
-                local_alt = []
-                local_pos = None
-
-                for al in alleles:
-                    spdi = (al.get("allele") or {}).get("spdi") or {}
-                    hgvs = al.get("hgvs", "") or ""
-                    pos0 = spdi.get("position")
-                    if pos0 is None:
-                        continue
-                    pos1 = pos0 + 1  # 0-based -> 1-based
-
-                    # sufix HGVS to know if is ref ou alt
-                    # ex: "NC_000008.11:g.19956018="   -> ref
-                    #     "NC_000008.11:g.19956018A>G" -> alt
-                    #     "NC_000008.11:g.19956018A>T" -> alt
-                    if hgvs.endswith("="):
-                        local_ref = spdi.get("deleted_sequence") or spdi.get(
-                            "inserted_sequence"
-                        )  # noqa E501
-                        local_pos = pos1
-                    elif ">" in hgvs:
-                        local_alt.append(spdi.get("inserted_sequence"))
-                        local_pos = pos1
-
-                # if not get ref/alt, ignore this placement
-                if local_pos is None or local_ref is None or local_alt is None:
-                    continue
+    def _iter_batches(self, f) -> Iterator[tuple[int, List[str]]]:
+        """
+        Yield (batch_id, lines) in file order; batch ids are the part ids.
+        """
+        batch_size = self.transform_batch_size
+        batch, batch_id = [], 0
+        for line in f:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch_id, batch
+                batch_id += 1
+                batch = []
+        # Tail
+        if batch:
+            yield batch_id, batch
+
+    def _transform_with_pool(
+        self, f, output_dir: str, already_done, workers: int
+    ) -> int:
+        """
+        Single reader (this process) decompresses and hands batches to
+        `workers` processes. At most `transform_max_pending` batches are in
+        flight, which bounds memory to roughly that many batches of text.
+        """
+        max_pending = self.transform_max_pending or workers + 1
+        ctx = multiprocessing.get_context("spawn")
+        pending = set()
+        n_batches = 0
 
-                # map chromossome from seq_id (or by GenomeAssembly table)
-                seq_id = p.get("seq_id") or spdi.get("seq_id")
-                chrom = _map_seq_id_to_chrom(seq_id)
-                if chrom is None:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        try:
+            for batch_id, batch in self._iter_batches(f):
+                n_batches = batch_id + 1
+                if already_done(batch_id):
+                    self.logger.log(
+                        f"⏭️  Skipping existing part {batch_id}", "DEBUG"
+                    )
                     continue
 
-                # keep by build
-                if "GRCH38" in assembly_name:
-                    position_38 = local_pos
-                    ref = local_ref
-                    alt = local_alt
-                elif "GRCH37" in assembly_name:
-                    position_37 = local_pos
-                    # ref/al must be same, but set it if not yet
-                    if ref is None:
-                        ref = local_ref
-                    if alt is None:
-                        alt = local_alt
-
-                # stop if both build were figure out
-                if position_37 is not None and position_38 is not None:
-                    break
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        self._log_batch_result(fut.result())
+
+                pending.add(
+                    pool.submit(
+                        _dbsnp_batch_worker,
+                        batch,
+                        batch_id,
+                        output_dir,
+                        self.debug_mode,
+                    )
+                )
+                self.logger.log(
+                    f"Queued batch {batch_id} with {len(batch)} lines...",
+                    "DEBUG",
+                )
 
-            if ref is not None or alt is not None:
-                alt_new = "/".join(sorted(set(alt)))
+            for fut in as_completed(pending):
+                self._log_batch_result(fut.result())
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+        return n_batches
 
-            return chrom, position_37, position_38, ref, alt_new
+    #  Support functions to TRANSFORM FASE  #
+    # --------------------------------------#
 
-        except Exception as e:
-            print(e)
+    def _extract_snp_positions(self, rec):
+        return _extract_snp_positions(rec)
 
     def _process_batch(self, batch, batch_id: int, output_dir: str) -> None:
         """
-        Process a batch of dbSNP JSON lines and write a Parquet part.
-
-        This replaces the external worker_dbsnp() function and keeps the logic
-        contained inside the DTP class.
+        Process a batch of dbSNP JSON lines and write a Parquet part
+        (serial mode; the pool mode runs `_dbsnp_batch_worker` directly).
         """
-        pid = os.getpid()
         self.logger.log(
-            f"[PID {pid}] Processing batch {batch_id} with {len(batch)} lines...",  # noqa E501
+            f"[PID {os.getpid()}] Processing batch {batch_id} with {len(batch)} lines...",  # noqa E501
             "DEBUG",
         )
+        result = _dbsnp_batch_worker(
+            batch, batch_id, output_dir, self.debug_mode
+        )
+        self._log_batch_result(result)
 
-        rows = []
-
-        for line in batch:
-            try:
-                rec = json.loads(line)
-
-                # Normalize rs_id as numeric (BigInteger)
-                raw_refsnp = rec.get("refsnp_id", None)
-                if raw_refsnp is None:
-                    continue
-                try:
-                    rs_numeric = int(raw_refsnp)
-                except (TypeError, ValueError):
-                    continue
-
-                # Keep only SNVs
-                primary = rec.get("primary_snapshot_data") or {}
-                variant_type = primary.get("variant_type", "")
-                if variant_type != "snv":
-                    continue
-
-                chrom, pos37, pos38, ref, alt = self._extract_snp_positions(
-                    rec
-                )  # noqa E501
-                if chrom is None or (pos37 is None and pos38 is None):
-                    # jump if do not have coordenates
-                    continue
-
-                rows.append(
-                    {
-                        "rs_id": rs_numeric,
-                        "chromosome": chrom,
-                        "position_37": pos37,
-                        "position_38": pos38,
-                        "reference_allele": ref,
-                        "alternate_allele": alt,
-                        "merge_log": _extract_merge_log(rec),
-                    }
-                )
-
-            except Exception as e:
-                self.logger.log(
-                    f"[PID {pid}] ⚠️ Error in batch {batch_id}: {e}",
-                    "WARNING",
-                )
-                continue
-
-        if not rows:
+    def _log_batch_result(self, result: dict) -> None:
+        pid = result["pid"]
+        batch_id = result["batch_id"]
+        for err in result["errors"]:
+            self.logger.log(
+                f"[PID {pid}] ⚠️ Error in batch {batch_id}: {err}",
+                "WARNING",
+            )
+        if result["n_errors"] > len(result["errors"]):
+            self.logger.log(
+                f"[PID {pid}] ⚠️ {result['n_errors']} errors in batch {batch_id} "  # noqa E501
+                f"({len(result['errors'])} shown)",
+                "WARNING",
+            )
+        if result["path"] is None:
             self.logger.log(
                 f"[PID {pid}] ⚠️ No rows produced for batch {batch_id}",
                 "WARNING",
             )
             return
-
-        df = pd.DataFrame(rows)
-
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        out_path = output_dir / f"processed_part_{batch_id}.parquet"
-        out_path_csv = output_dir / f"processed_part_{batch_id}.csv"
-
-        df.to_parquet(out_path, index=False)
-        if self.debug_mode:
-            # Save in CSV format to debug
-            df.to_csv(out_path_csv, index=False)
-
         self.logger.log(
             f"[PID {pid}] ✅ Finished batch {batch_id}, "
-            f"saved {len(df)} rows → {out_path}",
+            f"saved {result['rows']} rows → {result['path']}",
             "INFO",
         )
 
@@ -473,9 +657,21 @@ class DTP(DTPBase, EntityQueryMixin):
 
         # Set DB to Read Mode and Create Index
         try:
-            # self.create_indexes(self.get_snp_index_specs)
-            # self.db_read_mode()
-            self.logger.log("ℹ️  Index creation currently disabled.", "INFO")
+            if self.defer_indexes:
+                self.logger.log(
+                    "ℹ️  Index creation deferred: run `etl index --group snp --parallel N` after the bulk load.",  # noqa E501
+                    "INFO",
+                )
+            else:
+                records = IndexBuildManager(
+                    engine=self.db.engine,
+                    logger=self.logger,
+                    parallel=self.index_workers,
+                ).build(self.get_snp_index_specs)
+                total_warnings += sum(
+                    1 for r in records if r.status == "failed"
+                )
+                self.db_read_mode()
         except Exception as e:
             total_warnings += 1
             msg = f"Failed to finalize DB (create indexes / read mode): {e}"
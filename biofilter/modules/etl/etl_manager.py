@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import difflib
 import glob
 import importlib
 import os
@@ -8,7 +9,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Iterable, Optional, Sequence
 
-from sqlalchemy import MetaData, func, or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
 
@@ -20,21 +21,13 @@ from biofilter.modules.db.models import (
     ETLPackage,
     ETLSourceSystem,
 )
+from biofilter.modules.etl.alias_search_index import refresh_alias_search_index
+from biofilter.modules.etl.etl_purge import PurgeEngine
+from biofilter.modules.etl.etl_scheduler import ETLScheduler, ScheduledSource
+from biofilter.modules.etl.index_builder import IndexBuildManager
 from biofilter.modules.etl.mixins.base_dtp_turning import DBTuningMixin
 from biofilter.utils.logger import Logger
-
-ETL_TABLE_PREFIX = "etl_"
-PURGE_ORDER_OVERRIDE = [
-    "variant_masters",
-    "variant_molecular_effects",
-    "entity_relationships",
-    "entity_aliases",
-    "entities",
-]
-
-
-def _is_etl_table(table_name: str) -> bool:
-    return table_name.lower().startswith(ETL_TABLE_PREFIX)
+from biofilter.utils.registry_manifest import dtp_registry
 
 
 @dataclass(frozen=True)
@@ -73,10 +66,16 @@ class ETLManager:
         drop_first: bool = True,
         set_write_mode: bool = True,
         set_read_mode: bool = True,
+        parallel: int = 1,
+        concurrently: bool = False,
     ) -> tuple[bool, str]:
         """
         Rebuild (drop/create) indexes for selected groups using DBTuningMixin
         specs. Uses a short-lived session since this is admin-only.
+
+        Creation goes through IndexBuildManager: `parallel` connections,
+        optional CREATE INDEX CONCURRENTLY, and already built indexes are
+        skipped (run with drop_first=False to resume an interrupted build).
         """
         with self.db.get_session() as session:
             tuning = DBTuningMixin()._bind_db_tuning(session, self.logger)
@@ -115,6 +114,8 @@ class ETLManager:
                 "variants": "variant",
                 "protein": "protein",
                 "proteins": "protein",
+                "snp": "snp",
+                "snps": "snp",
             }
 
             selected = self._select_index_groups(index_group, index_catalog, aliases)  # noqa E501
@@ -151,19 +152,30 @@ class ETLManager:
 
             # Create
             self.logger.log("🏗️ Creating indexes...", "INFO")
+            all_specs = []
             for group_name, spec_fn in selected.items():
-                try:
-                    specs = spec_fn
-                    # specs = spec_fn()  # ✅ call it
-                    if not specs:
-                        continue
-                    msg = f"✅ Found {len(specs)} index specs for {group_name}."
-                    self.logger.log(msg, "INFO")
-                    tuning.create_indexes(specs)
-                except Exception as e:
-                    total_warnings += 1
-                    msg = f"⚠️ Failed to create indexes for {group_name}: {e}"
-                    self.logger.log(msg, "WARNING")
+                specs = spec_fn
+                if not specs:
+                    continue
+                msg = f"✅ Found {len(specs)} index specs for {group_name}."
+                self.logger.log(msg, "INFO")
+                all_specs.extend(specs)
+
+            # Release the session before the builders take their locks
+            session.commit()
+            try:
+                builder = IndexBuildManager(
+                    engine=session.get_bind(),
+                    logger=self.logger,
+                    parallel=parallel,
+                    concurrently=concurrently,
+                )
+                records = builder.build(all_specs)
+                total_warnings += sum(1 for r in records if r.status == "failed")  # noqa E501
+            except Exception as e:
+                total_warnings += 1
+                msg = f"⚠️ Failed to create indexes: {e}"
+                self.logger.log(msg, "WARNING")
 
             if set_read_mode:
                 tuning.db_read_mode()
@@ -256,6 +268,8 @@ class ETLManager:
         drop_files_on_success: bool = False,
         only_active: bool = True,
         stop_on_error: bool = False,
+        jobs: int = 1,
+        load_jobs: int = 1,
     ) -> dict[str, int]:
         """
         Resume-friendly ETL for many data sources:
@@ -263,6 +277,10 @@ class ETLManager:
         - skips data sources whose latest LOAD is already successful
         - runs extract/transform/load for pending ones
         - optionally drops raw/processed files after successful load
+
+        With `jobs > 1` pending data sources go through ETLScheduler:
+        extract/transform run in a pool of `jobs` processes following the
+        DTP dependency graph, with at most `load_jobs` loads at a time.
         """
         if isinstance(source_system, str):
             source_system = [source_system]
@@ -297,6 +315,7 @@ class ETLManager:
         }
         success_statuses = {"completed", "up-to-date", "not-applicable"}
 
+        pending: list[ScheduledSource] = []
         for ds_id in ds_ids:
             with self.db.get_session() as session:
                 ds = self._load_datasource(session, ds_id)
@@ -308,6 +327,16 @@ class ETLManager:
                     self.logger.log(msg, "INFO")
                     continue
 
+                if jobs > 1:
+                    pending.append(
+                        ScheduledSource(
+                            ds_id=ds.id,
+                            name=ds.name,
+                            dtp_script=ds.dtp_script,
+                        )
+                    )
+                    continue
+
                 summary["processed"] += 1
                 self._run_one_datasource(
                     session=session,
@@ -318,36 +347,40 @@ class ETLManager:
                     force_steps=[],
                 )
 
-                latest_after = self._latest_load_status(session, ds.id)
-                if latest_after in success_statuses:
-                    summary["succeeded"] += 1
-                    self.logger.log(
-                        f"✅ update-all succeeded for '{ds.name}' (load={latest_after}).",  # noqa E501
-                        "INFO",
-                    )
-
-                    if drop_files_on_success:
-                        if download_path:
-                            raw_base = os.path.join(
-                                str(download_path), ds.source_system.name, ds.name  # noqa E501
-                            )
-                            self._delete_matching_files(f"{raw_base}*")
-                        if processed_path:
-                            proc_base = os.path.join(
-                                str(processed_path), ds.source_system.name, ds.name  # noqa E501
-                            )
-                            self._delete_matching_files(f"{proc_base}*")
-                else:
-                    summary["failed"] += 1
-                    self.logger.log(
-                        (
-                            f"❌ update-all failed for '{ds.name}' "
-                            f"(latest load={latest_after or 'none'})."
-                        ),
-                        "ERROR",
+                ok = self._finish_update_all_source(
+                    session=session,
+                    ds=ds,
+                    summary=summary,
+                    drop_files_on_success=drop_files_on_success,
+                    download_path=download_path,
+                    processed_path=processed_path,
+                )
+                if not ok and stop_on_error:
+                    break
+
+        if pending:
+            scheduler = ETLScheduler.for_manager(
+                self,
+                download_path=download_path,
+                processed_path=processed_path,
+                jobs=jobs,
+                load_jobs=load_jobs,
+            )
+            results = scheduler.run(pending, stop_on_error=stop_on_error)
+            for src in pending:
+                if results.get(src.ds_id) == "cancelled":
+                    continue
+                summary["processed"] += 1
+                with self.db.get_session() as session:
+                    ds = self._load_datasource(session, src.ds_id)
+                    self._finish_update_all_source(
+                        session=session,
+                        ds=ds,
+                        summary=summary,
+                        drop_files_on_success=drop_files_on_success,
+                        download_path=download_path,
+                        processed_path=processed_path,
                     )
-                    if stop_on_error:
-                        break
 
         self.logger.log(
             (
@@ -360,6 +393,51 @@ class ETLManager:
         )
         return summary
 
+    def _finish_update_all_source(
+        self,
+        session: Session,
+        ds: ETLDataSource,
+        summary: dict[str, int],
+        drop_files_on_success: bool,
+        download_path: Optional[str],
+        processed_path: Optional[str],
+    ) -> bool:
+        """
+        Read the latest load status of an update-all target, update the
+        summary counters and optionally drop its files. Returns success.
+        """
+        success_statuses = {"completed", "up-to-date", "not-applicable"}
+        latest_after = self._latest_load_status(session, ds.id)
+        if latest_after not in success_statuses:
+            summary["failed"] += 1
+            self.logger.log(
+                (
+                    f"❌ update-all failed for '{ds.name}' "
+                    f"(latest load={latest_after or 'none'})."
+                ),
+                "ERROR",
+            )
+            return False
+
+        summary["succeeded"] += 1
+        self.logger.log(
+            f"✅ update-all succeeded for '{ds.name}' (load={latest_after}).",  # noqa E501
+            "INFO",
+        )
+
+        if drop_files_on_success:
+            if download_path:
+                raw_base = os.path.join(
+                    str(download_path), ds.source_system.name, ds.name  # noqa E501
+                )
+                self._delete_matching_files(f"{raw_base}*")
+            if processed_path:
+                proc_base = os.path.join(
+                    str(processed_path), ds.source_system.name, ds.name  # noqa E501
+                )
+                self._delete_matching_files(f"{proc_base}*")
+        return True
+
     def restart_etl_process(
         self,
         data_source: Optional[Sequence[str]] = None,
@@ -440,6 +518,7 @@ class ETLManager:
         delete_files: bool = False,
         download_path: Optional[str] = None,
         processed_path: Optional[str] = None,
+        dry_run: bool = False,
     ) -> bool:
         """
         Rollback ETL loads without rerunning ETL.
@@ -447,6 +526,9 @@ class ETLManager:
         Supported modes:
         - by package_ids (targeted rollback)
         - by data_source/source_system filters (full data-source rollback)
+
+        With `dry_run=True` only the purge plan (strategy and estimated rows
+        per table) is logged; nothing is deleted.
         """
         normalized_pkg_ids = self._normalize_package_ids(package_ids)
 
@@ -466,6 +548,11 @@ class ETLManager:
 
         all_ok = True
 
+        if dry_run:
+            return self._log_rollback_estimates(
+                normalized_pkg_ids, data_source, source_system
+            )
+
         if normalized_pkg_ids:
             if delete_files:
                 self.logger.log(
@@ -541,6 +628,37 @@ class ETLManager:
 
         return all_ok
 
+    def _log_rollback_estimates(
+        self,
+        package_ids: list[int],
+        data_source: Optional[Sequence[str]],
+        source_system: Optional[Sequence[str]],
+    ) -> bool:
+        if isinstance(source_system, str):
+            source_system = [source_system]
+        if isinstance(data_source, str):
+            data_source = [data_source]
+
+        engine = self._purge_engine()
+        with self.db.get_session() as session:
+            if package_ids:
+                targets = [("etl_package_id", pkg_id) for pkg_id in package_ids]  # noqa E501
+            else:
+                ds_ids = self._resolve_datasource_ids(
+                    session, source_system, data_source
+                )
+                targets = [("data_source_id", ds_id) for ds_id in ds_ids]
+
+            if not targets:
+                self.logger.log("⚠️ No matching rollback targets found.", "WARNING")  # noqa E501
+                return False
+
+            for key_name, key_value in targets:
+                plan = engine.plan(session, key_name, key_value)
+                self.logger.log(f"📐 [dry-run] {plan.summary()}", "INFO")
+            session.rollback()
+        return True
+
     def _resolve_datasource_ids(
         self,
         session: Session,
@@ -812,6 +930,8 @@ class ETLManager:
                 session,
                 ds_id=ds.id,
                 commit=False,
+                # One transaction: a failed rollback leaves nothing half-deleted  # noqa E501
+                batch_commit=False,
             )
             deleted_total = int(sum(deleted_rows_by_table.values()))
 
@@ -899,6 +1019,8 @@ class ETLManager:
                 session=session,
                 package_id=target_package.id,
                 commit=False,
+                # One transaction: a failed rollback leaves nothing half-deleted  # noqa E501
+                batch_commit=False,
             )
             deleted_total = int(sum(deleted_rows_by_table.values()))
 
@@ -1006,7 +1128,17 @@ class ETLManager:
             return self._dtp_module_cache[script_name]
 
         module_path = f"biofilter.modules.etl.dtps.{script_name}"
-        module = importlib.import_module(module_path)
+        try:
+            module = importlib.import_module(module_path)
+        except ModuleNotFoundError as e:
+            if e.name != module_path:
+                raise
+            available = [entry["module"] for entry in dtp_registry()]
+            matches = difflib.get_close_matches(script_name, available, n=3)
+            hint = f" Did you mean: {', '.join(matches)}?" if matches else ""
+            raise ValueError(
+                f"DataSource '{ds.name}' points to unknown DTP script '{script_name}'.{hint}"  # noqa E501
+            ) from e
         self._dtp_module_cache[script_name] = module
         return module
 
@@ -1235,6 +1367,7 @@ class ETLManager:
             session=session,
             db=self.db,
         )
+        dtp.force_transform = "transform" in force_steps
 
         ok, message = dtp.transform(download_path, processed_path)
 
@@ -1357,15 +1490,39 @@ class ETLManager:
             pkg.status = "completed"
             pkg.load_status = "completed"
             self.logger.log(f"✅ [Load] Completed for '{ds.name}'", "INFO")
+            self._refresh_alias_search_index(session, ds)
         else:
             pkg.status = "failed"
             pkg.load_status = "failed"
-            pkg.stats = {"error": message, "step": "load"}
+            # Keep stats written by the DTP (e.g. per-chromosome progress)
+            pkg.stats = {
+                **(pkg.stats or {}),
+                "error": message,
+                "step": "load",
+            }
             self.logger.log(message, "ERROR")
             self.logger.log(f"❌ [Load] Failed for '{ds.name}'", "ERROR")
 
         session.commit()
 
+    def _refresh_alias_search_index(self, session: Session, ds: ETLDataSource) -> None:  # noqa E501
+        """
+        Index the alias keys added by this load for fuzzy matching. Runs in
+        a savepoint: a failure is logged and leaves the load result intact.
+        """
+        try:
+            with session.begin_nested():
+                refresh_alias_search_index(
+                    session.connection(),
+                    data_source_ids=[ds.id],
+                    logger=self.logger,
+                )
+        except Exception as e:
+            self.logger.log(
+                f"⚠️ Alias search index refresh failed for '{ds.name}': {e}",
+                "WARNING",
+            )
+
     # ---------------------------------------------------------------------
     # UTILS
     # ---------------------------------------------------------------------
@@ -1381,14 +1538,8 @@ class ETLManager:
             except Exception as e:
                 self.logger.log(f"⚠️ Could not delete {file_path}: {e}", "WARNING")  # noqa E501
 
-    def _collect_purge_candidates(self, metadata: MetaData, key_name: str):
-        candidates = []
-        for tname, table in metadata.tables.items():
-            if _is_etl_table(tname):
-                continue
-            if key_name in table.columns:
-                candidates.append(table)
-        return candidates
+    def _purge_engine(self) -> PurgeEngine:
+        return PurgeEngine(logger=self.logger, debug_mode=self.debug_mode)
 
     def _simple_purge_by_data_source(
         self,
@@ -1396,47 +1547,17 @@ class ETLManager:
         ds_id: int,
         *,
         commit: bool = True,
+        batch_commit: bool = False,
     ) -> dict[str, int]:
-        engine = session.get_bind()
-        metadata = MetaData()
-        metadata.reflect(bind=engine)
-
-        candidates = self._collect_purge_candidates(metadata, "data_source_id")
-
-        if not candidates:
-            self.logger.log("ℹ️ No non-ETL tables with `data_source_id` found.", "INFO")  # noqa E501
-            return {}
-
-        ordered = self._order_for_delete(candidates, metadata)
-        deleted_rows_by_table: dict[str, int] = {}
-
-        for table in ordered:
-            # Cheap probe: stops at first match, with or without index.
-            # Avoids issuing a DELETE on tables that have no rows for
-            # this data source (saves planning, locks, WAL overhead).
-            has_rows = session.execute(
-                select(table.c.data_source_id)
-                .where(table.c.data_source_id == ds_id)
-                .limit(1)
-            ).first()
-            if not has_rows:
-                continue
-
-            if self.debug_mode:
-                self.logger.log(
-                    f"🗑️  Deleting rows from {table.name} "
-                    f"(data_source_id={ds_id})",
-                    "INFO",
-                )
+        """
+        Delete every non-ETL row with `data_source_id = ds_id`.
 
-            result = session.execute(
-                table.delete().where(table.c.data_source_id == ds_id)
-            )
-            affected = int(result.rowcount or 0)
-            if affected > 0:
-                deleted_rows_by_table[table.name] = (
-                    deleted_rows_by_table.get(table.name, 0) + affected
-                )
+        With `batch_commit=True` large tables are committed batch by batch,
+        so an interrupted purge leaves a consistent (smaller) remainder.
+        """
+        deleted_rows_by_table = self._purge_engine().purge(
+            session, "data_source_id", ds_id, batch_commit=batch_commit
+        )
 
         if commit:
             session.commit()
@@ -1449,64 +1570,13 @@ class ETLManager:
         package_id: int,
         *,
         commit: bool = True,
+        batch_commit: bool = False,
     ) -> dict[str, int]:
-        engine = session.get_bind()
-        metadata = MetaData()
-        metadata.reflect(bind=engine)
-
-        candidates = self._collect_purge_candidates(metadata, "etl_package_id")
-        if not candidates:
-            self.logger.log("ℹ️ No non-ETL tables with `etl_package_id` found.", "INFO")  # noqa E501
-            return {}
-
-        ordered = self._order_for_delete(candidates, metadata)
-        deleted_rows_by_table: dict[str, int] = {}
-
-        for table in ordered:
-            has_rows = session.execute(
-                select(table.c.etl_package_id)
-                .where(table.c.etl_package_id == package_id)
-                .limit(1)
-            ).first()
-            if not has_rows:
-                continue
-
-            if self.debug_mode:
-                self.logger.log(
-                    f"🗑️  Deleting rows from {table.name} "
-                    f"(etl_package_id={package_id})",
-                    "INFO",
-                )
-
-            result = session.execute(
-                table.delete().where(table.c.etl_package_id == package_id)
-            )
-            affected = int(result.rowcount or 0)
-            if affected > 0:
-                deleted_rows_by_table[table.name] = (
-                    deleted_rows_by_table.get(table.name, 0) + affected
-                )
+        deleted_rows_by_table = self._purge_engine().purge(
+            session, "etl_package_id", package_id, batch_commit=batch_commit
+        )
 
         if commit:
             session.commit()
         self.logger.log(f"✅ Simple purge complete for etl_package_id={package_id}.", "INFO")  # noqa E501
         return deleted_rows_by_table
-
-    def _order_for_delete(self, candidates, metadata):
-        cand_by_name = {t.name: t for t in candidates}
-        override = [cand_by_name[n] for n in PURGE_ORDER_OVERRIDE if n in cand_by_name]  # noqa E501
-
-        sorted_all = list(metadata.sorted_tables)
-        sorted_candidates_child_first = [
-            t
-            for t in reversed(sorted_all)
-            if t.name in cand_by_name and t.name not in PURGE_ORDER_OVERRIDE
-        ]
-        # reflected tables not present in metadata.sorted_tables
-        missing = [
-            t
-            for t in candidates
-            if t.name not in {x.name for x in override + sorted_candidates_child_first}  # noqa E501
-        ]
-
-        return override + sorted_candidates_child_first + missing
@@ -0,0 +1,461 @@
+"""
+Purge engine behind ETL rollback/restart.
+
+Rows owned by a data source (or a single ETL package) are removed per table
+with the cheapest strategy that is safe for that table:
+
+- truncate / drop: a chromosome partition whose rows all belong to the
+  target is emptied with TRUNCATE (or DETACH + DROP + re-create, which also
+  discards the partition's bloat and index pages);
+- batched: large tables are deleted in primary-key ranges of `batch_rows`,
+  optionally committing after each batch so WAL and locks stay bounded and
+  an interrupted purge can simply be re-run;
+- delete: small tables get a single DELETE, as before.
+
+Reflected metadata is cached per engine, and a plan with row estimates is
+built (and logged) before anything is deleted. When the purge deletes
+variant_effect_predictions rows, the derived variant_predictor_summary is
+rebuilt afterwards for the chromosomes involved.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import MetaData, func, select, text
+from sqlalchemy.orm import Session
+
+from biofilter.modules.etl.predictor_summary import (
+    SOURCE_TABLE as PREDICTION_TABLE,
+    has_predictor_summary,
+    refresh_predictor_summary,
+)
+
+ETL_TABLE_PREFIX = "etl_"
+PURGE_ORDER_OVERRIDE = [
+    "variant_masters",
+    "variant_molecular_effects",
+    "entity_relationships",
+    "entity_aliases",
+    "entities",
+]
+PURGE_BATCH_ROWS = 50_000
+PARTITION_MODES = ("truncate", "drop")
+
+_METADATA_CACHE: "weakref.WeakKeyDictionary[Any, MetaData]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _is_etl_table(table_name: str) -> bool:
+    return table_name.lower().startswith(ETL_TABLE_PREFIX)
+
+
+def reflect_metadata(engine, refresh: bool = False) -> MetaData:
+    """
+    Reflected schema for `engine`, cached for the lifetime of the engine.
+    """
+    metadata = None if refresh else _METADATA_CACHE.get(engine)
+    if metadata is None:
+        metadata = MetaData()
+        metadata.reflect(bind=engine)
+        _METADATA_CACHE[engine] = metadata
+    return metadata
+
+
+def clear_metadata_cache() -> None:
+    _METADATA_CACHE.clear()
+
+
+def partition_map(conn) -> Dict[str, List[tuple]]:
+    """
+    Postgres partitions in the current schema:
+    {parent: [(partition, bound_expression), ...]}.
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT parent.relname, child.relname,
+                   pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_namespace n ON n.oid = parent.relnamespace
+            WHERE parent.relkind = 'p'
+              AND n.nspname = current_schema()
+            ORDER BY parent.relname, child.relname
+            """
+        )
+    ).all()
+    out: Dict[str, List[tuple]] = {}
+    for parent, child, bound in rows:
+        out.setdefault(parent, []).append((child, bound))
+    return out
+
+
+@dataclass
+class PurgeStep:
+    table: str
+    strategy: str  # truncate | drop | batched | delete
+    estimated_rows: int
+    parent: Optional[str] = None
+    pk_column: Optional[str] = None
+    partition_bound: Optional[str] = None
+
+
+@dataclass
+class PurgePlan:
+    key_name: str
+    key_value: int
+    steps: List[PurgeStep] = field(default_factory=list)
+
+    @property
+    def estimated_rows(self) -> int:
+        return int(sum(s.estimated_rows for s in self.steps))
+
+    def summary(self) -> str:
+        if not self.steps:
+            return f"nothing to purge for {self.key_name}={self.key_value}"
+        parts = ", ".join(
+            f"{s.table}: {s.strategy} (~{s.estimated_rows:,})"
+            for s in self.steps
+        )
+        return (
+            f"~{self.estimated_rows:,} rows in {len(self.steps)} table(s) "
+            f"for {self.key_name}={self.key_value} -> {parts}"
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "estimated_rows_total": self.estimated_rows,
+            "steps": [
+                {
+                    "table": s.table,
+                    "strategy": s.strategy,
+                    "estimated_rows": s.estimated_rows,
+                }
+                for s in self.steps
+            ],
+        }
+
+
+class PurgeEngine:
+    def __init__(
+        self,
+        logger,
+        debug_mode: bool = False,
+        batch_rows: int = PURGE_BATCH_ROWS,
+        partition_mode: str = "truncate",
+    ):
+        if partition_mode not in PARTITION_MODES:
+            raise ValueError(f"partition_mode must be one of {PARTITION_MODES}")  # noqa E501
+        self.logger = logger
+        self.debug_mode = debug_mode
+        self.batch_rows = max(1, int(batch_rows))
+        self.partition_mode = partition_mode
+
+    # ------------------------------------------------------------------
+    # Candidates / ordering
+    # ------------------------------------------------------------------
+    @staticmethod
+    def collect_candidates(metadata: MetaData, key_name: str, skip=()):
+        candidates = []
+        for tname, table in metadata.tables.items():
+            if _is_etl_table(tname) or tname in skip:
+                continue
+            if key_name in table.columns:
+                candidates.append(table)
+        return candidates
+
+    @staticmethod
+    def order_for_delete(candidates, metadata: MetaData):
+        cand_by_name = {t.name: t for t in candidates}
+        override = [cand_by_name[n] for n in PURGE_ORDER_OVERRIDE if n in cand_by_name]  # noqa E501
+
+        sorted_all = list(metadata.sorted_tables)
+        sorted_candidates_child_first = [
+            t
+            for t in reversed(sorted_all)
+            if t.name in cand_by_name and t.name not in PURGE_ORDER_OVERRIDE
+        ]
+        # reflected tables not present in metadata.sorted_tables
+        missing = [
+            t
+            for t in candidates
+            if t.name not in {x.name for x in override + sorted_candidates_child_first}  # noqa E501
+        ]
+
+        return override + sorted_candidates_child_first + missing
+
+    @staticmethod
+    def _pk_column(table) -> Optional[str]:
+        """
+        Integer primary-key column used for range batches. Composite keys
+        such as (chromosome, variant_id) use their last integer column.
+        """
+        int_cols = [
+            c.name
+            for c in table.primary_key.columns
+            if isinstance(c.type, sa.Integer)
+        ]
+        if not int_cols:
+            return None
+        return "id" if "id" in int_cols else int_cols[-1]
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _core_table(name: str, *cols: Optional[str]):
+        return sa.table(name, *[sa.column(c) for c in cols if c])
+
+    def _estimate_rows(self, session, tbl, key_name, key_value, is_pg) -> int:
+        query = select(sa.literal(1)).select_from(tbl).where(
+            tbl.c[key_name] == key_value
+        )
+        if is_pg:
+            compiled = query.compile(
+                dialect=session.get_bind().dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()  # noqa E501
+            return int(plan[0]["Plan"]["Plan Rows"])
+        return int(
+            session.execute(
+                select(func.count()).select_from(tbl).where(
+                    tbl.c[key_name] == key_value
+                )
+            ).scalar()
+            or 0
+        )
+
+    @staticmethod
+    def _has_rows(session, tbl, key_name, key_value) -> bool:
+        return (
+            session.execute(
+                select(tbl.c[key_name]).where(tbl.c[key_name] == key_value).limit(1)  # noqa E501
+            ).first()
+            is not None
+        )
+
+    @staticmethod
+    def _has_foreign_rows(session, tbl, key_name, key_value) -> bool:
+        col = tbl.c[key_name]
+        return (
+            session.execute(
+                select(col).where(col.is_distinct_from(key_value)).limit(1)
+            ).first()
+            is not None
+        )
+
+    # ------------------------------------------------------------------
+    # Plan
+    # ------------------------------------------------------------------
+    def plan(self, session: Session, key_name: str, key_value: int) -> PurgePlan:  # noqa E501
+        engine = session.get_bind()
+        is_pg = engine.dialect.name == "postgresql"
+        metadata = reflect_metadata(engine)
+        partitions = partition_map(session) if is_pg else {}
+        children = {c for kids in partitions.values() for c, _ in kids}
+
+        candidates = self.collect_candidates(metadata, key_name, skip=children)  # noqa E501
+        plan = PurgePlan(key_name=key_name, key_value=int(key_value))
+
+        for table in self.order_for_delete(candidates, metadata):
+            pk_column = self._pk_column(table)
+            physical = partitions.get(table.name) or [(table.name, None)]
+            for name, bound in physical:
+                tbl = self._core_table(name, key_name, pk_column)
+                # Cheap probe: stops at first match, with or without index.
+                if not self._has_rows(session, tbl, key_name, key_value):
+                    continue
+
+                estimate = self._estimate_rows(session, tbl, key_name, key_value, is_pg)  # noqa E501
+                if bound is not None and not self._has_foreign_rows(
+                    session, tbl, key_name, key_value
+                ):
+                    strategy = self.partition_mode
+                elif pk_column and estimate > self.batch_rows:
+                    strategy = "batched"
+                else:
+                    strategy = "delete"
+
+                plan.steps.append(
+                    PurgeStep(
+                        table=name,
+                        strategy=strategy,
+                        estimated_rows=estimate,
+                        parent=table.name if bound is not None else None,
+                        pk_column=pk_column,
+                        partition_bound=bound,
+                    )
+                )
+        return plan
+
+    # ------------------------------------------------------------------
+    # Execute
+    # ------------------------------------------------------------------
+    def execute(
+        self,
+        session: Session,
+        plan: PurgePlan,
+        batch_commit: bool = False,
+    ) -> Dict[str, int]:
+        deleted_rows_by_table: Dict[str, int] = {}
+
+        for step in plan.steps:
+            if self.debug_mode:
+                self.logger.log(
+                    f"🗑️  {step.strategy} {step.table} "
+                    f"({plan.key_name}={plan.key_value}, ~{step.estimated_rows:,} rows)",  # noqa E501
+                    "INFO",
+                )
+
+            affected = None
+            if step.strategy in PARTITION_MODES:
+                affected = self._empty_partition(session, step)
+                if affected is None:
+                    step.strategy = "batched" if step.pk_column else "delete"
+
+            if step.strategy == "batched":
+                affected = self._delete_batched(session, plan, step, batch_commit)  # noqa E501
+            elif step.strategy == "delete":
+                tbl = self._core_table(step.table, plan.key_name)
+                result = session.execute(
+                    tbl.delete().where(tbl.c[plan.key_name] == plan.key_value)
+                )
+                affected = int(result.rowcount or 0)
+
+            if affected:
+                deleted_rows_by_table[step.table] = (
+                    deleted_rows_by_table.get(step.table, 0) + int(affected)
+                )
+
+        return deleted_rows_by_table
+
+    def purge(
+        self,
+        session: Session,
+        key_name: str,
+        key_value: int,
+        batch_commit: bool = False,
+    ) -> Dict[str, int]:
+        plan = self.plan(session, key_name, key_value)
+        self.logger.log(f"📐 Purge plan: {plan.summary()}", "INFO")
+        chromosomes = self._prediction_chromosomes(session, plan)
+        deleted = self.execute(session, plan, batch_commit=batch_commit)
+        if chromosomes:
+            # Summary rows aggregate every source of a variant: rebuild
+            # them from the predictions left instead of deleting them
+            refresh_predictor_summary(
+                session.connection(), chromosomes, logger=self.logger
+            )
+        return deleted
+
+    @staticmethod
+    def _prediction_chromosomes(session: Session, plan: PurgePlan) -> List[int]:  # noqa E501
+        """Chromosomes of the variant_effect_predictions rows in `plan`."""
+        steps = [
+            s for s in plan.steps if PREDICTION_TABLE in (s.table, s.parent)
+        ]
+        if not steps or not has_predictor_summary(session.connection()):
+            return []
+
+        chromosomes = set()
+        for step in steps:
+            if step.partition_bound:
+                chromosomes.update(
+                    int(v) for v in re.findall(r"\d+", step.partition_bound)
+                )
+                continue
+            tbl = sa.table(step.table, sa.column(plan.key_name), sa.column("chromosome"))  # noqa E501
+            chromosomes.update(
+                session.execute(
+                    select(tbl.c.chromosome)
+                    .where(tbl.c[plan.key_name] == plan.key_value)
+                    .distinct()
+                ).scalars()
+            )
+        return sorted(chromosomes)
+
+    def _empty_partition(self, session: Session, step: PurgeStep) -> Optional[int]:  # noqa E501
+        """
+        TRUNCATE (or DETACH + DROP + re-create) a partition fully owned by
+        the target. Returns None when the statement is refused (e.g. the
+        partition is referenced by a foreign key) so the caller can fall
+        back to deletes.
+        """
+        q = session.get_bind().dialect.identifier_preparer.quote
+        part, parent = q(step.table), q(step.parent)
+        if step.strategy == "drop":
+            statements = [
+                f"ALTER TABLE {parent} DETACH PARTITION {part}",
+                f"DROP TABLE {part}",
+                f"CREATE TABLE {part} PARTITION OF {parent} {step.partition_bound}",  # noqa E501
+            ]
+        else:
+            statements = [f"TRUNCATE TABLE {part}"]
+
+        try:
+            with session.begin_nested():
+                for stmt in statements:
+                    session.execute(text(stmt))
+        except Exception as e:
+            self.logger.log(
+                f"⚠️ Could not {step.strategy} partition {step.table} ({e}); falling back to deletes",  # noqa E501
+                "WARNING",
+            )
+            return None
+        return step.estimated_rows
+
+    def _delete_batched(
+        self,
+        session: Session,
+        plan: PurgePlan,
+        step: PurgeStep,
+        batch_commit: bool,
+    ) -> int:
+        key_name, key_value = plan.key_name, plan.key_value
+        tbl = self._core_table(step.table, key_name, step.pk_column)
+        key_col, pk_col = tbl.c[key_name], tbl.c[step.pk_column]
+
+        lo, hi = session.execute(
+            select(func.min(pk_col), func.max(pk_col)).where(key_col == key_value)  # noqa E501
+        ).one()
+        if lo is None:
+            return 0
+
+        t0 = time.time()
+        deleted = 0
+        next_report = 0.1
+        span = max(1, int(hi) - int(lo) + 1)
+        cursor = int(lo)
+        while cursor <= int(hi):
+            upper = cursor + self.batch_rows
+            result = session.execute(
+                tbl.delete().where(
+                    key_col == key_value,
+                    pk_col >= cursor,
+                    pk_col < upper,
+                )
+            )
+            deleted += int(result.rowcount or 0)
+            if batch_commit:
+                session.commit()
+            cursor = upper
+
+            done = min(1.0, (cursor - int(lo)) / span)
+            if done >= next_report:
+                rate = deleted / max(time.time() - t0, 1e-6)
+                self.logger.log(
+                    f"🗑️  {step.table}: {deleted:,} rows deleted "
+                    f"({done:.0%} of key range, {rate:,.0f} rows/s)",
+                    "INFO",
+                )
+                next_report = done + 0.1
+        return deleted
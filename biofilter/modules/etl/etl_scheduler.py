@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Optional, Sequence
+
+from biofilter.utils.logger import Logger
+
+# Masters resolved by alias lookup from relationship DTPs
+GENE_MASTER_DTPS = ("dtp_gene_hgnc", "dtp_gene_ncbi")
+MASTER_DTPS = GENE_MASTER_DTPS + (
+    "dtp_gene_ensembl",
+    "dtp_pfam",
+    "dtp_uniprot",
+    "dtp_go",
+    "dtp_kegg",
+    "dtp_reactome",
+    "dtp_mondo",
+    "dtp_chebi",
+)
+
+# dtp_script -> dtp_scripts that must run first. Only dependencies present
+# in the selected set are enforced.
+DTP_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "dtp_gene_ncbi": ("dtp_gene_hgnc",),
+    "dtp_gene_ensembl": GENE_MASTER_DTPS,
+    "dtp_uniprot": ("dtp_pfam",),
+    "dtp_biogrid": MASTER_DTPS,
+    "dtp_clingen": MASTER_DTPS,
+    "dtp_mondo_relationships": MASTER_DTPS,
+    "dtp_reactome_relationships": MASTER_DTPS,
+    "dtp_uniprot_relationships": MASTER_DTPS,
+    "dtp_variant_alphamissense": ("dtp_variant_gnomad",),
+    "dtp_variant_eqtl_gtex": ("dtp_variant_gnomad",) + GENE_MASTER_DTPS,
+    # Standalone: GWAS keeps reported/mapped genes and SNP ids as text, and
+    # dbSNP fills its own tables with no lookup into other data sources
+    "dtp_gwas": (),
+    "dtp_variant_ncbi": (),
+}
+
+PREPARE_STEPS = ("extract", "transform")
+LOAD_STEPS = ("load",)
+STEP_OK_STATUSES = {"completed", "up-to-date", "not-applicable"}
+
+
+@dataclass
+class ScheduledSource:
+    ds_id: int
+    name: str
+    dtp_script: str
+    depends_on: set[int] = field(default_factory=set)
+
+
+def build_dependency_graph(
+    sources: Sequence[ScheduledSource],
+    dependencies: Optional[dict[str, Sequence[str]]] = None,
+) -> dict[int, set[int]]:
+    """
+    Fill `depends_on` for each source from DTP_DEPENDENCIES and return the
+    graph as {ds_id: {upstream ds_id, ...}}.
+
+    Raises:
+        ValueError: If the selected sources form a dependency cycle.
+    """
+    if dependencies is None:
+        dependencies = DTP_DEPENDENCIES
+
+    by_script: dict[str, list[int]] = {}
+    for src in sources:
+        script = (src.dtp_script or "").lower().strip()
+        by_script.setdefault(script, []).append(src.ds_id)
+
+    graph: dict[int, set[int]] = {}
+    for src in sources:
+        script = (src.dtp_script or "").lower().strip()
+        deps = set()
+        for upstream in dependencies.get(script, ()):
+            deps.update(by_script.get(upstream, []))
+        deps.discard(src.ds_id)
+        src.depends_on = deps
+        graph[src.ds_id] = deps
+
+    # Kahn's algorithm, only to detect cycles early
+    remaining = {k: set(v) for k, v in graph.items()}
+    ready = [k for k, v in remaining.items() if not v]
+    while ready:
+        node = ready.pop()
+        for other, deps in remaining.items():
+            if node in deps:
+                deps.discard(node)
+                if not deps:
+                    ready.append(other)
+    cyclic = sorted(k for k, v in remaining.items() if v)
+    if cyclic:
+        raise ValueError(f"Dependency cycle between data sources: {cyclic}")
+
+    return graph
+
+
+def run_datasource_steps(
+    ds_id: int,
+    run_steps: Sequence[str],
+    db_uri: str,
+    debug_mode: bool = False,
+    download_path: Optional[str] = None,
+    processed_path: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Worker entry point: run `run_steps` for one data source with a fresh
+    engine and session. ETLPackage rows are written by the worker itself.
+
+    Returns the latest load status when a load step was run. For extract/
+    transform it returns the transform status, or "failed" when any step
+    did not record a successful package in this run (ETLManager logs and
+    swallows step errors, so the packages are the only trace).
+    """
+    # Imported here so the worker does not pull the manager at module import
+    from biofilter.modules.db.database import Database
+    from biofilter.modules.etl.etl_manager import ETLManager
+
+    db = Database(db_uri=db_uri)
+    try:
+        manager = ETLManager(debug_mode=debug_mode, db=db)
+        with db.get_session() as session:
+            ds = manager._load_datasource(session, ds_id)
+            since_id = _last_package_id(session, ds_id)
+            manager._run_one_datasource(
+                session=session,
+                ds=ds,
+                download_path=download_path,
+                processed_path=processed_path,
+                run_steps=list(run_steps),
+                force_steps=[],
+            )
+            if "load" in run_steps:
+                return manager._latest_load_status(session, ds_id)
+            return _prepare_status(session, ds_id, since_id, run_steps)
+    finally:
+        if db.engine is not None:
+            db.engine.dispose()
+
+
+def _last_package_id(session, ds_id: int) -> int:
+    from sqlalchemy import func
+
+    from biofilter.modules.db.models import ETLPackage
+
+    last = (
+        session.query(func.max(ETLPackage.id))
+        .filter(ETLPackage.data_source_id == int(ds_id))
+        .scalar()
+    )
+    return int(last or 0)
+
+
+def _prepare_status(session, ds_id: int, since_id: int, run_steps) -> str:
+    """Status of the last step in `run_steps`, "failed" if any step failed."""
+    from biofilter.modules.db.models import ETLPackage
+
+    session.expire_all()
+    rows = (
+        session.query(ETLPackage.operation_type, ETLPackage.status)
+        .filter(
+            ETLPackage.data_source_id == int(ds_id),
+            ETLPackage.id > int(since_id),
+        )
+        .order_by(ETLPackage.id.asc())
+        .all()
+    )
+    # Latest package per step; a step that raised may have left none, or
+    # one stuck in "running"
+    statuses = {str(op or "").lower(): status for op, status in rows}
+    steps = [s for s in PREPARE_STEPS if s in run_steps]
+    for step in steps:
+        if statuses.get(step) not in STEP_OK_STATUSES:
+            return "failed"
+    return statuses[steps[-1]] if steps else "not-applicable"
+
+
+class ETLScheduler:
+    """
+    Dependency-aware scheduler for many data sources.
+
+    - extract/transform of a source starts once its upstream sources have
+      finished their own extract/transform (relationship DTPs read their
+      parent's processed files);
+    - load of a source starts once its own transform is done and every
+      upstream load succeeded;
+    - all steps run in a process pool of `jobs` workers, with at most
+      `load_jobs` loads in flight (loads are DB-bound).
+
+    The step runner returns the step status (see `run_datasource_steps`).
+    A source whose extract/transform fails is reported as "failed" and is
+    not loaded; sources whose upstream failed are reported as "blocked".
+    """
+
+    SUCCESS_STATUSES = STEP_OK_STATUSES
+
+    def __init__(
+        self,
+        step_runner: Callable[[int, Sequence[str]], Optional[str]],
+        jobs: int = 1,
+        load_jobs: int = 1,
+        logger: Optional[Logger] = None,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+    ):
+        self.step_runner = step_runner
+        self.jobs = max(1, int(jobs))
+        self.load_jobs = max(1, min(int(load_jobs), self.jobs))
+        self.logger = logger or Logger()
+        self.executor_factory = executor_factory or self._process_pool
+
+    @staticmethod
+    def _process_pool(max_workers: int) -> Executor:
+        # spawn: never fork a process holding live DB connections
+        ctx = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
+
+    @classmethod
+    def for_manager(
+        cls,
+        manager,
+        download_path: Optional[str],
+        processed_path: Optional[str],
+        jobs: int = 1,
+        load_jobs: int = 1,
+    ) -> "ETLScheduler":
+        db_uri = manager.db.engine.url.render_as_string(hide_password=False)
+        if manager.db.engine.dialect.name == "sqlite" and load_jobs > 1:
+            manager.logger.log(
+                "ℹ️ SQLite allows a single writer; running loads one at a time.",  # noqa E501
+                "INFO",
+            )
+            load_jobs = 1
+
+        runner = partial(
+            run_datasource_steps,
+            db_uri=db_uri,
+            debug_mode=manager.debug_mode,
+            download_path=download_path,
+            processed_path=processed_path,
+        )
+        return cls(
+            step_runner=runner,
+            jobs=jobs,
+            load_jobs=load_jobs,
+            logger=manager.logger,
+        )
+
+    def run(
+        self,
+        sources: Sequence[ScheduledSource],
+        stop_on_error: bool = False,
+    ) -> dict[int, str]:
+        """
+        Run all sources and return {ds_id: final load status}. Status is
+        the latest load status, "failed", "blocked" or "cancelled".
+        """
+        build_dependency_graph(sources)
+        by_id = {s.ds_id: s for s in sources}
+        order = sorted(by_id)
+
+        prepared: set[int] = set()
+        results: dict[int, str] = {}
+        to_prepare = list(order)
+        to_load: list[int] = []
+        running: dict[Future, tuple[int, str]] = {}
+        stopping = False
+
+        with self.executor_factory(self.jobs) as executor:
+            while to_prepare or to_load or running:
+                if not stopping:
+                    self._block_dependents(by_id, to_prepare, to_load, results)
+                    self._submit_ready(
+                        executor,
+                        by_id,
+                        to_prepare,
+                        to_load,
+                        prepared,
+                        results,
+                        running,
+                    )
+
+                if not running:
+                    if stopping or not (to_prepare or to_load):
+                        break
+                    # Nothing runnable and nothing in flight: give up on the
+                    # rest instead of spinning
+                    for ds_id in to_prepare + to_load:
+                        results[ds_id] = "blocked"
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    ds_id, phase = running.pop(fut)
+                    name = by_id[ds_id].name
+                    try:
+                        status = fut.result()
+                    except Exception as e:
+                        self.logger.log(
+                            f"❌ Scheduled {phase} failed for '{name}': {e}",
+                            "ERROR",
+                        )
+                        results[ds_id] = "failed"
+                    else:
+                        if phase == "prepare" and status not in self.SUCCESS_STATUSES:  # noqa E501
+                            self.logger.log(
+                                f"❌ Scheduled {phase} failed for '{name}' (status={status})",  # noqa E501
+                                "ERROR",
+                            )
+                            results[ds_id] = "failed"
+                        elif phase == "prepare":
+                            prepared.add(ds_id)
+                            to_load.append(ds_id)
+                        else:
+                            results[ds_id] = status or "failed"
+
+                    if (
+                        stop_on_error
+                        and results.get(ds_id) is not None
+                        and results[ds_id] not in self.SUCCESS_STATUSES
+                    ):
+                        stopping = True
+
+                if stopping and (to_prepare or to_load):
+                    self.logger.log(
+                        "⛔️ Stopping scheduler after failure; waiting for running steps.",  # noqa E501
+                        "WARNING",
+                    )
+                    for ds_id in to_prepare + to_load:
+                        results[ds_id] = "cancelled"
+                    to_prepare.clear()
+                    to_load.clear()
+
+        return results
+
+    def _block_dependents(self, by_id, to_prepare, to_load, results):
+        changed = True
+        while changed:
+            changed = False
+            for queue in (to_prepare, to_load):
+                for ds_id in list(queue):
+                    deps = by_id[ds_id].depends_on
+                    bad = [
+                        d
+                        for d in deps
+                        if results.get(d) is not None
+                        and results[d] not in self.SUCCESS_STATUSES
+                    ]
+                    if bad:
+                        queue.remove(ds_id)
+                        results[ds_id] = "blocked"
+                        changed = True
+                        names = [by_id[d].name for d in bad]
+                        self.logger.log(
+                            f"⏭️ Blocking '{by_id[ds_id].name}': upstream failed {names}",  # noqa E501
+                            "WARNING",
+                        )
+
+    def _submit_ready(
+        self,
+        executor,
+        by_id,
+        to_prepare,
+        to_load,
+        prepared,
+        results,
+        running,
+    ):
+        # Loads first so DB slots do not starve behind downloads
+        loads = sum(1 for _, phase in running.values() if phase == "load")
+        for ds_id in list(to_load):
+            if loads >= self.load_jobs or len(running) >= self.jobs:
+                break
+            deps = by_id[ds_id].depends_on
+            if all(results.get(d) in self.SUCCESS_STATUSES for d in deps):
+                to_load.remove(ds_id)
+                fut = executor.submit(self.step_runner, ds_id, LOAD_STEPS)
+                running[fut] = (ds_id, "load")
+                loads += 1
+                self.logger.log(
+                    f"🚚 Scheduled load for '{by_id[ds_id].name}'", "INFO"
+                )
+
+        for ds_id in list(to_prepare):
+            if len(running) >= self.jobs:
+                break
+            deps = by_id[ds_id].depends_on
+            if not deps <= prepared:
+                continue
+            to_prepare.remove(ds_id)
+            fut = executor.submit(self.step_runner, ds_id, PREPARE_STEPS)
+            running[fut] = (ds_id, "prepare")
+            self.logger.log(
+                f"⚙️  Scheduled extract/transform for '{by_id[ds_id].name}'",
+                "INFO",
+            )
@@ -0,0 +1,401 @@
+"""
+Parallel index builds for the DBTuningMixin index groups.
+
+`DBTuningMixin.create_indexes` runs one `CREATE INDEX` after another in a
+single session. After a bulk load that leaves most cores idle, so
+`IndexBuildManager` spreads the builds over `parallel` connections:
+
+- each connection sets `maintenance_work_mem` and
+  `max_parallel_maintenance_workers` before building;
+- builds are plain `CREATE INDEX` (maintenance mode, fastest) or
+  `CREATE INDEX CONCURRENTLY` when the database is in use;
+- on partitioned tables the parent index is created `ON ONLY` the parent
+  and every chromosome partition is built as its own job and then
+  attached, so one large table also uses all workers;
+- jobs run largest table first, and duration and index size are recorded
+  per index.
+
+Builds are resumable: valid indexes that already exist are skipped, and
+invalid leftovers of an interrupted `CONCURRENTLY` build are dropped and
+rebuilt. Each finished build is written to a small JSON state file (one
+per database, in the biofilter cache dir), so a resumed run still reports
+the duration and size of the indexes an earlier run built.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import text
+
+from biofilter.modules.etl.etl_purge import partition_map
+from biofilter.utils.registry_manifest import cache_dir
+
+IndexSpec = Tuple[str, List[str]]
+
+DEFAULT_MAINTENANCE_WORK_MEM = os.environ.get(
+    "BIOFILTER_INDEX_MAINTENANCE_MEM", "1GB"
+)
+PG_MAX_IDENTIFIER = 63
+
+
+def index_name_for(table: str, columns: Iterable[str]) -> str:
+    """Same naming rule as DBTuningMixin.create_indexes/drop_indexes."""
+    return f"idx_{table}_{'_'.join(columns)}"
+
+
+def index_state_path(engine) -> Path:
+    """Default build state file of the database behind `engine`."""
+    url = engine.url.render_as_string(hide_password=True)
+    digest = hashlib.md5(url.encode()).hexdigest()[:12]
+    return cache_dir() / f"index-build-{digest}.json"
+
+
+def partition_index_name(index_name: str, partition: str) -> str:
+    name = f"{index_name}__{partition}"
+    if len(name) <= PG_MAX_IDENTIFIER:
+        return name
+    digest = hashlib.md5(name.encode()).hexdigest()[:8]
+    return f"{name[:PG_MAX_IDENTIFIER - 9]}_{digest}"
+
+
+@dataclass
+class IndexBuildRecord:
+    index_name: str
+    table: str
+    columns: List[str]
+    status: str  # created | skipped | failed
+    seconds: float = 0.0
+    size_bytes: Optional[int] = None
+    parent_index: Optional[str] = None
+    error: Optional[str] = None
+    built_at: Optional[str] = None
+
+
+@dataclass
+class _BuildJob:
+    index_name: str
+    table: str
+    columns: List[str]
+    parent_index: Optional[str] = None
+    exists: bool = False  # valid index already there, only attach
+    table_bytes: int = 0
+
+
+class IndexBuildManager:
+    def __init__(
+        self,
+        engine,
+        logger,
+        parallel: int = 1,
+        concurrently: bool = False,
+        maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+        parallel_maintenance_workers: Optional[int] = None,
+        state_path: Optional[Union[str, Path]] = None,
+    ):
+        self.engine = engine
+        self.logger = logger
+        self.state_path = Path(state_path or index_state_path(engine))
+        self._state_lock = threading.Lock()
+        self._state: Dict[str, dict] = {}
+        self.is_pg = engine.dialect.name == "postgresql"
+        # SQLite has a single writer: parallel builds would only queue
+        self.parallel = max(1, int(parallel or 1)) if self.is_pg else 1
+        self.concurrently = bool(concurrently) and self.is_pg
+        self.maintenance_work_mem = maintenance_work_mem
+        if parallel_maintenance_workers is None:
+            parallel_maintenance_workers = max(
+                0, (os.cpu_count() or 2) // self.parallel - 1
+            )
+        self.parallel_maintenance_workers = int(parallel_maintenance_workers)
+
+    # ------------------------------------------------------------------
+    # Catalog helpers
+    # ------------------------------------------------------------------
+    def _existing_indexes(self, conn) -> Dict[str, bool]:
+        """{index_name: is_valid}"""
+        if self.is_pg:
+            rows = conn.execute(
+                text(
+                    """
+                    SELECT c.relname, i.indisvalid
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = current_schema()
+                    """
+                )
+            ).all()
+            return {name: bool(valid) for name, valid in rows}
+        rows = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).all()
+        return {r[0]: True for r in rows}
+
+    def _table_bytes(self, conn, table: str) -> int:
+        if not self.is_pg:
+            return 0
+        return int(
+            conn.execute(
+                text("SELECT pg_relation_size(to_regclass(:t))"), {"t": table}
+            ).scalar()
+            or 0
+        )
+
+    def _index_bytes(self, conn, index_name: str) -> Optional[int]:
+        if not self.is_pg:
+            return None
+        return conn.execute(
+            text("SELECT pg_relation_size(to_regclass(:i))"), {"i": index_name}
+        ).scalar()
+
+    def _apply_session_settings(self, conn) -> None:
+        if not self.is_pg:
+            return
+        conn.execute(text(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'"))  # noqa E501
+        conn.execute(
+            text(
+                "SET max_parallel_maintenance_workers = "
+                f"{self.parallel_maintenance_workers}"
+            )
+        )
+
+    def _autocommit(self):
+        return self.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+
+    # ------------------------------------------------------------------
+    # Build state
+    # ------------------------------------------------------------------
+    def read_state(self) -> Dict[str, dict]:
+        """{index_name: record} of earlier builds on this database."""
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return dict(data.get("indexes") or {})
+
+    def _save_record(self, rec: IndexBuildRecord) -> None:
+        """Persist one finished build right away (best effort)."""
+        with self._state_lock:
+            self._state[rec.index_name] = asdict(rec)
+            payload = {
+                "database": self.engine.url.render_as_string(hide_password=True),  # noqa E501
+                "indexes": self._state,
+            }
+            tmp = self.state_path.with_suffix(".tmp")
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+                os.replace(tmp, self.state_path)
+            except OSError as e:
+                self.logger.log(
+                    f"⚠️ Could not write index build state {self.state_path}: {e}",  # noqa E501
+                    "DEBUG",
+                )
+
+    def _with_previous_stats(self, rec: IndexBuildRecord) -> IndexBuildRecord:
+        """A skipped index keeps the duration/size of the run that built it."""
+        prev = self._state.get(rec.index_name)
+        if prev and prev.get("status") == "created":
+            rec.seconds = prev.get("seconds") or 0.0
+            rec.size_bytes = prev.get("size_bytes", rec.size_bytes)
+            rec.built_at = prev.get("built_at")
+        return rec
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+    def plan(self, specs: Iterable[IndexSpec]) -> Tuple[List[_BuildJob], List[IndexBuildRecord]]:  # noqa E501
+        """
+        Expand specs into build jobs. Creates the `ON ONLY` parent indexes
+        of partitioned tables and drops invalid leftovers on the way.
+        """
+        seen = set()
+        unique_specs = []
+        for table, columns in specs:
+            key = (table, tuple(columns))
+            if key not in seen:
+                seen.add(key)
+                unique_specs.append((table, list(columns)))
+
+        jobs: List[_BuildJob] = []
+        skipped: List[IndexBuildRecord] = []
+        q = self.engine.dialect.identifier_preparer.quote
+
+        with self._autocommit() as conn:
+            existing = self._existing_indexes(conn)
+            partitions = partition_map(conn) if self.is_pg else {}
+            drop = "DROP INDEX CONCURRENTLY IF EXISTS" if self.concurrently else "DROP INDEX IF EXISTS"  # noqa E501
+
+            for table, columns in unique_specs:
+                name = index_name_for(table, columns)
+                if existing.get(name):
+                    skipped.append(
+                        IndexBuildRecord(name, table, columns, "skipped")
+                    )
+                    continue
+
+                children = partitions.get(table)
+                if not children:
+                    if name in existing:
+                        conn.execute(text(f"{drop} {q(name)}"))
+                        self.logger.log(f"♻️  Dropped invalid index {name}", "INFO")  # noqa E501
+                    jobs.append(
+                        _BuildJob(
+                            name,
+                            table,
+                            columns,
+                            table_bytes=self._table_bytes(conn, table),
+                        )
+                    )
+                    continue
+
+                col_str = ", ".join(q(c) for c in columns)
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {q(name)} "
+                        f"ON ONLY {q(table)} ({col_str})"
+                    )
+                )
+                for part, _ in children:
+                    child = partition_index_name(name, part)
+                    valid = existing.get(child)
+                    if child in existing and not valid:
+                        conn.execute(text(f"{drop} {q(child)}"))
+                    jobs.append(
+                        _BuildJob(
+                            child,
+                            part,
+                            columns,
+                            parent_index=name,
+                            exists=bool(valid),
+                            table_bytes=self._table_bytes(conn, part),
+                        )
+                    )
+
+        # Longest builds first keeps the workers evenly busy
+        jobs.sort(key=lambda j: j.table_bytes, reverse=True)
+        return jobs, skipped
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+    def _run_job(self, job: _BuildJob) -> IndexBuildRecord:
+        q = self.engine.dialect.identifier_preparer.quote
+        t0 = time.time()
+        try:
+            with self._autocommit() as conn:
+                self._apply_session_settings(conn)
+                if not job.exists:
+                    concurrently = "CONCURRENTLY " if self.concurrently else ""
+                    col_str = ", ".join(q(c) for c in job.columns)
+                    conn.execute(
+                        text(
+                            f"CREATE INDEX {concurrently}IF NOT EXISTS "
+                            f"{q(job.index_name)} ON {q(job.table)} ({col_str})"  # noqa E501
+                        )
+                    )
+                if job.parent_index:
+                    conn.execute(
+                        text(
+                            f"ALTER INDEX {q(job.parent_index)} "
+                            f"ATTACH PARTITION {q(job.index_name)}"
+                        )
+                    )
+                size = self._index_bytes(conn, job.index_name)
+        except Exception as e:
+            return IndexBuildRecord(
+                job.index_name,
+                job.table,
+                job.columns,
+                "failed",
+                seconds=time.time() - t0,
+                parent_index=job.parent_index,
+                error=str(e),
+            )
+        if job.exists:
+            return self._with_previous_stats(
+                IndexBuildRecord(
+                    job.index_name,
+                    job.table,
+                    job.columns,
+                    "skipped",
+                    size_bytes=size,
+                    parent_index=job.parent_index,
+                )
+            )
+        return IndexBuildRecord(
+            job.index_name,
+            job.table,
+            job.columns,
+            "created",
+            seconds=time.time() - t0,
+            size_bytes=size,
+            parent_index=job.parent_index,
+            built_at=datetime.now().isoformat(timespec="seconds"),
+        )
+
+    def build(self, specs: Iterable[IndexSpec]) -> List[IndexBuildRecord]:
+        t0 = time.time()
+        self._state = self.read_state()
+        jobs, records = self.plan(specs)
+        records = [self._with_previous_stats(r) for r in records]
+        mode = "CONCURRENTLY" if self.concurrently else "maintenance"
+        self.logger.log(
+            f"🏗️ Building {len(jobs)} index(es) with {self.parallel} connection(s) "  # noqa E501
+            f"({mode}, maintenance_work_mem={self.maintenance_work_mem}, "
+            f"max_parallel_maintenance_workers={self.parallel_maintenance_workers}); "  # noqa E501
+            f"{len(records)} already present",
+            "INFO",
+        )
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            futures = [pool.submit(self._run_job, job) for job in jobs]
+            for fut in as_completed(futures):
+                rec = fut.result()
+                records.append(rec)
+                if rec.status != "skipped":
+                    self._save_record(rec)
+                if rec.status == "failed":
+                    self.logger.log(
+                        f"⚠️ Failed to build {rec.index_name} on {rec.table}: {rec.error}",  # noqa E501
+                        "WARNING",
+                    )
+                    continue
+                size = (
+                    f", {rec.size_bytes / (1 << 20):,.1f} MiB"
+                    if rec.size_bytes is not None
+                    else ""
+                )
+                self.logger.log(
+                    f"📌 {rec.status} {rec.index_name} on {rec.table} in {rec.seconds:.1f}s{size}",  # noqa E501
+                    "INFO" if rec.status == "created" else "DEBUG",
+                )
+
+        created = sum(1 for r in records if r.status == "created")
+        failed = sum(1 for r in records if r.status == "failed")
+        earlier = [r for r in records if r.status == "skipped" and r.built_at]
+        resumed = ""
+        if earlier:
+            size = sum(r.size_bytes or 0 for r in earlier) / (1 << 20)
+            resumed = (
+                f"; {len(earlier)} built by an earlier run "
+                f"({sum(r.seconds for r in earlier):.1f}s, {size:,.1f} MiB)"
+            )
+        self.logger.log(
+            f"✅ Index build: created={created} skipped={len(records) - created - failed} "  # noqa E501
+            f"failed={failed} in {time.time() - t0:.1f}s{resumed}",
+            "WARNING" if failed else "INFO",
+        )
+        return records
@@ -1,19 +1,36 @@
 import os
+import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
 import requests
 from packaging import version
+from sqlalchemy import text
 
 # from biofilter.utils.file_hash import compute_file_hash
 from biofilter.modules.db.models import BiofilterMetadata, EntityGroup
 from biofilter.modules.etl.mixins.base_dtp_turning import DBTuningMixin
+from biofilter.utils.http_download import DownloadError, HTTPDownloader
+from biofilter.utils.pg_copy import (
+    COPY_BATCH_ROWS,
+    CopySource,
+    copy_batches_to_postgres,
+    iter_record_batches,
+)
+
+
+MD5_HEX = re.compile(r"^[0-9a-fA-F]{32}$")
 
 
 class DTPBase(DBTuningMixin):
     TRUNCATE_MODE_255: bool = True
     MAXLEN_ALIAS: int = 255  # alias_value / alias_norm / free-text aliases
     MAXLEN_DESCRIPTION: int = 255  # generic descriptions (Pfam, GO, UniProt, etc.)
+    DOWNLOAD_SEGMENTS: int = 4  # parallel ranged requests per http_download
+    DOWNLOAD_RETRIES: int = 5
+    last_download = None  # DownloadResult of the latest http_download
+    force_transform: bool = False  # set by ETLManager on a forced transform
 
     def __init__(self, *args, **kwargs):
         self.trunc_metrics: Dict[str, int] = {}  # field_name -> count
@@ -76,38 +93,144 @@ class DTPBase(DBTuningMixin):
 
     # ---FIX END
 
-    def http_download(self, url: str, landing_dir: str) -> Path:
-        filename = os.path.basename(url)
+    # ----------------------------- Bulk COPY ---------------------------------
+
+    def copy_to_table(
+        self,
+        conn,
+        table_name: str,
+        source: CopySource,
+        columns: Optional[List[str]] = None,
+        create: bool = False,
+        batch_rows: int = COPY_BATCH_ROWS,
+    ) -> int:
+        """
+        Stream `source` (DataFrame, Arrow table/batches or parquet path) into
+        `table_name` on `conn` and return the number of rows written.
+
+        On PostgreSQL the data goes through `COPY ... FROM STDIN` one Arrow
+        batch at a time; other dialects fall back to batched `to_sql`.
+        With `create=True` the table is (re)created from the source schema
+        first, as `to_sql(if_exists="replace")` would.
+        """
+        batches = iter_record_batches(source, columns, batch_rows)
+        first = next(batches, None)
+        if first is None:
+            return 0
+        if columns is None:
+            columns = list(first.schema.names)
+
+        if create:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+            empty = first.schema.empty_table().to_pandas()
+            if isinstance(source, pd.DataFrame):
+                empty = source[columns].head(0)
+            empty.to_sql(table_name, con=conn, if_exists="replace", index=False)
+
+        def _all_batches():
+            yield first
+            yield from batches
+
+        if conn.dialect.name == "postgresql":
+            return copy_batches_to_postgres(
+                conn, table_name, columns, _all_batches()
+            )
+
+        rows = 0
+        for batch in _all_batches():
+            batch.to_pandas().to_sql(
+                table_name,
+                con=conn,
+                if_exists="append",
+                index=False,
+                method="multi",
+                chunksize=10_000,
+            )
+            rows += batch.num_rows
+        return rows
+
+    def http_download(
+        self,
+        url: str,
+        landing_dir: str,
+        expected_md5: Optional[str] = None,
+        filename: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Download `url` into `landing_dir` (as `filename`, default the URL
+        basename) using ranged parallel segments when the server allows
+        it. Interrupted downloads resume from the `.part` file left behind.
+
+        SHA256/MD5 are computed while streaming and kept in
+        `self.last_download`, so callers do not need to re-read the file.
+        When `expected_md5` is given (e.g. from `get_md5_from_url_file`)
+        the file is verified before it is moved into place.
+        """
+        filename = filename or os.path.basename(url)
         local_path = Path(landing_dir) / filename
         os.makedirs(landing_dir, exist_ok=True)
 
-        response = requests.get(url, stream=True)
-        if response.status_code != 200:
-            msg = f"Failed to download {filename}. HTTP Status: {response.status_code}"  # noqa: E501
-            return False, msg
-
         msg = f"⬇️  Downloading {filename} ..."
         self.logger.log(msg, "INFO")
 
-        with open(local_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=1024):
-                if chunk:
-                    f.write(chunk)
+        downloader = HTTPDownloader(
+            segments=self.DOWNLOAD_SEGMENTS,
+            retries=self.DOWNLOAD_RETRIES,
+            headers=headers,
+            logger=self.logger,
+        )
+        try:
+            self.last_download = downloader.download(
+                url, local_path, expected_md5=expected_md5
+            )
+        except DownloadError as e:
+            self.last_download = None
+            msg = f"Failed to download {filename}. {e}"
+            return False, msg
 
-        msg = f"Downloaded {filename} to {landing_dir}"
+        result = self.last_download
+        rate = result.size / max(result.seconds, 1e-6) / (1 << 20)
+        msg = (
+            f"Downloaded {filename} to {landing_dir} "
+            f"({result.size:,} bytes, {result.segments} segment(s), {rate:.1f} MiB/s)"  # noqa E501
+        )
         return True, msg
 
-    def get_md5_from_url_file(self, url_md5: str) -> Optional[str]:
+    def get_md5_from_url_file(
+        self, url_md5: str, verify: bool = False
+    ) -> Optional[str]:
+        """
+        Returns the checksum published in a remote `.md5` file, or None
+        when it cannot be read or is not an MD5 hex digest (the download
+        then goes unverified).
 
+        With `verify=True` the value is also compared to the MD5 computed
+        while streaming the last `http_download`; None is returned on a
+        mismatch.
+        """
         try:
             response = requests.get(url_md5)
             if response.status_code == 200:
-                remote_md5 = response.text.strip().split()[0]
+                fields = response.text.split()
+                remote_md5 = fields[0] if fields else ""
             else:
                 remote_md5 = None
         except Exception:
             remote_md5 = None
 
+        if remote_md5 is not None and not MD5_HEX.match(remote_md5):
+            msg = f"⚠️ Ignoring invalid MD5 from {url_md5}: {remote_md5[:64]!r}; download will not be verified"  # noqa E501
+            self.logger.log(msg, "WARNING")
+            remote_md5 = None
+
+        if verify and remote_md5:
+            last = getattr(self, "last_download", None)
+            if last is None or last.md5 != remote_md5.lower():
+                msg = f"❌ MD5 mismatch for {url_md5}: {remote_md5} != {getattr(last, 'md5', None)}"  # noqa E501
+                self.logger.log(msg, "ERROR")
+                return None
+
         return remote_md5
 
     # File System Management Methods
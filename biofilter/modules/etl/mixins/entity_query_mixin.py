@@ -1,14 +1,27 @@
+from typing import Optional, Union
+
+import pandas as pd
+from sqlalchemy import insert, text
 from sqlalchemy.exc import IntegrityError
+
 from biofilter.modules.db.models.model_entities import (
     Entity,
     EntityAlias,
     EntityRelationship,  # noqa: E501
 )
+from biofilter.utils.pg_copy import copy_batches_to_postgres, iter_record_batches
 from biofilter.utils.utilities import string_normalization, as_list
 
+ALIAS_KEY_COLUMNS = ["alias_value", "alias_type", "xref_source"]
+# Columns of a secondary alias frame pointing at its entity's primary key
+PRIMARY_KEY_COLUMNS = ["primary_value", "primary_type", "primary_source"]
+
 
 class EntityQueryMixin:
 
+    # Rows per multi-row INSERT ... RETURNING batch in the bulk resolver
+    BULK_ENTITY_BATCH_SIZE: int = 50_000
+
     def get_or_create_entity(
         self,
         name: str,
@@ -274,3 +287,615 @@ class EntityQueryMixin:
 
         # Drop Duplicated was transfer to add Entity Aliases Method
         return payloads
+
+    # --- SET-BASED (BULK) ENTITY RESOLUTION ---
+
+    def build_alias_frames(
+        self,
+        df: pd.DataFrame,
+        is_active: Union[bool, pd.Series] = True,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Vectorized counterpart of `build_alias` for a whole DataFrame.
+
+        Every column mapped in `self.alias_schema` is exploded into a long
+        alias frame. The first primary alias of each row (schema order)
+        becomes the entity key; all other aliases of the row are secondary.
+
+        Args:
+            df (pd.DataFrame): One entity per row. Its index is kept as
+                `row_id` in both outputs and must be unique.
+            is_active (bool | pd.Series): Scalar flag or a per-row flag
+                aligned with `df.index`.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: (primary, secondary) frames
+            ready for `bulk_get_or_create_entities`. Secondary rows carry
+            the key of their row's primary alias (`primary_value`,
+            `primary_type`, `primary_source`).
+        """
+        cols = [
+            "row_id",
+            "alias_value",
+            "alias_type",
+            "xref_source",
+            "alias_norm",
+            "locale",
+            "is_active",
+        ]
+
+        parts = []
+        for key, (atype, src, is_primary) in self.alias_schema.items():
+            if key not in df.columns:
+                continue
+            values = (
+                df[key].reset_index(drop=True).map(as_list).explode().dropna()
+            )  # noqa E501
+            if values.empty:
+                continue
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "row_pos": values.index.to_numpy(),
+                        "alias_value": values.astype(str).to_numpy(),
+                        "alias_type": atype,
+                        "xref_source": src,
+                        "is_primary": bool(is_primary),
+                    }
+                )
+            )
+
+        if not parts:
+            return (
+                pd.DataFrame(columns=cols),
+                pd.DataFrame(columns=cols + PRIMARY_KEY_COLUMNS),
+            )
+
+        # Stable sort keeps schema order (and list order) inside each row
+        aliases = pd.concat(parts, ignore_index=True)
+        aliases = aliases.sort_values("row_pos", kind="stable")
+        aliases = aliases.reset_index(drop=True)
+        aliases["alias_norm"] = aliases["alias_value"].map(
+            string_normalization
+        )
+        aliases["locale"] = "en"
+
+        row_pos = aliases["row_pos"].to_numpy()
+        aliases["row_id"] = df.index.to_numpy()[row_pos]
+        if isinstance(is_active, pd.Series):
+            flags = is_active.reindex(df.index).fillna(True).astype(bool)
+            aliases["is_active"] = flags.to_numpy()[row_pos]
+        else:
+            aliases["is_active"] = bool(is_active)
+
+        primary_idx = (
+            aliases.loc[aliases["is_primary"]].drop_duplicates("row_pos").index
+        )  # noqa E501
+        primary = aliases.loc[primary_idx]
+        secondary = aliases.drop(index=primary_idx)
+        by_pos = primary.set_index("row_pos")
+        for key_col, col in zip(PRIMARY_KEY_COLUMNS, ALIAS_KEY_COLUMNS):
+            secondary[key_col] = secondary["row_pos"].map(by_pos[col])
+        # Rows without a primary alias cannot be keyed to an entity
+        secondary = secondary.loc[secondary["primary_value"].notna()]
+
+        return (
+            primary[cols].reset_index(drop=True),
+            secondary[cols + PRIMARY_KEY_COLUMNS].reset_index(drop=True),
+        )
+
+    def bulk_get_or_create_entities(
+        self,
+        primary: pd.DataFrame,
+        secondary: Optional[pd.DataFrame] = None,
+        group_id: int = None,
+        data_source_id: int = 0,
+        package_id: int = None,
+        is_active: bool = True,
+        force_create: bool = False,
+        auto_commit: bool = True,
+        stage_table: Optional[str] = None,
+        alias_existing: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Set-based counterpart of `get_or_create_entity` and
+        `get_or_create_entity_name`.
+
+        Existing primary aliases are resolved with one staged join against
+        `entity_aliases`; missing `Entity` rows are created with multi-row
+        INSERT ... RETURNING and their primary `EntityAlias` rows inserted in
+        bulk. Secondary aliases go through the same staged anti-join and
+        are inserted only when new for their entity.
+
+        Args:
+            primary (pd.DataFrame): One row per entity with `alias_value`,
+                `alias_type`, `xref_source`, `alias_norm` and optionally
+                `is_active`.
+            secondary (pd.DataFrame): Optional aliases with the same columns
+                (plus optional `locale`) and `primary_value`,
+                `primary_type`, `primary_source`: the primary alias key of
+                the entity they belong to. Frames with `primary_value` only
+                are matched by value when it is unambiguous.
+            group_id (int): FK to EntityGroup.
+            data_source_id (int): FK to DataSource.
+            package_id (int): Optional FK to Package (for traceability).
+            is_active (bool): Default when `is_active` is not a column.
+            force_create (bool): If True, skip both lookups and create all.
+            auto_commit (bool): When True commits inside the helper; when
+                False only flushes and leaves commit control to the caller.
+            stage_table (str): Name of the session TEMP table used for
+                joins. Defaults to one per data source.
+            alias_existing (bool): When False, secondary aliases are only
+                added to entities created by this call.
+
+        Returns:
+            pd.DataFrame: Indexed by the primary alias key
+            (`alias_value`, `alias_type`, `xref_source`), with columns
+            `entity_id` and `is_new`. Use `map_entity_ids` to project it
+            back onto the input rows. If the set-based pass fails, rows are
+            retried one by one and those that still fail are logged and
+            left out (as `get_or_create_entity` returns None for them).
+
+        Raises:
+            Exception: A database error that fails every row, after the
+            session is rolled back.
+        """
+        result_cols = ["entity_id", "is_new"]
+        if primary is None or primary.empty:
+            return pd.DataFrame(
+                columns=result_cols,
+                index=pd.MultiIndex.from_arrays(
+                    [[]] * len(ALIAS_KEY_COLUMNS), names=ALIAS_KEY_COLUMNS
+                ),
+            )
+
+        if not stage_table:
+            stage_table = f"tmp_entity_alias_stage_{data_source_id}"
+
+        opts = dict(
+            group_id=group_id,
+            data_source_id=data_source_id,
+            package_id=package_id,
+            force_create=force_create,
+            alias_existing=alias_existing,
+            stage_table=stage_table,
+        )
+        try:
+            conn = self.session.connection()
+
+            prim = primary.copy()
+            prim["alias_value"] = prim["alias_value"].astype(str).str.strip()
+            prim = prim.loc[prim["alias_value"] != ""]
+            if "is_active" not in prim.columns:
+                prim["is_active"] = is_active
+            if "alias_norm" not in prim.columns:
+                prim["alias_norm"] = None
+            prim = prim.drop_duplicates(subset=ALIAS_KEY_COLUMNS)
+            prim = prim.reset_index(drop=True)
+
+            try:
+                with self.session.begin_nested():
+                    prim, count_added = self._resolve_entity_frame(
+                        conn, prim, secondary, **opts
+                    )
+            except Exception as e:
+                # Same tolerance as the per-row helper: a bad row is logged
+                # and skipped instead of failing the whole load
+                msg = f"⚠️ Bulk entity resolution failed, retrying row by row: {e}"  # noqa E501
+                self.logger.log(msg, "WARNING")
+                prim, count_added = self._resolve_entities_by_row(
+                    conn, prim, secondary, **opts
+                )
+
+            if auto_commit:
+                self.session.commit()
+            else:
+                self.session.flush()
+
+        except Exception as e:
+            self.session.rollback()
+            msg = f"⚠️ Bulk entity resolution failed: {e}"
+            self.logger.log(msg, "ERROR")
+            raise
+
+        n_new = int(prim["is_new"].sum())
+        msg = (
+            f"✅ Bulk entities resolved: {len(prim)} "
+            f"(new={n_new}, existing={len(prim) - n_new}, "
+            f"aliases_added={count_added})"
+        )
+        self.logger.log(msg, "DEBUG")
+
+        # prim is unique by key, so every key maps to exactly one entity
+        return prim.set_index(ALIAS_KEY_COLUMNS)[result_cols]
+
+    def _resolve_entity_frame(
+        self,
+        conn,
+        prim: pd.DataFrame,
+        secondary: Optional[pd.DataFrame],
+        group_id: int,
+        data_source_id: int,
+        package_id: int,
+        force_create: bool,
+        alias_existing: bool,
+        stage_table: str,
+    ) -> tuple[pd.DataFrame, int]:
+        prim = prim.copy()
+
+        # 1) Resolve already existing primary aliases (one staged join)
+        if force_create:
+            prim["entity_id"] = pd.NA
+        else:
+            found = self._stage_alias_lookup(
+                conn,
+                prim[ALIAS_KEY_COLUMNS],
+                stage_table,
+                select_sql="MIN(ea.entity_id)",
+                extra_where="ea.is_primary = :is_primary",
+                group_by=True,
+                params={"is_primary": True},
+            )
+            prim["entity_id"] = pd.Series(found, dtype="object").reindex(
+                prim.index
+            )  # noqa E501
+        prim["is_new"] = prim["entity_id"].isna()
+
+        # 2) Create missing Entities + primary aliases
+        new_mask = prim["is_new"].to_numpy()
+        if new_mask.any():
+            new_rows = prim.loc[new_mask]
+            new_ids = self._insert_entities(
+                new_rows["is_active"].tolist(),
+                group_id=group_id,
+                data_source_id=data_source_id,
+                package_id=package_id,
+            )
+            prim.loc[new_mask, "entity_id"] = new_ids
+
+            alias_records = pd.DataFrame(
+                {
+                    "entity_id": new_ids,
+                    "group_id": group_id,
+                    "alias_value": new_rows["alias_value"].to_numpy(),
+                    "alias_type": new_rows["alias_type"].to_numpy(),
+                    "xref_source": new_rows["xref_source"].to_numpy(),
+                    "alias_norm": new_rows["alias_norm"].to_numpy(),
+                    "is_primary": True,
+                    "is_active": new_rows["is_active"].to_numpy(),
+                    "locale": "en",
+                    "data_source_id": data_source_id,
+                    "etl_package_id": package_id,
+                }
+            )
+            self._insert_alias_records(alias_records)
+
+        prim["entity_id"] = prim["entity_id"].astype("int64")
+
+        # 3) Secondary aliases
+        count_added = 0
+        if secondary is not None and not secondary.empty:
+            owners = prim if alias_existing else prim.loc[prim["is_new"]]
+            count_added = self._bulk_add_entity_aliases(
+                conn,
+                owners,
+                secondary,
+                group_id=group_id,
+                data_source_id=data_source_id,
+                package_id=package_id,
+                force_create=force_create,
+                stage_table=stage_table,
+            )
+        return prim, count_added
+
+    def _resolve_entities_by_row(
+        self,
+        conn,
+        prim: pd.DataFrame,
+        secondary: Optional[pd.DataFrame],
+        **opts,
+    ) -> tuple[pd.DataFrame, int]:
+        """
+        Fallback of `bulk_get_or_create_entities`: one savepoint per
+        primary alias (with its secondaries). Failing rows are logged and
+        left out of the result; if every row fails, the last error is
+        raised (the problem is not the data).
+        """
+        sec_rows: dict = {}
+        if secondary is not None and not secondary.empty:
+            key_cols = (
+                PRIMARY_KEY_COLUMNS
+                if set(PRIMARY_KEY_COLUMNS) <= set(secondary.columns)
+                else ["primary_value"]
+            )
+            keys = secondary[key_cols].astype(object)
+            keys["primary_value"] = keys["primary_value"].astype(str).str.strip()  # noqa E501
+            keys = keys.where(keys.notna(), None)
+            for pos, key in enumerate(keys.itertuples(index=False, name=None)):
+                sec_rows.setdefault(key, []).append(pos)
+            prim_keys = prim[ALIAS_KEY_COLUMNS[: len(key_cols)]].astype(object)
+            prim_keys = prim_keys.where(prim_keys.notna(), None)
+            prim_keys = list(prim_keys.itertuples(index=False, name=None))
+
+        done, count_added, last_error = [], 0, None
+        for i in range(len(prim)):
+            row = prim.iloc[[i]]
+            sec = None
+            if sec_rows:
+                sec = secondary.iloc[sec_rows.get(prim_keys[i], [])]
+            try:
+                with self.session.begin_nested():
+                    resolved, added = self._resolve_entity_frame(
+                        conn, row, sec, **opts
+                    )
+            except Exception as e:
+                last_error = e
+                value = row["alias_value"].iat[0]
+                msg = f"⚠️ Insert Entity failed for: {value} with error: {e}"  # noqa E501
+                self.logger.log(msg, "WARNING")
+                continue
+            done.append(resolved)
+            count_added += added
+
+        if not done:
+            if last_error is not None:
+                raise last_error
+            return prim.assign(entity_id=pd.Series(dtype="int64"), is_new=False), 0  # noqa E501
+        return pd.concat(done), count_added
+
+    def map_entity_ids(
+        self, primary: pd.DataFrame, resolved: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Project the result of `bulk_get_or_create_entities` back onto the
+        `row_id` of the frames built by `build_alias_frames`.
+
+        Returns:
+            pd.DataFrame: Indexed by `row_id` with `entity_id` and `is_new`.
+        """
+        keys = primary[["row_id"] + ALIAS_KEY_COLUMNS].copy()
+        keys["alias_value"] = keys["alias_value"].astype(str).str.strip()
+        merged = keys.merge(
+            resolved.reset_index(), on=ALIAS_KEY_COLUMNS, how="left"
+        )
+        return pd.DataFrame(
+            {
+                "entity_id": merged["entity_id"].to_numpy(),
+                "is_new": merged["is_new"].fillna(False).to_numpy(),
+            },
+            index=pd.Index(merged["row_id"].to_numpy(), name="row_id"),
+        )
+
+    def _null_safe_eq(self) -> str:
+        if self.session.bind.dialect.name == "postgresql":
+            return "IS NOT DISTINCT FROM"
+        return "IS"
+
+    def _stage_alias_lookup(
+        self,
+        conn,
+        keys: pd.DataFrame,
+        stage_table: str,
+        select_sql: str,
+        extra_where: str = None,
+        group_by: bool = False,
+        join_entity: bool = False,
+        params: dict = None,
+    ) -> dict:
+        """
+        Stage `keys` (one row per position) in a session TEMP table and join
+        it to `entity_aliases`. On PostgreSQL the keys go through COPY.
+
+        Returns a {stage_pos: value} dict for the staged rows that matched.
+        """
+        stage = keys.reset_index(drop=True).copy()
+        stage["stage_pos"] = range(len(stage))
+        columns = list(stage.columns)
+
+        col_defs = ", ".join(
+            f"{c} BIGINT" if c in ("stage_pos", "entity_id") else f"{c} TEXT"
+            for c in columns
+        )
+        conn.execute(text(f"DROP TABLE IF EXISTS {stage_table}"))
+        conn.execute(text(f"CREATE TEMP TABLE {stage_table} ({col_defs})"))
+        try:
+            if conn.dialect.name == "postgresql":
+                copy_batches_to_postgres(
+                    conn, stage_table, columns, iter_record_batches(stage)
+                )
+            else:
+                rows = stage.astype(object).where(stage.notna(), None)
+                conn.execute(
+                    text(
+                        f"INSERT INTO {stage_table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(':' + c for c in columns)})"
+                    ),
+                    rows.to_dict(orient="records"),
+                )
+            return self._join_alias_stage(
+                conn,
+                stage_table,
+                select_sql,
+                extra_where=extra_where,
+                group_by=group_by,
+                join_entity=join_entity,
+                params=params,
+            )
+        finally:
+            try:
+                conn.execute(text(f"DROP TABLE IF EXISTS {stage_table}"))
+            except Exception:
+                # Aborted transaction: the caller's rollback drops it
+                pass
+
+    def _join_alias_stage(
+        self,
+        conn,
+        stage_table: str,
+        select_sql: str,
+        extra_where: str = None,
+        group_by: bool = False,
+        join_entity: bool = False,
+        params: dict = None,
+    ) -> dict:
+        on_entity = "AND ea.entity_id = s.entity_id" if join_entity else ""
+        where = f"WHERE {extra_where}" if extra_where else ""
+        group = "GROUP BY s.stage_pos" if group_by else ""
+        sql = f"""
+            SELECT s.stage_pos, {select_sql}
+            FROM {stage_table} s
+            JOIN entity_aliases ea
+              ON ea.alias_value = s.alias_value
+             AND ea.alias_type = s.alias_type
+             AND ea.xref_source {self._null_safe_eq()} s.xref_source
+             {on_entity}
+            {where}
+            {group}
+        """
+        rows = conn.execute(text(sql), params or {}).fetchall()
+        return {int(r[0]): r[1] for r in rows}
+
+    def _insert_entities(
+        self,
+        is_active_flags: list,
+        group_id: int,
+        data_source_id: int,
+        package_id: int,
+    ) -> list[int]:
+        """
+        Multi-row INSERT ... RETURNING of Entities, ids in input order.
+        """
+        records = [
+            {
+                "group_id": group_id,
+                "is_active": bool(flag),
+                "data_source_id": data_source_id,
+                "etl_package_id": package_id,
+            }
+            for flag in is_active_flags
+        ]
+        stmt = insert(Entity).returning(
+            Entity.id, sort_by_parameter_order=True
+        )  # noqa E501
+
+        new_ids: list[int] = []
+        batch = self.BULK_ENTITY_BATCH_SIZE
+        for start in range(0, len(records), batch):
+            res = self.session.scalars(stmt, records[start:start + batch])
+            new_ids.extend(int(i) for i in res.all())
+        return new_ids
+
+    def _insert_alias_records(self, records: pd.DataFrame) -> None:
+        if records.empty:
+            return
+        clean = records.astype(object).where(records.notna(), None)
+        rows = clean.to_dict(orient="records")
+        batch = self.BULK_ENTITY_BATCH_SIZE
+        for start in range(0, len(rows), batch):
+            chunk = rows[start:start + batch]
+            self.session.execute(insert(EntityAlias), chunk)
+
+    def _guard_alias_series(self, values: pd.Series) -> pd.Series:
+        """
+        Vectorized `guard_description` (strip + optional truncation).
+        """
+        out = values.astype("string").str.strip()
+        maxlen = self.MAXLEN_DESCRIPTION
+        if self.TRUNCATE_MODE_255:
+            too_long = int((out.str.len() > maxlen).sum())
+            if too_long:
+                metrics = getattr(self, "trunc_metrics", None) or {}
+                metrics["description"] = (
+                    metrics.get("description", 0) + too_long
+                )  # noqa E501
+                self.trunc_metrics = metrics
+                out = out.str.slice(0, maxlen)
+        return out.astype(object).where(out.notna(), None)
+
+    def _bulk_add_entity_aliases(
+        self,
+        conn,
+        prim: pd.DataFrame,
+        secondary: pd.DataFrame,
+        group_id: int,
+        data_source_id: int,
+        package_id: int,
+        force_create: bool,
+        stage_table: str,
+    ) -> int:
+        sec = secondary.copy()
+        sec["alias_value"] = sec["alias_value"].astype(str).str.strip()
+        sec = sec.loc[sec["alias_value"] != ""]
+
+        owners = prim[ALIAS_KEY_COLUMNS + ["entity_id", "is_active"]]
+        probe = pd.DataFrame(
+            {"alias_value": sec["primary_value"].astype(str).str.strip()}
+        )
+        if set(PRIMARY_KEY_COLUMNS) <= set(sec.columns):
+            probe["alias_type"] = sec["primary_type"]
+            probe["xref_source"] = sec["primary_source"]
+            on = ALIAS_KEY_COLUMNS
+        else:
+            # Value-only frames: skip values shared by several primaries
+            owners = owners.drop_duplicates(subset="alias_value", keep=False)
+            on = ["alias_value"]
+        owner = probe.merge(
+            owners[on + ["entity_id", "is_active"]], on=on, how="left"
+        )
+        sec["entity_id"] = owner["entity_id"].to_numpy()
+        if "is_active" not in sec.columns:
+            sec["is_active"] = owner["is_active"].to_numpy()
+        if "locale" not in sec.columns:
+            sec["locale"] = "en"
+        sec["locale"] = sec["locale"].fillna("en")
+        if "alias_norm" not in sec.columns:
+            sec["alias_norm"] = None
+        sec = sec.loc[sec["entity_id"].notna()]
+        sec["entity_id"] = sec["entity_id"].astype("int64")
+
+        # Drop duplicated alias_norm per entity (same rule as the per-row
+        # helper: empty norms are always kept)
+        norm = sec["alias_norm"].fillna("").astype(str).str.strip()
+        dup_norm = norm.ne("") & pd.DataFrame(
+            {"entity_id": sec["entity_id"], "norm": norm}
+        ).duplicated()
+        sec = sec.loc[~dup_norm]
+
+        sec["alias_value"] = self._guard_alias_series(sec["alias_value"])
+        sec["alias_norm"] = self._guard_alias_series(sec["alias_norm"])
+        sec = sec.drop_duplicates(subset=["entity_id"] + ALIAS_KEY_COLUMNS)
+        sec = sec.reset_index(drop=True)
+        if sec.empty:
+            return 0
+
+        if not force_create:
+            existing = self._stage_alias_lookup(
+                conn,
+                sec[["entity_id"] + ALIAS_KEY_COLUMNS],
+                stage_table,
+                select_sql="1",
+                join_entity=True,
+            )
+            if existing:
+                sec = sec.drop(index=list(existing.keys()))
+
+        if sec.empty:
+            return 0
+
+        records = pd.DataFrame(
+            {
+                "entity_id": sec["entity_id"].astype("int64").to_numpy(),
+                "group_id": group_id,
+                "alias_value": sec["alias_value"].to_numpy(),
+                "alias_type": sec["alias_type"].to_numpy(),
+                "xref_source": sec["xref_source"].to_numpy(),
+                "alias_norm": sec["alias_norm"].to_numpy(),
+                "locale": sec["locale"].to_numpy(),
+                "is_primary": False,
+                "is_active": sec["is_active"].to_numpy(),
+                "data_source_id": data_source_id,
+                "etl_package_id": package_id,
+            }
+        )
+        self._insert_alias_records(records)
+        return len(records)
@@ -0,0 +1,119 @@
+"""
+Per-variant predictor summary (`variant_predictor_summary`).
+
+Reports that only need one score per variant (e.g. the AlphaMissense
+columns of gene_to_variant_filtering) used to aggregate
+`variant_effect_predictions` (one row per transcript) with
+`MAX(score), MAX(classification) ... GROUP BY variant_id` on every run.
+This module materializes that aggregate once, partitioned by chromosome
+like the source table:
+
+- `ensure_predictor_summary` creates the table (and its chromosome
+  partitions on PostgreSQL) when it is missing, so databases created
+  before the table existed are upgraded on first refresh;
+- `refresh_predictor_summary` rebuilds the rows of the given chromosomes
+  only, inside the caller's transaction; prediction DTPs call it with the
+  chromosomes their load touched.
+
+Rows carry the newest `data_source_id` / `etl_package_id` among the
+predictions they summarize. A variant can be scored by several sources, so
+PurgeEngine does not rely on those columns alone: after deleting
+predictions it refreshes the chromosomes they were on.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import MetaData, inspect, text
+
+from biofilter.modules.db.core_ddl import (
+    ddl_list_partitions,
+    ddl_variant_predictor_summary,
+)
+from biofilter.modules.db.models.model_variants import map_variant_predictor_summary  # noqa E501
+
+SUMMARY_TABLE = "variant_predictor_summary"
+SOURCE_TABLE = "variant_effect_predictions"
+CHROMOSOMES = range(1, 26)  # same range as ddl_list_partitions
+
+
+def has_predictor_summary(conn) -> bool:
+    """True when the summary table exists on this connection's database."""
+    return inspect(conn).has_table(SUMMARY_TABLE)
+
+
+def ensure_predictor_summary(conn) -> None:
+    """Create the summary table (and PostgreSQL partitions) if missing."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(ddl_variant_predictor_summary()))
+        for ddl in ddl_list_partitions(SUMMARY_TABLE, SUMMARY_TABLE):
+            conn.execute(text(ddl))
+        return
+    if not has_predictor_summary(conn):
+        table = map_variant_predictor_summary(conn.engine, MetaData())
+        table.create(conn)
+
+
+def refresh_predictor_summary(
+    conn,
+    chromosomes: Optional[Iterable[int]] = None,
+    logger=None,
+) -> Dict[int, int]:
+    """
+    Rebuild the summary rows of `chromosomes` (default: all) from
+    variant_effect_predictions. Returns {chromosome: summary rows}.
+
+    Each chromosome is one DELETE + INSERT ... SELECT with a literal
+    chromosome predicate, so PostgreSQL only touches that partition.
+    """
+    ensure_predictor_summary(conn)
+    chroms = sorted({int(c) for c in (CHROMOSOMES if chromosomes is None else chromosomes)})  # noqa E501
+
+    counts: Dict[int, int] = {}
+    for chrom in chroms:
+        conn.execute(
+            text(f"DELETE FROM {SUMMARY_TABLE} WHERE chromosome = :chromosome"),
+            {"chromosome": chrom},
+        )
+        result = conn.execute(
+            text(
+                f"""
+                INSERT INTO {SUMMARY_TABLE} (
+                    chromosome,
+                    variant_id,
+                    predictor_name,
+                    max_score,
+                    max_classification,
+                    prediction_count,
+                    data_source_id,
+                    etl_package_id
+                )
+                SELECT
+                    chromosome,
+                    variant_id,
+                    LOWER(predictor_name),
+                    MAX(score),
+                    MAX(classification),
+                    COUNT(*),
+                    MAX(data_source_id),
+                    MAX(etl_package_id)
+                FROM {SOURCE_TABLE}
+                WHERE chromosome = :chromosome
+                GROUP BY chromosome, variant_id, LOWER(predictor_name)
+                """
+            ),
+            {"chromosome": chrom},
+        )
+        counts[chrom] = max(int(result.rowcount or 0), 0)
+
+    if conn.dialect.name == "postgresql" and chroms:
+        conn.execute(text(f"ANALYZE {SUMMARY_TABLE}"))
+
+    if logger is not None:
+        logger.log(
+            f"🧮 Refreshed {SUMMARY_TABLE} for {len(chroms)} chromosome(s): "
+            f"{sum(counts.values())} rows",
+            "INFO",
+        )
+    return counts
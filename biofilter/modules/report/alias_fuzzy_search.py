@@ -0,0 +1,103 @@
+"""
+Fuzzy alias matching shared by the entity reports.
+
+`report_entity_filter` and `report_entity_neighborhood_summary` match input
+words against alias keys with rapidfuzz's `token_sort_ratio`. This module
+keeps that contract and makes it cheaper:
+
+- `candidate_alias_keys` asks the q-gram alias search index
+  (`biofilter.modules.etl.alias_search_index`) for the keys that can still
+  reach the threshold; it returns None when the index has not been built,
+  and callers then score every key as before;
+- `fetch_for_keys` runs a report's own alias query restricted to those
+  keys (in chunks, to stay under bind parameter limits);
+- `score_alias_keys` scores all inputs against all keys in one
+  `process.cdist` call per input batch, using every core.
+
+The scores are the ones `process.extract` would return for the same keys.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from biofilter.modules.etl.alias_search_index import (
+    alias_search_candidates,
+    has_alias_search_index,
+)
+
+IN_CHUNK_SIZE = 900
+MAX_SCORE_CELLS = 5_000_000  # inputs x keys scored per cdist call
+
+
+def _rapidfuzz():
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        raise ImportError(
+            "rapidfuzz is required for fuzzy matching. "
+            "Install it with: pip install rapidfuzz"
+        )
+    return fuzz, process
+
+
+def candidate_alias_keys(
+    session, queries: Iterable[str], threshold: float, logger=None
+) -> Optional[list[str]]:
+    """
+    Union of the index candidates of all queries (sorted), or None when
+    the alias search index is unavailable or cannot filter (threshold <= 0).
+    """
+    if threshold <= 0:
+        return None
+    conn = session.connection()
+    if not has_alias_search_index(conn):
+        if logger is not None:
+            logger.log(
+                "⚠️ Alias search index not built; fuzzy matching scans all "
+                "alias keys.",
+                "DEBUG",
+            )
+        return None
+    per_query = alias_search_candidates(conn, queries, threshold)
+    return sorted(set().union(*per_query.values())) if per_query else []
+
+
+def fetch_for_keys(query, key_expr, keys: list[str]) -> list:
+    """Rows of `query` whose `key_expr` is in `keys`."""
+    rows: list = []
+    for i in range(0, len(keys), IN_CHUNK_SIZE):
+        rows.extend(query.filter(key_expr.in_(keys[i:i + IN_CHUNK_SIZE])).all())
+    return rows
+
+
+def score_alias_keys(
+    queries: list[str], keys: list[str], threshold: float
+) -> dict[str, list[tuple[str, float]]]:
+    """
+    {query: [(key, score), ...]} for every key scoring >= threshold with
+    token_sort_ratio, keys in input order.
+    """
+    fuzz, process = _rapidfuzz()
+    queries = list(dict.fromkeys(queries))
+    out: dict[str, list[tuple[str, float]]] = {q: [] for q in queries}
+    if not queries or not keys:
+        return out
+
+    batch = max(1, MAX_SCORE_CELLS // len(keys))
+    for start in range(0, len(queries), batch):
+        chunk = queries[start:start + batch]
+        scores = process.cdist(
+            chunk,
+            keys,
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=threshold,
+            dtype=np.float64,
+            workers=-1,
+        )
+        for query, row in zip(chunk, scores):
+            hits = np.nonzero(row >= threshold)[0]
+            out[query].extend((keys[j], float(row[j])) for j in hits)
+    return out
@@ -0,0 +1,347 @@
+"""
+Shared gene interval index for report overlap lookups.
+
+Reports that ask "which genes overlap this position/range" used to run one
+SQL query per input (or keep their own window dict). `GeneIntervalIndex`
+loads the matching `entity_locations` rows once and answers overlap and
+nearest-gene queries in memory:
+
+- rows are sorted by (chromosome, start, end, entity_id), one contiguous
+  segment per chromosome;
+- each segment keeps the running maximum of `end` (max-end augmentation),
+  so the candidates for a query [qs, qe] are the rows between the first
+  running max >= qs and the last start <= qe, both found by binary search;
+- batch queries take whole arrays of positions and return
+  (query, row) pairs.
+
+`load_gene_interval_index` caches one index per engine and
+(build, entity groups) in the current process. The cache is checked
+against the `etl_packages` table and rebuilt after any ETL load or
+rollback.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Iterable
+
+import numpy as np
+from sqlalchemy import and_, func
+from sqlalchemy.orm import aliased
+
+from biofilter.modules.db.models import (
+    Entity,
+    EntityAlias,
+    EntityGroup,
+    EntityLocation,
+    ETLPackage,
+)
+
+GROUP_ON = {"location", "entity"}
+
+
+class GeneIntervalIndex:
+    """
+    Immutable, picklable interval index over gene locations. Row ids are
+    positions in the sorted arrays; `record`/`records` turn them back into
+    dicts.
+    """
+
+    def __init__(
+        self,
+        chromosome: Iterable[int],
+        start: Iterable[int],
+        end: Iterable[int],
+        entity_id: Iterable[int],
+        primary_name: Iterable[str | None] | None = None,
+        group_name: Iterable[str | None] | None = None,
+    ):
+        chromosome = np.asarray(list(chromosome), dtype=np.int64)
+        start = np.asarray(list(start), dtype=np.int64)
+        end = np.asarray(list(end), dtype=np.int64)
+        entity_id = np.asarray(list(entity_id), dtype=np.int64)
+        n = len(chromosome)
+        primary_name = (
+            np.asarray(list(primary_name), dtype=object)
+            if primary_name is not None
+            else np.full(n, None, dtype=object)
+        )
+        group_name = (
+            np.asarray(list(group_name), dtype=object)
+            if group_name is not None
+            else np.full(n, None, dtype=object)
+        )
+
+        # Swapped coordinates are treated as the same interval
+        lo = np.minimum(start, end)
+        hi = np.maximum(start, end)
+
+        order = np.lexsort((entity_id, hi, lo, chromosome))
+        self.chromosome = chromosome[order]
+        self.start = lo[order]
+        self.end = hi[order]
+        self.entity_id = entity_id[order]
+        self.primary_name = primary_name[order]
+        self.group_name = group_name[order]
+
+        self._segments: dict[int, tuple[int, int]] = {}
+        self.max_end = np.empty_like(self.end)
+        if n:
+            chroms, first = np.unique(self.chromosome, return_index=True)
+            bounds = list(first) + [n]
+            for i, chrom in enumerate(chroms):
+                seg_lo, seg_hi = int(bounds[i]), int(bounds[i + 1])
+                self._segments[int(chrom)] = (seg_lo, seg_hi)
+                self.max_end[seg_lo:seg_hi] = np.maximum.accumulate(
+                    self.end[seg_lo:seg_hi]
+                )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> GeneIntervalIndex:
+        """Build from dicts with chromosome/start_pos/end_pos/entity_id keys."""
+        records = list(records)
+        return cls(
+            chromosome=[int(r["chromosome"]) for r in records],
+            start=[int(r["start_pos"]) for r in records],
+            end=[int(r["end_pos"]) for r in records],
+            entity_id=[int(r["entity_id"]) for r in records],
+            primary_name=[r.get("primary_name") for r in records],
+            group_name=[r.get("group_name") for r in records],
+        )
+
+    def __len__(self) -> int:
+        return len(self.chromosome)
+
+    @property
+    def chromosomes(self) -> list[int]:
+        return sorted(self._segments)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def overlaps(self, chromosome: int, start: int, end: int) -> np.ndarray:
+        """Row ids of intervals overlapping [start, end], in index order."""
+        segment = self._segments.get(int(chromosome))
+        if segment is None:
+            return np.zeros(0, dtype=np.int64)
+        seg_lo, seg_hi = segment
+        first = seg_lo + int(
+            np.searchsorted(self.max_end[seg_lo:seg_hi], int(start), side="left")
+        )
+        last = seg_lo + int(
+            np.searchsorted(self.start[seg_lo:seg_hi], int(end), side="right")
+        )
+        if first >= last:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.arange(first, last, dtype=np.int64)
+        return rows[self.end[first:last] >= int(start)]
+
+    def overlaps_batch(
+        self,
+        chromosomes: Iterable[int],
+        starts: Iterable[int],
+        ends: Iterable[int],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All overlaps for arrays of queries. Returns (query_idx, row_id)
+        pairs ordered by query, then index order.
+        """
+        chromosomes = np.asarray(list(chromosomes), dtype=np.int64)
+        starts = np.asarray(list(starts), dtype=np.int64)
+        ends = np.asarray(list(ends), dtype=np.int64)
+
+        first = np.zeros(len(chromosomes), dtype=np.int64)
+        last = np.zeros(len(chromosomes), dtype=np.int64)
+        for chrom, (seg_lo, seg_hi) in self._segments.items():
+            mask = chromosomes == chrom
+            if not mask.any():
+                continue
+            first[mask] = seg_lo + np.searchsorted(
+                self.max_end[seg_lo:seg_hi], starts[mask], side="left"
+            )
+            last[mask] = seg_lo + np.searchsorted(
+                self.start[seg_lo:seg_hi], ends[mask], side="right"
+            )
+
+        counts = np.maximum(last - first, 0)
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        query_idx = np.repeat(np.arange(len(chromosomes), dtype=np.int64), counts)
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        rows = np.repeat(first, counts) + offsets
+        keep = self.end[rows] >= starts[query_idx]
+        return query_idx[keep], rows[keep]
+
+    def nearest(
+        self,
+        chromosomes: Iterable[int],
+        positions: Iterable[int],
+        max_distance: int = 0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Closest interval to each position within `max_distance` bp.
+        Intervals containing the position have distance 0; ties go to the
+        shortest interval. Returns (row_id, distance) arrays, with -1 for
+        positions that have no interval in range.
+        """
+        positions = np.asarray(list(positions), dtype=np.int64)
+        query_idx, rows = self.overlaps_batch(
+            chromosomes, positions - int(max_distance), positions + int(max_distance)
+        )
+
+        best_rows = np.full(len(positions), -1, dtype=np.int64)
+        best_dist = np.full(len(positions), -1, dtype=np.int64)
+        if not len(rows):
+            return best_rows, best_dist
+
+        pos = positions[query_idx]
+        dist = np.maximum(np.maximum(self.start[rows] - pos, pos - self.end[rows]), 0)
+        span = self.end[rows] - self.start[rows]
+        order = np.lexsort((rows, span, dist, query_idx))
+        query_sorted = query_idx[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = query_sorted[1:] != query_sorted[:-1]
+        winners = order[first]
+        best_rows[query_idx[winners]] = rows[winners]
+        best_dist[query_idx[winners]] = dist[winners]
+        return best_rows, best_dist
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+    def record(self, row: int) -> dict[str, Any]:
+        row = int(row)
+        return {
+            "entity_id": int(self.entity_id[row]),
+            "group_name": self.group_name[row],
+            "primary_name": self.primary_name[row],
+            "chromosome": int(self.chromosome[row]),
+            "start_pos": int(self.start[row]),
+            "end_pos": int(self.end[row]),
+        }
+
+    def records(self, rows: Iterable[int]) -> list[dict[str, Any]]:
+        return [self.record(row) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# Process-level cache
+# ----------------------------------------------------------------------
+_INDEX_CACHE: "weakref.WeakKeyDictionary[Any, dict[tuple, tuple[tuple, GeneIntervalIndex]]]" = (  # noqa E501
+    weakref.WeakKeyDictionary()
+)
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def clear_gene_interval_cache() -> None:
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.clear()
+
+
+def etl_load_token(session) -> tuple:
+    """
+    Changes whenever an ETL package is created (loads and rollbacks) or a
+    load finishes.
+    """
+    count, max_id, last_load = session.query(
+        func.count(ETLPackage.id),
+        func.max(ETLPackage.id),
+        func.max(ETLPackage.load_end),
+    ).one()
+    return (int(count or 0), max_id, str(last_load) if last_load else None)
+
+
+def entity_group_ids(session, names: Iterable[str]) -> frozenset[int]:
+    """Ids of the entity groups whose name matches `names` (case-insensitive)."""
+    names_lower = sorted({str(n).strip().lower() for n in names if str(n).strip()})
+    if not names_lower:
+        return frozenset()
+    rows = (
+        session.query(EntityGroup.id)
+        .filter(func.lower(EntityGroup.name).in_(names_lower))
+        .all()
+    )
+    return frozenset(int(r[0]) for r in rows)
+
+
+def _query_index(
+    session,
+    build: int,
+    group_ids: frozenset[int] | None,
+    group_on: str,
+) -> GeneIntervalIndex:
+    primary_alias = aliased(EntityAlias)
+    q = (
+        session.query(
+            EntityLocation.entity_id,
+            EntityLocation.chromosome,
+            EntityLocation.start_pos,
+            EntityLocation.end_pos,
+            primary_alias.alias_value,
+            EntityGroup.name,
+        )
+        .join(Entity, Entity.id == EntityLocation.entity_id)
+        .outerjoin(EntityGroup, Entity.group_id == EntityGroup.id)
+        .outerjoin(
+            primary_alias,
+            and_(
+                primary_alias.entity_id == EntityLocation.entity_id,
+                primary_alias.is_primary.is_(True),
+            ),
+        )
+        .filter(EntityLocation.build == int(build))
+    )
+    if group_ids is not None:
+        column = (
+            EntityLocation.entity_group_id if group_on == "location" else Entity.group_id
+        )
+        q = q.filter(column.in_(sorted(group_ids)))
+
+    rows = q.all()
+    return GeneIntervalIndex(
+        chromosome=(r[1] for r in rows),
+        start=(r[2] for r in rows),
+        end=(r[3] for r in rows),
+        entity_id=(r[0] for r in rows),
+        primary_name=(r[4] for r in rows),
+        group_name=(r[5] for r in rows),
+    )
+
+
+def load_gene_interval_index(
+    session,
+    build: int,
+    group_ids: Iterable[int] | None = None,
+    group_on: str = "location",
+) -> GeneIntervalIndex:
+    """
+    Gene interval index for `build`, restricted to `group_ids` (None = all
+    locations). `group_on` selects which group is matched:
+    `entity_locations.entity_group_id` ("location") or the entity's own
+    group ("entity").
+
+    The index is built once per engine and key, and rebuilt when
+    `etl_load_token` changes.
+    """
+    if group_on not in GROUP_ON:
+        raise ValueError(f"group_on must be one of: {sorted(GROUP_ON)}")
+    group_key = frozenset(int(g) for g in group_ids) if group_ids is not None else None
+    key = (int(build), group_key, group_on)
+    engine = session.get_bind()
+    token = etl_load_token(session)
+
+    with _INDEX_CACHE_LOCK:
+        cached = _INDEX_CACHE.get(engine, {}).get(key)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+
+    index = _query_index(session, int(build), group_key, group_on)
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.setdefault(engine, {})[key] = (token, index)
+    return index
@@ -0,0 +1,208 @@
+"""
+Bounded-memory pair expansion for the SNP-SNP reports.
+
+Variant x variant expansions grow quadratically, so building every pair in
+one DataFrame does not scale past a few million pairs. This module gives
+the reports three building blocks:
+
+- exact pair counts (`count_cross_pairs`, `count_triu_pairs`,
+  `count_cartesian_pairs`) that can be checked against `max_pairs` before
+  any pair is generated;
+- index generators (`iter_triu_blocks`, `iter_cartesian_blocks`) that
+  yield at most `chunk_rows` pairs at a time;
+- `PairChunkWriter`, which writes each chunk as a numbered Parquet or CSV
+  part file, so only one chunk is held in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 500_000
+OUTPUT_FORMATS = {"parquet", "csv"}
+
+
+# ----------------------------------------------------------------------
+# Exact counts
+# ----------------------------------------------------------------------
+def _by_seed(ids: set[int], seed_ids: set[int]) -> tuple[int, int]:
+    """(non-seed, seed) sizes of `ids`."""
+    n_seed = len(ids & seed_ids)
+    return len(ids) - n_seed, n_seed
+
+
+def count_cross_pairs(
+    ids_a: Iterable[int],
+    ids_b: Iterable[int],
+    seed_ids: Iterable[int] = (),
+) -> list[int]:
+    """
+    Exact number of distinct unordered pairs {a, b} with a in `ids_a`,
+    b in `ids_b` and a != b, split by how many of the two are seeds.
+
+    Returns [pairs with 0 seeds, with 1 seed, with 2 seeds]. Variants
+    present in both lists (overlapping genes) are counted once per pair.
+    """
+    a, b, seeds = set(ids_a), set(ids_b), set(seed_ids)
+    shared = a & b
+    only_a, only_b = a - shared, b - shared
+
+    counts = [0, 0, 0]
+
+    def _cross(x: set[int], y: set[int]) -> None:
+        x0, x1 = _by_seed(x, seeds)
+        y0, y1 = _by_seed(y, seeds)
+        counts[0] += x0 * y0
+        counts[1] += x0 * y1 + x1 * y0
+        counts[2] += x1 * y1
+
+    _cross(only_a, only_b)
+    _cross(only_a, shared)
+    _cross(shared, only_b)
+
+    s0, s1 = _by_seed(shared, seeds)
+    counts[0] += s0 * (s0 - 1) // 2
+    counts[1] += s0 * s1
+    counts[2] += s1 * (s1 - 1) // 2
+    return counts
+
+
+def _same_key_pairs(keys: pd.Series) -> int:
+    """Unordered pairs of rows sharing the same (non-null) key."""
+    sizes = keys.dropna().value_counts().to_numpy(dtype=np.int64)
+    return int((sizes * (sizes - 1) // 2).sum())
+
+
+def count_triu_pairs(n: int, keys: pd.Series | None = None) -> int:
+    """
+    Exact number of pairs i < j over `n` rows; pairs whose `keys` are
+    equal are left out when `keys` is given.
+    """
+    total = n * (n - 1) // 2
+    if keys is not None:
+        total -= _same_key_pairs(keys)
+    return total
+
+
+def count_cartesian_pairs(
+    n_a: int,
+    n_b: int,
+    keys_a: pd.Series | None = None,
+    keys_b: pd.Series | None = None,
+) -> int:
+    """
+    Exact number of pairs in `n_a` x `n_b`; pairs whose keys are equal
+    are left out when both key series are given.
+    """
+    total = n_a * n_b
+    if keys_a is not None and keys_b is not None:
+        left = keys_a.dropna().value_counts()
+        right = keys_b.dropna().value_counts()
+        common = left.index.intersection(right.index)
+        total -= int((left[common] * right[common]).sum())
+    return total
+
+
+# ----------------------------------------------------------------------
+# Index generators
+# ----------------------------------------------------------------------
+def iter_triu_blocks(n: int, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[tuple[np.ndarray, np.ndarray]]:  # noqa E501
+    """
+    Yield (idx_a, idx_b) with every i < j pair over `n` rows exactly once,
+    in `np.triu_indices(n, k=1)` order, at most ~`chunk_rows` pairs per
+    block (a single row's pairs are never split).
+    """
+    chunk_rows = max(1, int(chunk_rows))
+    i = 0
+    while i < n - 1:
+        # Row i contributes n - 1 - i pairs; take rows until the block is full
+        stop, size = i, 0
+        while stop < n - 1 and (size == 0 or size + (n - 1 - stop) <= chunk_rows):
+            size += n - 1 - stop
+            stop += 1
+        rows = np.arange(i, stop, dtype=np.int64)
+        per_row = n - 1 - rows
+        idx_a = np.repeat(rows, per_row)
+        offsets = np.arange(size, dtype=np.int64) - np.repeat(
+            np.cumsum(per_row) - per_row, per_row
+        )
+        idx_b = idx_a + 1 + offsets
+        yield idx_a, idx_b
+        i = stop
+
+
+def iter_cartesian_blocks(
+    n_a: int, n_b: int, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (idx_a, idx_b) covering `n_a` x `n_b` in row-major order, whole
+    rows of `a` at a time, at most ~`chunk_rows` pairs per block.
+    """
+    if n_a <= 0 or n_b <= 0:
+        return
+    rows_per_block = max(1, int(chunk_rows) // n_b)
+    for start in range(0, n_a, rows_per_block):
+        rows = np.arange(start, min(n_a, start + rows_per_block), dtype=np.int64)
+        yield np.repeat(rows, n_b), np.tile(np.arange(n_b, dtype=np.int64), len(rows))
+
+
+# ----------------------------------------------------------------------
+# Chunked output
+# ----------------------------------------------------------------------
+class PairChunkWriter:
+    """
+    Writes DataFrame chunks to `<output_dir>/<prefix>-00000.<ext>`, ... and
+    a `_<prefix>_manifest.json` with the file list and row counts on close
+    (underscore-prefixed, so Parquet dataset readers skip it).
+
+    `dtypes` (passed to `DataFrame.astype`) keeps the Parquet schema stable
+    when a column is all-null in some chunks.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        output_format: str = "parquet",
+        prefix: str = "part",
+        dtypes: dict[str, str] | None = None,
+    ):
+        output_format = str(output_format or "parquet").lower()
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of: {sorted(OUTPUT_FORMATS)}")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format
+        self.prefix = prefix
+        self.dtypes = dtypes or {}
+        self.files: list[dict[str, Any]] = []
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        if self.dtypes:
+            df = df.astype({c: t for c, t in self.dtypes.items() if c in df.columns})
+        path = self.output_dir / f"{self.prefix}-{len(self.files):05d}.{self.output_format}"  # noqa E501
+        if self.output_format == "parquet":
+            df.to_parquet(path, index=False, engine="pyarrow")
+        else:
+            df.to_csv(path, index=False)
+        self.files.append({"file": path.name, "rows": int(len(df))})
+        self.rows += int(len(df))
+
+    def close(self, **extra: Any) -> dict[str, Any]:
+        manifest = {
+            "format": self.output_format,
+            "rows": self.rows,
+            "files": self.files,
+            **extra,
+        }
+        (self.output_dir / f"_{self.prefix}_manifest.json").write_text(
+            json.dumps(manifest, indent=2, default=str)
+        )
+        return manifest
@@ -5,14 +5,17 @@ import pkgutil
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Type
-
-from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Type  # noqa E501
 
 import biofilter.modules.report.reports as reports_pkg
-from biofilter.modules.db.database import Database
 from biofilter.modules.report.reports.base_report import ReportBase
 from biofilter.utils.logger import Logger
+from biofilter.utils.registry_manifest import REPORTS_PACKAGE, cached_registry
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from biofilter.modules.db.database import Database
 
 
 @dataclass(frozen=True)
@@ -57,22 +60,37 @@ class ReportManager:
         self._index_cache = None
 
     def index(self) -> List[ReportInfo]:
-        """Return cached list of reports (module, name, description)."""
+        """
+        Return cached list of reports (module, name, description).
+
+        Read from the on-disk registry manifest when it is current, so
+        listing reports does not import every report module.
+        """
         if self._index_cache is None:
-            items: List[ReportInfo] = []
-            for module_name in self.iter_modules():
-                cls = self._load_class(module_name)
-                items.append(
-                    ReportInfo(
-                        module=module_name,
-                        name=getattr(cls, "name", module_name),
-                        description=getattr(cls, "description", "") or "",
-                    )
-                )
+            entries = cached_registry(
+                "reports",
+                REPORTS_PACKAGE,
+                list(self.iter_modules()),
+                self._build_index,
+            )
+            items = [ReportInfo(**e) for e in entries]
             items.sort(key=lambda x: x.name.lower())
             self._index_cache = items
         return list(self._index_cache)
 
+    def _build_index(self, modules: List[str]) -> List[dict]:
+        items = []
+        for module_name in modules:
+            cls = self._load_class(module_name)
+            items.append(
+                {
+                    "module": module_name,
+                    "name": getattr(cls, "name", module_name),
+                    "description": getattr(cls, "description", "") or "",
+                }
+            )
+        return items
+
     def list_reports(self) -> List[dict]:
         return [
             {"module": i.module, "name": i.name, "description": i.description}
@@ -247,6 +265,46 @@ class ReportManager:
             return cls(session=session, logger=self.logger, **kwargs)
 
     def run(self, identifier: str, **kwargs):
+        return self._execute(identifier, lambda report: report.run(), **kwargs)
+
+    def run_to_sink(
+        self,
+        identifier: str,
+        output: str | Path,
+        fmt: Optional[str] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Run a report and stream its `iter_chunks()` output into a CSV,
+        Parquet or Arrow IPC file (`fmt`, default: from the suffix of
+        `output`). Only one chunk is held in memory at a time; reports
+        without a chunked implementation are written in one piece.
+
+        Returns {"output", "format", "rows", "chunks"}.
+        """
+
+        from biofilter.modules.report.report_sinks import open_sink
+
+        def _stream(report) -> Dict[str, Any]:
+            with open_sink(output, fmt) as sink:
+                for chunk in report.iter_chunks():
+                    sink.write(chunk)
+                    self.logger.log(
+                        f"Chunk {sink.chunks}: {len(chunk):,} rows "
+                        f"({sink.rows:,} total) → {output}",
+                        "DEBUG",
+                    )
+            return {
+                "output": str(sink.path),
+                "format": sink.format,
+                "rows": sink.rows,
+                "chunks": sink.chunks,
+            }
+
+        return self._execute(identifier, _stream, **kwargs)
+
+    def _execute(self, identifier: str, action: Callable[[Any], Any], **kwargs):
+        """Instantiate the report in a fresh session and apply `action`."""
         start_time = time.perf_counter()
         report_name = identifier
         self.logger.log(
@@ -261,7 +319,7 @@ class ReportManager:
             try:
                 report = self.get(identifier, session=session, **kwargs)
                 report_name = getattr(report, "name", identifier)
-                result = report.run()
+                result = action(report)
 
                 elapsed_seconds = time.perf_counter() - start_time
                 elapsed_minutes = elapsed_seconds / 60.0
@@ -0,0 +1,201 @@
+"""
+Chunk writers for streamed report output.
+
+`ReportManager.run_to_sink()` feeds the DataFrames yielded by
+`ReportBase.iter_chunks()` into one of these sinks, so a report never has
+to hold its full result in memory:
+
+- `CsvSink`: one CSV file, header written once;
+- `ParquetSink`: one Parquet file, one row group per chunk;
+- `ArrowIpcSink`: one Arrow IPC (Feather v2) file, one record batch per
+  chunk.
+
+The Parquet/Arrow schema is fixed by the first non-empty chunk (all-null
+columns become strings) and later chunks are cast to it. Output goes to
+`<path>.partial` and is renamed on `close()`, so an interrupted report
+never leaves a truncated file under the requested name.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+SINK_FORMATS = ("csv", "parquet", "arrow")
+
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def infer_sink_format(path: str | Path) -> str:
+    """Sink format implied by the file suffix (CSV when unknown)."""
+    return _SUFFIX_FORMATS.get(Path(path).suffix.lower(), "csv")
+
+
+class ReportSink:
+    """
+    Base class: `write(df)` per chunk, then `close()` (or `abort()`).
+
+    Usable as a context manager; an exception inside the block aborts the
+    sink and removes the partial file.
+    """
+
+    format = ""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".partial")
+        self.columns: list[str] | None = None
+        self.rows = 0
+        self.chunks = 0
+        self.closed = False
+        self._template: pd.DataFrame | None = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.closed:
+            raise ValueError(f"Sink for {self.path} is already closed.")
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+        elif [str(c) for c in df.columns] != self.columns:
+            raise ValueError(
+                f"Chunk columns {list(df.columns)} do not match the first "
+                f"chunk {self.columns}."
+            )
+        if df.empty:
+            # Remembered so an all-empty report still gets a file with columns
+            if self._template is None:
+                self._template = df
+            return
+        self._write(df)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self) -> Path:
+        if self.closed:
+            return self.path
+        if not self.chunks:
+            self._write(
+                self._template
+                if self._template is not None
+                else pd.DataFrame(columns=self.columns or [])
+            )
+        self._close()
+        self.closed = True
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._close()
+        finally:
+            self.closed = True
+            self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    # Format hooks
+    def _write(self, df: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+
+class CsvSink(ReportSink):
+    format = "csv"
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._fh = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self._header = True
+
+    def _write(self, df: pd.DataFrame) -> None:
+        df.to_csv(self._fh, index=False, header=self._header)
+        self._header = False
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+class _ArrowSink(ReportSink):
+    """Shared schema handling for the Parquet and Arrow IPC sinks."""
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self.schema: pa.Schema | None = None
+        self._writer = None
+
+    def _to_table(self, df: pd.DataFrame) -> pa.Table:
+        if self.schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            fields = [
+                pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                for f in table.schema
+            ]
+            self.schema = pa.schema(fields, metadata=table.schema.metadata)
+            self._writer = self._open_writer(self.schema)
+        try:
+            return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(
+                f"Chunk does not match the {self.format} schema of the first "
+                f"chunk: {e}"
+            ) from e
+
+    def _write(self, df: pd.DataFrame) -> None:
+        table = self._to_table(df)  # opens the writer on the first chunk
+        self._writer.write_table(table)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def _open_writer(self, schema: pa.Schema):
+        raise NotImplementedError
+
+
+class ParquetSink(_ArrowSink):
+    format = "parquet"
+
+    def _open_writer(self, schema: pa.Schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(str(self.tmp_path), schema)
+
+
+class ArrowIpcSink(_ArrowSink):
+    format = "arrow"
+
+    def _open_writer(self, schema: pa.Schema):
+        return pa.ipc.new_file(str(self.tmp_path), schema)
+
+
+_SINKS = {"csv": CsvSink, "parquet": ParquetSink, "arrow": ArrowIpcSink}
+
+
+def open_sink(path: str | Path, fmt: str | None = None) -> ReportSink:
+    """Sink for `path`; `fmt` defaults to the format implied by the suffix."""
+    fmt = str(fmt or infer_sink_format(path)).lower()
+    if fmt not in _SINKS:
+        raise ValueError(f"Unsupported output format '{fmt}'. Use one of: {list(SINK_FORMATS)}")  # noqa E501
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return _SINKS[fmt](path)
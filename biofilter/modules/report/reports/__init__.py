@@ -1,43 +1,32 @@
-# from .report_etl_status import ETLStatusReport
-from .report_template import TemplateReport
-from .report_entity_filter import EntityFilterReport
-from .report_entity_relationship_model import EntityRelationshipModelReport
-from .report_variant_gene_location_model import VariantGeneLocationModelReport
-from .report_variant_binning import VariantBinningReport
-from .report_snp_snp_model import SNPSNPModelReport
-from .report_annotation_master_gene import AnnotationMasterGeneReport
-from .report_annotation_master_pathway import AnnotationMasterPathwayReport
-from .report_annotation_master_protein import AnnotationMasterProteinReport
-from .report_annotation_master_disease import AnnotationMasterDiseaseReport
-from .report_annotation_master_go import AnnotationMasterGOReport
-from .report_annotation_master_chemical import AnnotationMasterChemicalReport
-from .report_platform_data_statistics import PlatformDataStatisticsReport
-from .report_variant_annotation_expanded import VariantAnnotationExpandedReport
-from .report_variant_list_intersect import VariantListIntersectReport
-from .report_snp_snp_pair_generator import SNPSNPPairGeneratorReport
-from .report_variant_modeling import VariantModelingReport
-from .report_annotation_master_variant import AnnotationMasterVariantReport
+from biofilter.utils.lazy_import import lazy_exports
 
+# Report classes are imported on first access: ReportManager discovers the
+# modules by name and reads the registry manifest for listings.
+_REPORTS = {
+    # "ETLStatusReport": "report_etl_status",
+    "TemplateReport": "report_template",
+    "EntityFilterReport": "report_entity_filter",
+    "EntityRelationshipModelReport": "report_entity_relationship_model",
+    "VariantGeneLocationModelReport": "report_variant_gene_location_model",
+    "VariantBinningReport": "report_variant_binning",
+    "SNPSNPModelReport": "report_snp_snp_model",
+    "AnnotationMasterGeneReport": "report_annotation_master_gene",
+    "AnnotationMasterPathwayReport": "report_annotation_master_pathway",
+    "AnnotationMasterProteinReport": "report_annotation_master_protein",
+    "AnnotationMasterDiseaseReport": "report_annotation_master_disease",
+    "AnnotationMasterGOReport": "report_annotation_master_go",
+    "AnnotationMasterChemicalReport": "report_annotation_master_chemical",
+    "PlatformDataStatisticsReport": "report_platform_data_statistics",
+    "VariantAnnotationExpandedReport": "report_variant_annotation_expanded",
+    "VariantListIntersectReport": "report_variant_list_intersect",
+    "SNPSNPPairGeneratorReport": "report_snp_snp_pair_generator",
+    "VariantModelingReport": "report_variant_modeling",
+    "AnnotationMasterVariantReport": "report_annotation_master_variant",
+}
 
-__all__ = [
-    # Mapping all Reports
-    # "ETLStatusReport",
-    "TemplateReport",
-    "EntityFilterReport",
-    "EntityRelationshipModelReport",
-    "VariantGeneLocationModelReport",
-    "VariantBinningReport",
-    "SNPSNPModelReport",
-    "AnnotationMasterGeneReport",
-    "AnnotationMasterPathwayReport",
-    "AnnotationMasterProteinReport",
-    "AnnotationMasterDiseaseReport",
-    "AnnotationMasterGOReport",
-    "AnnotationMasterChemicalReport",
-    "PlatformDataStatisticsReport",
-    "VariantAnnotationExpandedReport",
-    "VariantListIntersectReport",
-    "SNPSNPPairGeneratorReport",
-    "VariantModelingReport",
-    "AnnotationMasterVariantReport",
-]
+__getattr__ = lazy_exports(
+    __name__, {cls: f"{__name__}.{module}" for cls, module in _REPORTS.items()}
+)
+
+
+__all__ = list(_REPORTS)
@@ -4,7 +4,7 @@ import os
 import re
 import ast
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 from sqlalchemy import func
 
@@ -41,6 +41,16 @@ class ReportBase:
     def run(self):
         raise NotImplementedError("Subclasses must implement `run()`.")
 
+    def iter_chunks(self) -> Iterator[Any]:
+        """
+        Yield the report output as a sequence of DataFrames with the same
+        columns. `ReportManager.run_to_sink()` writes each chunk as it
+        arrives, so reports that can produce their rows piecewise (per
+        chromosome, per gene window, ...) override this to keep memory
+        bounded. The default yields the full `run()` result once.
+        """
+        yield self.run()
+
     # Small helper for params
     def param(self, key: str, default: Any = None, required: bool = False) -> Any:
         if key in self.params:
@@ -165,6 +175,27 @@ class ReportBase:
         )
         return {row[0]: row[1] for row in rows}
 
+    def gene_interval_index(
+        self,
+        build: int,
+        group_names: Optional[Iterable[str]] = None,
+        group_on: str = "entity",
+    ):
+        """
+        Process-cached GeneIntervalIndex for `build`, restricted to the
+        entity groups named in `group_names` (case-insensitive; empty or
+        None = all locations).
+        """
+        from biofilter.modules.report.gene_interval_index import (
+            entity_group_ids,
+            load_gene_interval_index,
+        )
+
+        group_ids = entity_group_ids(self.session, group_names) if group_names else None  # noqa E501
+        return load_gene_interval_index(
+            self.session, build=int(build), group_ids=group_ids, group_on=group_on
+        )
+
     def parse_and_join(self, alleles):
         if isinstance(alleles, str):
             try:
@@ -18,6 +18,9 @@ from biofilter.modules.db.models.model_variants import (
     map_variant_molecular_effects,
 )
 from biofilter.modules.report.reports.base_report import ReportBase
+from biofilter.modules.report.variant_position_resolver import (
+    resolve_variants_at_positions,
+)
 
 _RSID_RE = re.compile(r"^rs\d+$", re.IGNORECASE)
 _CHR_POS_RE = re.compile(r"^(?:chr)?([0-9xyXYmMtT]+)\s*[:;,\s]\s*(\d+)$")
@@ -272,19 +275,14 @@ class AnnotationMasterVariantReport(ReportBase):
             for p in rsid_inputs:
                 result[p["raw"]] = rsid_to_rows.get(p["rsid"], [])
 
-        # chr:pos lookup — one query per input
+        # chr:pos lookup — one staged join per chromosome for all inputs
+        pos_to_rows = resolve_variants_at_positions(
+            self.session,
+            vm,
+            [(p["chromosome"], p["position"]) for p in pos_inputs],
+        )
         for p in pos_inputs:
-            chrom, pos = p["chromosome"], p["position"]
-            stmt = vm.select().where(
-                and_(
-                    vm.c.chromosome == chrom,
-                    vm.c.position_start <= pos,
-                    vm.c.position_end >= pos,
-                )
-            )
-            if "allele_type" in vm.c:
-                stmt = stmt.where(func.lower(vm.c.allele_type) == "snv")
-            rows = conn.execute(stmt).mappings().fetchall()
+            rows = pos_to_rows[(p["chromosome"], p["position"])]
             seen: set[int] = set()
             deduped = []
             for row in rows:
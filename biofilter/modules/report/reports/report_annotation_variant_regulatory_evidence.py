@@ -8,6 +8,7 @@ import pandas as pd
 from sqlalchemy import func, text
 from sqlalchemy.orm import aliased
 
+from biofilter.modules.db.arrow_fetch import fetch_frame
 from biofilter.modules.db.models import (
     EntityAlias,
     EntityGroup,
@@ -458,15 +459,14 @@ class AnnotationVariantRegulatoryEvidenceReport(ReportBase):
         """  # noqa: S608 — bind params used for all user-provided values
 
         try:
-            rows = self.session.execute(text(sql), bind).mappings().all()
+            df = fetch_frame(self.session, sql, bind)
         except Exception as exc:
             self.logger.log(f"rsid mode query failed: {exc}", "ERROR")
             return None
 
-        if not rows:
+        if df.empty:
             return None
 
-        df = pd.DataFrame([dict(r) for r in rows])
         df["input_term"] = df["rsid"].apply(
             lambda r: rsid_to_input.get(str(r).lower()) if r is not None else None
         )
@@ -575,16 +575,14 @@ class AnnotationVariantRegulatoryEvidenceReport(ReportBase):
         """  # noqa: S608
 
         try:
-            rows = self.session.execute(text(sql), bind).mappings().all()
+            df = fetch_frame(self.session, sql, bind)
         except Exception as exc:
             self.logger.log(f"Query failed for chr{chromosome}: {exc}", "ERROR")
             return None
 
-        if not rows:
+        if df.empty:
             return None
 
-        df = pd.DataFrame([dict(r) for r in rows])
-
         if include_input_gene and not df.empty:
             entity_to_symbol = self._batch_entity_primary_symbols(
                 [int(e) for e in df["input_gene_entity_id"].dropna().unique()]
@@ -3,6 +3,11 @@ from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import aliased
 
 from biofilter.modules.db.models import Entity, EntityAlias, EntityGroup
+from biofilter.modules.report.alias_fuzzy_search import (
+    candidate_alias_keys,
+    fetch_for_keys,
+    score_alias_keys,
+)
 from biofilter.modules.report.reports.base_report import ReportBase
 
 VALID_MATCH_MODES = ("exact", "like", "fuzzy")
@@ -188,21 +193,15 @@ class EntityFilterReport(ReportBase):
         group_filter: str | None,
     ) -> tuple[list, dict, dict]:
         """
-        Fetch all alias keys from DB and use rapidfuzz to find matches above threshold.
+        Score alias keys against the inputs with rapidfuzz and keep those
+        above threshold. When the alias search index is built, only its
+        candidate keys are fetched and scored.
 
         Returns:
             matched_keys: list of alias keys that matched
             key_to_input_original: alias_key -> original input string
             match_scores: alias_key -> best similarity score
         """
-        try:
-            from rapidfuzz import fuzz, process
-        except ImportError:
-            raise ImportError(
-                "rapidfuzz is required for fuzzy matching. "
-                "Install it with: pip install rapidfuzz"
-            )
-
         # Lightweight query: only alias keys (with optional group filter)
         light_q = (
             self.session.query(input_key_expr.label("input_key"))
@@ -215,20 +214,22 @@ class EntityFilterReport(ReportBase):
                 func.lower(EntityGroup.name) == group_filter.lower()
             )
 
-        all_alias_keys = [row.input_key for row in light_q.all() if row.input_key]
+        candidates = candidate_alias_keys(
+            self.session, input_keys, threshold, logger=self.logger
+        )
+        rows = (
+            light_q.all()
+            if candidates is None
+            else fetch_for_keys(light_q, input_key_expr, candidates)
+        )
+        all_alias_keys = [row.input_key for row in rows if row.input_key]
 
         key_to_input_original: dict[str, str] = {}
         match_scores: dict[str, float] = {}
 
+        scored = score_alias_keys(input_keys, all_alias_keys, threshold)
         for input_key in input_keys:
-            results = process.extract(
-                input_key,
-                all_alias_keys,
-                scorer=fuzz.token_sort_ratio,
-                score_cutoff=threshold,
-                limit=None,
-            )
-            for alias_key, score, _ in results:
+            for alias_key, score in scored[input_key]:
                 if score > match_scores.get(alias_key, 0):
                     key_to_input_original[alias_key] = normalized_to_original[input_key]
                     match_scores[alias_key] = score
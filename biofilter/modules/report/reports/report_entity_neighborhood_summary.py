@@ -25,6 +25,11 @@ from biofilter.modules.db.models import (
     EntityGroup,
     EntityRelationship,
 )
+from biofilter.modules.report.alias_fuzzy_search import (
+    candidate_alias_keys,
+    fetch_for_keys,
+    score_alias_keys,
+)
 from biofilter.modules.report.reports.base_report import ReportBase
 
 
@@ -396,22 +401,14 @@ class EntityNeighborhoodSummaryReport(ReportBase):
         threshold: float,
         primary_alias,
     ) -> dict[str, list[dict]]:
-        try:
-            from rapidfuzz import fuzz, process
-        except ImportError:
-            raise ImportError(
-                "rapidfuzz is required for fuzzy matching. "
-                "Install it with: pip install rapidfuzz"
-            )
-
         from sqlalchemy import func
 
         word_expr = func.lower(
             func.coalesce(EntityAlias.alias_norm, EntityAlias.alias_value)
         )
 
-        # Pull all alias candidates for the (optional) group, with primary
-        # alias and group name.
+        # Alias rows for the (optional) group, with primary alias and group
+        # name; restricted to the alias search index candidates when built.
         q = (
             self.session.query(
                 word_expr.label("matched_norm"),
@@ -434,25 +431,27 @@ class EntityNeighborhoodSummaryReport(ReportBase):
         if group_id is not None:
             q = q.filter(Entity.group_id == group_id)
 
-        all_rows = q.all()
-        all_keys = [r.matched_norm for r in all_rows if r.matched_norm]
+        norm_words = list(dict.fromkeys(w.lower() for w in words))
+        candidates = candidate_alias_keys(
+            self.session, norm_words, threshold, logger=self.logger
+        )
+        all_rows = (
+            q.all() if candidates is None else fetch_for_keys(q, word_expr, candidates)
+        )
+        all_keys = list(
+            dict.fromkeys(r.matched_norm for r in all_rows if r.matched_norm)
+        )
         # Many-to-one: same matched_norm can map to multiple entities.
         key_to_rows: dict[str, list] = {}
         for r in all_rows:
             if r.matched_norm:
                 key_to_rows.setdefault(r.matched_norm, []).append(r)
 
+        scored = score_alias_keys(norm_words, all_keys, threshold)
         out: dict[str, list[dict]] = {}
         for word in words:
-            results = process.extract(
-                word.lower(),
-                all_keys,
-                scorer=fuzz.token_sort_ratio,
-                score_cutoff=threshold,
-                limit=None,
-            )
             best_per_entity: dict[int, dict] = {}
-            for matched_key, score, _ in results:
+            for matched_key, score in scored[word.lower()]:
                 for r in key_to_rows.get(matched_key, []):
                     eid = int(r.entity_id)
                     prev = best_per_entity.get(eid)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 
 import pandas as pd
 from sqlalchemy import func, or_, text
 from sqlalchemy.orm import aliased
 
+from biofilter.modules.db.arrow_fetch import fetch_frame
 from biofilter.modules.db.models import (
     EntityAlias,
     EntityGroup,
@@ -16,6 +18,7 @@ from biofilter.modules.db.models import (
     VariantConsequenceGroup,
     VariantImpact,
 )
+from biofilter.modules.etl.predictor_summary import has_predictor_summary
 from biofilter.modules.report.reports.base_report import ReportBase
 
 # ---------------------------------------------------------------------------
@@ -120,6 +123,7 @@ class GeneToVariantFilteringReport(ReportBase):
     )
 
     _BATCH = 500
+    _use_predictor_summary = False
 
     # ------------------------------------------------------------------
     # Public interface
@@ -143,6 +147,7 @@ class GeneToVariantFilteringReport(ReportBase):
             "alphamissense_score_min": None,
             "alphamissense_classification": None,
             "max_variants_per_gene": 5000,
+            "parallel_chromosomes": False,
         }
 
     @classmethod
@@ -192,6 +197,10 @@ class GeneToVariantFilteringReport(ReportBase):
             "\n"
             "  max_variants_per_gene (default 5000)  safety cap; emits a WARNING\n"
             "    if a gene exceeds this limit after all filters.\n"
+            "\n"
+            "  parallel_chromosomes (default False)  True (up to 4) or a number of\n"
+            "    connections used to query chromosome partitions concurrently.\n"
+            "    PostgreSQL only; other backends query sequentially.\n"
         )
 
     # ------------------------------------------------------------------
@@ -199,6 +208,21 @@ class GeneToVariantFilteringReport(ReportBase):
     # ------------------------------------------------------------------
 
     def run(self) -> pd.DataFrame:
+        frames = list(self.iter_chunks())
+        if len(frames) == 1:
+            return frames[0]
+        # Chunks arrive per chromosome; a gene never spans two chromosomes,
+        # so a stable sort on gene_entity_id restores the single-pass order.
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values("gene_entity_id", kind="mergesort", ignore_index=True)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the report one chromosome at a time (genes sorted by
+        entity_id within each chunk), or a single status row when the
+        input does not resolve. Every per-gene step (dedup, cap) only
+        needs the gene's own rows, so chunks are final as yielded.
+        """
         # ── 1. Read parameters ─────────────────────────────────────────────
         # run_example() passes example_input() as input_data=<dict>; unpack it
         # so the individual keys are available via self.param().
@@ -218,7 +242,8 @@ class GeneToVariantFilteringReport(ReportBase):
             gene_symbols = self.resolve_input_list(raw_genes, param_name="gene_symbols")
 
         if not gene_symbols:
-            return _empty_df(raw_genes, "empty_gene_list")
+            yield _empty_df(raw_genes, "empty_gene_list")
+            return
 
         build = int(self.param("build", default=38) or 38)
         gene_window_bp = int(self.param("gene_window_bp", default=0) or 0)
@@ -257,7 +282,8 @@ class GeneToVariantFilteringReport(ReportBase):
         gene_entity_map = self._resolve_gene_symbols(gene_symbols)
         if not gene_entity_map:
             self.logger.log("No genes resolved from input symbols", "WARNING")
-            return _empty_df(gene_symbols, "no_genes_resolved")
+            yield _empty_df(gene_symbols, "no_genes_resolved")
+            return
 
         self.logger.log(
             f"Resolved {len(gene_entity_map)}/{len(gene_symbols)} gene symbols"
@@ -272,7 +298,8 @@ class GeneToVariantFilteringReport(ReportBase):
         )
         if not gene_loci:
             self.logger.log("No genomic loci found for resolved genes", "WARNING")
-            return _empty_df(gene_symbols, "no_loci_found")
+            yield _empty_df(gene_symbols, "no_loci_found")
+            return
 
         self.logger.log(f"Gene loci resolved: {len(gene_loci)} genes with locations")
 
@@ -288,43 +315,176 @@ class GeneToVariantFilteringReport(ReportBase):
         consequence_labels = self._build_consequence_labels()
         impact_labels = self._build_impact_labels()
 
-        # ── 6. Create temp table and populate ──────────────────────────────
-        self._create_temp_table()
-        self._populate_temp_table(gene_entity_map, gene_loci)
-
-        # ── 7. Query variants per chromosome ───────────────────────────────
+        # ── 6. Query variants per chromosome (temp gene-range table) ───────
+        # Checked once on the report session (parallel workers must not use it)
+        self._use_predictor_summary = self._has_predictor_summary()
+        if not self._use_predictor_summary:
+            self.logger.log(
+                "variant_predictor_summary not found; aggregating "
+                "AlphaMissense predictions at query time",
+                "WARNING",
+            )
         chromosomes = sorted({loc["chromosome"] for loc in gene_loci.values()})
-        self.logger.log(f"Querying {len(chromosomes)} chromosome partition(s)")
+        query_kwargs = dict(
+            most_severe_only=most_severe_only,
+            impact_ids=impact_ids,
+            consequence_ids=consequence_ids,
+            lof_confidence=lof_confidence_filter,
+            af_max=af_max,
+            af_min=af_min,
+            cadd_phred_min=cadd_phred_min,
+            sift_score_max=sift_score_max,
+            polyphen_score_min=polyphen_score_min,
+        )
+        workers = self._chromosome_workers(len(chromosomes))
+        if workers > 1:
+            self.logger.log(
+                f"Querying {len(chromosomes)} chromosome partition(s) "
+                f"on {workers} connections"
+            )
+            chrom_frames = self._iter_chromosomes_parallel(
+                chromosomes, gene_entity_map, gene_loci, query_kwargs, workers
+            )
+        else:
+            self.logger.log(f"Querying {len(chromosomes)} chromosome partition(s)")
+            chrom_frames = self._iter_chromosomes(
+                chromosomes, gene_entity_map, gene_loci, query_kwargs
+            )
+
+        # ── 7. Filter and yield variants per chromosome ────────────────────
+        total_rows = total_genes = total_variants = 0
+        for chrom, df_chrom in chrom_frames:
+            if df_chrom is None or df_chrom.empty:
+                continue
+            self.logger.log(
+                f"  chr{chrom}: {len(df_chrom)} rows, "
+                f"{df_chrom['variant_id'].nunique()} unique variants"
+            )
+
+            df_chrom = self._finalize_chunk(
+                df_chrom,
+                consequence_labels=consequence_labels,
+                impact_labels=impact_labels,
+                am_score_min=am_score_min,
+                am_class_filter=am_class_filter,
+                most_severe_only=most_severe_only,
+                max_per_gene=max_per_gene,
+            )
+            if df_chrom.empty:
+                continue
+
+            # Genes and variants never repeat across chromosomes
+            total_rows += len(df_chrom)
+            total_genes += df_chrom["gene_entity_id"].nunique()
+            total_variants += df_chrom["variant_id"].nunique()
+            yield df_chrom
+
+        if not total_rows:
+            yield _empty_df(gene_symbols, "no_variants_found")
+            return
 
-        frames: list[pd.DataFrame] = []
+        self.logger.log(
+            f"Final output: {total_rows} rows, "
+            f"{total_genes} genes, "
+            f"{total_variants} unique variants"
+        )
+
+    def _chromosome_workers(self, n_chromosomes: int) -> int:
+        """
+        Connections to use for the per-chromosome queries. `parallel_chromosomes`
+        accepts True (up to 4) or a worker count; only PostgreSQL runs them
+        concurrently, other backends fall back to one session.
+        """
+        raw = self.param("parallel_chromosomes", default=False)
+        if raw is True:
+            workers = 4
+        else:
+            try:
+                workers = int(raw or 0)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"parallel_chromosomes must be a boolean or an integer, got {raw!r}"
+                )
+        workers = min(workers, n_chromosomes)
+        if workers > 1 and not self._supports_parallel_chromosomes():
+            self.logger.log(
+                "parallel_chromosomes is only used on PostgreSQL; "
+                "querying chromosomes sequentially",
+                "WARNING",
+            )
+            return 1
+        return workers
+
+    def _has_predictor_summary(self) -> bool:
+        return has_predictor_summary(self.session.connection())
+
+    def _supports_parallel_chromosomes(self) -> bool:
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    def _iter_chromosomes(
+        self,
+        chromosomes: list[int],
+        gene_entity_map: dict[int, str],
+        gene_loci: dict[int, dict],
+        query_kwargs: dict[str, Any],
+    ) -> Iterator[tuple[int, pd.DataFrame | None]]:
+        """One temp table on the report session, one query per chromosome."""
+        self._create_temp_table()
+        self._populate_temp_table(gene_entity_map, gene_loci)
         try:
             for chrom in chromosomes:
-                df_chrom = self._query_chromosome(
-                    chromosome=chrom,
-                    most_severe_only=most_severe_only,
-                    impact_ids=impact_ids,
-                    consequence_ids=consequence_ids,
-                    lof_confidence=lof_confidence_filter,
-                    af_max=af_max,
-                    af_min=af_min,
-                    cadd_phred_min=cadd_phred_min,
-                    sift_score_max=sift_score_max,
-                    polyphen_score_min=polyphen_score_min,
-                )
-                if df_chrom is not None and not df_chrom.empty:
-                    frames.append(df_chrom)
-                    self.logger.log(
-                        f"  chr{chrom}: {len(df_chrom)} rows, "
-                        f"{df_chrom['variant_id'].nunique()} unique variants"
-                    )
+                yield chrom, self._query_chromosome(chromosome=chrom, **query_kwargs)
         finally:
             self._drop_temp_table()
 
-        if not frames:
-            return _empty_df(gene_symbols, "no_variants_found")
+    def _iter_chromosomes_parallel(
+        self,
+        chromosomes: list[int],
+        gene_entity_map: dict[int, str],
+        gene_loci: dict[int, dict],
+        query_kwargs: dict[str, Any],
+        workers: int,
+    ) -> Iterator[tuple[int, pd.DataFrame | None]]:
+        """
+        Run each chromosome on its own pooled connection with a private temp
+        table holding only that chromosome's genes. Results are yielded in
+        chromosome order as soon as each one (and all before it) is done.
+        """
+        engine = self.session.get_bind()
+
+        def _query(chrom: int) -> pd.DataFrame | None:
+            chrom_loci = {
+                eid: loc for eid, loc in gene_loci.items() if loc["chromosome"] == chrom
+            }
+            with engine.connect() as conn:
+                try:
+                    self._create_temp_table(conn)
+                    self._populate_temp_table(gene_entity_map, chrom_loci, conn)
+                    return self._query_chromosome(
+                        chromosome=chrom, conn=conn, **query_kwargs
+                    )
+                finally:
+                    conn.rollback()
 
-        df = pd.concat(frames, ignore_index=True)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="g2v_chrom")
+        try:
+            futures = [(chrom, pool.submit(_query, chrom)) for chrom in chromosomes]
+            for chrom, future in futures:
+                yield chrom, future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
+    def _finalize_chunk(
+        self,
+        df: pd.DataFrame,
+        consequence_labels: dict[int, dict],
+        impact_labels: dict[int, str],
+        am_score_min,
+        am_class_filter: list[str],
+        most_severe_only: bool,
+        max_per_gene: int,
+    ) -> pd.DataFrame:
+        """Label, filter, dedup, cap and order the rows of one chromosome."""
         # ── 8. Enrich with label columns ───────────────────────────────────
         df["consequence_name"] = df["consequence_id"].map(
             lambda x: consequence_labels.get(x, {}).get("name")
@@ -365,6 +525,9 @@ class GeneToVariantFilteringReport(ReportBase):
                     f"({before - after} transcript duplicates removed)"
                 )
 
+        if df.empty:
+            return df
+
         # ── 11. Apply max_variants_per_gene cap ────────────────────────────
         capped_frames: list[pd.DataFrame] = []
         for gene_eid, gdf in df.groupby("gene_entity_id"):
@@ -384,14 +547,7 @@ class GeneToVariantFilteringReport(ReportBase):
         df["resolution_status"] = None
         df["gene_input"] = df["gene_symbol"]
 
-        total_variants = df["variant_id"].nunique()  # noqa: E501
-        self.logger.log(
-            f"Final output: {len(df)} rows, "
-            f"{df['gene_entity_id'].nunique()} genes, "
-            f"{total_variants} unique variants"
-        )
-
-        # ── 11. Reorder columns (and suppress transcript columns in variant mode) ──
+        # ── 12. Reorder columns (and suppress transcript columns in variant mode) ──
         # When most_severe_only=True the unit is the variant, not the transcript.
         # transcript_id, canonical and mane_select are implementation details of
         # the consequence selection — exposing them would confuse users who did
@@ -627,9 +783,10 @@ class GeneToVariantFilteringReport(ReportBase):
     # Step 6 — Temp table lifecycle
     # ------------------------------------------------------------------
 
-    def _create_temp_table(self) -> None:
-        self.session.execute(text(f"DROP TABLE IF EXISTS {_TEMP_TABLE}"))
-        self.session.execute(
+    def _create_temp_table(self, conn=None) -> None:
+        db = conn if conn is not None else self.session
+        db.execute(text(f"DROP TABLE IF EXISTS {_TEMP_TABLE}"))
+        db.execute(
             text(
                 f"""
             CREATE TEMP TABLE {_TEMP_TABLE} (
@@ -642,13 +799,16 @@ class GeneToVariantFilteringReport(ReportBase):
         """
             )
         )
-        self.session.flush()
+        if conn is None:
+            self.session.flush()
 
     def _populate_temp_table(
         self,
         gene_entity_map: dict[int, str],
         gene_loci: dict[int, dict],
+        conn=None,
     ) -> None:
+        db = conn if conn is not None else self.session
         rows = []
         for eid, loc in gene_loci.items():
             rows.append(
@@ -663,7 +823,7 @@ class GeneToVariantFilteringReport(ReportBase):
 
         for i in range(0, len(rows), self._BATCH):
             batch = rows[i : i + self._BATCH]
-            self.session.execute(
+            db.execute(
                 text(
                     f"""
                     INSERT INTO {_TEMP_TABLE}
@@ -673,7 +833,8 @@ class GeneToVariantFilteringReport(ReportBase):
                 ),
                 batch,
             )
-        self.session.flush()
+        if conn is None:
+            self.session.flush()
 
     def _drop_temp_table(self) -> None:
         try:
@@ -686,6 +847,35 @@ class GeneToVariantFilteringReport(ReportBase):
     # Step 7 — Per-chromosome variant query
     # ------------------------------------------------------------------
 
+    def _alphamissense_source(self) -> str:
+        """
+        Per-variant AlphaMissense relation joined as `vep_am` (am_score,
+        am_class). Reads the precomputed variant_predictor_summary when the
+        database has it, else aggregates the raw predictions per query.
+        """
+        if self._use_predictor_summary:
+            return """(
+                SELECT
+                    chromosome,
+                    variant_id,
+                    max_score          AS am_score,
+                    max_classification AS am_class
+                FROM variant_predictor_summary
+                WHERE chromosome     = :chromosome
+                  AND predictor_name = 'alphamissense'
+            )"""
+        return """(
+                SELECT
+                    chromosome,
+                    variant_id,
+                    MAX(score)          AS am_score,
+                    MAX(classification) AS am_class
+                FROM variant_effect_predictions
+                WHERE chromosome = :chromosome
+                  AND LOWER(predictor_name) = 'alphamissense'
+                GROUP BY chromosome, variant_id
+            )"""
+
     def _query_chromosome(
         self,
         chromosome: int,
@@ -698,6 +888,7 @@ class GeneToVariantFilteringReport(ReportBase):
         cadd_phred_min,
         sift_score_max,
         polyphen_score_min,
+        conn=None,
     ) -> pd.DataFrame | None:
         """
         Build and execute the main variant query for one chromosome.
@@ -711,6 +902,9 @@ class GeneToVariantFilteringReport(ReportBase):
 
         The join condition uses BETWEEN which allows the Postgres query planner
         to use indexes on (chromosome, position_start).
+
+        `conn` runs the query on a worker connection (parallel_chromosomes)
+        instead of the report session; it must hold its own temp table.
         """
         # ── VME filters ────────────────────────────────────────────────────
         vme_clauses: list[str] = []
@@ -786,17 +980,7 @@ class GeneToVariantFilteringReport(ReportBase):
                 ON  vme.variant_id  = vm.variant_id
                 AND vme.chromosome  = vm.chromosome
                 {" ".join(vme_clauses)}
-            LEFT JOIN (
-                SELECT
-                    chromosome,
-                    variant_id,
-                    MAX(score)          AS am_score,
-                    MAX(classification) AS am_class
-                FROM variant_effect_predictions
-                WHERE chromosome   = :chromosome
-                  AND predictor_key = 'alphamissense'
-                GROUP BY chromosome, variant_id
-            ) vep_am
+            LEFT JOIN {self._alphamissense_source()} vep_am
                 ON  vep_am.variant_id  = vm.variant_id
                 AND vep_am.chromosome  = vm.chromosome
             WHERE vm.chromosome = :chromosome
@@ -805,15 +989,15 @@ class GeneToVariantFilteringReport(ReportBase):
         """  # noqa: S608 — bind params used for all user values; IDs are pre-resolved ints
 
         try:
-            result = self.session.execute(text(sql), bind_params)
-            rows = result.mappings().all()
+            db = conn if conn is not None else self.session
+            # Streamed into Arrow batches; no per-row dicts
+            df = fetch_frame(db, sql, bind_params)
         except Exception as exc:
             self.logger.log(f"Query failed for chr{chromosome}: {exc}", "ERROR")
             return None
 
-        if not rows:
+        if df.empty:
             return None
 
-        df = pd.DataFrame([dict(r) for r in rows])
         df["gene_chromosome"] = chromosome
         return df
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import re
 from collections import OrderedDict
-from itertools import combinations
-from typing import Any
+from itertools import combinations, islice
+from pathlib import Path
+from typing import Any, Iterator
 
 import pandas as pd
 from sqlalchemy import MetaData, Table, and_, func, or_, select
@@ -18,7 +19,16 @@ from biofilter.modules.db.models import (
     EntityRelationshipType,
     ETLDataSource,
 )
+from biofilter.modules.report.pair_engine import (
+    DEFAULT_CHUNK_ROWS,
+    OUTPUT_FORMATS,
+    PairChunkWriter,
+    count_cross_pairs,
+)
 from biofilter.modules.report.reports.base_report import ReportBase
+from biofilter.modules.report.variant_position_resolver import (
+    resolve_variants_at_positions,
+)
 
 
 def _norm_str(value: Any) -> str:
@@ -411,35 +421,27 @@ class SNPSNPModelReport(ReportBase):
         out["raw"] = f"{_format_chr(chrom_i)}:{pos_i}"
         return out
 
-    def _query_variants_at_position(
+    def _query_variants_at_positions(
         self,
         vm: Table,
-        chrom: int,
-        pos: int,
-    ) -> list[dict[str, Any]]:
-        stmt = (
-            select(
-                vm.c.variant_id,
-                vm.c.rsid,
-                vm.c.chromosome,
-                vm.c.position_start,
-                vm.c.position_end,
-                vm.c.reference_allele,
-                vm.c.alternate_allele,
-            )
-            .where(
-                and_(
-                    vm.c.chromosome == int(chrom),
-                    vm.c.position_start <= int(pos),
-                    vm.c.position_end >= int(pos),
-                )
-            )
-            .order_by(vm.c.position_start.asc(), vm.c.variant_id.asc())
+        positions: list[tuple[int, int]],
+    ) -> dict[tuple[int, int], list[dict[str, Any]]]:
+        """Seed variants for all (chromosome, position) inputs in one staged join."""
+        found = resolve_variants_at_positions(
+            self.session,
+            vm,
+            positions,
+            columns=[
+                "variant_id",
+                "rsid",
+                "chromosome",
+                "position_start",
+                "position_end",
+                "reference_allele",
+                "alternate_allele",
+            ],
         )
-        if "allele_type" in vm.c:
-            stmt = stmt.where(func.lower(vm.c.allele_type) == "snv")
-        rows = self.session.execute(stmt).mappings().all()
-        return self._dedupe_variants([dict(row) for row in rows])
+        return {pair: self._dedupe_variants(rows) for pair, rows in found.items()}
 
     def _query_variants_overlap(
         self,
@@ -479,58 +481,6 @@ class SNPSNPModelReport(ReportBase):
             return deduped[:limit]
         return deduped
 
-    def _query_genes_overlap(
-        self,
-        chrom: int,
-        start: int,
-        end: int,
-        build: int,
-        gene_group_filter: set[str],
-    ) -> list[dict[str, Any]]:
-        primary_alias = aliased(EntityAlias)
-        q = (
-            self.session.query(
-                Entity.id.label("entity_id"),
-                EntityGroup.name.label("group_name"),
-                primary_alias.alias_value.label("primary_name"),
-                EntityLocation.chromosome.label("chromosome"),
-                EntityLocation.start_pos.label("start_pos"),
-                EntityLocation.end_pos.label("end_pos"),
-            )
-            .join(EntityLocation, EntityLocation.entity_id == Entity.id)
-            .join(EntityGroup, Entity.group_id == EntityGroup.id, isouter=True)
-            .join(
-                primary_alias,
-                and_(
-                    primary_alias.entity_id == Entity.id,
-                    primary_alias.is_primary.is_(True),
-                ),
-                isouter=True,
-            )
-            .filter(EntityLocation.build == int(build))
-            .filter(EntityLocation.chromosome == int(chrom))
-            .filter(EntityLocation.start_pos <= int(end))
-            .filter(EntityLocation.end_pos >= int(start))
-        )
-
-        if gene_group_filter:
-            q = q.filter(func.lower(EntityGroup.name).in_(list(gene_group_filter)))
-
-        rows = q.all()
-        out: list[dict[str, Any]] = []
-        for row in rows:
-            out.append(
-                {
-                    "entity_id": int(row.entity_id),
-                    "group_name": row.group_name,
-                    "primary_name": row.primary_name,
-                    "chromosome": int(row.chromosome),
-                    "start_pos": int(row.start_pos),
-                    "end_pos": int(row.end_pos),
-                }
-            )
-        return out
-
     def _resolve_entities_by_alias(
         self,
         alias_keys: list[str],
@@ -993,6 +943,91 @@ class SNPSNPModelReport(ReportBase):
             )
         return out
 
+    @classmethod
+    def _column_dtypes(cls) -> dict[str, str]:
+        """Nullable dtypes that keep chunked Parquet output on one schema."""
+        int_columns = {"input_position", "build", "window_bp"}
+        int_suffixes = ("_id", "_chromosome", "_start", "_end", "_count")
+        return {
+            col: "Int64" if col in int_columns or col.endswith(int_suffixes) else "string"
+            for col in cls.columns
+        }
+
+    def _iter_snp_pair_rows(
+        self,
+        gene_pair_models: list[dict[str, Any]],
+        gene_to_variants: dict[int, list[dict[str, Any]]],
+        seed_variant_ids: set[int],
+        snp_pair_scope: str,
+        stats: dict[str, Any],
+        entity_name,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield one snp_pair row per distinct variant pair of each gene pair,
+        so callers can stream them instead of holding every pair.
+        """
+        for model in gene_pair_models:
+            gene_1_id = int(model["gene_1_id"])
+            gene_2_id = int(model["gene_2_id"])
+            v1_list = gene_to_variants.get(gene_1_id, [])
+            v2_list = gene_to_variants.get(gene_2_id, [])
+            if not v1_list or not v2_list:
+                continue
+
+            pair_fields = {
+                "gene_1_id": gene_1_id,
+                "gene_1_name": entity_name(gene_1_id),
+                "gene_2_id": gene_2_id,
+                "gene_2_name": entity_name(gene_2_id),
+                "gene_pair_seed_scope": model["gene_pair_seed_scope"],
+                "gene_pair_seed_count": model["gene_pair_seed_count"],
+                "group_support_count": len(model["group_ids"]),
+                "group_support_ids": "|".join(str(x) for x in model["group_ids"]),
+                "group_support_names": "|".join(model["group_names"]),
+                "data_source_support_count": len(model["data_source_ids"]),
+                "data_source_support_ids": "|".join(str(x) for x in model["data_source_ids"]),
+                "data_source_support_names": "|".join(model["data_source_names"]),
+            }
+            per_gene_pair_seen: set[tuple[int, int]] = set()
+
+            for v1 in v1_list:
+                for v2 in v2_list:
+                    id1 = int(v1["variant_id"])
+                    id2 = int(v2["variant_id"])
+                    if id1 == id2:
+                        continue
+
+                    dedup_key = (min(id1, id2), max(id1, id2))
+                    if dedup_key in per_gene_pair_seen:
+                        continue
+                    per_gene_pair_seen.add(dedup_key)
+
+                    seed_count = int(id1 in seed_variant_ids) + int(id2 in seed_variant_ids)
+                    if not _scope_keep(snp_pair_scope, seed_count):
+                        continue
+
+                    row = self._base_row()
+                    row.update(stats)
+                    row["row_type"] = "snp_pair"
+                    row["observation"] = "ok"
+                    row.update(pair_fields)
+
+                    row["variant_1_id"] = id1
+                    row["variant_1_rsid"] = v1.get("rsid")
+                    row["variant_1_chromosome"] = v1.get("chromosome")
+                    row["variant_1_start"] = v1.get("position_start")
+                    row["variant_1_end"] = v1.get("position_end")
+
+                    row["variant_2_id"] = id2
+                    row["variant_2_rsid"] = v2.get("rsid")
+                    row["variant_2_chromosome"] = v2.get("chromosome")
+                    row["variant_2_start"] = v2.get("position_start")
+                    row["variant_2_end"] = v2.get("position_end")
+
+                    row["snp_pair_seed_count"] = seed_count
+                    row["snp_pair_seed_scope"] = _seed_scope(seed_count)
+                    yield row
+
     def _base_row(self) -> dict[str, Any]:
         return {column: None for column in self.columns}
 
@@ -1017,6 +1052,14 @@ class SNPSNPModelReport(ReportBase):
             0,
             int(self.param("max_snp_pairs", 200000) or 200000),
         )
+        # Hard guard: refuse the SNP-SNP expansion when its exact size is larger
+        max_pairs = max(0, int(self.param("max_pairs", 0) or 0))
+        estimate_pairs_only = _parse_bool(self.param("estimate_pairs_only", False), False)
+        output_path = self.param("output_path", None)
+        output_format = _norm_str(self.param("output_format", "parquet")).lower() or "parquet"
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of: {', '.join(sorted(OUTPUT_FORMATS))}.")
+        chunk_rows = max(1, int(self.param("chunk_rows", DEFAULT_CHUNK_ROWS) or DEFAULT_CHUNK_ROWS))
 
         gene_pair_scope = self._parse_scope(
             self.param("gene_pair_scope", "at_least_one_from_seed"),
@@ -1118,15 +1161,15 @@ class SNPSNPModelReport(ReportBase):
             return df.reset_index(drop=True)
 
         # ------------------------------------------------------------------
-        # Step 1: seed variants from input chr:position # TODO melhor query por bloco ou por variant?
+        # Step 1: seed variants from input chr:position (one staged join per chromosome)
         # ------------------------------------------------------------------
         seed_variants_by_id: dict[int, dict[str, Any]] = {}
+        variants_by_position = self._query_variants_at_positions(
+            vm=vm,
+            positions=[(int(i["chromosome"]), int(i["position"])) for i in valid_inputs],
+        )
         for item in valid_inputs:
-            variants = self._query_variants_at_position(
-                vm=vm,
-                chrom=int(item["chromosome"]),
-                pos=int(item["position"]),
-            )
+            variants = variants_by_position[(int(item["chromosome"]), int(item["position"]))]
             if not variants and emit_not_found_rows:
                 row = self._base_row()
                 row["row_type"] = "input"
@@ -1150,26 +1193,16 @@ class SNPSNPModelReport(ReportBase):
         # Step 2: seed variant -> seed genes via entity_locations overlap
         # ------------------------------------------------------------------
         seed_variant_ids = set(seed_variants_by_id.keys())
-        seed_gene_ids: set[int] = set()
-        gene_overlap_cache: dict[tuple[int, int, int], list[dict[str, Any]]] = {}
-
-        for variant_id, variant in seed_variants_by_id.items():
-            vstart = max(1, int(variant["position_start"]) - window_bp)
-            vend = int(variant["position_end"]) + window_bp  # TODO vez se colocamos o windows aqui ou na variant (eu ach melhor aqui)
-            cache_key = (int(variant["chromosome"]), int(vstart), int(vend))
-            genes = gene_overlap_cache.get(cache_key)
-            if genes is None:
-                genes = self._query_genes_overlap(
-                    chrom=int(variant["chromosome"]),
-                    start=vstart,
-                    end=vend,
-                    build=build,
-                    gene_group_filter=gene_group_filter,
-                )
-                gene_overlap_cache[cache_key] = genes
 
-            gene_ids = {int(g["entity_id"]) for g in genes}
-            seed_gene_ids.update(gene_ids)
+        # One batch lookup against the shared gene interval index
+        gene_index = self.gene_interval_index(build, gene_group_filter)
+        seed_variants = list(seed_variants_by_id.values())
+        _, gene_rows = gene_index.overlaps_batch(
+            [int(v["chromosome"]) for v in seed_variants],
+            [max(1, int(v["position_start"]) - window_bp) for v in seed_variants],
+            [int(v["position_end"]) + window_bp for v in seed_variants],
+        )
+        seed_gene_ids: set[int] = {int(e) for e in gene_index.entity_id[gene_rows]}
 
         if not seed_gene_ids:
             if emit_not_found_rows:
@@ -1414,81 +1447,79 @@ class SNPSNPModelReport(ReportBase):
                     bucket.append(variant)
                     seen_variant_ids.add(vid)
 
-            snp_rows_count = 0
-            stop = False
-
+            # Exact pair count before any pair is built (fail fast on max_pairs)
+            snp_pairs_estimated = 0
             for model in gene_pair_models:
-                gene_1_id = int(model["gene_1_id"])
-                gene_2_id = int(model["gene_2_id"])
-                v1_list = gene_to_variants.get(gene_1_id, [])
-                v2_list = gene_to_variants.get(gene_2_id, [])
-                if not v1_list or not v2_list:
-                    continue
-
-                per_gene_pair_seen: set[tuple[int, int]] = set()
-
-                for v1 in v1_list:
-                    for v2 in v2_list:
-                        id1 = int(v1["variant_id"])
-                        id2 = int(v2["variant_id"])
-                        if id1 == id2:
-                            continue
-
-                        dedup_key = (min(id1, id2), max(id1, id2))
-                        if dedup_key in per_gene_pair_seen:
-                            continue
-                        per_gene_pair_seen.add(dedup_key)
-
-                        seed_count = int(id1 in seed_variant_ids) + int(id2 in seed_variant_ids)
-                        if not _scope_keep(snp_pair_scope, seed_count):
-                            continue
-
-                        row = self._base_row()
-                        row.update(stats)
-                        row["row_type"] = "snp_pair"
-                        row["observation"] = "ok"
-                        row["gene_1_id"] = gene_1_id
-                        row["gene_1_name"] = _entity_name(gene_1_id)
-                        row["gene_2_id"] = gene_2_id
-                        row["gene_2_name"] = _entity_name(gene_2_id)
-                        row["gene_pair_seed_scope"] = model["gene_pair_seed_scope"]
-                        row["gene_pair_seed_count"] = model["gene_pair_seed_count"]
-                        row["group_support_count"] = len(model["group_ids"])
-                        row["group_support_ids"] = "|".join(str(x) for x in model["group_ids"])
-                        row["group_support_names"] = "|".join(model["group_names"])
-                        row["data_source_support_count"] = len(model["data_source_ids"])
-                        row["data_source_support_ids"] = "|".join(
-                            str(x) for x in model["data_source_ids"]
-                        )
-                        row["data_source_support_names"] = "|".join(
-                            model["data_source_names"]
-                        )
-
-                        row["variant_1_id"] = id1
-                        row["variant_1_rsid"] = v1.get("rsid")
-                        row["variant_1_chromosome"] = v1.get("chromosome")
-                        row["variant_1_start"] = v1.get("position_start")
-                        row["variant_1_end"] = v1.get("position_end")
-
-                        row["variant_2_id"] = id2
-                        row["variant_2_rsid"] = v2.get("rsid")
-                        row["variant_2_chromosome"] = v2.get("chromosome")
-                        row["variant_2_start"] = v2.get("position_start")
-                        row["variant_2_end"] = v2.get("position_end")
-
-                        row["snp_pair_seed_count"] = seed_count
-                        row["snp_pair_seed_scope"] = _seed_scope(seed_count)
-                        rows_out.append(row)
+                counts = count_cross_pairs(
+                    (int(v["variant_id"]) for v in gene_to_variants.get(int(model["gene_1_id"]), [])),
+                    (int(v["variant_id"]) for v in gene_to_variants.get(int(model["gene_2_id"]), [])),
+                    seed_variant_ids,
+                )
+                snp_pairs_estimated += sum(
+                    n for seed_count, n in enumerate(counts) if _scope_keep(snp_pair_scope, seed_count)
+                )
+            self.logger.log(
+                f"🔢 SNP-SNP pairs to expand: {snp_pairs_estimated:,} "
+                f"(max_pairs={max_pairs or 'off'}, max_snp_pairs={max_snp_pairs or 'off'})",
+                "INFO",
+            )
 
-                        snp_rows_count += 1
-                        if max_snp_pairs and snp_rows_count >= max_snp_pairs:
-                            stop = True
-                            snp_pairs_truncated = True
-                            break
-                    if stop:
-                        break
-                if stop:
-                    break
+            if estimate_pairs_only or (max_pairs and snp_pairs_estimated > max_pairs):
+                row = self._base_row()
+                row.update(stats)
+                row["row_type"] = "summary"
+                if estimate_pairs_only:
+                    row["observation"] = "pair_estimate"
+                    row["note"] = f"Exact SNP-SNP pair count: {snp_pairs_estimated}."
+                else:
+                    row["observation"] = "pair_limit_exceeded"
+                    row["note"] = (
+                        f"SNP-SNP expansion would produce {snp_pairs_estimated} pairs, "
+                        f"above max_pairs={max_pairs}. Narrow the scopes/groups or raise max_pairs."
+                    )
+                    self.logger.log(f"⛔ {row['note']}", "WARNING")
+                rows_out.append(row)
+            else:
+                pair_rows = self._iter_snp_pair_rows(
+                    gene_pair_models=gene_pair_models,
+                    gene_to_variants=gene_to_variants,
+                    seed_variant_ids=seed_variant_ids,
+                    snp_pair_scope=snp_pair_scope,
+                    stats=stats,
+                    entity_name=_entity_name,
+                )
+                if max_snp_pairs and snp_pairs_estimated > max_snp_pairs:
+                    pair_rows = islice(pair_rows, max_snp_pairs)
+                    snp_pairs_truncated = True
+
+                if output_path:
+                    writer = PairChunkWriter(
+                        Path(output_path),
+                        output_format=output_format,
+                        prefix="snp_pairs",
+                        dtypes=self._column_dtypes(),
+                    )
+                    chunk: list[dict[str, Any]] = []
+                    for row in pair_rows:
+                        chunk.append(row)
+                        if len(chunk) >= chunk_rows:
+                            writer.write(pd.DataFrame(chunk).reindex(columns=self.columns))
+                            chunk = []
+                    writer.write(pd.DataFrame(chunk).reindex(columns=self.columns))
+                    writer.close(report=self.name, estimated_pairs=snp_pairs_estimated)
+
+                    row = self._base_row()
+                    row.update(stats)
+                    row["row_type"] = "summary"
+                    row["observation"] = "written"
+                    row["note"] = (
+                        f"{writer.rows} SNP-SNP pairs written to {writer.output_dir} "
+                        f"({len(writer.files)} {writer.output_format} part file(s))."
+                    )
+                    rows_out.append(row)
+                    self.logger.log(f"💾 {row['note']}", "INFO")
+                else:
+                    rows_out.extend(pair_rows)
 
         if snp_pairs_truncated and emit_not_found_rows:
             row = self._base_row()
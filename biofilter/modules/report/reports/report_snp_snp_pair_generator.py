@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-import numpy as np
 import pandas as pd
 
+from biofilter.modules.report.pair_engine import (
+    DEFAULT_CHUNK_ROWS,
+    OUTPUT_FORMATS,
+    PairChunkWriter,
+    count_cartesian_pairs,
+    count_triu_pairs,
+    iter_cartesian_blocks,
+    iter_triu_blocks,
+)
 from biofilter.modules.report.reports.base_report import ReportBase
 
 # ---------------------------------------------------------------------------
@@ -169,95 +177,105 @@ def _enrich(variant_ids: list[str], df_annot: pd.DataFrame) -> pd.DataFrame:
 # ---------------------------------------------------------------------------
 
 
+def _gene_col(df: pd.DataFrame) -> str | None:
+    return next((c for c in ["gene_symbol", "gene"] if c in df.columns), None)
+
+
 def _estimate_pairs(
     strategy: str,
     df: pd.DataFrame,
     seed_ids: set[str],
     exclude_same_gene: bool,
 ) -> int:
-    """Fast upper-bound estimate — does not materialise pairs."""
-    n = len(df)
-    if strategy == "all_vs_all":
-        return n * (n - 1) // 2
+    """
+    Exact number of pairs `_iter_pair_chunks` will produce for `df` (one
+    row per variant x gene), without materialising any pair.
+    """
+    gene_col = _gene_col(df)
+    drop_same_gene = gene_col is not None and (
+        exclude_same_gene or strategy == "cross_gene"
+    )
     if strategy == "seed_vs_all":
-        n_seed = len(seed_ids)
-        n_other = n - n_seed
-        return n_seed * n_other
-    if strategy == "cross_gene":
-        # Upper bound = all_vs_all; actual will be lower after same-gene exclusion
-        return n * (n - 1) // 2
-    return n * (n - 1) // 2  # fallback
+        is_seed = df["_list_d_id"].isin(seed_ids)
+        if gene_col is None or not exclude_same_gene:
+            return count_cartesian_pairs(int(is_seed.sum()), int((~is_seed).sum()))
+        return count_cartesian_pairs(
+            int(is_seed.sum()),
+            int((~is_seed).sum()),
+            df.loc[is_seed, gene_col],
+            df.loc[~is_seed, gene_col],
+        )
+    return count_triu_pairs(len(df), df[gene_col] if drop_same_gene else None)
 
 
-def _generate_pairs(
+def _iter_pair_chunks(
     strategy: str,
     df: pd.DataFrame,
     seed_ids: set[str],
     exclude_same_gene: bool,
     annotation_cols: list[str],
-) -> pd.DataFrame:
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
     """
-    Materialise pairs as a DataFrame with columns suffixed _a and _b.
-    Uses numpy triu_indices for all_vs_all / cross_gene (no Python loop).
-    Uses cartesian merge for seed_vs_all.
+    Yield pair DataFrames (columns suffixed _a and _b) of at most
+    ~chunk_rows rows each, in the same order a full expansion would have.
+    seed_vs_all pairs every seed row with every other row (all columns);
+    all_vs_all / cross_gene walk the upper triangle (annotation columns).
     """
-
-    def _side(df_sub: pd.DataFrame, suffix: str) -> pd.DataFrame:
-        return df_sub[annotation_cols].rename(
-            columns={c: f"{c}{suffix}" for c in annotation_cols}
-        )
+    gene_col = _gene_col(df)
 
     if strategy == "seed_vs_all":
-        gene_col = next((c for c in ["gene_symbol", "gene"] if c in df.columns), None)
-        df_seed = df[df["_list_d_id"].isin(seed_ids)].reset_index(drop=True)
-        df_other = df[~df["_list_d_id"].isin(seed_ids)].reset_index(drop=True)
-
-        df_seed = df_seed.assign(_key=1)
-        df_other = df_other.assign(_key=1)
-        pairs = df_seed.merge(df_other, on="_key", suffixes=("_a", "_b")).drop(
-            columns="_key"
+        is_seed = df["_list_d_id"].isin(seed_ids)
+        side_a = df[is_seed].reset_index(drop=True)
+        side_b = df[~is_seed].reset_index(drop=True)
+        columns = list(df.columns)
+        drop_same_gene = exclude_same_gene and gene_col is not None
+        blocks = iter_cartesian_blocks(len(side_a), len(side_b), chunk_rows)
+    else:
+        side_a = side_b = df.reset_index(drop=True)
+        columns = annotation_cols
+        drop_same_gene = gene_col is not None and (
+            strategy == "cross_gene" or exclude_same_gene
         )
-
-        # Rename annotation columns that were automatically suffixed by merge
-        # The merge already appended _a/_b because of suffixes parameter
-        # No further renaming needed
-
-        if exclude_same_gene and gene_col:
-            before = len(pairs)
+        blocks = iter_triu_blocks(len(side_a), chunk_rows)
+
+    for idx_a, idx_b in blocks:
+        part_a = side_a.iloc[idx_a][columns].reset_index(drop=True)
+        part_b = side_b.iloc[idx_b][columns].reset_index(drop=True)
+        part_a.columns = [f"{c}_a" for c in columns]
+        part_b.columns = [f"{c}_b" for c in columns]
+        pairs = pd.concat([part_a, part_b], axis=1)
+        if drop_same_gene:
             pairs = pairs[
                 pairs[f"{gene_col}_a"] != pairs[f"{gene_col}_b"]
-            ]
-            after = len(pairs)
-            if before != after:
-                pairs = pairs.reset_index(drop=True)
-
-        return pairs
-
-    # all_vs_all / cross_gene — use numpy upper triangular indices
-    df = df.reset_index(drop=True)
-    n = len(df)
-    idx_a, idx_b = np.triu_indices(n, k=1)
+            ].reset_index(drop=True)
+        yield pairs
 
-    side_a = df.iloc[idx_a][annotation_cols].reset_index(drop=True)
-    side_b = df.iloc[idx_b][annotation_cols].reset_index(drop=True)
 
-    side_a.columns = [f"{c}_a" for c in annotation_cols]
-    side_b.columns = [f"{c}_b" for c in annotation_cols]
-
-    pairs = pd.concat([side_a, side_b], axis=1)
-
-    gene_col = next((c for c in ["gene_symbol", "gene"] if c in df.columns), None)
+def _generate_pairs(
+    strategy: str,
+    df: pd.DataFrame,
+    seed_ids: set[str],
+    exclude_same_gene: bool,
+    annotation_cols: list[str],
+) -> pd.DataFrame:
+    """Materialise all pairs of `_iter_pair_chunks` as one DataFrame."""
+    chunks = list(
+        _iter_pair_chunks(strategy, df, seed_ids, exclude_same_gene, annotation_cols)
+    )
+    if chunks:
+        return pd.concat(chunks, ignore_index=True)
+    columns = list(df.columns) if strategy == "seed_vs_all" else annotation_cols
+    return pd.DataFrame(
+        columns=[f"{c}_a" for c in columns] + [f"{c}_b" for c in columns]
+    )
 
-    if strategy == "cross_gene" and gene_col:
-        pairs = pairs[pairs[f"{gene_col}_a"] != pairs[f"{gene_col}_b"]].reset_index(
-            drop=True
-        )
-    elif exclude_same_gene and gene_col:
-        pairs = pairs[pairs[f"{gene_col}_a"] != pairs[f"{gene_col}_b"]].reset_index(
-            drop=True
-        )
 
-    return pairs
+def _add_pair_metadata(df_pairs: pd.DataFrame, pairing_strategy: str) -> pd.DataFrame:
+    if "gene_symbol_a" in df_pairs.columns and "gene_symbol_b" in df_pairs.columns:
+        df_pairs["same_gene"] = df_pairs["gene_symbol_a"] == df_pairs["gene_symbol_b"]
+    df_pairs["pairing_strategy"] = pairing_strategy
+    return df_pairs
 
 
 # ---------------------------------------------------------------------------
@@ -285,6 +303,9 @@ class SNPSNPPairGeneratorReport(ReportBase):
             "seed_variants":      None,
             "max_pairs":          _DEFAULT_MAX_PAIRS,
             "exclude_same_gene":  True,
+            "output_path":        None,
+            "output_format":      "parquet",
+            "chunk_rows":         DEFAULT_CHUNK_ROWS,
         }
 
     @classmethod
@@ -313,6 +334,14 @@ class SNPSNPPairGeneratorReport(ReportBase):
         seed_variants     = self.param("seed_variants",      default=None)
         max_pairs         = int(self.param("max_pairs",      default=_DEFAULT_MAX_PAIRS))
         exclude_same_gene = bool(self.param("exclude_same_gene", default=True))
+        output_path       = self.param("output_path",        default=None)
+        output_format     = str(self.param("output_format",  default="parquet")).lower()
+        chunk_rows        = int(self.param("chunk_rows",     default=DEFAULT_CHUNK_ROWS))
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"output_format must be one of {sorted(OUTPUT_FORMATS)}, got {output_format!r}"
+            )
 
         valid_strategies = {"seed_vs_all", "cross_gene", "all_vs_all"}
         if pairing_strategy not in valid_strategies:
@@ -408,10 +437,9 @@ class SNPSNPPairGeneratorReport(ReportBase):
         # ------------------------------------------------------------------ #
         # 5. Estimate pair count — safety check
         # ------------------------------------------------------------------ #
-        # Deduplicate enriched list to one row per variant ID for estimation.
-        df_dedup = df_enriched.drop_duplicates(subset=["_list_d_id"])
+        # Exact count over the enriched rows (one per variant x gene)
         n_estimated = _estimate_pairs(
-            pairing_strategy, df_dedup, seed_ids, exclude_same_gene
+            pairing_strategy, df_enriched, seed_ids, exclude_same_gene
         )
 
         self.logger.log(
@@ -452,6 +480,42 @@ class SNPSNPPairGeneratorReport(ReportBase):
         # ------------------------------------------------------------------ #
         self.logger.log(f"Generating pairs (strategy={pairing_strategy!r}) …")
 
+        if output_path:
+            # Stream chunks to part files; only one chunk is held in memory
+            writer = PairChunkWriter(
+                Path(output_path), output_format=output_format, prefix="pairs"
+            )
+            for chunk in _iter_pair_chunks(
+                pairing_strategy,
+                df_enriched,
+                seed_ids,
+                exclude_same_gene,
+                annotation_cols,
+                chunk_rows=chunk_rows,
+            ):
+                writer.write(_add_pair_metadata(chunk, pairing_strategy))
+            writer.close(
+                report=self.name,
+                pairing_strategy=pairing_strategy,
+                estimated_pairs=n_estimated,
+            )
+            self.logger.log(
+                f"Pairs written: {writer.rows:,} to {writer.output_dir} "
+                f"({len(writer.files)} {writer.output_format} part file(s))"
+            )
+            return pd.DataFrame(
+                [
+                    {
+                        "resolution_status": "written",
+                        "pairs":             writer.rows,
+                        "part_files":        len(writer.files),
+                        "output_path":       str(writer.output_dir),
+                        "output_format":     writer.output_format,
+                        "pairing_strategy":  pairing_strategy,
+                    }
+                ]
+            )
+
         df_pairs = _generate_pairs(
             pairing_strategy,
             df_enriched,
@@ -463,13 +527,7 @@ class SNPSNPPairGeneratorReport(ReportBase):
         # ------------------------------------------------------------------ #
         # 8. Add metadata columns
         # ------------------------------------------------------------------ #
-        gene_a_col = "gene_symbol_a" if "gene_symbol_a" in df_pairs.columns else None
-        gene_b_col = "gene_symbol_b" if "gene_symbol_b" in df_pairs.columns else None
-
-        if gene_a_col and gene_b_col:
-            df_pairs["same_gene"] = df_pairs[gene_a_col] == df_pairs[gene_b_col]
-
-        df_pairs["pairing_strategy"] = pairing_strategy
+        df_pairs = _add_pair_metadata(df_pairs, pairing_strategy)
 
         self.logger.log(
             f"Pairs generated: {len(df_pairs):,} | "
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import uuid
 from collections import defaultdict
-from typing import Any
+from typing import Any, Iterator
 
 from sqlalchemy import select as sa_select
 
 import pandas as pd
 from sqlalchemy import MetaData, text
 
+from biofilter.modules.db.arrow_fetch import fetch_frame
 from biofilter.modules.db.models import (
     VariantConsequence,
     VariantConsequenceCategory,
@@ -37,8 +38,9 @@ class VariantAnnotationExpandedReport(ReportBase):
     (stripping Ensembl version suffix). When one side has more rows than the other,
     overflow rows are added with a sequence number > 1.
 
-    Uses a PostgreSQL TEMPORARY TABLE to accumulate results in batches,
-    then returns the full DataFrame at the end.
+    Uses a PostgreSQL TEMPORARY TABLE to accumulate results in batches.
+    `iter_chunks()` drains it after every gene window, so streamed output
+    holds one window in memory; `run()` concatenates the windows.
     """
 
     name = "variant_annotation_expanded"
@@ -448,6 +450,13 @@ class VariantAnnotationExpandedReport(ReportBase):
     # ------------------------------------------------------------------
 
     def run(self) -> pd.DataFrame:
+        frames = list(self.iter_chunks())
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        self.results = df
+        return df.reset_index(drop=True)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yield the annotation rows of one gene window at a time."""
         input_path = self.param("input_file", required=True)
 
         self.logger.log(f"Reading gene list from: {input_path}")
@@ -488,6 +497,7 @@ class VariantAnnotationExpandedReport(ReportBase):
         conn = self.session.connection()
 
         total_rows = 0
+        yielded_rows = 0
         total_genes = len(genes)
 
         for window_start in range(0, total_genes, self.GENE_WINDOW):
@@ -569,12 +579,25 @@ class VariantAnnotationExpandedReport(ReportBase):
                     f"(total so far: {total_rows:,})"
                 )
 
-        # 6. Final SELECT from temp table
-        self.logger.log(f"Done. Selecting {total_rows} rows from temp table.")
-        result = self.session.execute(text(f"SELECT * FROM {tmp_name}"))
-        df = pd.DataFrame(result.fetchall(), columns=self.columns)
-
-        # 7. Cast numeric and boolean columns
+            # --- Step D: drain the temp table so only this window is in memory ---
+            if total_rows > yielded_rows:
+                yield self._drain_temp_table(tmp_name)
+                yielded_rows = total_rows
+
+        self.logger.log(f"Done. {total_rows} rows selected from temp table.")
+        if not yielded_rows:
+            yield self._cast_frame(pd.DataFrame(columns=self.columns))
+
+    def _drain_temp_table(self, tmp_name: str) -> pd.DataFrame:
+        """Select and delete the rows accumulated in the temp table."""
+        df = fetch_frame(self.session, f"SELECT * FROM {tmp_name}")
+        df.columns = self.columns
+        self.session.execute(text(f"DELETE FROM {tmp_name}"))
+        return self._cast_frame(df)
+
+    def _cast_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast the TEXT temp-table columns back to numeric and boolean."""
+        # Cast numeric and boolean columns
         int_cols = [
             "gene_entity_id", "gene_chromosome", "gene_start", "gene_end",
             "chromosome", "variant_id", "position_start", "position_end",
@@ -599,8 +622,7 @@ class VariantAnnotationExpandedReport(ReportBase):
             if col in df.columns:
                 df[col] = df[col].map(lambda v: _bool_map.get(v, None) if isinstance(v, str) else v)
 
-        self.results = df
-        return df.reset_index(drop=True)
+        return df
 
 
 # ---------------------------------------------------------------------------
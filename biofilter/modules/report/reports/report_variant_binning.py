@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import csv
 import json
+import multiprocessing
+import shutil
+import tempfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import and_, func
+from sqlalchemy import func
 from sqlalchemy.orm import aliased
 
 from biofilter.modules.db.models import (
     EntityAlias,
     EntityGroup,
-    EntityLocation,
     EntityRelationship,
     EntityRelationshipType,
     GeneGroup,
@@ -22,6 +27,10 @@ from biofilter.modules.db.models import (
     GeneMaster,
     PathwayMaster,
 )
+from biofilter.modules.report.gene_interval_index import (
+    GeneIntervalIndex,
+    load_gene_interval_index,
+)
 from biofilter.modules.report.reports.base_report import ReportBase
 
 
@@ -96,6 +105,419 @@ def _first_non_empty(*values: Any) -> str | None:
     return None
 
 
+def _genotype_alleles(record, sample_indexes: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    First two allele columns of cyvcf2's genotype array for the selected
+    samples (-1 = missing), matching what `record.genotypes` yields call
+    by call: for haploid calls the second element is the phase flag. In
+    mixed-ploidy records the array pads haploid calls with the vector-end
+    (-2), so the flag is taken from the last column there; haploid-only
+    records carry no phase bit and the array's phase column is not
+    reliable for them, so the second element is 0.
+    """
+    gt = record.genotype
+    if gt is None:
+        return None
+    arr = gt.array()
+    if arr.size == 0:
+        return None
+    # fancy indexing copies out of cyvcf2's buffer while `gt` is alive
+    arr = arr[sample_indexes]
+    a1 = arr[:, 0]
+    if arr.shape[1] > 2:
+        second = np.where(arr[:, 1] == -2, arr[:, -1], arr[:, 1])
+    else:
+        second = np.zeros_like(a1)
+    return a1, second
+
+
+class _SampleBinCounts:
+    """
+    Sparse sample x bin accumulator: COO chunks (sample position, bin,
+    alt count, variant count) reduced once with bincount instead of a
+    dict update per carrier.
+    """
+
+    def __init__(self):
+        self.bin_index: dict[str, int] = {}
+        self._rows: list[np.ndarray] = []
+        self._cols: list[np.ndarray] = []
+        self._vals: list[np.ndarray] = []
+        self._vars: list[np.ndarray] = []
+
+    def add(self, bin_name: str, positions: np.ndarray, alt_counts: np.ndarray) -> None:
+        if positions.size == 0:
+            return
+        col = self.bin_index.setdefault(bin_name, len(self.bin_index))
+        self._rows.append(positions.astype(np.int64, copy=False))
+        self._cols.append(np.full(positions.size, col, dtype=np.int64))
+        self._vals.append(alt_counts.astype(np.int64, copy=False))
+        self._vars.append(np.ones(positions.size, dtype=np.int64))
+
+    def merge(self, other: _SampleBinCounts) -> None:
+        """Append the chunks of another accumulator (e.g. a region worker)."""
+        if not other.bin_index:
+            return
+        remap = np.zeros(len(other.bin_index), dtype=np.int64)
+        for name, col in other.bin_index.items():
+            remap[col] = self.bin_index.setdefault(name, len(self.bin_index))
+        self._rows.extend(other._rows)
+        self._cols.extend(remap[cols] for cols in other._cols)
+        self._vals.extend(other._vals)
+        self._vars.extend(other._vars)
+
+    def compact(self) -> None:
+        """Collapse the chunks to one entry per (sample, bin)."""
+        if len(self._rows) <= 1:
+            return
+        n_bins = len(self.bin_index)
+        keys = np.concatenate(self._rows) * n_bins + np.concatenate(self._cols)
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        self._rows = [uniq // n_bins]
+        self._cols = [uniq % n_bins]
+        self._vals = [np.bincount(inverse, weights=np.concatenate(self._vals)).astype(np.int64)]
+        self._vars = [np.bincount(inverse, weights=np.concatenate(self._vars)).astype(np.int64)]
+
+    def reduce(self, bins_sorted: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (sample_pos, sorted_bin_pos, alt_allele_count, variant_count)
+        ordered by sample then bin name.
+        """
+        empty = np.zeros(0, dtype=np.int64)
+        if not self._rows:
+            return empty, empty, empty, empty
+
+        order = {name: i for i, name in enumerate(bins_sorted)}
+        remap = np.zeros(len(self.bin_index), dtype=np.int64)
+        for name, col in self.bin_index.items():
+            remap[col] = order[name]
+
+        rows = np.concatenate(self._rows)
+        cols = remap[np.concatenate(self._cols)]
+
+        keys = rows * len(bins_sorted) + cols
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        alt_sums = np.bincount(inverse, weights=np.concatenate(self._vals)).astype(np.int64)
+        var_counts = np.bincount(inverse, weights=np.concatenate(self._vars)).astype(np.int64)
+        return uniq // len(bins_sorted), uniq % len(bins_sorted), alt_sums, var_counts
+
+
+# Region size for tabix-indexed VCFs scanned with workers > 1
+DEFAULT_REGION_SIZE = 20_000_000
+
+VARIANT_TO_BIN_COLUMNS = [
+    "variant_key",
+    "variant_id_in_vcf",
+    "chromosome",
+    "position_start",
+    "position_end",
+    "reference_allele",
+    "alternate_allele",
+    "group_by",
+    "bin_type",
+    "bin_name",
+    "gene_entity_id",
+    "gene_symbol",
+    "maf_filter",
+    "maf_overall",
+    "maf_case",
+    "maf_control",
+    "af_overall",
+    "af_case",
+    "af_control",
+    "ac_overall",
+    "an_overall",
+    "ac_case",
+    "an_case",
+    "ac_control",
+    "an_control",
+]
+
+
+@dataclass
+class _BinningScanConfig:
+    """
+    Read-only inputs of a VCF scan. Region workers receive it once, through
+    the pool initializer, so the gene-interval index is not re-sent per task.
+    """
+
+    group_by: str
+    maf_cutoff: float
+    rare_case_control_active: bool
+    overall_major_allele: bool
+    max_variants: int | None
+    sample_indexes: np.ndarray
+    case_mask: np.ndarray
+    control_mask: np.ndarray
+    gene_index: GeneIntervalIndex
+    genes_by_row: list[dict[str, Any]]
+    pathway_bins_by_gene: dict[int, list[str]]
+    pathway_meta_by_bin: dict[str, dict[str, Any]]
+
+
+@dataclass
+class _BinningScan:
+    """Partial result of scanning one or more VCF regions."""
+
+    sample_bin_counts: _SampleBinCounts = field(default_factory=_SampleBinCounts)
+    bin_variant_keys: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    bin_meta: dict[str, dict[str, Any]] = field(default_factory=dict)
+    variants_processed: int = 0
+    variants_rare: int = 0
+    variants_with_gene_overlap: int = 0
+    variants_binned: int = 0
+
+    def merge(self, other: _BinningScan) -> None:
+        """
+        Fold in the scan of a later region. Merging regions in genomic order
+        keeps the first-seen bin metadata of a serial scan.
+        """
+        self.sample_bin_counts.merge(other.sample_bin_counts)
+        for bin_name, keys in other.bin_variant_keys.items():
+            self.bin_variant_keys[bin_name].update(keys)
+        for bin_name, meta in other.bin_meta.items():
+            self.bin_meta.setdefault(bin_name, meta)
+        self.variants_processed += other.variants_processed
+        self.variants_rare += other.variants_rare
+        self.variants_with_gene_overlap += other.variants_with_gene_overlap
+        self.variants_binned += other.variants_binned
+
+
+def _scan_records(records, config: _BinningScanConfig, writer, scan: _BinningScan) -> bool:
+    """
+    Bin the rare variants of `records` into `scan`, writing one
+    variant_to_bin row per (variant, gene, bin). Returns True when
+    `max_variants` stopped the scan.
+    """
+    group_by = config.group_by
+    has_case = bool(config.case_mask.any())
+    has_control = bool(config.control_mask.any())
+
+    for record in records:
+        chromosome = _parse_chr_to_int(record.CHROM)
+        if chromosome is None:
+            continue
+
+        ref = _norm(record.REF)
+        if not ref:
+            continue
+
+        alts = [str(a) for a in (record.ALT or []) if _norm(a)]
+        if not alts:
+            continue
+
+        start_pos = int(record.POS)
+        end_pos = start_pos + max(len(ref), 1) - 1
+
+        alleles = _genotype_alleles(record, config.sample_indexes)
+        if alleles is None:
+            continue
+        a1, a2 = alleles
+
+        called_counts = (a1 >= 0).astype(np.int8) + (a2 >= 0).astype(np.int8)
+        an_overall = int(called_counts.sum(dtype=np.int64))
+        an_case_total = (
+            int(called_counts[config.case_mask].sum(dtype=np.int64)) if has_case else None
+        )
+        an_control_total = (
+            int(called_counts[config.control_mask].sum(dtype=np.int64))
+            if has_control
+            else None
+        )
+
+        for alt_idx, alt in enumerate(alts, start=1):
+            scan.variants_processed += 1
+            if config.max_variants is not None and scan.variants_processed > config.max_variants:
+                return True
+
+            alt_counts = (a1 == alt_idx).astype(np.int8) + (a2 == alt_idx).astype(np.int8)
+
+            ac_overall = int(alt_counts.sum(dtype=np.int64))
+            if an_overall <= 0:
+                continue
+
+            af_overall = ac_overall / an_overall
+            maf_overall = min(af_overall, 1.0 - af_overall)
+
+            ac_case = an_case = None
+            ac_control = an_control = None
+            af_case = af_control = None
+            maf_case = maf_control = None
+
+            if has_case:
+                ac_case = int(alt_counts[config.case_mask].sum(dtype=np.int64))
+                an_case = an_case_total
+                af_case = (ac_case / an_case) if an_case > 0 else None
+                maf_case = min(af_case, 1.0 - af_case) if af_case is not None else None
+
+            if has_control:
+                ac_control = int(alt_counts[config.control_mask].sum(dtype=np.int64))
+                an_control = an_control_total
+                af_control = (ac_control / an_control) if an_control > 0 else None
+                maf_control = (
+                    min(af_control, 1.0 - af_control)
+                    if af_control is not None
+                    else None
+                )
+
+            maf_filter = maf_overall
+            if config.rare_case_control_active:
+                if maf_case is not None and maf_control is not None:
+                    maf_filter = max(maf_case, maf_control)
+            elif not config.overall_major_allele and maf_control is not None:
+                maf_filter = maf_control
+
+            is_rare = maf_filter <= config.maf_cutoff
+            if not is_rare:
+                continue
+
+            scan.variants_rare += 1
+
+            overlapping_genes = VariantBinningReport._find_overlapping_genes(
+                chromosome=chromosome,
+                start_pos=start_pos,
+                end_pos=end_pos,
+                gene_index=config.gene_index,
+                genes_by_row=config.genes_by_row,
+            )
+
+            if not overlapping_genes:
+                continue
+
+            scan.variants_with_gene_overlap += 1
+
+            variant_key = f"{chromosome}:{start_pos}:{end_pos}:{ref}>{alt}"
+            variant_id_in_vcf = _norm(record.ID) or None
+
+            unique_bins_this_variant: set[str] = set()
+            any_mapping_written = False
+
+            for gene in overlapping_genes:
+                gene_entity_id = int(gene["entity_id"])
+                gene_symbol = _norm(gene.get("symbol")) or f"GENE_ENTITY_{gene_entity_id}"
+
+                bin_specs = VariantBinningReport._resolve_bins_for_gene(
+                    group_by=group_by,
+                    gene=gene,
+                    pathway_bins_by_gene=config.pathway_bins_by_gene,
+                )
+                if not bin_specs:
+                    continue
+
+                for spec in bin_specs:
+                    bin_name = str(spec["bin_name"])
+                    bin_type = str(spec["bin_type"])
+                    meta = dict(spec.get("meta") or {})
+
+                    any_mapping_written = True
+                    unique_bins_this_variant.add(bin_name)
+
+                    if group_by == "pathway" and bin_name in config.pathway_meta_by_bin:
+                        meta.update(config.pathway_meta_by_bin[bin_name])
+
+                    if bin_name not in scan.bin_meta:
+                        scan.bin_meta[bin_name] = {
+                            "bin_name": bin_name,
+                            "bin_type": bin_type,
+                            **meta,
+                        }
+
+                    writer.writerow(
+                        {
+                            "variant_key": variant_key,
+                            "variant_id_in_vcf": variant_id_in_vcf,
+                            "chromosome": chromosome,
+                            "position_start": start_pos,
+                            "position_end": end_pos,
+                            "reference_allele": ref,
+                            "alternate_allele": alt,
+                            "group_by": group_by,
+                            "bin_type": bin_type,
+                            "bin_name": bin_name,
+                            "gene_entity_id": gene_entity_id,
+                            "gene_symbol": gene_symbol,
+                            "maf_filter": maf_filter,
+                            "maf_overall": maf_overall,
+                            "maf_case": maf_case,
+                            "maf_control": maf_control,
+                            "af_overall": af_overall,
+                            "af_case": af_case,
+                            "af_control": af_control,
+                            "ac_overall": ac_overall,
+                            "an_overall": an_overall,
+                            "ac_case": ac_case,
+                            "an_case": an_case,
+                            "ac_control": ac_control,
+                            "an_control": an_control,
+                        }
+                    )
+
+            if not any_mapping_written:
+                continue
+
+            scan.variants_binned += 1
+
+            positive_sample_positions = np.flatnonzero(alt_counts)
+            positive_alt_counts = alt_counts[positive_sample_positions]
+
+            for bin_name in unique_bins_this_variant:
+                scan.bin_variant_keys[bin_name].add(variant_key)
+                scan.sample_bin_counts.add(
+                    bin_name, positive_sample_positions, positive_alt_counts
+                )
+
+    return False
+
+
+# Set in each pool process by _init_binning_worker
+_WORKER_SCAN_CONFIG: _BinningScanConfig | None = None
+
+
+def _init_binning_worker(config: _BinningScanConfig) -> None:
+    global _WORKER_SCAN_CONFIG
+    _WORKER_SCAN_CONFIG = config
+
+
+def _region_records(vcf, region: tuple[str, int, int | None] | None):
+    """
+    Records starting inside `region` (contig, 1-based start, inclusive end
+    or None for the whole contig). Records overlapping the region but
+    starting before it belong to the previous region.
+    """
+    if region is None:
+        return iter(vcf)
+    contig, start, end = region
+    query = f"{contig}:{start}-{end}" if end is not None else contig
+    return (
+        record
+        for record in vcf(query)
+        if record.POS >= start and (end is None or record.POS <= end)
+    )
+
+
+def _binning_region_worker(
+    vcf_path: str,
+    region: tuple[str, int, int | None] | None,
+    part_path: str,
+) -> _BinningScan:
+    """
+    Process-pool entry point: scan one VCF file or region and write its
+    variant_to_bin rows, without header, to `part_path`.
+    """
+    from cyvcf2 import VCF
+
+    scan = _BinningScan()
+    vcf = VCF(vcf_path)
+    try:
+        with open(part_path, "w", encoding="utf-8", newline="") as f_part:
+            writer = csv.DictWriter(f_part, fieldnames=VARIANT_TO_BIN_COLUMNS)
+            _scan_records(_region_records(vcf, region), _WORKER_SCAN_CONFIG, writer, scan)
+    finally:
+        vcf.close()
+    scan.sample_bin_counts.compact()
+    return scan
+
+
 class VariantBinningReport(ReportBase):
     name = "variant_binning"
     description = (
@@ -284,57 +706,37 @@ class VariantBinningReport(ReportBase):
         self,
         build: int,
         gene_entity_group_names: set[str],
-        window_size: int,
     ) -> tuple[
-        dict[int, list[dict[str, Any]]],
-        dict[int, dict[int, list[int]]],
+        GeneIntervalIndex,
+        list[dict[str, Any]],
         dict[int, dict[str, Any]],
     ]:
+        """
+        Shared gene interval index for `build` plus one gene dict per index
+        row (symbol, locus type, gene groups), aligned with the row ids.
+        """
         group_ids = self._resolve_group_ids(gene_entity_group_names)
-        gene_group_id_values = sorted(group_ids.values())
-
-        meta_by_entity, groups_by_entity = self._load_gene_metadata()
-
-        primary_alias = aliased(EntityAlias)
-        rows = (
-            self.session.query(
-                EntityLocation.entity_id,
-                EntityLocation.chromosome,
-                EntityLocation.start_pos,
-                EntityLocation.end_pos,
-                primary_alias.alias_value.label("primary_alias"),
-            )
-            .outerjoin(
-                primary_alias,
-                and_(
-                    primary_alias.entity_id == EntityLocation.entity_id,
-                    primary_alias.is_primary.is_(True),
-                ),
-            )
-            .filter(
-                EntityLocation.build == int(build),
-                EntityLocation.entity_group_id.in_(gene_group_id_values),
-            )
-            .all()
+        gene_index = load_gene_interval_index(
+            self.session,
+            build=int(build),
+            group_ids=group_ids.values(),
+            group_on="location",
         )
 
-        genes_by_chr: dict[int, list[dict[str, Any]]] = defaultdict(list)
-
-        for row in rows:
-            chrom = int(row.chromosome)
-            entity_id = int(row.entity_id)
-            start = int(row.start_pos)
-            end = int(row.end_pos)
-            if end < start:
-                start, end = end, start
+        meta_by_entity, groups_by_entity = self._load_gene_metadata()
 
+        genes_by_row: list[dict[str, Any]] = []
+        for row in range(len(gene_index)):
+            entity_id = int(gene_index.entity_id[row])
             meta = meta_by_entity.get(entity_id, {})
-            symbol = _first_non_empty(meta.get("symbol"), row.primary_alias, f"GENE_ENTITY_{entity_id}")
-            genes_by_chr[chrom].append(
+            symbol = _first_non_empty(
+                meta.get("symbol"), gene_index.primary_name[row], f"GENE_ENTITY_{entity_id}"
+            )
+            genes_by_row.append(
                 {
                     "entity_id": entity_id,
-                    "start": start,
-                    "end": end,
+                    "start": int(gene_index.start[row]),
+                    "end": int(gene_index.end[row]),
                     "symbol": symbol,
                     "gene_id": meta.get("gene_id"),
                     "locus_type": meta.get("locus_type"),
@@ -342,52 +744,20 @@ class VariantBinningReport(ReportBase):
                 }
             )
 
-        windows_by_chr: dict[int, dict[int, list[int]]] = {}
-        for chrom, genes in genes_by_chr.items():
-            genes.sort(key=lambda g: (int(g["start"]), int(g["end"]), int(g["entity_id"])))
-            window_map: dict[int, list[int]] = defaultdict(list)
-            for idx, gene in enumerate(genes):
-                window_start = int(gene["start"]) // window_size
-                window_end = int(gene["end"]) // window_size
-                for window in range(window_start, window_end + 1):
-                    window_map[window].append(idx)
-            windows_by_chr[chrom] = dict(window_map)
-
-        return dict(genes_by_chr), windows_by_chr, meta_by_entity
+        return gene_index, genes_by_row, meta_by_entity
 
+    @staticmethod
     def _find_overlapping_genes(
-        self,
         chromosome: int,
         start_pos: int,
         end_pos: int,
-        genes_by_chr: dict[int, list[dict[str, Any]]],
-        windows_by_chr: dict[int, dict[int, list[int]]],
-        window_size: int,
+        gene_index: GeneIntervalIndex,
+        genes_by_row: list[dict[str, Any]],
     ) -> list[dict[str, Any]]:
-        genes = genes_by_chr.get(chromosome)
-        if not genes:
-            return []
-
-        window_map = windows_by_chr.get(chromosome, {})
-        w_start = start_pos // window_size
-        w_end = end_pos // window_size
-
-        candidate_indexes: set[int] = set()
-        for window in range(w_start, w_end + 1):
-            candidate_indexes.update(window_map.get(window, []))
-
-        if not candidate_indexes:
-            return []
-
-        overlaps: list[dict[str, Any]] = []
-        for idx in sorted(candidate_indexes):
-            gene = genes[idx]
-            if int(gene["end"]) < start_pos:
-                continue
-            if int(gene["start"]) > end_pos:
-                continue
-            overlaps.append(gene)
-        return overlaps
+        return [
+            genes_by_row[row]
+            for row in gene_index.overlaps(chromosome, start_pos, end_pos)
+        ]
 
     def _build_pathway_mapping(
         self,
@@ -511,8 +881,8 @@ class VariantBinningReport(ReportBase):
 
         return gene_to_bins, pathway_meta_by_bin
 
+    @staticmethod
     def _resolve_bins_for_gene(
-        self,
         group_by: str,
         gene: dict[str, Any],
         pathway_bins_by_gene: dict[int, list[str]],
@@ -590,6 +960,124 @@ class VariantBinningReport(ReportBase):
 
         return VCF(vcf_path)
 
+    def _vcf_samples(self, vcf_paths: list[str]) -> list[str]:
+        """Samples of the cohort; every VCF must list the same samples in the same order."""
+        samples: list[str] | None = None
+        for path in vcf_paths:
+            vcf = self._load_vcf(path)
+            try:
+                path_samples = list(vcf.samples)
+            finally:
+                vcf.close()
+            if samples is None:
+                samples = path_samples
+            elif path_samples != samples:
+                raise ValueError(
+                    f"VCF samples differ between {vcf_paths[0]} and {path}. "
+                    "All VCFs must list the same samples in the same order."
+                )
+        return samples or []
+
+    def _vcf_tasks(
+        self,
+        vcf_paths: list[str],
+        workers: int,
+        region_size: int,
+    ) -> list[tuple[str, tuple[str, int, int | None] | None]]:
+        """
+        Units of work as (vcf_path, region). A tabix/CSI-indexed VCF is
+        split into `region_size` windows per contig (or whole contigs when
+        the header has no lengths) when workers > 1; any other VCF is one
+        task. Tasks are in file and contig order.
+        """
+        tasks: list[tuple[str, tuple[str, int, int | None] | None]] = []
+        for path in vcf_paths:
+            indexed = any(Path(f"{path}{ext}").exists() for ext in (".tbi", ".csi"))
+            if workers <= 1 or not indexed:
+                tasks.append((path, None))
+                continue
+
+            vcf = self._load_vcf(path)
+            try:
+                contigs = list(vcf.seqnames)
+                try:
+                    lengths = [int(n) for n in vcf.seqlens]
+                except Exception:
+                    lengths = [0] * len(contigs)
+            finally:
+                vcf.close()
+
+            for contig, length in zip(contigs, lengths):
+                if _parse_chr_to_int(contig) is None:
+                    continue
+                if not length:
+                    tasks.append((path, (contig, 1, None)))
+                    continue
+                for start in range(1, length + 1, region_size):
+                    tasks.append((path, (contig, start, min(start + region_size - 1, length))))
+        return tasks
+
+    def _scan_parallel(
+        self,
+        tasks: list[tuple[str, tuple[str, int, int | None] | None]],
+        config: _BinningScanConfig,
+        workers: int,
+        f_variant,
+        scan: _BinningScan,
+        parts_parent: Path,
+    ) -> None:
+        """
+        Scan each task in its own process. Workers write their
+        variant_to_bin rows to part files and return partial sample x bin
+        counts; both are merged in task order, so the artifacts match a
+        serial scan of a sorted VCF.
+        """
+        parts_dir = Path(tempfile.mkdtemp(prefix=".variant_to_bin_parts_", dir=parts_parent))
+        part_paths = [parts_dir / f"part_{i:05d}.csv" for i in range(len(tasks))]
+        self.logger.log(
+            f"🧩 Variant binning: {len(tasks)} region(s) on {min(workers, len(tasks))} worker(s)",
+            "INFO",
+        )
+
+        pending: dict[int, _BinningScan] = {}
+        next_task = 0
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            mp_context=ctx,
+            initializer=_init_binning_worker,
+            initargs=(config,),
+        )
+        try:
+            futures = {
+                pool.submit(_binning_region_worker, path, region, str(part_paths[i])): i
+                for i, (path, region) in enumerate(tasks)
+            }
+            for fut in as_completed(futures):
+                task_idx = futures[fut]
+                pending[task_idx] = fut.result()
+                path, region = tasks[task_idx]
+                label = f"{region[0]}:{region[1]}-{region[2] or 'end'}" if region else Path(path).name
+                self.logger.log(
+                    f"🧩 Region {label} done "
+                    f"(variants={pending[task_idx].variants_processed}, "
+                    f"binned={pending[task_idx].variants_binned})",
+                    "DEBUG",
+                )
+
+                while next_task in pending:
+                    scan.merge(pending.pop(next_task))
+                    with part_paths[next_task].open("r", encoding="utf-8", newline="") as f_part:
+                        shutil.copyfileobj(f_part, f_variant)
+                    part_paths[next_task].unlink()
+                    next_task += 1
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            shutil.rmtree(parts_dir, ignore_errors=True)
+            raise
+        pool.shutdown(wait=True)
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
     def _classify_sample(
         self,
         phenotype_value: str,
@@ -603,8 +1091,61 @@ class VariantBinningReport(ReportBase):
             return "case" if value in case_values else "unknown"
         return "case"
 
+    def _sample_bin_long_frame(
+        self,
+        sample_bin_counts: _SampleBinCounts,
+        bins_sorted: list[str],
+        selected_samples: list[str],
+        sample_phenotype_value: dict[str, str | None],
+        sample_class: dict[str, str],
+        group_by: str,
+        include_zero_counts: bool,
+    ) -> pd.DataFrame:
+        """
+        One row per (sample, bin), samples in VCF order and bins sorted by
+        name; zero rows are kept only with include_zero_counts.
+        """
+        sample_pos, bin_pos, alt_sums, var_counts = sample_bin_counts.reduce(bins_sorted)
+        n_bins = len(bins_sorted)
+
+        if include_zero_counts:
+            alt_dense = np.zeros((len(selected_samples), n_bins), dtype=np.int64)
+            var_dense = np.zeros((len(selected_samples), n_bins), dtype=np.int64)
+            alt_dense[sample_pos, bin_pos] = alt_sums
+            var_dense[sample_pos, bin_pos] = var_counts
+            sample_pos = np.repeat(np.arange(len(selected_samples)), n_bins)
+            bin_pos = np.tile(np.arange(n_bins), len(selected_samples))
+            alt_sums = alt_dense.ravel()
+            var_counts = var_dense.ravel()
+
+        if sample_pos.size == 0:
+            return pd.DataFrame()
+
+        samples = np.asarray(selected_samples, dtype=object)
+        phenotypes = np.asarray(
+            [sample_phenotype_value.get(s) for s in selected_samples], dtype=object
+        )
+        classes = np.asarray(
+            [sample_class.get(s, "unknown") for s in selected_samples], dtype=object
+        )
+        bins = np.asarray(bins_sorted, dtype=object)
+
+        return pd.DataFrame(
+            {
+                "sample_id": samples[sample_pos],
+                "phenotype_value": phenotypes[sample_pos],
+                "sample_class": classes[sample_pos],
+                "bin_name": bins[bin_pos],
+                "group_by": group_by,
+                "variant_count": var_counts,
+                "alt_allele_count": alt_sums,
+            }
+        )
+
     def run(self):
-        vcf_path = _norm(self.param("vcf_path", required=True))
+        vcf_paths = self._as_list(self.param("vcf_path", required=True)) or []
+        if not vcf_paths:
+            raise ValueError("vcf_path is required.")
         output_dir_raw = _norm(self.param("output_dir", required=True))
         phenotype_path = _norm(self.param("phenotype_path")) or None
 
@@ -622,7 +1163,8 @@ class VariantBinningReport(ReportBase):
         max_variants = self.param("max_variants")
         max_variants_int = int(max_variants) if max_variants not in (None, "") else None
 
-        gene_window_size = int(self.param("gene_window_size", 500000) or 500000)
+        workers = max(1, int(self.param("workers", 1) or 1))
+        region_size = int(self.param("region_size", DEFAULT_REGION_SIZE) or DEFAULT_REGION_SIZE)
 
         gene_entity_group_names = _to_set(self.param("gene_entity_groups", ["Gene", "Genes"]))
         if not gene_entity_group_names:
@@ -660,10 +1202,9 @@ class VariantBinningReport(ReportBase):
             value_column=phenotype_value_column,
         )
 
-        genes_by_chr, windows_by_chr, meta_by_entity = self._load_gene_intervals(
+        gene_index, genes_by_row, meta_by_entity = self._load_gene_intervals(
             build=build,
             gene_entity_group_names=gene_entity_group_names,
-            window_size=gene_window_size,
         )
 
         pathway_bins_by_gene: dict[int, list[str]] = {}
@@ -675,8 +1216,7 @@ class VariantBinningReport(ReportBase):
                 relationship_types=relationship_types,
             )
 
-        vcf = self._load_vcf(vcf_path)
-        vcf_samples = list(vcf.samples)
+        vcf_samples = self._vcf_samples(vcf_paths)
 
         if not vcf_samples:
             raise ValueError("VCF has no samples. A multi-sample cohort VCF is required.")
@@ -725,256 +1265,69 @@ class VariantBinningReport(ReportBase):
             rare_case_control and bool(case_positions) and bool(control_positions)
         )
 
-        variant_to_bin_columns = [
-            "variant_key",
-            "variant_id_in_vcf",
-            "chromosome",
-            "position_start",
-            "position_end",
-            "reference_allele",
-            "alternate_allele",
-            "group_by",
-            "bin_type",
-            "bin_name",
-            "gene_entity_id",
-            "gene_symbol",
-            "maf_filter",
-            "maf_overall",
-            "maf_case",
-            "maf_control",
-            "af_overall",
-            "af_case",
-            "af_control",
-            "ac_overall",
-            "an_overall",
-            "ac_case",
-            "an_case",
-            "ac_control",
-            "an_control",
-        ]
-
-        sample_bin_alt_counts: dict[tuple[str, str], int] = defaultdict(int)
-        sample_bin_variant_counts: dict[tuple[str, str], int] = defaultdict(int)
-        bin_variant_keys: dict[str, set[str]] = defaultdict(set)
-        bin_meta: dict[str, dict[str, Any]] = {}
+        case_mask = np.zeros(len(selected_samples), dtype=bool)
+        case_mask[case_positions] = True
+        control_mask = np.zeros(len(selected_samples), dtype=bool)
+        control_mask[control_positions] = True
+
+        config = _BinningScanConfig(
+            group_by=group_by,
+            maf_cutoff=maf_cutoff,
+            rare_case_control_active=rare_case_control_active,
+            overall_major_allele=overall_major_allele,
+            max_variants=max_variants_int,
+            sample_indexes=np.asarray(selected_sample_indexes, dtype=np.int64),
+            case_mask=case_mask,
+            control_mask=control_mask,
+            gene_index=gene_index,
+            genes_by_row=genes_by_row,
+            pathway_bins_by_gene=pathway_bins_by_gene,
+            pathway_meta_by_bin=pathway_meta_by_bin,
+        )
 
-        variants_processed = 0
-        variants_rare = 0
-        variants_with_gene_overlap = 0
-        variants_binned = 0
+        tasks = self._vcf_tasks(vcf_paths, workers=workers, region_size=region_size)
+        parallel = workers > 1 and len(tasks) > 1
+        if parallel and max_variants_int is not None:
+            self.logger.log(
+                "ℹ️ max_variants caps the scan in file order; running variant binning serially.",
+                "INFO",
+            )
+            parallel = False
 
+        scan = _BinningScan()
         with artifact_variant_to_bin.open("w", encoding="utf-8", newline="") as f_variant:
-            writer = csv.DictWriter(f_variant, fieldnames=variant_to_bin_columns)
+            writer = csv.DictWriter(f_variant, fieldnames=VARIANT_TO_BIN_COLUMNS)
             writer.writeheader()
 
-            stop = False
-            for record in vcf:
-                chromosome = _parse_chr_to_int(record.CHROM)
-                if chromosome is None:
-                    continue
-
-                ref = _norm(record.REF)
-                if not ref:
-                    continue
-
-                alts = [str(a) for a in (record.ALT or []) if _norm(a)]
-                if not alts:
-                    continue
-
-                start_pos = int(record.POS)
-                end_pos = start_pos + max(len(ref), 1) - 1
-
-                genotypes = record.genotypes
-                if not genotypes:
-                    continue
-
-                selected_alleles: list[tuple[int, int]] = []
-                called_counts: list[int] = []
-
-                for sample_idx in selected_sample_indexes:
-                    call = genotypes[sample_idx] if sample_idx < len(genotypes) else None
-                    if not call:
-                        a1, a2 = -1, -1
-                    else:
-                        raw_a1 = call[0] if len(call) >= 1 else -1
-                        raw_a2 = call[1] if len(call) >= 2 else -1
-                        try:
-                            a1 = int(raw_a1) if raw_a1 is not None else -1
-                        except Exception:
-                            a1 = -1
-                        try:
-                            a2 = int(raw_a2) if raw_a2 is not None else -1
-                        except Exception:
-                            a2 = -1
-                    selected_alleles.append((a1, a2))
-                    called_counts.append((1 if a1 >= 0 else 0) + (1 if a2 >= 0 else 0))
-
-                for alt_idx, alt in enumerate(alts, start=1):
-                    variants_processed += 1
-                    if max_variants_int is not None and variants_processed > max_variants_int:
-                        stop = True
+            if parallel:
+                self._scan_parallel(
+                    tasks=tasks,
+                    config=config,
+                    workers=workers,
+                    f_variant=f_variant,
+                    scan=scan,
+                    parts_parent=output_dir,
+                )
+            else:
+                for path in vcf_paths:
+                    vcf = self._load_vcf(path)
+                    try:
+                        stopped = _scan_records(vcf, config, writer, scan)
+                    finally:
+                        vcf.close()
+                    if stopped:
                         break
 
-                    alt_counts = [
-                        (1 if a1 == alt_idx else 0) + (1 if a2 == alt_idx else 0)
-                        for a1, a2 in selected_alleles
-                    ]
-
-                    ac_overall = int(sum(alt_counts))
-                    an_overall = int(sum(called_counts))
-                    if an_overall <= 0:
-                        continue
-
-                    af_overall = ac_overall / an_overall
-                    maf_overall = min(af_overall, 1.0 - af_overall)
-
-                    ac_case = an_case = None
-                    ac_control = an_control = None
-                    af_case = af_control = None
-                    maf_case = maf_control = None
-
-                    if case_positions:
-                        ac_case = int(sum(alt_counts[p] for p in case_positions))
-                        an_case = int(sum(called_counts[p] for p in case_positions))
-                        af_case = (ac_case / an_case) if an_case > 0 else None
-                        maf_case = min(af_case, 1.0 - af_case) if af_case is not None else None
-
-                    if control_positions:
-                        ac_control = int(sum(alt_counts[p] for p in control_positions))
-                        an_control = int(sum(called_counts[p] for p in control_positions))
-                        af_control = (ac_control / an_control) if an_control > 0 else None
-                        maf_control = (
-                            min(af_control, 1.0 - af_control)
-                            if af_control is not None
-                            else None
-                        )
-
-                    maf_filter = maf_overall
-                    if rare_case_control_active:
-                        if maf_case is not None and maf_control is not None:
-                            maf_filter = max(maf_case, maf_control)
-                    elif not overall_major_allele and maf_control is not None:
-                        maf_filter = maf_control
-
-                    is_rare = maf_filter <= maf_cutoff
-                    if not is_rare:
-                        continue
-
-                    variants_rare += 1
-
-                    overlapping_genes = self._find_overlapping_genes(
-                        chromosome=chromosome,
-                        start_pos=start_pos,
-                        end_pos=end_pos,
-                        genes_by_chr=genes_by_chr,
-                        windows_by_chr=windows_by_chr,
-                        window_size=gene_window_size,
-                    )
-
-                    if not overlapping_genes:
-                        continue
-
-                    variants_with_gene_overlap += 1
-
-                    variant_key = f"{chromosome}:{start_pos}:{end_pos}:{ref}>{alt}"
-                    variant_id_in_vcf = _norm(record.ID) or None
-
-                    unique_bins_this_variant: set[str] = set()
-                    any_mapping_written = False
-
-                    for gene in overlapping_genes:
-                        gene_entity_id = int(gene["entity_id"])
-                        gene_symbol = _norm(gene.get("symbol")) or f"GENE_ENTITY_{gene_entity_id}"
-
-                        bin_specs = self._resolve_bins_for_gene(
-                            group_by=group_by,
-                            gene=gene,
-                            pathway_bins_by_gene=pathway_bins_by_gene,
-                        )
-                        if not bin_specs:
-                            continue
-
-                        for spec in bin_specs:
-                            bin_name = str(spec["bin_name"])
-                            bin_type = str(spec["bin_type"])
-                            meta = dict(spec.get("meta") or {})
-
-                            any_mapping_written = True
-                            unique_bins_this_variant.add(bin_name)
-
-                            if group_by == "pathway" and bin_name in pathway_meta_by_bin:
-                                meta.update(pathway_meta_by_bin[bin_name])
-
-                            if bin_name not in bin_meta:
-                                bin_meta[bin_name] = {
-                                    "bin_name": bin_name,
-                                    "bin_type": bin_type,
-                                    **meta,
-                                }
-
-                            writer.writerow(
-                                {
-                                    "variant_key": variant_key,
-                                    "variant_id_in_vcf": variant_id_in_vcf,
-                                    "chromosome": chromosome,
-                                    "position_start": start_pos,
-                                    "position_end": end_pos,
-                                    "reference_allele": ref,
-                                    "alternate_allele": alt,
-                                    "group_by": group_by,
-                                    "bin_type": bin_type,
-                                    "bin_name": bin_name,
-                                    "gene_entity_id": gene_entity_id,
-                                    "gene_symbol": gene_symbol,
-                                    "maf_filter": maf_filter,
-                                    "maf_overall": maf_overall,
-                                    "maf_case": maf_case,
-                                    "maf_control": maf_control,
-                                    "af_overall": af_overall,
-                                    "af_case": af_case,
-                                    "af_control": af_control,
-                                    "ac_overall": ac_overall,
-                                    "an_overall": an_overall,
-                                    "ac_case": ac_case,
-                                    "an_case": an_case,
-                                    "ac_control": ac_control,
-                                    "an_control": an_control,
-                                }
-                            )
-
-                    if not any_mapping_written:
-                        continue
-
-                    variants_binned += 1
-
-                    positive_sample_positions = [
-                        p for p, alt_count in enumerate(alt_counts) if alt_count > 0
-                    ]
-
-                    for bin_name in unique_bins_this_variant:
-                        bin_variant_keys[bin_name].add(variant_key)
-
-                        for pos in positive_sample_positions:
-                            sample = selected_samples[pos]
-                            key = (sample, bin_name)
-                            sample_bin_alt_counts[key] += int(alt_counts[pos])
-                            sample_bin_variant_counts[key] += 1
-
-                if stop:
-                    break
-
-        vcf.close()
-
-        bins_sorted = sorted(bin_variant_keys.keys())
+        bins_sorted = sorted(scan.bin_variant_keys.keys())
 
         bin_member_rows: list[dict[str, Any]] = []
         for bin_name in bins_sorted:
-            meta = dict(bin_meta.get(bin_name, {}))
+            meta = dict(scan.bin_meta.get(bin_name, {}))
             bin_member_rows.append(
                 {
                     "bin_name": bin_name,
                     "bin_type": meta.get("bin_type") or group_by,
-                    "variant_count": len(bin_variant_keys[bin_name]),
+                    "variant_count": len(scan.bin_variant_keys[bin_name]),
                     **{k: v for k, v in meta.items() if k not in {"bin_name", "bin_type"}},
                 }
             )
@@ -994,31 +1347,15 @@ class VariantBinningReport(ReportBase):
         bin_def_df = bin_member_df.copy()
         bin_def_df.to_csv(artifact_bin_definitions, index=False)
 
-        sample_long_rows: list[dict[str, Any]] = []
-        for sample in selected_samples:
-            sample_pheno = sample_phenotype_value.get(sample)
-            sample_cls = sample_class.get(sample, "unknown")
-
-            for bin_name in bins_sorted:
-                key = (sample, bin_name)
-                alt_allele_count = int(sample_bin_alt_counts.get(key, 0))
-                variant_count = int(sample_bin_variant_counts.get(key, 0))
-                if (not include_zero_counts) and alt_allele_count == 0 and variant_count == 0:
-                    continue
-
-                sample_long_rows.append(
-                    {
-                        "sample_id": sample,
-                        "phenotype_value": sample_pheno,
-                        "sample_class": sample_cls,
-                        "bin_name": bin_name,
-                        "group_by": group_by,
-                        "variant_count": variant_count,
-                        "alt_allele_count": alt_allele_count,
-                    }
-                )
-
-        sample_long_df = pd.DataFrame(sample_long_rows)
+        sample_long_df = self._sample_bin_long_frame(
+            sample_bin_counts=scan.sample_bin_counts,
+            bins_sorted=bins_sorted,
+            selected_samples=selected_samples,
+            sample_phenotype_value=sample_phenotype_value,
+            sample_class=sample_class,
+            group_by=group_by,
+            include_zero_counts=include_zero_counts,
+        )
         if sample_long_df.empty:
             sample_long_df = pd.DataFrame(
                 columns=[
@@ -1065,16 +1402,18 @@ class VariantBinningReport(ReportBase):
             "rare_case_control_active": rare_case_control_active,
             "overall_major_allele": overall_major_allele,
             "include_zero_counts": include_zero_counts,
+            "workers": workers,
+            "vcf_tasks": len(tasks),
             "phenotype_file": phenotype_path,
             "resolved_phenotype_column": resolved_phenotype_column,
             "samples_total_in_vcf": len(vcf_samples),
             "samples_selected": len(selected_samples),
             "samples_case": len(case_positions),
             "samples_control": len(control_positions),
-            "variants_processed": variants_processed,
-            "variants_rare": variants_rare,
-            "variants_with_gene_overlap": variants_with_gene_overlap,
-            "variants_binned": variants_binned,
+            "variants_processed": scan.variants_processed,
+            "variants_rare": scan.variants_rare,
+            "variants_with_gene_overlap": scan.variants_with_gene_overlap,
+            "variants_binned": scan.variants_binned,
             "bins_generated": len(bins_sorted),
             "artifacts": {
                 "bin_counts": str(artifact_bin_counts),
@@ -1107,10 +1446,10 @@ class VariantBinningReport(ReportBase):
                     "output_dir": str(output_dir),
                     "group_by": group_by,
                     "maf_cutoff": maf_cutoff,
-                    "variants_processed": variants_processed,
-                    "variants_rare": variants_rare,
-                    "variants_with_gene_overlap": variants_with_gene_overlap,
-                    "variants_binned": variants_binned,
+                    "variants_processed": scan.variants_processed,
+                    "variants_rare": scan.variants_rare,
+                    "variants_with_gene_overlap": scan.variants_with_gene_overlap,
+                    "variants_binned": scan.variants_binned,
                     "bins_generated": len(bins_sorted),
                     "samples_selected": len(selected_samples),
                     "artifact_bin_counts": str(artifact_bin_counts),
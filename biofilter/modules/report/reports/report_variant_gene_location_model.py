@@ -9,6 +9,7 @@ from sqlalchemy import MetaData, Table, and_, func, or_, select
 from sqlalchemy.orm import aliased
 
 from biofilter.modules.db.models import Entity, EntityAlias, EntityGroup, EntityLocation
+from biofilter.modules.report.gene_interval_index import GeneIntervalIndex
 from biofilter.modules.report.reports.base_report import ReportBase
 
 
@@ -509,57 +510,14 @@ class VariantGeneLocationModelReport(ReportBase):
         cache[chrom_i] = count_value > 0
         return cache[chrom_i]
 
+    @staticmethod
     def _query_genes_overlap(
-        self,
+        gene_index: GeneIntervalIndex,
         chrom: int,
         start: int,
         end: int,
-        build: int,
-        gene_group_filter: set[str],
     ) -> list[dict[str, Any]]:
-        primary_alias = aliased(EntityAlias)
-        q = (
-            self.session.query(
-                Entity.id.label("entity_id"),
-                EntityGroup.name.label("group_name"),
-                primary_alias.alias_value.label("primary_name"),
-                EntityLocation.chromosome.label("chromosome"),
-                EntityLocation.start_pos.label("start_pos"),
-                EntityLocation.end_pos.label("end_pos"),
-            )
-            .join(EntityLocation, EntityLocation.entity_id == Entity.id)
-            .join(EntityGroup, Entity.group_id == EntityGroup.id, isouter=True)
-            .join(
-                primary_alias,
-                and_(
-                    primary_alias.entity_id == Entity.id,
-                    primary_alias.is_primary.is_(True),
-                ),
-                isouter=True,
-            )
-            .filter(EntityLocation.build == int(build))
-            .filter(EntityLocation.chromosome == int(chrom))
-            .filter(EntityLocation.start_pos <= int(end))
-            .filter(EntityLocation.end_pos >= int(start))
-        )
-
-        if gene_group_filter:
-            q = q.filter(func.lower(EntityGroup.name).in_(list(gene_group_filter)))
-
-        rows = q.all()
-        out = []
-        for row in rows:
-            out.append(
-                {
-                    "entity_id": int(row.entity_id),
-                    "group_name": row.group_name,
-                    "primary_name": row.primary_name,
-                    "chromosome": int(row.chromosome),
-                    "start_pos": int(row.start_pos),
-                    "end_pos": int(row.end_pos),
-                }
-            )
-        return out
+        return gene_index.records(gene_index.overlaps(chrom, start, end))
 
     # ------------------------------------------------------------------
     # Row builders
@@ -684,7 +642,8 @@ class VariantGeneLocationModelReport(ReportBase):
 
         chromosome_variant_cache: dict[int, bool] = {}
 
-        # Cache gene-overlap lookups for variants/position/region workflows.
+        # Gene overlaps come from the shared in-memory interval index.
+        gene_index = self.gene_interval_index(build, gene_group_filter)
         gene_overlap_cache: dict[tuple[int, int, int], list[dict[str, Any]]] = {}
 
         for item in normalized_inputs:
@@ -796,11 +755,10 @@ class VariantGeneLocationModelReport(ReportBase):
                         genes = gene_overlap_cache.get(cache_key)
                         if genes is None:
                             genes = self._query_genes_overlap(
+                                gene_index=gene_index,
                                 chrom=int(variant["chromosome"]),
                                 start=vstart,
                                 end=vend,
-                                build=build,
-                                gene_group_filter=gene_group_filter,
                             )
                             gene_overlap_cache[cache_key] = genes
 
@@ -877,11 +835,10 @@ class VariantGeneLocationModelReport(ReportBase):
                         genes = gene_overlap_cache.get(cache_key)
                         if genes is None:
                             genes = self._query_genes_overlap(
+                                gene_index=gene_index,
                                 chrom=int(variant["chromosome"]),
                                 start=vstart,
                                 end=vend,
-                                build=build,
-                                gene_group_filter=gene_group_filter,
                             )
                             gene_overlap_cache[cache_key] = genes
 
@@ -12,12 +12,14 @@ from biofilter.modules.db.models import (
     Entity,
     EntityAlias,
     EntityGroup,
-    EntityLocation,
     EntityRelationship,
     EntityRelationshipType,
     ETLDataSource,
 )
 from biofilter.modules.report.reports.base_report import ReportBase
+from biofilter.modules.report.variant_position_resolver import (
+    resolve_variants_at_positions,
+)
 
 _RSID_RE = re.compile(r"^rs\d+$", re.IGNORECASE)
 _CHR_POS_RE = re.compile(r"^(?:chr)?([0-9xyXYmMtT]+)\s*[:;,\s]\s*(\d+)$")
@@ -187,83 +189,24 @@ class VariantModelingReport(ReportBase):
                 out.append(dict(row))
         return out
 
-    def _query_variants_at_position(
-        self, vm: Table, chrom: int, pos: int
-    ) -> list[dict[str, Any]]:
-        stmt = (
-            select(
-                vm.c.variant_id,
-                vm.c.rsid,
-                vm.c.chromosome,
-                vm.c.position_start,
-                vm.c.position_end,
-            )
-            .where(
-                and_(
-                    vm.c.chromosome == chrom,
-                    vm.c.position_start <= pos,
-                    vm.c.position_end >= pos,
-                )
-            )
-            .order_by(vm.c.position_start.asc(), vm.c.variant_id.asc())
-        )
-        if "allele_type" in vm.c:
-            stmt = stmt.where(func.lower(vm.c.allele_type) == "snv")
-        rows = self.session.execute(stmt).mappings().all()
-        seen: set[int] = set()
-        out = []
-        for row in rows:
-            vid = int(row["variant_id"])
-            if vid not in seen:
-                seen.add(vid)
-                out.append(dict(row))
-        return out
-
-    def _query_genes_overlap(
-        self,
-        chrom: int,
-        start: int,
-        end: int,
-        build: int,
-        gene_group_filter: set[str],
-    ) -> list[dict[str, Any]]:
-        primary_alias = aliased(EntityAlias)
-        q = (
-            self.session.query(
-                Entity.id.label("entity_id"),
-                primary_alias.alias_value.label("primary_name"),
-                EntityLocation.chromosome.label("chromosome"),
-                EntityLocation.start_pos.label("start_pos"),
-                EntityLocation.end_pos.label("end_pos"),
-            )
-            .join(EntityLocation, EntityLocation.entity_id == Entity.id)
-            .join(EntityGroup, Entity.group_id == EntityGroup.id, isouter=True)
-            .join(
-                primary_alias,
-                and_(
-                    primary_alias.entity_id == Entity.id,
-                    primary_alias.is_primary.is_(True),
-                ),
-                isouter=True,
-            )
-            .filter(EntityLocation.build == build)
-            .filter(EntityLocation.chromosome == chrom)
-            .filter(EntityLocation.start_pos <= end)
-            .filter(EntityLocation.end_pos >= start)
+    def _query_variants_at_positions(
+        self, vm: Table, positions: list[tuple[int, int]]
+    ) -> dict[tuple[int, int], list[dict[str, Any]]]:
+        found = resolve_variants_at_positions(
+            self.session,
+            vm,
+            positions,
+            columns=["variant_id", "rsid", "chromosome", "position_start", "position_end"],
         )
-        if gene_group_filter:
-            q = q.filter(func.lower(EntityGroup.name).in_(list(gene_group_filter)))
-        out = []
-        for row in q.all():
-            out.append(
-                {
-                    "entity_id": int(row.entity_id),
-                    "primary_name": row.primary_name,
-                    "chromosome": int(row.chromosome),
-                    "start_pos": int(row.start_pos),
-                    "end_pos": int(row.end_pos),
-                }
-            )
+        out: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        for pair, rows in found.items():
+            seen: set[int] = set()
+            out[pair] = []
+            for row in rows:
+                vid = int(row["variant_id"])
+                if vid not in seen:
+                    seen.add(vid)
+                    out[pair].append(row)
         return out
 
     def _query_gene_to_groups(
@@ -501,6 +444,12 @@ class VariantModelingReport(ReportBase):
         variant_by_id: dict[int, dict[str, Any]] = {}
         not_found: list[str] = []
 
+        # chr:pos inputs are resolved together in one staged join
+        variants_by_position = self._query_variants_at_positions(
+            vm,
+            [(p["chromosome"], p["position"]) for p in parsed if p["kind"] == "chr_pos"],
+        )
+
         for item in parsed:
             if item["kind"] == "invalid":
                 self.logger.log(
@@ -510,9 +459,7 @@ class VariantModelingReport(ReportBase):
             if item["kind"] == "rsid":
                 found = self._query_variant_by_rsid(vm, item["rsid"])
             else:
-                found = self._query_variants_at_position(
-                    vm, item["chromosome"], item["position"]
-                )
+                found = variants_by_position[(item["chromosome"], item["position"])]
             if not found:
                 not_found.append(item["raw"])
                 self.logger.log(f"No variant found for input '{item['raw']}'", "WARNING")
@@ -528,28 +475,21 @@ class VariantModelingReport(ReportBase):
         # ------------------------------------------------------------------
         gene_to_variants: dict[int, list[dict[str, Any]]] = {}
         gene_name_map: dict[int, str] = {}
-        _pos_cache: dict[tuple[int, int, int], list[dict[str, Any]]] = {}
-
-        for variant in variant_by_id.values():
-            chrom = int(variant["chromosome"])
-            vstart = max(1, int(variant["position_start"]) - window_bp)
-            vend = int(variant["position_end"]) + window_bp
-            cache_key = (chrom, vstart, vend)
-
-            if cache_key not in _pos_cache:
-                _pos_cache[cache_key] = self._query_genes_overlap(
-                    chrom=chrom,
-                    start=vstart,
-                    end=vend,
-                    build=build,
-                    gene_group_filter=gene_group_filter,
-                )
-            for gene in _pos_cache[cache_key]:
-                gid = int(gene["entity_id"])
-                gene_to_variants.setdefault(gid, [])
-                if not any(v["variant_id"] == variant["variant_id"] for v in gene_to_variants[gid]):
-                    gene_to_variants[gid].append(variant)
-                gene_name_map[gid] = _norm(gene["primary_name"]) or str(gid)
+
+        gene_index = self.gene_interval_index(build, gene_group_filter)
+        variants = list(variant_by_id.values())
+        variant_idx, gene_rows = gene_index.overlaps_batch(
+            [int(v["chromosome"]) for v in variants],
+            [max(1, int(v["position_start"]) - window_bp) for v in variants],
+            [int(v["position_end"]) + window_bp for v in variants],
+        )
+        for v_idx, row in zip(variant_idx.tolist(), gene_rows.tolist()):
+            variant = variants[v_idx]
+            gid = int(gene_index.entity_id[row])
+            gene_to_variants.setdefault(gid, [])
+            if not any(v["variant_id"] == variant["variant_id"] for v in gene_to_variants[gid]):
+                gene_to_variants[gid].append(variant)
+            gene_name_map[gid] = _norm(gene_index.primary_name[row]) or str(gid)
 
         seed_gene_ids = set(gene_to_variants.keys())
 
@@ -6,12 +6,10 @@ from typing import Any
 
 import pandas as pd
 from sqlalchemy import MetaData, Table, and_, func, or_, select
-from sqlalchemy.orm import aliased
 
 from biofilter.modules.db.models import (
     ETLDataSource,
     ETLSourceSystem,
-    Entity,
     EntityAlias,
     EntityGroup,
     EntityLocation,
@@ -21,6 +19,7 @@ from biofilter.modules.db.models import (
     GeneGroupMembership,
     GeneLocusGroup,
 )
+from biofilter.modules.report.gene_interval_index import load_gene_interval_index
 from biofilter.modules.report.reports.base_report import ReportBase
 
 
@@ -310,7 +309,7 @@ class VariantSingleGeneAnnotationReport(ReportBase):
 
         # ── 7. Find seed gene at position ──────────────────────────────────
         seed_gene = self._find_gene_at_position(
-            chrom, pos, window_bp, gene_group, assembly_ids
+            chrom, pos, window_bp, gene_group, build
         )
         if seed_gene is None:
             self.logger.log(
@@ -481,7 +480,7 @@ class VariantSingleGeneAnnotationReport(ReportBase):
         position: int,
         window_bp: int,
         gene_group: EntityGroup,
-        assembly_ids: list[int],
+        build: int,
     ) -> dict[str, Any] | None:
         """
         Return the gene that best covers (or is closest to) the given position.
@@ -496,59 +495,23 @@ class VariantSingleGeneAnnotationReport(ReportBase):
           - genes downstream have distance = position - gene_end
         The gene with the smallest distance is returned; ties broken by
         smallest locus span (most specific gene).
+
+        Lookups go through the shared in-memory gene interval index.
         """
-        primary_alias = aliased(EntityAlias)
-
-        search_start = position - window_bp
-        search_end = position + window_bp
-
-        q = (
-            self.session.query(
-                EntityLocation.entity_id.label("entity_id"),
-                EntityLocation.chromosome.label("chromosome"),
-                EntityLocation.start_pos.label("start_pos"),
-                EntityLocation.end_pos.label("end_pos"),
-                primary_alias.alias_value.label("gene_symbol"),
-            )
-            .join(Entity, Entity.id == EntityLocation.entity_id)
-            .join(
-                primary_alias,
-                and_(
-                    primary_alias.entity_id == Entity.id,
-                    primary_alias.is_primary.is_(True),
-                ),
-                isouter=True,
-            )
-            .filter(
-                EntityLocation.entity_group_id == gene_group.id,
-                EntityLocation.chromosome == chromosome,
-                EntityLocation.start_pos <= search_end,
-                EntityLocation.end_pos >= search_start,
-            )
+        gene_index = load_gene_interval_index(
+            self.session, build=build, group_ids=[gene_group.id], group_on="location"
         )
-        if assembly_ids:
-            q = q.filter(EntityLocation.assembly_id.in_(assembly_ids))
-
-        rows = q.all()
-        if not rows:
+        rows, _ = gene_index.nearest([chromosome], [position], max_distance=window_bp)
+        if rows[0] < 0:
             return None
 
-        def _distance(row) -> int:
-            """Distance from position to gene; 0 if position is inside the gene."""
-            if row.start_pos <= position <= row.end_pos:
-                return 0
-            if position < row.start_pos:
-                return row.start_pos - position
-            return position - row.end_pos
-
-        # Primary sort: distance ascending; secondary: locus span ascending
-        best = min(rows, key=lambda r: (_distance(r), r.end_pos - r.start_pos))
+        best = gene_index.record(rows[0])
         return {
-            "entity_id": int(best.entity_id),
-            "gene_symbol": _norm_str(best.gene_symbol) or f"entity_{best.entity_id}",
-            "chromosome": int(best.chromosome),
-            "start_pos": int(best.start_pos),
-            "end_pos": int(best.end_pos),
+            "entity_id": best["entity_id"],
+            "gene_symbol": _norm_str(best["primary_name"]) or f"entity_{best['entity_id']}",
+            "chromosome": best["chromosome"],
+            "start_pos": best["start_pos"],
+            "end_pos": best["end_pos"],
         }
 
     # ------------------------------------------------------------------
@@ -0,0 +1,124 @@
+"""
+Set-based chr:pos -> variant_masters resolution for reports.
+
+Resolving input positions one `SELECT` at a time costs one round trip per
+input, which dominates report time for large position lists.
+`resolve_variants_at_positions` instead:
+
+- loads the distinct (chromosome, position) pairs into a temporary staging
+  table (`COPY` on PostgreSQL, `executemany` inserts elsewhere);
+- runs one join against `variant_masters` per chromosome, with a literal
+  `vm.chromosome = :chromosome` predicate so PostgreSQL only scans that
+  chromosome's partition;
+- returns the matching rows grouped by input position, in the same order
+  the per-position queries used (position_start, variant_id).
+"""
+
+from __future__ import annotations
+
+import io
+import uuid
+from collections import defaultdict
+from typing import Any, Iterable
+
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Table, and_, func, select
+
+INSERT_BATCH = 10_000
+
+
+def _staging_table(name: str) -> Table:
+    return Table(
+        name,
+        MetaData(),
+        Column("chromosome", Integer, nullable=False),
+        Column("position", BigInteger, nullable=False),
+        prefixes=["TEMPORARY"],
+    )
+
+
+def _copy_rows(conn, table_name: str, rows: list[tuple[int, int]]) -> None:
+    """COPY rows into a PostgreSQL table through the raw DBAPI cursor."""
+    buf = io.StringIO("".join(f"{c}\t{p}\n" for c, p in rows))
+    sql = f"COPY {table_name} (chromosome, position) FROM STDIN"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buf)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buf.getvalue())
+    finally:
+        cursor.close()
+
+
+def _load_staging(conn, staging: Table, rows: list[tuple[int, int]]) -> None:
+    if conn.dialect.name == "postgresql":
+        _copy_rows(conn, staging.name, rows)
+        return
+    for i in range(0, len(rows), INSERT_BATCH):
+        conn.execute(
+            staging.insert(),
+            [{"chromosome": c, "position": p} for c, p in rows[i : i + INSERT_BATCH]],
+        )
+
+
+def resolve_variants_at_positions(
+    session,
+    vm: Table,
+    positions: Iterable[tuple[int, int]],
+    columns: Iterable[str] | None = None,
+    snv_only: bool = True,
+) -> dict[tuple[int, int], list[dict[str, Any]]]:
+    """
+    Variants overlapping each (chromosome, position) pair.
+
+    Returns {(chromosome, position): [row dicts]} with one entry per
+    distinct input pair (empty list when nothing matches). `columns`
+    restricts the selected `variant_masters` columns (default: all).
+    Rows are filtered to `allele_type = 'snv'` when `snv_only` is set and
+    the column exists.
+    """
+    pairs = sorted({(int(c), int(p)) for c, p in positions})
+    result: dict[tuple[int, int], list[dict[str, Any]]] = {pair: [] for pair in pairs}
+    if not pairs:
+        return result
+
+    selected = [vm.c[name] for name in columns] if columns is not None else list(vm.c)
+    conn = session.connection()
+    staging = _staging_table(f"_bf_seed_positions_{uuid.uuid4().hex[:8]}")
+    staging.create(conn)
+    try:
+        _load_staging(conn, staging, pairs)
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql(f"ANALYZE {staging.name}")
+
+        s = staging.c
+        for chrom in sorted({c for c, _ in pairs}):
+            stmt = (
+                select(s.position.label("_bf_input_position"), *selected)
+                .select_from(
+                    staging.join(
+                        vm,
+                        and_(
+                            vm.c.chromosome == s.chromosome,
+                            vm.c.position_start <= s.position,
+                            vm.c.position_end >= s.position,
+                        ),
+                    )
+                )
+                .where(vm.c.chromosome == chrom, s.chromosome == chrom)
+                .order_by(s.position, vm.c.position_start, vm.c.variant_id)
+            )
+            if snv_only and "allele_type" in vm.c:
+                stmt = stmt.where(func.lower(vm.c.allele_type) == "snv")
+
+            by_position: dict[int, list[dict[str, Any]]] = defaultdict(list)
+            for row in conn.execute(stmt).mappings():
+                row = dict(row)
+                by_position[int(row.pop("_bf_input_position"))].append(row)
+            for pos, rows in by_position.items():
+                result[(chrom, pos)] = rows
+    finally:
+        staging.drop(conn, checkfirst=True)
+
+    return result
@@ -1,3 +1,6 @@
-from .model_explorer import ModelExplorer
+from .lazy_import import lazy_exports
+
+# ModelExplorer needs pandas/SQLAlchemy; keep `biofilter.utils.*` imports light
+__getattr__ = lazy_exports(__name__, {"ModelExplorer": f"{__name__}.model_explorer"})  # noqa E501
 
 __all__ = ["ModelExplorer"]
@@ -44,6 +44,7 @@ def register_imperative_tables(engine) -> None:
         map_variant_masters,
         map_variant_molecular_effects,
         map_variant_effect_predictions,
+        map_variant_predictor_summary,
         map_variant_regulatory_elements,
         map_variant_gene_regulatory_evidence,
     )
@@ -52,6 +53,7 @@ def register_imperative_tables(engine) -> None:
         ("variant_masters", map_variant_masters),
         ("variant_molecular_effects", map_variant_molecular_effects),
         ("variant_effect_predictions", map_variant_effect_predictions),
+        ("variant_predictor_summary", map_variant_predictor_summary),
         ("variant_regulatory_elements", map_variant_regulatory_elements),
         ("variant_gene_regulatory_evidence", map_variant_gene_regulatory_evidence),
     ]
@@ -0,0 +1,396 @@
+"""
+Resumable, segmented HTTP downloads with streaming checksums.
+
+A download is written to `<file>.part` and renamed into place only once it
+is complete (and, when an expected checksum is given, verified):
+
+- servers that advertise `Accept-Ranges: bytes` and a `Content-Length` are
+  fetched as N ranged segments in parallel threads. Progress is kept in a
+  `<file>.part.json` sidecar so an interrupted job restarts each segment
+  from the last byte written;
+- everything else is a single stream. A leftover `.part` without a sidecar
+  is continued with an open-ended `Range` request when the server allows it;
+- each request is retried with exponential backoff, continuing from the
+  current offset rather than from the start of the segment.
+
+SHA256 and MD5 are computed while the data arrives. In segmented mode the
+contiguous prefix is hashed as soon as its segments are complete, so by the
+time the last byte lands only the tail is left to hash and the file is never
+re-read after the download.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import requests
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+DEFAULT_SEGMENTS = 4
+DEFAULT_RETRIES = 5
+MIN_SEGMENT_SIZE = 8 << 20  # do not split files below 2 x 8 MiB
+STATE_FLUSH_BYTES = 16 << 20
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    size: int
+    sha256: str
+    md5: str
+    segments: int = 1
+    resumed_bytes: int = 0
+    seconds: float = 0.0
+
+
+class _Hashers:
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.md5 = hashlib.md5()
+
+    def update(self, chunk: bytes) -> None:
+        self.sha256.update(chunk)
+        self.md5.update(chunk)
+
+    def update_from_file(
+        self, path: Path, start: int, end: int, chunk_size: int
+    ) -> None:
+        """Hash bytes [start, end) of `path`."""
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise DownloadError(f"Short read while hashing {path}")
+                self.update(chunk)
+                remaining -= len(chunk)
+
+
+class HTTPDownloader:
+    """
+    Download `url` into `dest` with ranged segments, resume and retries.
+
+    >>> HTTPDownloader(segments=8).download(url, "/data/raw/file.gz")
+    """
+
+    def __init__(
+        self,
+        segments: int = DEFAULT_SEGMENTS,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = 1.0,
+        timeout: float = 60.0,
+        chunk_size: int = CHUNK_SIZE,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        headers: Optional[Dict[str, str]] = None,
+        logger=None,
+    ):
+        self.segments = max(1, int(segments or 1))
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.min_segment_size = min_segment_size
+        self.headers = dict(headers or {})  # sent with every request
+        self.logger = logger
+
+    def _log(self, msg: str, level: str = "INFO") -> None:
+        if self.logger is not None:
+            self.logger.log(msg, level)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def download(
+        self,
+        url: str,
+        dest: Union[str, Path],
+        expected_md5: Optional[str] = None,
+        expected_sha256: Optional[str] = None,
+    ) -> DownloadResult:
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part = dest.with_name(dest.name + ".part")
+        state_path = dest.with_name(dest.name + ".part.json")
+
+        t0 = time.time()
+        size, accepts_ranges, etag = self._probe(url)
+
+        use_segments = (
+            self.segments > 1
+            and accepts_ranges
+            and size is not None
+            and size >= 2 * self.min_segment_size
+            and (state_path.exists() or not part.exists())
+        )
+        if use_segments:
+            hashers, resumed, n_segments = self._download_segmented(
+                url, part, state_path, size, etag
+            )
+        else:
+            hashers, resumed = self._download_single(
+                url, part, size, accepts_ranges
+            )
+            n_segments = 1
+
+        result = DownloadResult(
+            path=dest,
+            size=part.stat().st_size,
+            sha256=hashers.sha256.hexdigest(),
+            md5=hashers.md5.hexdigest(),
+            segments=n_segments,
+            resumed_bytes=resumed,
+        )
+
+        mismatch = None
+        if expected_md5 and expected_md5.lower() != result.md5:
+            mismatch = f"MD5 {result.md5} != expected {expected_md5}"
+        elif expected_sha256 and expected_sha256.lower() != result.sha256:
+            mismatch = f"SHA256 {result.sha256} != expected {expected_sha256}"  # noqa E501
+        if mismatch:
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise DownloadError(f"Checksum mismatch for {dest.name}: {mismatch}")  # noqa E501
+
+        os.replace(part, dest)
+        state_path.unlink(missing_ok=True)
+        result.seconds = time.time() - t0
+        return result
+
+    # ------------------------------------------------------------------
+    # Probe / retry helpers
+    # ------------------------------------------------------------------
+    def _probe(self, url: str) -> Tuple[Optional[int], bool, Optional[str]]:
+        """
+        Returns (size, accepts_ranges, etag). Servers that reject HEAD fall
+        back to the single-stream path.
+        """
+        try:
+            resp = requests.head(
+                url, headers=self.headers, allow_redirects=True, timeout=self.timeout  # noqa E501
+            )
+        except requests.RequestException:
+            return None, False, None
+        if resp.status_code >= 400:
+            if resp.status_code in (404, 410):
+                raise DownloadError(f"HTTP Status: {resp.status_code}")
+            return None, False, None
+
+        length = resp.headers.get("Content-Length")
+        size = int(length) if length and length.isdigit() else None
+        accepts_ranges = resp.headers.get("Accept-Ranges", "").lower() == "bytes"  # noqa E501
+        etag = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        return size, accepts_ranges, etag
+
+    def _sleep(self, attempt: int) -> None:
+        time.sleep(self.backoff * (2 ** attempt))
+
+    # ------------------------------------------------------------------
+    # Single stream
+    # ------------------------------------------------------------------
+    def _download_single(
+        self,
+        url: str,
+        part: Path,
+        size: Optional[int],
+        accepts_ranges: bool,
+    ) -> Tuple[_Hashers, int]:
+        hashers = _Hashers()
+        offset = 0
+        if part.exists() and accepts_ranges:
+            offset = part.stat().st_size
+            if size is not None and offset > size:
+                offset = 0
+        resumed = offset
+        if offset:
+            self._log(f"↪️  Resuming {part.name} at {offset:,} bytes", "INFO")
+            hashers.update_from_file(part, 0, offset, self.chunk_size)
+
+        attempt = 0
+        while True:
+            if size is not None and offset == size:
+                return hashers, resumed
+            headers = dict(self.headers)
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                with requests.get(
+                    url, headers=headers, stream=True, timeout=self.timeout
+                ) as resp:
+                    if offset and resp.status_code == 200:
+                        # Range ignored: start over
+                        offset = resumed = 0
+                        hashers = _Hashers()
+                    elif resp.status_code not in (200, 206):
+                        raise DownloadError(f"HTTP Status: {resp.status_code}")  # noqa E501
+
+                    with open(part, "r+b" if offset else "wb") as f:
+                        f.seek(offset)
+                        f.truncate()
+                        for chunk in resp.iter_content(self.chunk_size):
+                            if chunk:
+                                f.write(chunk)
+                                hashers.update(chunk)
+                                offset += len(chunk)
+
+                if size is None or offset == size:
+                    return hashers, resumed
+                raise requests.ConnectionError(
+                    f"incomplete body ({offset:,} of {size:,} bytes)"
+                )
+            except DownloadError:
+                raise
+            except requests.RequestException as e:
+                if attempt >= self.retries:
+                    raise DownloadError(
+                        f"giving up after {attempt + 1} attempts: {e}"
+                    ) from e
+                self._log(f"⚠️  Download interrupted ({e}); retrying from byte {offset:,}", "WARNING")  # noqa E501
+                self._sleep(attempt)
+                attempt += 1
+                if not accepts_ranges:
+                    offset = 0
+                    hashers = _Hashers()
+
+    # ------------------------------------------------------------------
+    # Segmented
+    # ------------------------------------------------------------------
+    def _load_state(
+        self, state_path: Path, size: int, etag: Optional[str]
+    ) -> Optional[List[Dict[str, int]]]:
+        if not state_path.exists():
+            return None
+        try:
+            state = json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if state.get("size") != size or state.get("etag") != etag:
+            return None
+        return state.get("segments")
+
+    def _new_segments(self, size: int) -> List[Dict[str, int]]:
+        n = max(1, min(self.segments, size // self.min_segment_size))
+        step = -(-size // n)
+        return [
+            {"start": s, "end": min(s + step, size), "done": 0}
+            for s in range(0, size, step)
+        ]
+
+    def _download_segmented(
+        self,
+        url: str,
+        part: Path,
+        state_path: Path,
+        size: int,
+        etag: Optional[str],
+    ) -> Tuple[_Hashers, int, int]:
+        segments = self._load_state(state_path, size, etag)
+        if segments is None or not part.exists():
+            segments = self._new_segments(size)
+            with open(part, "wb") as f:
+                f.truncate(size)
+
+        resumed = sum(seg["done"] for seg in segments)
+        if resumed:
+            self._log(f"↪️  Resuming {part.name} at {resumed:,} of {size:,} bytes", "INFO")  # noqa E501
+
+        lock = threading.Lock()
+
+        def save_state():
+            with lock:
+                payload = {"size": size, "etag": etag, "segments": segments}
+                tmp = state_path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(payload))
+                os.replace(tmp, state_path)
+
+        save_state()
+
+        hashers = _Hashers()
+        next_to_hash = 0
+        with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+            pending = {
+                pool.submit(self._fetch_segment, url, part, seg, save_state): i  # noqa E501
+                for i, seg in enumerate(segments)
+            }
+            finished = set()
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        fut.result()
+                        finished.add(pending.pop(fut))
+                    # Hash the contiguous completed prefix while the others
+                    # are still downloading
+                    while next_to_hash in finished:
+                        seg = segments[next_to_hash]
+                        hashers.update_from_file(
+                            part, seg["start"], seg["end"], self.chunk_size
+                        )
+                        next_to_hash += 1
+            except BaseException:
+                for fut in pending:
+                    fut.cancel()
+                save_state()
+                raise
+
+        return hashers, resumed, len(segments)
+
+    def _fetch_segment(self, url, part: Path, seg: Dict[str, int], save_state):  # noqa E501
+        attempt = 0
+        unsaved = 0
+        while True:
+            pos = seg["start"] + seg["done"]
+            if pos >= seg["end"]:
+                save_state()
+                return
+            headers = {**self.headers, "Range": f"bytes={pos}-{seg['end'] - 1}"}  # noqa E501
+            try:
+                with requests.get(
+                    url, headers=headers, stream=True, timeout=self.timeout
+                ) as resp:
+                    if resp.status_code != 206:
+                        raise DownloadError(
+                            f"HTTP Status: {resp.status_code} for range {headers['Range']}"  # noqa E501
+                        )
+                    with open(part, "r+b") as f:
+                        f.seek(pos)
+                        for chunk in resp.iter_content(self.chunk_size):
+                            if not chunk:
+                                continue
+                            chunk = chunk[: seg["end"] - pos]
+                            f.write(chunk)
+                            pos += len(chunk)
+                            seg["done"] += len(chunk)
+                            unsaved += len(chunk)
+                            if unsaved >= STATE_FLUSH_BYTES:
+                                f.flush()
+                                save_state()
+                                unsaved = 0
+                            if pos >= seg["end"]:
+                                break
+                if pos < seg["end"]:
+                    raise requests.ConnectionError(
+                        f"segment ended at byte {pos:,} (expected {seg['end']:,})"  # noqa E501
+                    )
+            except DownloadError:
+                raise
+            except requests.RequestException as e:
+                if attempt >= self.retries:
+                    raise DownloadError(
+                        f"giving up after {attempt + 1} attempts: {e}"
+                    ) from e
+                self._log(f"⚠️  Segment interrupted ({e}); retrying from byte {pos:,}", "WARNING")  # noqa E501
+                self._sleep(attempt)
+                attempt += 1
@@ -0,0 +1,62 @@
+"""
+Deferred imports for startup-sensitive modules.
+
+`biofilter --version` or `biofilter report list` should not pay for
+pandas, pyarrow, alembic or the ETL stack. Two helpers keep the public
+names where they are while importing the code on first use:
+
+- `lazy_attr(module, name)`: a callable stand-in for `from module import
+  name` (functions and classes that are only called). The name stays a
+  plain module attribute, so it can still be monkeypatched.
+- `lazy_exports(package, {name: module})`: a PEP 562 `__getattr__` for
+  package `__init__` re-exports.
+"""
+
+from __future__ import annotations
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict
+
+
+class LazyAttr:
+    """`module.name`, imported the first time it is called or inspected."""
+
+    __slots__ = ("_module", "_name", "_target")
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            self._target = getattr(import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module}.{self._name}>"
+
+
+def lazy_attr(module: str, name: str) -> LazyAttr:
+    return LazyAttr(module, name)
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:  # noqa E501
+    """Module `__getattr__` importing `exports[name]` on first access."""
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")  # noqa E501
+        value = getattr(import_module(module), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,169 @@
+"""
+Streaming COPY helpers for PostgreSQL.
+
+Data is handed to COPY as Arrow record batches encoded with the Arrow CSV
+writer, one batch at a time, so neither a Python per-row loop nor the whole
+encoded buffer is needed:
+
+- nulls are written as unquoted empty fields and empty strings as `""`,
+  which is exactly what `COPY ... (FORMAT CSV)` expects by default;
+- the file-like stream only ever holds one encoded batch.
+"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+COPY_BATCH_ROWS = 100_000
+
+CopySource = Union[
+    pd.DataFrame,
+    pa.Table,
+    pa.RecordBatch,
+    str,
+    Path,
+    Iterable[pa.RecordBatch],
+]
+
+
+def _frame_to_table(df: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns: send them as text, COPY casts them
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].astype("string")
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def iter_record_batches(
+    source: CopySource,
+    columns: Optional[List[str]] = None,
+    batch_rows: int = COPY_BATCH_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yield record batches (at most `batch_rows` rows) restricted to `columns`
+    from a DataFrame, an Arrow table/batch, a parquet file or an iterable
+    of record batches. Parquet files are read batch by batch.
+    """
+    if isinstance(source, (str, Path)):
+        pf = pq.ParquetFile(str(source))
+        yield from pf.iter_batches(batch_size=batch_rows, columns=columns)
+        return
+
+    if isinstance(source, pd.DataFrame):
+        frame = source[columns] if columns is not None else source
+        source = _frame_to_table(frame)
+        columns = None
+
+    if isinstance(source, pa.RecordBatch):
+        source = pa.Table.from_batches([source])
+
+    if isinstance(source, pa.Table):
+        if columns is not None:
+            source = source.select(columns)
+        yield from source.to_batches(max_chunksize=batch_rows)
+        return
+
+    for batch in source:
+        if columns is not None:
+            batch = batch.select(columns)
+        yield batch
+
+
+def encode_csv_batch(batch: pa.RecordBatch) -> bytes:
+    sink = pa.BufferOutputStream()
+    pacsv.write_csv(
+        batch,
+        sink,
+        write_options=pacsv.WriteOptions(include_header=False),
+    )
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowCSVStream(io.RawIOBase):
+    """
+    Read-only file object over CSV-encoded record batches, consumed by
+    `cursor.copy_expert`. Counts rows as batches are pulled.
+    """
+
+    def __init__(self, batches: Iterable[pa.RecordBatch]):
+        self._batches = iter(batches)
+        self._buf = b""
+        self._pos = 0
+        self.rows = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> bool:
+        for batch in self._batches:
+            if batch.num_rows == 0:
+                continue
+            self.rows += batch.num_rows
+            self._buf = encode_csv_batch(batch)
+            self._pos = 0
+            return True
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            chunks = [self._buf[self._pos:]]
+            while self._fill():
+                chunks.append(self._buf)
+            self._buf, self._pos = b"", 0
+            return b"".join(chunks)
+
+        if self._pos >= len(self._buf) and not self._fill():
+            return b""
+        chunk = self._buf[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+    def readinto(self, b) -> int:
+        chunk = self.read(len(b))
+        b[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def driver_connection(conn):
+    """
+    DBAPI connection behind a SQLAlchemy Connection (psycopg2).
+    """
+    raw_conn = getattr(conn.connection, "driver_connection", None)
+    if raw_conn is None:
+        raw_conn = getattr(conn.connection, "connection", None)
+    if raw_conn is None:
+        raise RuntimeError("Could not access the PostgreSQL driver connection.")  # noqa E501
+    return raw_conn
+
+
+def copy_batches_to_postgres(
+    conn,
+    table_name: str,
+    columns: List[str],
+    batches: Iterable[pa.RecordBatch],
+) -> int:
+    """
+    COPY record batches into `table_name` on the SQLAlchemy connection's
+    current transaction. Returns the number of rows sent.
+    """
+    cols = ", ".join(columns)
+    copy_sql = f"COPY {table_name} ({cols}) FROM STDIN WITH (FORMAT CSV)"
+    stream = ArrowCSVStream(batches)
+
+    cursor = driver_connection(conn).cursor()
+    try:
+        cursor.copy_expert(copy_sql, stream)
+    finally:
+        cursor.close()
+    return stream.rows
@@ -0,0 +1,149 @@
+"""
+Cached registries of reports and DTPs.
+
+Listing reports used to import every report module (and with them pandas,
+the models and the report helpers) just to read `name`/`description`.
+The registry is built once and kept on disk as a small JSON manifest:
+
+- `<cache dir>/registry-<kind>-<biofilter version>.json`, where the cache
+  dir is $BIOFILTER_CACHE_DIR, else $XDG_CACHE_HOME/biofilter, else
+  ~/.cache/biofilter;
+- the manifest also stores a signature of the package's module files
+  (name, size, mtime), so adding or editing a report/DTP rebuilds it even
+  without a version bump;
+- writing is best effort: on a read-only home the registry is rebuilt in
+  memory on every call, as before.
+
+Reports are registered by importing them (their metadata are class
+attributes, possibly inherited). DTPs set `dtp_name`/`dtp_version` in
+`__init__`, so their entries are read from the source with `ast`.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import pkgutil
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from biofilter.utils.version import __version__
+
+REPORTS_PACKAGE = "biofilter.modules.report.reports"
+DTPS_PACKAGE = "biofilter.modules.etl.dtps"
+
+Entry = Dict[str, str]
+
+
+def cache_dir() -> Path:
+    root = os.getenv("BIOFILTER_CACHE_DIR")
+    if root:
+        return Path(root).expanduser()
+    xdg = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "biofilter"
+
+
+def package_modules(package: str, prefix: str) -> List[str]:
+    """Module names in `package` starting with `prefix` (no import)."""
+    pkg = import_module(package)
+    return sorted(
+        name
+        for _, name, _ in pkgutil.iter_modules(pkg.__path__)
+        if name.startswith(prefix)
+    )
+
+
+def modules_signature(package: str, modules: List[str]) -> str:
+    """Hash of the version plus name/size/mtime of each module file."""
+    root = Path(import_module(package).__path__[0])
+    digest = hashlib.sha256(__version__.encode())
+    for name in modules:
+        path = root / f"{name}.py"
+        try:
+            st = path.stat()
+            digest.update(f"{name}:{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(f"{name}:-".encode())
+    return digest.hexdigest()
+
+
+def manifest_path(kind: str) -> Path:
+    return cache_dir() / f"registry-{kind}-{__version__}.json"
+
+
+def cached_registry(
+    kind: str,
+    package: str,
+    modules: List[str],
+    build: Callable[[List[str]], List[Entry]],
+) -> List[Entry]:
+    """
+    Entries for `modules`: from the manifest when its signature matches,
+    otherwise from `build(modules)` (then saved for the next call).
+    """
+    signature = modules_signature(package, modules)
+    path = manifest_path(kind)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("signature") == signature:
+            return data["entries"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    entries = build(modules)
+    payload = {
+        "kind": kind,
+        "version": __version__,
+        "signature": signature,
+        "entries": entries,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# DTPs
+# ---------------------------------------------------------------------------
+def _dtp_entry(package: str, module: str) -> Entry:
+    path = Path(import_module(package).__path__[0]) / f"{module}.py"
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    entry = {
+        "module": module,
+        "name": module,
+        "version": "",
+        "description": (ast.get_docstring(tree) or "").strip().split("\n")[0],
+    }
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == "DTP"):
+            continue
+        doc = (ast.get_docstring(node) or "").strip()
+        if doc:
+            entry["description"] = doc.split("\n")[0]
+        for sub in ast.walk(node):
+            if not isinstance(sub, ast.Assign) or not isinstance(sub.value, ast.Constant):  # noqa E501
+                continue
+            for target in sub.targets:
+                if isinstance(target, ast.Attribute) and target.attr in ("dtp_name", "dtp_version"):  # noqa E501
+                    entry["name" if target.attr == "dtp_name" else "version"] = str(sub.value.value)  # noqa E501
+    return entry
+
+
+def dtp_registry(modules: Optional[List[str]] = None) -> List[Entry]:
+    """[{module, name, version, description}] of the DTP scripts."""
+    modules = modules if modules is not None else package_modules(DTPS_PACKAGE, "dtp_")  # noqa E501
+    return cached_registry(
+        "dtps",
+        DTPS_PACKAGE,
+        modules,
+        lambda mods: [_dtp_entry(DTPS_PACKAGE, m) for m in mods],
+    )
@@ -0,0 +1,125 @@
+"""
+CLI startup benchmark based on `python -X importtime`.
+
+Each scenario runs in a fresh interpreter; the script reports the best
+wall time, the summed self import time, the heavy dependencies that were
+imported and the slowest modules (cumulative). Save a run with --json and
+compare later runs against it with --baseline to catch regressions.
+
+    python scripts/benchmarks/startup_importtime.py
+    python scripts/benchmarks/startup_importtime.py --json startup.json
+    python scripts/benchmarks/startup_importtime.py --baseline startup.json --tolerance 1.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HEAVY = ("pandas", "pyarrow", "numpy", "sqlalchemy", "alembic", "matplotlib")
+
+SCENARIOS = {
+    "import biofilter": "import biofilter",
+    "import cli": "import biofilter.api.cli.main",
+    "biofilter --version": (
+        "from biofilter.api.cli.main import main\n"
+        "main(['--version'], standalone_mode=False)"
+    ),
+    "biofilter report --help": (
+        "from biofilter.api.cli.main import main\n"
+        "main(['report', '--help'], standalone_mode=False)"
+    ),
+}
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _probe(code: str) -> str:
+    # Print the heavy modules loaded by `code` on the last stdout line
+    return (
+        f"{code}\n"
+        "import sys\n"
+        f"print('HEAVY=' + ','.join(m for m in {HEAVY!r} if m in sys.modules))\n"
+    )
+
+
+def run_scenario(code: str, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _probe(code)],
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - t0
+        if proc.returncode != 0:
+            raise RuntimeError(f"Scenario failed:\n{proc.stderr[-2000:]}")
+        if best is None or elapsed < best["wall_ms"] / 1e3:
+            modules = [
+                (m.group(4), int(m.group(1)), int(m.group(2)))
+                for m in map(LINE.match, proc.stderr.splitlines())
+                if m
+            ]
+            heavy = proc.stdout.strip().splitlines()[-1].partition("=")[2]
+            best = {
+                "wall_ms": round(elapsed * 1e3, 1),
+                "import_ms": round(sum(s for _, s, _ in modules) / 1e3, 1),
+                "modules": len(modules),
+                "heavy": [h for h in heavy.split(",") if h],
+                "slowest": [
+                    {"module": name, "cumulative_ms": round(cum / 1e3, 1)}
+                    for name, _, cum in sorted(modules, key=lambda x: -x[2])[:8]
+                ],
+            }
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Biofilter CLI startup benchmark")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--json", help="Write results to this file")
+    p.add_argument("--baseline", help="Compare import_ms against a saved run")
+    p.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Fail when import_ms exceeds baseline x tolerance",
+    )
+    args = p.parse_args()
+
+    results = {name: run_scenario(code, args.repeat) for name, code in SCENARIOS.items()}  # noqa E501
+
+    for name, r in results.items():
+        print(
+            f"{name:<26} wall {r['wall_ms']:>7.1f} ms | imports {r['import_ms']:>7.1f} ms "  # noqa E501
+            f"({r['modules']} modules) | heavy: {', '.join(r['heavy']) or '-'}"
+        )
+        for s in r["slowest"][:3]:
+            print(f"{'':<28}{s['cumulative_ms']:>7.1f} ms  {s['module']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        failed = []
+        for name, r in results.items():
+            base = baseline.get(name)
+            if base and r["import_ms"] > base["import_ms"] * args.tolerance:
+                failed.append(f"{name}: {r['import_ms']} ms > {base['import_ms']} ms x {args.tolerance}")  # noqa E501
+            if base and set(r["heavy"]) - set(base["heavy"]):
+                failed.append(f"{name}: new heavy imports {sorted(set(r['heavy']) - set(base['heavy']))}")  # noqa E501
+        if failed:
+            print("\nStartup regressions:\n  " + "\n  ".join(failed))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_registry_cache(tmp_path_factory, monkeypatch):
+    # Keep registry manifests (biofilter.utils.registry_manifest) out of ~/.cache
+    monkeypatch.setenv("BIOFILTER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("pandas", "pyarrow", "numpy", "sqlalchemy", "alembic")
+
+
+@pytest.mark.parametrize("module", ["biofilter", "biofilter.api.cli.main"])
+def test_import_does_not_load_heavy_dependencies(module):
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def test_lazy_exports_resolve_on_first_access():
+    import biofilter
+    from biofilter.core import components
+
+    assert biofilter.Biofilter.__name__ == "Biofilter"
+    assert components.DBComponent.__name__ == "DBComponent"
+    assert "Biofilter" in vars(biofilter)  # cached after first access
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from biofilter.modules.db.arrow_fetch import (
+    fetch_arrow,
+    fetch_frame,
+    iter_record_batches,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, score REAL, label TEXT, late INTEGER)"))  # noqa E501
+        conn.execute(
+            text("INSERT INTO t VALUES (:id, :score, :label, :late)"),
+            [
+                {
+                    "id": i,
+                    "score": None if i % 4 == 0 else i / 2,
+                    "label": f"v{i}" if i % 3 else None,
+                    # NULL for the whole first batches, typed later
+                    "late": i if i >= 8 else None,
+                }
+                for i in range(10)
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def _rows_frame(conn, sql):
+    return pd.DataFrame([dict(r) for r in conn.execute(text(sql)).mappings().all()])
+
+
+def test_fetch_frame_matches_frame_built_from_rows(engine):
+    sql = "SELECT * FROM t ORDER BY id"
+    with engine.connect() as conn:
+        expected = _rows_frame(conn, sql)
+        for batch_size in (3, 100):
+            pd.testing.assert_frame_equal(
+                fetch_frame(conn, sql, batch_size=batch_size), expected
+            )
+
+
+def test_batches_are_bounded_and_table_schema_is_promoted(engine):
+    with engine.connect() as conn:
+        batches = list(iter_record_batches(conn, "SELECT * FROM t ORDER BY id", batch_size=4))  # noqa E501
+        table = fetch_arrow(conn, "SELECT * FROM t ORDER BY id", batch_size=4)
+
+    assert [b.num_rows for b in batches] == [4, 4, 2]
+    assert batches[0].schema.field("late").type == pa.null()
+    assert table.schema.field("late").type == pa.int64()
+    assert table.column("late").to_pylist()[-2:] == [8, 9]
+
+
+def test_fetch_on_session_sees_its_temp_tables_and_binds_params(engine):
+    with Session(engine) as session:
+        session.execute(text("CREATE TEMP TABLE picks (id INTEGER)"))
+        session.execute(text("INSERT INTO picks VALUES (2), (5)"))
+        df = fetch_frame(
+            session,
+            "SELECT t.id, t.label FROM t JOIN picks p ON p.id = t.id WHERE t.id > :lo",  # noqa E501
+            {"lo": 3},
+        )
+    assert df.to_dict("records") == [{"id": 5, "label": "v5"}]
+
+
+def test_empty_result_keeps_column_names(engine):
+    with engine.connect() as conn:
+        table = fetch_arrow(conn, "SELECT id, label FROM t WHERE id < 0")
+        df = fetch_frame(conn, "SELECT id, label FROM t WHERE id < 0")
+    assert table.num_rows == 0 and table.column_names == ["id", "label"]
+    assert df.empty and list(df.columns) == ["id", "label"]
+
+
+def test_mixed_column_types_raise_value_error(engine):
+    with engine.connect() as conn:
+        with pytest.raises(ValueError, match="Column 'v'"):
+            fetch_arrow(conn, "SELECT 1 AS v UNION ALL SELECT 'x'")
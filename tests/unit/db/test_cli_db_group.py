@@ -269,6 +269,8 @@ def test_export_calls_export_with_normalized_format(monkeypatch, tmp_path):
                 "chunksize": 123,
                 "tables": None,
                 "exclude_tables": None,
+                "workers": 4,
+                "base_bundle": None,
             },
         )
     ]
@@ -310,6 +312,8 @@ def test_export_accepts_table_filters(monkeypatch, tmp_path):
                 "chunksize": 250000,
                 "tables": ["variants", "variant_consequences", "system_config"],
                 "exclude_tables": ["etl_status"],
+                "workers": 4,
+                "base_bundle": None,
             },
         )
     ]
@@ -351,6 +355,8 @@ def test_import_calls_import_with_flag_inversion(monkeypatch, tmp_path):
                 "rebuild_indexes": False,
                 "reset_postgres_sequences": False,
                 "allow_missing_tables": False,
+                "workers": 4,
+                "defer_indexes": True,
             },
         )
     ]
@@ -388,6 +394,38 @@ def test_import_passes_allow_missing_tables(monkeypatch, tmp_path):
                 "rebuild_indexes": True,
                 "reset_postgres_sequences": True,
                 "allow_missing_tables": True,
+                "workers": 4,
+                "defer_indexes": True,
             },
         )
     ]
+
+
+def test_import_passes_jobs_and_no_defer_indexes(monkeypatch, tmp_path):
+    runner = CliRunner()
+    fake_db = FakeDBFacade()
+    capture = {}
+    _patch_biofilter(monkeypatch, fake_db, capture)
+    _patch_require_db_uri(monkeypatch, capture)
+
+    in_dir = tmp_path / "bundle"
+    in_dir.mkdir(parents=True, exist_ok=True)
+
+    result = runner.invoke(
+        db_cli_mod.db,
+        [
+            "import",
+            "--db-uri",
+            "sqlite:///x.db",
+            "--in",
+            str(in_dir),
+            "--jobs",
+            "8",
+            "--no-defer-indexes",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    _, kwargs = fake_db.calls[0]
+    assert kwargs["workers"] == 8
+    assert kwargs["defer_indexes"] is False
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import io
+import threading
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    create_engine,
+)
+
+import biofilter.modules.db.clone_engine as cmod
+from biofilter.modules.db.clone_engine import (
+    _read_copy_csv,
+    arrow_type_for,
+    conform_batch,
+    copy_compatible,
+    deferred_constraints,
+    fk_waves,
+    run_parallel,
+)
+
+
+def _schema():
+    meta = MetaData()
+    a = Table("a", meta, Column("id", Integer, primary_key=True))
+    b = Table(
+        "b",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("a_id", ForeignKey("a.id")),
+        Column("parent_id", ForeignKey("b.id")),  # self reference
+    )
+    c = Table(
+        "c",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("a_id", ForeignKey("a.id")),
+    )
+    d = Table(
+        "d",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("b_id", ForeignKey("b.id")),
+        Column("c_id", ForeignKey("c.id")),
+    )
+    e = Table("e", meta, Column("id", Integer, primary_key=True))
+    return meta, a, b, c, d, e
+
+
+def test_fk_waves_groups_tables_without_fk_paths_between_them():
+    meta, a, b, c, d, e = _schema()
+    waves = fk_waves(meta.sorted_tables)
+    assert [[t.name for t in w] for w in waves] == [["a", "e"], ["b", "c"], ["d"]]
+
+
+def test_fk_waves_ignores_tables_outside_the_set():
+    _, a, b, c, d, e = _schema()
+    # Parent "a" not imported: b and c are free, d still waits for them
+    waves = fk_waves([b, c, d])
+    assert [[t.name for t in w] for w in waves] == [["b", "c"], ["d"]]
+
+
+def test_fk_waves_serializes_fk_cycles_in_input_order():
+    meta = MetaData()
+    x = Table("x", meta, Column("id", Integer, primary_key=True), Column("y_id", Integer))  # noqa E501
+    y = Table("y", meta, Column("id", Integer, primary_key=True), Column("x_id", ForeignKey("x.id")))  # noqa E501
+    x.append_constraint(ForeignKeyConstraint(["y_id"], ["y.id"]))
+    z = Table("z", meta, Column("id", Integer, primary_key=True))
+    waves = fk_waves([x, y, z])
+    assert [[t.name for t in w] for w in waves] == [["z"], ["x"], ["y"]]
+
+
+def test_run_parallel_keeps_job_order():
+    def job(i):
+        # Later jobs finish first
+        threading.Event().wait(0.001 * (20 - i))
+        return i * 2
+
+    jobs = [lambda i=i: job(i) for i in range(20)]
+    assert run_parallel(jobs, workers=4) == [i * 2 for i in range(20)]
+    assert run_parallel(jobs, workers=1) == [i * 2 for i in range(20)]
+    assert run_parallel([], workers=4) == []
+
+
+def test_run_parallel_propagates_job_errors():
+    def boom():
+        raise RuntimeError("failed table")
+
+    with pytest.raises(RuntimeError, match="failed table"):
+        run_parallel([lambda: 1, boom], workers=2)
+
+
+def test_arrow_type_for_keeps_lossy_types_as_text():
+    assert arrow_type_for(Boolean()) == pa.bool_()
+    assert arrow_type_for(Integer()) == pa.int64()
+    assert arrow_type_for(Float()) == pa.float64()
+    assert arrow_type_for(DateTime()) == pa.timestamp("us")
+    assert arrow_type_for(DateTime(timezone=True)) == pa.string()
+    assert arrow_type_for(Date()) == pa.date32()
+    assert arrow_type_for(Numeric(10, 2)) == pa.string()
+    assert arrow_type_for(String(20)) == pa.string()
+
+
+def test_conform_batch_casts_pandas_floats_and_int_flags():
+    meta = MetaData()
+    table = Table(
+        "t",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("flag", Boolean),
+        Column("name", String),
+    )
+    batch = pa.record_batch(
+        {
+            "id": pa.array([1.0, None]),
+            "flag": pa.array([1, 0]),
+            "name": pa.array(["x", None]),
+        }
+    )
+    out = conform_batch(batch, table)
+    assert out.schema.field("id").type == pa.int64()
+    assert out.column("flag").to_pylist() == [True, False]
+
+    with pytest.raises(pa.ArrowInvalid):
+        conform_batch(pa.record_batch({"id": pa.array([1.5])}), table)
+    with pytest.raises(RuntimeError, match="not in table 't'"):
+        conform_batch(pa.record_batch({"other": pa.array([1])}), table)
+
+
+def test_read_copy_csv_handles_newlines_across_blocks(monkeypatch):
+    monkeypatch.setattr(cmod, "CSV_BLOCK_SIZE", 256)
+    # COPY TO STDOUT (FORMAT csv) output: quoted multi-line text, NULL as ,,
+    note = "line one\n" + "x" * 100 + "\nline three"
+    rows = [f'{i},"{note}",' if i % 2 else f'{i},"a\nb",t' for i in range(50)]  # noqa E501
+    payload = ("\n".join(rows) + "\n").encode()
+    schema = pa.schema([("id", pa.int64()), ("note", pa.string()), ("flag", pa.bool_())])  # noqa E501
+
+    batches = list(_read_copy_csv(io.BytesIO(payload), schema.names, schema))
+    table = pa.Table.from_batches(batches, schema)
+
+    assert table.num_rows == 50
+    assert table.column("note").to_pylist()[:2] == ["a\nb", note]
+    assert table.column("flag").to_pylist()[:2] == [True, None]
+
+
+def test_copy_compatible_rejects_nested_and_binary_columns():
+    assert copy_compatible(pa.schema([("a", pa.int64()), ("b", pa.string())]))
+    assert not copy_compatible(pa.schema([("a", pa.list_(pa.int64()))]))
+    assert not copy_compatible(pa.schema([("a", pa.binary())]))
+
+
+def test_deferred_constraints_is_a_noop_outside_postgres():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    with deferred_constraints(engine, ["a", "b"], workers=4) as counts:
+        assert counts == (0, 0)
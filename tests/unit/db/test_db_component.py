@@ -313,6 +313,8 @@ def test_import_calls_import_full_clone_and_rebuild_indexes(monkeypatch, tmp_pat
     assert imported["fmt"] == "csv"
     assert imported["reset_sequences"] is False
     assert imported["allow_missing_tables"] is False
+    assert imported["workers"] == 4
+    assert imported["defer_indexes"] is True
     assert connect_calls["check_exists"] is True
     assert rebuild_calls == {"groups": None, "drop_first": True}
 
@@ -348,3 +350,57 @@ def test_import_passes_allow_missing_tables(monkeypatch, tmp_path):
 
     assert imported["allow_missing_tables"] is True
     assert connect_calls["check_exists"] is True
+
+
+def test_export_with_base_bundle_writes_differential(monkeypatch, tmp_path):
+    core = DummyCore()
+    core.db = SimpleNamespace(engine=object())
+    component = dbcomp_mod.DBComponent(core)
+
+    captured = {}
+
+    def fake_export_diff_clone(engine, out, **kwargs):
+        captured["kwargs"] = kwargs
+        return out
+
+    def fail_full(*args, **kwargs):
+        raise AssertionError("full export must not run")
+
+    monkeypatch.setattr(dbcomp_mod, "export_diff_clone", fake_export_diff_clone)
+    monkeypatch.setattr(dbcomp_mod, "export_full_clone", fail_full)
+
+    base = tmp_path / "base"
+    component.export(out_dir=tmp_path / "diff", base_bundle=base)
+    assert captured["kwargs"]["base_bundle"] == base
+
+    with pytest.raises(ValueError, match="parquet only"):
+        component.export(out_dir=tmp_path / "diff", fmt="csv", base_bundle=base)
+
+
+def test_import_applies_differential_bundle_in_place(monkeypatch, tmp_path):
+    core = DummyCore()
+    core.db = SimpleNamespace(engine=object())
+    core.etl = SimpleNamespace(
+        rebuild_indexes=lambda **kw: (_ for _ in ()).throw(AssertionError())
+    )
+    component = dbcomp_mod.DBComponent(core)
+
+    applied = {}
+
+    def fake_import_diff_clone(**kwargs):
+        applied.update(kwargs)
+
+    monkeypatch.setattr(dbcomp_mod, "import_diff_clone", fake_import_diff_clone)
+
+    in_dir = tmp_path / "diff"
+    in_dir.mkdir()
+    (in_dir / "manifest.json").write_text(
+        '{"bundle_type": "differential", "tables": []}', encoding="utf-8"
+    )
+
+    component.import_(in_dir=in_dir)
+
+    assert applied["db"] is core.db
+    assert applied["in_dir"] == in_dir.resolve()
+    assert applied["logger"] is core.logger
+    assert applied["reset_sequences"] is True
@@ -241,3 +241,53 @@ def test_import_full_clone_csv_preserves_empty_string_in_non_nullable_text(tmp_p
         rows = conn.execute(text("SELECT id, format FROM a ORDER BY id")).all()
 
     assert rows == [(1, "")]
+
+
+def test_parquet_clone_round_trip_streams_row_groups_in_fk_waves(tmp_path):
+    schema = [
+        "CREATE TABLE parent (id INTEGER PRIMARY KEY, name TEXT NOT NULL)",
+        "CREATE TABLE child (id INTEGER PRIMARY KEY, "
+        "parent_id INTEGER REFERENCES parent(id), score REAL, flag BOOLEAN)",
+    ]
+    src = _sqlite_engine(tmp_path / "src.db")
+    dst = _sqlite_engine(tmp_path / "dst.db")
+    for engine in (src, dst):
+        with engine.begin() as conn:
+            for ddl in schema:
+                conn.execute(text(ddl))
+    with src.begin() as conn:
+        conn.execute(text("INSERT INTO parent VALUES (1, 'a'), (2, '')"))
+        conn.execute(
+            text(
+                "INSERT INTO child VALUES "
+                "(1, 1, 0.5, 1), (2, 2, NULL, 0), (3, NULL, 1.5, NULL)"
+            )
+        )
+
+    out_dir = tmp_path / "bundle"
+    export_full_clone(
+        src,
+        out_dir,
+        biofilter_version="4.1.1-test",
+        schema_version="4.1.1",
+        workers=4,
+    )
+    manifest = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert {e["name"]: e["rows"] for e in manifest["tables"]} == {
+        "child": 3,
+        "parent": 2,
+    }
+
+    # Several row groups per file: the import must not need the whole file
+    child = pd.read_parquet(out_dir / "tables" / "child.parquet")
+    child.to_parquet(out_dir / "tables" / "child.parquet", row_group_size=1)
+
+    import_full_clone(FakeDB(dst), str(out_dir), workers=4)
+
+    with dst.connect() as conn:
+        parents = conn.execute(text("SELECT id, name FROM parent ORDER BY id")).all()  # noqa E501
+        children = conn.execute(
+            text("SELECT id, parent_id, score, flag FROM child ORDER BY id")
+        ).all()
+    assert parents == [(1, "a"), (2, "")]
+    assert children == [(1, 1, 0.5, 1), (2, 2, None, 0), (3, None, 1.5, None)]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import MetaData, Table, create_engine, text
+
+from biofilter.modules.db.transfer import (
+    bundle_type,
+    export_diff_clone,
+    export_full_clone,
+    import_diff_clone,
+    import_full_clone,
+)
+
+
+class FakeDB:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def table(self, name: str):
+        return Table(name, MetaData(), autoload_with=self.engine)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+SCHEMA = [
+    "CREATE TABLE etl_packages (id INTEGER PRIMARY KEY, data_source_id INTEGER, "
+    "status TEXT, operation_type TEXT, stats TEXT)",
+    "CREATE TABLE lookup (id INTEGER PRIMARY KEY, name TEXT)",
+    "CREATE TABLE system_config (id INTEGER PRIMARY KEY, key TEXT, value TEXT)",
+    "CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT, "
+    "lookup_id INTEGER REFERENCES lookup(id), "
+    "data_source_id INTEGER, etl_package_id INTEGER)",
+    "CREATE TABLE item_links (id INTEGER PRIMARY KEY, "
+    "item_id INTEGER REFERENCES items(id), label TEXT)",
+]
+
+
+def _engine(path: Path):
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    with engine.begin() as conn:
+        for ddl in SCHEMA:
+            conn.execute(text(ddl))
+    return engine
+
+
+def _run(engine, *statements):
+    with engine.begin() as conn:
+        for sql in statements:
+            conn.execute(text(sql))
+
+
+def _rows(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT * FROM {table} ORDER BY id")).all()
+
+
+def _full_bundle(engine, out):
+    return export_full_clone(
+        engine, out, biofilter_version="t", schema_version="t"
+    )
+
+
+@pytest.fixture
+def synced(tmp_path):
+    src = _engine(tmp_path / "src.db")
+    dst = _engine(tmp_path / "dst.db")
+    _run(
+        src,
+        "INSERT INTO etl_packages VALUES (1, 1, 'completed', 'load', NULL)",
+        "INSERT INTO etl_packages VALUES (2, 2, 'completed', 'load', NULL)",
+        "INSERT INTO lookup VALUES (1, 'gene')",
+        "INSERT INTO system_config VALUES (1, 'mode', 'source')",
+        "INSERT INTO items VALUES (1, 'a', 1, 1, 1), (2, 'b', 1, 2, 2), (3, 'c', 1, 2, 2)",  # noqa E501
+        "INSERT INTO item_links VALUES (1, 1, 'x'), (2, 2, 'y')",
+    )
+    base = _full_bundle(src, tmp_path / "base")
+    import_full_clone(FakeDB(dst), str(base), defer_indexes=False)
+    _run(dst, "UPDATE system_config SET value = 'satellite'")
+    return src, dst, base
+
+
+def test_full_bundle_records_high_water_mark_below_running_packages(tmp_path):
+    engine = _engine(tmp_path / "db.db")
+    _run(
+        engine,
+        "INSERT INTO etl_packages VALUES (1, 1, 'completed', 'load', NULL)",
+        "INSERT INTO etl_packages VALUES (2, 1, 'running', 'load', NULL)",
+        "INSERT INTO etl_packages VALUES (3, 2, 'completed', 'load', NULL)",
+    )
+    out = _full_bundle(engine, tmp_path / "bundle")
+    manifest = json.loads((out / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["bundle_type"] == "full"
+    assert manifest["etl_package_high_water"] == 1
+    assert bundle_type(out) == "full"
+    assert bundle_type(tmp_path / "nowhere") == "full"
+
+
+def test_diff_bundle_ships_new_packages_and_tombstones_only(synced, tmp_path):
+    src, dst, base = synced
+    # Package 3 reloads data source 1 (upsert keeps id 1), package 4 rolls
+    # back package 2, and package 5 adds a new lookup value with its item
+    _run(
+        src,
+        "INSERT INTO etl_packages VALUES (3, 1, 'completed', 'load', NULL)",
+        "UPDATE items SET value = 'a2', etl_package_id = 3 WHERE id = 1",
+        "DELETE FROM item_links WHERE item_id = 1",
+        "INSERT INTO item_links VALUES (3, 1, 'x2')",
+        "INSERT INTO etl_packages VALUES (4, 2, 'completed', 'rollback', "
+        "'{\"mode\": \"package\", \"target_package_id\": 2}')",
+        "DELETE FROM item_links WHERE item_id IN (2, 3)",
+        "DELETE FROM items WHERE etl_package_id = 2",
+        "INSERT INTO etl_packages VALUES (5, 1, 'completed', 'load', NULL)",
+        "INSERT INTO lookup VALUES (2, 'protein')",
+        "INSERT INTO items VALUES (4, 'd', 2, 1, 5)",
+    )
+
+    out = export_diff_clone(
+        src,
+        tmp_path / "diff",
+        base_bundle=base,
+        biofilter_version="t",
+        schema_version="t",
+    )
+    manifest = json.loads((out / "manifest.json").read_text(encoding="utf-8"))
+    tables = {e["name"]: e for e in manifest["tables"]}
+    assert manifest["bundle_type"] == "differential"
+    assert (manifest["base_high_water"], manifest["etl_package_high_water"]) == (2, 5)  # noqa E501
+    assert manifest["tombstones"] == [
+        {"rollback_package_id": 4, "key_name": "etl_package_id", "key_value": 2}  # noqa E501
+    ]
+    assert "system_config" not in tables
+    assert (tables["items"]["mode"], tables["items"]["rows"]) == ("package", 2)
+    assert (tables["item_links"]["mode"], tables["item_links"]["rows"]) == ("dependent", 1)  # noqa E501
+    assert tables["lookup"]["mode"] == "reference"
+
+    logger = DummyLogger()
+    totals = import_diff_clone(FakeDB(dst), out, logger=logger)
+    assert totals["tombstones"] == 2
+
+    for table in ("etl_packages", "lookup", "items"):
+        assert _rows(dst, table) == _rows(src, table)
+    # Children of shipped parents are replaced; links of rolled-back items
+    # are left to the FK cascade, as with ETL rollbacks on SQLite
+    assert [r for r in _rows(dst, "item_links") if r[1] == 1] == [(3, 1, "x2")]  # noqa E501
+    assert _rows(dst, "system_config") == [(1, "mode", "satellite")]
+    assert any("Differential bundle applied" in m for _, m in logger.messages)
+
+    # Re-applying the same bundle changes nothing
+    import_diff_clone(FakeDB(dst), out)
+    assert _rows(dst, "items") == _rows(src, "items")
+
+
+def test_diff_bundle_replaces_data_sources_reloaded_at_the_source(synced, tmp_path):  # noqa E501
+    src, dst, base = synced
+    # Package 3 reloads data source 2 the way DTPs do (delete, reinsert):
+    # item 3 is gone and item 2 moves to the new package with a new link
+    _run(
+        src,
+        "INSERT INTO etl_packages VALUES (3, 2, 'completed', 'load', NULL)",
+        "DELETE FROM item_links WHERE item_id IN (2, 3)",
+        "DELETE FROM items WHERE data_source_id = 2",
+        "INSERT INTO items VALUES (2, 'b2', 1, 2, 3)",
+        "INSERT INTO item_links VALUES (3, 2, 'y2')",
+        # Skipped loads do not replace anything
+        "INSERT INTO etl_packages VALUES (4, 1, 'not-applicable', 'load', NULL)",  # noqa E501
+    )
+
+    out = export_diff_clone(
+        src,
+        tmp_path / "diff",
+        base_bundle=base,
+        biofilter_version="t",
+        schema_version="t",
+    )
+    manifest = json.loads((out / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["replaced_data_sources"] == [2]
+
+    import_diff_clone(FakeDB(dst), out)
+    for table in ("etl_packages", "items", "item_links"):
+        assert _rows(dst, table) == _rows(src, table)
+    assert [r[0] for r in _rows(dst, "items")] == [1, 2]
+
+    import_diff_clone(FakeDB(dst), out)
+    assert _rows(dst, "item_links") == _rows(src, "item_links")
+
+
+def test_diff_import_requires_the_base_bundle(synced, tmp_path):
+    src, _, base = synced
+    _run(src, "INSERT INTO etl_packages VALUES (3, 1, 'completed', 'load', NULL)")  # noqa E501
+    first = export_diff_clone(
+        src, tmp_path / "d1", base_bundle=base, biofilter_version="t", schema_version="t"  # noqa E501
+    )
+    _run(src, "INSERT INTO etl_packages VALUES (4, 1, 'completed', 'load', NULL)")  # noqa E501
+    second = export_diff_clone(
+        src, tmp_path / "d2", base_bundle=first, biofilter_version="t", schema_version="t"  # noqa E501
+    )
+
+    fresh = _engine(tmp_path / "fresh.db")
+    _run(fresh, "INSERT INTO etl_packages VALUES (1, 1, 'completed', 'load', NULL)")  # noqa E501
+    with pytest.raises(RuntimeError, match="Import the base bundle first"):
+        import_diff_clone(FakeDB(fresh), second)
+    with pytest.raises(RuntimeError, match="Not a differential bundle"):
+        import_diff_clone(FakeDB(fresh), base)
+
+
+def test_diff_export_requires_a_high_water_mark_in_the_base(synced, tmp_path):
+    src, _, base = synced
+    manifest = json.loads((base / "manifest.json").read_text(encoding="utf-8"))
+    manifest.pop("etl_package_high_water")
+    (base / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="no etl_package_high_water"):
+        export_diff_clone(
+            src, tmp_path / "diff", base_bundle=base, biofilter_version="t", schema_version="t"  # noqa E501
+        )
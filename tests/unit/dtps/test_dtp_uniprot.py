@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import biofilter.modules.etl.dtps.dtp_uniprot as mod
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, msg: str, level: str = "INFO"):
+        self.messages.append((level, msg))
+
+
+@dataclass
+class FakeSourceSystem:
+    name: str
+
+
+@dataclass
+class FakeDataSource:
+    name: str
+    source_system: FakeSourceSystem
+    id: int = 7
+
+
+def _entry(i: int, with_refs: bool = True) -> str:
+    refs = ""
+    if with_refs:
+        refs = (
+            f'<dbReference type="GO" id="GO:{i:07d}"/>'
+            f'<dbReference type="HGNC" id="HGNC:{i}"/>'
+            f'<dbReference type="Pfam" id="PF{i:05d}"/>'
+            '<organism><name type="scientific">Homo sapiens</name>'
+            '<dbReference type="NCBI Taxonomy" id="9606"/></organism>'
+        )
+    return (
+        "<entry>"
+        f"<accession>P{i:05d}</accession><accession>Q{i:05d}</accession>"
+        f"<name>N{i}_HUMAN</name>"
+        f'<gene><name type="primary">G{i}</name></gene>'
+        f"{refs}"
+        f'<sequence length="{100 + i}">AAA</sequence>'
+        "</entry>"
+    )
+
+
+def _run_transform(monkeypatch, tmp_path, entries, batch_size=2, debug_mode=False):  # noqa E501
+    ds = FakeDataSource(name="uniprot", source_system=FakeSourceSystem("UniProt"))  # noqa E501
+    raw = tmp_path / "raw" / "UniProt" / "uniprot"
+    raw.mkdir(parents=True, exist_ok=True)
+    (raw / "proteins.xml").write_text(
+        '<?xml version="1.0"?>'
+        '<uniprot xmlns="http://uniprot.org/uniprot">'
+        + "".join(entries)
+        + "<copyright>c</copyright></uniprot>"
+    )
+
+    monkeypatch.setattr(mod.DTP, "check_compatibility", lambda self: None)
+    dtp = mod.DTP(logger=DummyLogger(), datasource=ds, debug_mode=debug_mode)
+    dtp.transform_batch_size = batch_size
+
+    ok, msg = dtp.transform(str(tmp_path / "raw"), str(tmp_path / "processed"))  # noqa E501
+    return ok, msg, tmp_path / "processed" / "UniProt" / "uniprot"
+
+
+def test_transform_streams_entries_in_batches(monkeypatch, tmp_path):
+    entries = [_entry(i, with_refs=(i != 2)) for i in range(1, 6)]
+    ok, msg, out = _run_transform(monkeypatch, tmp_path, entries)
+    assert ok is True, msg
+
+    master_file = pq.ParquetFile(out / "master_data.parquet")
+    # 5 entries / batches of 2 -> 3 row groups in one file
+    assert master_file.metadata.num_row_groups == 3
+
+    master = pd.read_parquet(out / "master_data.parquet")
+    assert list(master.columns) == mod.MASTER_COLUMNS
+    assert master["uniprot_id"].tolist() == [f"P{i:05d}" for i in range(1, 6)]
+    assert list(master["secondary_ids"].iloc[0]) == ["Q00001"]
+    assert master["tax_id"].tolist()[:2] == ["9606", ""]
+    assert master["pfam_ids"].iloc[1] is None
+    assert master["protein_length"].iloc[4] == "105"
+
+    links = pd.read_parquet(out / "relationship_data.parquet")
+    assert list(links.columns) == mod.LINK_COLUMNS
+    assert len(links) == 8  # GO + HGNC for the 4 entries with refs
+    hgnc = links[links["target_type"] == "Genes"]
+    assert hgnc["target_id"].tolist() == ["HGNC:1", "HGNC:3", "HGNC:4", "HGNC:5"]  # noqa E501
+    assert set(hgnc["relation_type"]) == {"encodes"}
+
+
+def test_transform_without_entries_fails(monkeypatch, tmp_path):
+    ok, msg, out = _run_transform(monkeypatch, tmp_path, [])
+
+    assert ok is False
+    assert "No UniProt entries" in msg
+    assert not (out / "master_data.parquet").exists()
+
+
+def test_debug_csv_is_rewritten_on_each_run(monkeypatch, tmp_path):
+    entries = [_entry(i) for i in range(1, 6)]
+    for _ in range(2):
+        ok, msg, out = _run_transform(monkeypatch, tmp_path, entries, debug_mode=True)  # noqa E501
+        assert ok is True, msg
+
+    master_csv = pd.read_csv(out / "master_data.csv")
+    assert master_csv["uniprot_id"].tolist() == [f"P{i:05d}" for i in range(1, 6)]  # noqa E501
+
+    # The first batch of a run truncates a leftover CSV on its own
+    stale = out / "stale"
+    stale.with_suffix(".csv").write_text("uniprot_id\nOLD\n")
+    dtp = mod.DTP(logger=DummyLogger(), debug_mode=True)
+    writers = {}
+    frame = pd.DataFrame({"uniprot_id": ["P1"]})
+    for _ in range(2):
+        dtp._write_batch(writers, frame, None, stale)
+    for writer in writers.values():
+        writer.close()
+    assert pd.read_csv(stale.with_suffix(".csv"))["uniprot_id"].tolist() == ["P1", "P1"]  # noqa E501
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from types import SimpleNamespace
 
 import pandas as pd
-from sqlalchemy import MetaData, create_engine, select
+from sqlalchemy import MetaData, create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 
 import biofilter.modules.etl.dtps.dtp_variant_alphamissense as mod
@@ -178,3 +178,10 @@ def test_load_resolves_variant_ids_and_inserts_predictions(monkeypatch, tmp_path
     assert row.predictor_name == "alphamissense"
     assert row.transcript_id == "ENST000001"
     assert float(row.score) == 0.91
+
+    # Loaded chromosomes get their per-variant predictor summary rebuilt
+    with engine.connect() as conn:
+        summary = conn.execute(
+            text("SELECT chromosome, predictor_name, max_score FROM variant_predictor_summary")  # noqa E501
+        ).fetchall()
+    assert [tuple(r) for r in summary] == [(22, "alphamissense", 0.91)]
@@ -11,12 +11,15 @@ import pyarrow.parquet as pq
 import pytest
 
 # Keep unit tests runnable even when cyvcf2 is not installed locally.
-if "cyvcf2" not in sys.modules:
+try:
+    import cyvcf2  # noqa: F401
+except ImportError:
     cyvcf2_stub = types.ModuleType("cyvcf2")
     cyvcf2_stub.VCF = object
     sys.modules["cyvcf2"] = cyvcf2_stub
 
 import biofilter.modules.etl.dtps.dtp_variant_gnomad as mod  # noqa: F401
+from biofilter.modules.etl.index_builder import IndexBuildRecord, index_name_for  # noqa E501
 
 
 # -----------------------------
@@ -363,7 +366,9 @@ def test_load_postgres_part_file_fast_stages_and_bulk_loads(monkeypatch):
 
     monkeypatch.setattr(dtp, "_copy_dataframe_to_postgres_stage", fake_copy)
     monkeypatch.setattr(
-        dtp, "_bulk_insert_variant_masters_from_stage", lambda conn: 2
+        dtp,
+        "_bulk_insert_variant_masters_from_stage",
+        lambda conn, table_name="variant_masters": 2,
     )
     monkeypatch.setattr(
         dtp,
@@ -373,7 +378,9 @@ def test_load_postgres_part_file_fast_stages_and_bulk_loads(monkeypatch):
         ),
     )
     monkeypatch.setattr(
-        dtp, "_bulk_insert_variant_molecular_effects_from_stage", lambda conn: 5
+        dtp,
+        "_bulk_insert_variant_molecular_effects_from_stage",
+        lambda conn, table_name="variant_molecular_effects": 5,
     )
 
     df_variants = pd.DataFrame(
@@ -436,3 +443,416 @@ def test_load_postgres_part_file_fast_stages_and_bulk_loads(monkeypatch):
         "tmp_gnomad_variant_stage",
         "tmp_gnomad_consequence_stage",
     ]
+
+
+# -----------------------------
+# Per-chromosome load
+# -----------------------------
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conns = []
+
+    def _new_conn(self):
+        conn = FakeConn("postgresql")
+        self.conns.append(conn)
+        return conn
+
+    def begin(self):
+        engine = self
+
+        class _Ctx:
+            def __enter__(self):
+                return engine._new_conn()
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+    def connect(self):
+        engine = self
+
+        class _Conn:
+            def execution_options(self, **kwargs):
+                return engine.begin()
+
+        return _Conn()
+
+
+class FakePackage:
+    id = 99
+    load_hash = "abc"
+    stats = None
+
+
+def _write_chrom_parts(tmp_path, ds, chroms):
+    variants_dir = tmp_path / ds.source_system.name / ds.name / "variants"
+    variants_dir.mkdir(parents=True)
+    for i, chrom in enumerate(chroms):
+        pd.DataFrame(
+            {"chrom": [chrom], "variant_key": [f"{chrom}:1:A:G"]}
+        ).to_parquet(variants_dir / f"variants_part_{i:04d}.parquet")
+
+
+def _chrom_load_dtp(monkeypatch, tmp_path, workers=2):
+    ds = FakeDataSource(
+        name="gnomad_exomes", source_system=FakeSourceSystem(name="gnomad")
+    )
+    _write_chrom_parts(tmp_path, ds, [21, 22, 22])
+
+    dtp = mod.DTP(
+        logger=DummyLogger(),
+        datasource=ds,
+        package=FakePackage(),
+        db=type("DB", (), {"engine": FakeEngine()})(),
+        config=mod.GnomadCyvcf2Config(load_workers=workers),
+    )
+    monkeypatch.setattr(dtp, "check_compatibility", lambda: None)
+    monkeypatch.setattr(dtp, "db_write_mode", lambda: None)
+    monkeypatch.setattr(dtp, "_load_dimension_cache", lambda conn, t: {})
+    return dtp
+
+
+def test_load_runs_chromosomes_separately_and_records_stats(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    seen = {}
+
+    def fake_load_chromosome(chrom, files, consequence_map, dim_caches):
+        seen[chrom] = [Path(f).name for f in files]
+        if chrom == 22:
+            raise RuntimeError("boom")
+        return {"status": "completed", "files": 1, "variants": 3, "effects": 4}  # noqa E501
+
+    monkeypatch.setattr(dtp, "_load_chromosome", fake_load_chromosome)
+
+    ok, msg = dtp.load(str(tmp_path))
+
+    assert ok is False
+    assert "[22]" in msg
+    assert seen == {
+        21: ["variants_part_0000.parquet"],
+        22: ["variants_part_0001.parquet", "variants_part_0002.parquet"],
+    }
+    chroms = dtp.package.stats["chromosomes"]
+    assert chroms["21"]["status"] == "completed"
+    assert chroms["22"] == {"status": "failed", "error": "boom"}
+
+
+def test_load_skips_chromosomes_completed_by_previous_attempt(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path, workers=1)
+    monkeypatch.setattr(
+        dtp,
+        "_previous_chromosome_stats",
+        lambda: {"21": {"status": "completed", "variants": 3, "effects": 4}},
+    )
+    loaded = []
+
+    def fake_load_chromosome(chrom, files, consequence_map, dim_caches):
+        loaded.append(chrom)
+        return {"status": "completed", "files": 2, "variants": 5, "effects": 1}  # noqa E501
+
+    monkeypatch.setattr(dtp, "_load_chromosome", fake_load_chromosome)
+
+    ok, msg = dtp.load(str(tmp_path))
+
+    assert ok is True, msg
+    assert loaded == [22]
+    chroms = dtp.package.stats["chromosomes"]
+    assert chroms["21"]["reused"] is True
+    assert chroms["22"]["variants"] == 5
+
+
+def test_load_chromosome_swap_mode_detaches_and_attaches(monkeypatch, tmp_path):  # noqa E501
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    dtp.config.postgres_partition_swap = True
+    used_tables = []
+
+    monkeypatch.setattr(dtp, "_create_postgres_stage_tables", lambda conn: None)  # noqa E501
+
+    def fake_part_load(conn, dfv, dfc, caches, tables=None, dim_conn=None):
+        used_tables.append(dict(tables))
+        return 2, 2, 3
+
+    monkeypatch.setattr(dtp, "_load_postgres_part_file_fast", fake_part_load)
+    monkeypatch.setattr(
+        dtp,
+        "_build_swap_indexes",
+        lambda parent, chrom, swap: {f"idx_{swap}_x": f"idx_{parent}_x__p"},
+    )
+
+    variants_dir = tmp_path / "gnomad" / "gnomad_exomes" / "variants"
+    stats = dtp._load_chromosome(
+        22, [str(variants_dir / "variants_part_0001.parquet")], {}, {}
+    )
+
+    assert stats["mode"] == "swap"
+    assert (stats["files"], stats["variants"], stats["effects"]) == (1, 2, 3)
+    assert used_tables == [
+        {
+            "variant_masters": "variant_masters_chr_22_swap",
+            "variant_molecular_effects": "variant_molecular_effects_chr_22_swap",  # noqa E501
+        }
+    ]
+    sql = [str(stmt) for conn in dtp.db.engine.conns for stmt, _ in conn.executed]  # noqa E501
+    assert any(
+        'DETACH PARTITION "variant_masters_chr_22"' in s for s in sql
+    )
+    assert any(
+        'ATTACH PARTITION "variant_molecular_effects_chr_22" FOR VALUES IN (22)' in s  # noqa E501
+        for s in sql
+    )
+    # Load and swap run in separate transactions, indexes renamed before ATTACH  # noqa E501
+    load_sql, swap_sql = (
+        [str(stmt) for stmt, _ in conn.executed] for conn in dtp.db.engine.conns[-2:]  # noqa E501
+    )
+    assert not any("PARTITION" in s for s in load_sql)
+    rename = swap_sql.index(
+        'ALTER INDEX "idx_variant_masters_chr_22_swap_x" '
+        'RENAME TO "idx_variant_masters_x__p"'
+    )
+    attach = next(
+        i for i, s in enumerate(swap_sql)
+        if 'ATTACH PARTITION "variant_masters_chr_22"' in s
+    )
+    assert rename < attach
+
+
+def test_build_swap_indexes_uses_index_build_manager(monkeypatch, tmp_path):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    built = []
+
+    class FakeBuilder:
+        def __init__(self, engine, logger, **kwargs):
+            pass
+
+        def build(self, specs):
+            built.extend(specs)
+            return [
+                IndexBuildRecord(index_name_for(t, c), t, c, "created")
+                for t, c in specs
+            ]
+
+    monkeypatch.setattr(mod, "IndexBuildManager", FakeBuilder)
+
+    renames = dtp._build_swap_indexes(
+        "variant_masters", 22, "variant_masters_chr_22_swap"
+    )
+
+    assert built == [
+        ("variant_masters_chr_22_swap", ["chromosome", "position_start"]),
+        ("variant_masters_chr_22_swap", ["rsid"]),
+    ]
+    assert renames["idx_variant_masters_chr_22_swap_rsid"] == (
+        "idx_variant_masters_rsid__variant_masters_chr_22"
+    )
+
+
+class ScriptedConn(FakeConn):
+    """FakeConn whose scalar() answers depend on the SQL text."""
+
+    def __init__(self, answers):
+        super().__init__("postgresql")
+        self.answers = answers
+
+    def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        sql = str(stmt)
+        value = next((v for k, v in self.answers.items() if k in sql), 0)
+        return self._ScalarResult(value)
+
+
+def test_partition_swap_refused_when_other_sources_share_the_partition(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    conn = ScriptedConn({"IS DISTINCT FROM :data_source_id": True})
+
+    with pytest.raises(RuntimeError, match="holds rows of other data sources"):  # noqa E501
+        dtp._check_partition_swap_allowed(conn, 22)
+
+
+def test_partition_swap_refused_when_variant_ids_are_referenced(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    conn = ScriptedConn(
+        {
+            "string_agg": "variant_effect_predictions,variant_notes",
+            '"variant_notes" d': True,
+        }
+    )
+
+    with pytest.raises(RuntimeError, match="variant_notes references"):
+        dtp._check_partition_swap_allowed(conn, 22)
+    sql = [str(stmt) for stmt, _ in conn.executed]
+    assert any('"variant_effect_predictions" d' in s for s in sql)
+
+
+def test_swap_partition_copies_only_primary_and_unique_keys(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    conn = ScriptedConn(
+        {
+            "pg_get_constraintdef": "PRIMARY KEY (chromosome, variant_id);"
+            "UNIQUE (chromosome, position_start)"
+        }
+    )
+
+    swap = dtp._create_swap_partition(conn, "variant_masters", 22)
+
+    sql = [str(stmt) for stmt, _ in conn.executed]
+    assert swap == "variant_masters_chr_22_swap"
+    assert not any("INCLUDING INDEXES" in s for s in sql)
+    assert 'ALTER TABLE "variant_masters_chr_22_swap" ADD PRIMARY KEY (chromosome, variant_id)' in sql  # noqa E501
+    assert 'ALTER TABLE "variant_masters_chr_22_swap" ADD UNIQUE (chromosome, position_start)' in sql  # noqa E501
+
+
+def test_load_chromosome_swap_guard_runs_before_any_partition_change(
+    monkeypatch, tmp_path
+):
+    dtp = _chrom_load_dtp(monkeypatch, tmp_path)
+    dtp.config.postgres_partition_swap = True
+    monkeypatch.setattr(dtp, "_create_postgres_stage_tables", lambda conn: None)  # noqa E501
+
+    def refuse(conn, chrom):
+        raise RuntimeError("Partition swap refused")
+
+    monkeypatch.setattr(dtp, "_check_partition_swap_allowed", refuse)
+
+    with pytest.raises(RuntimeError, match="refused"):
+        dtp._load_chromosome(22, [], {}, {})
+    sql = [str(stmt) for conn in dtp.db.engine.conns for stmt, _ in conn.executed]  # noqa E501
+    assert not any("_swap" in s or "PARTITION" in s for s in sql)
+
+
+# -----------------------------
+# Columnar VEP / region transform
+# -----------------------------
+
+
+VEP_POSITIONS = [
+    (0, "Allele"),
+    (1, "Consequence"),
+    (2, "IMPACT"),
+    (3, "SYMBOL"),
+    (4, "Gene"),
+    (5, "Feature_type"),
+    (6, "Feature"),
+    (7, "LoF"),
+]
+
+
+def test_build_consequence_frame_explodes_annotations_and_terms():
+    variants = pd.DataFrame(
+        {
+            "variant_key": ["22:100:A:G", "22:200:C:T", "22:300:G:A"],
+            "chrom": [22, 22, 22],
+            "pos": [100, 200, 300],
+            "ref": ["A", "C", "G"],
+            "alt": ["G", "T", "A"],
+        }
+    )
+    vep_values = [
+        "G|missense_variant&splice_region_variant|MODERATE|G1|ENSG1|Transcript|ENST1|HC,"  # noqa E501
+        "G|intron_variant|MODIFIER|G1|ENSG1|Transcript|ENST2|",
+        None,
+        "A||LOW|G3|ENSG3",
+    ]
+
+    out = mod._build_consequence_frame(variants, vep_values, VEP_POSITIONS)
+
+    assert list(out.columns) == mod.CONSEQUENCE_COLUMNS
+    assert out["variant_key"].tolist() == [
+        "22:100:A:G",
+        "22:100:A:G",
+        "22:100:A:G",
+        "22:300:G:A",
+    ]
+    assert out["annotation_index"].tolist() == [0, 0, 1, 0]
+    assert out["consequence"].tolist()[:3] == [
+        "missense_variant",
+        "splice_region_variant",
+        "intron_variant",
+    ]
+    assert out["consequence"].isna().tolist()[3]
+    assert out["transcript_id"].tolist()[:3] == ["ENST1", "ENST1", "ENST2"]
+    assert out["transcript_id"].isna().tolist()[3]
+    assert out["lof_flag"].tolist() == [True, True, False, False]
+    assert out["impact_rank"].tolist()[:3] == [2, 2, 4]
+    assert out["most_severe_consequence_per_annotation"].tolist()[:3] == [
+        "missense_variant",
+        "missense_variant",
+        "intron_variant",
+    ]
+    assert out["most_severe_consequence_per_variant"].tolist()[:3] == [
+        "missense_variant"
+    ] * 3
+    assert out["is_most_severe_for_annotation"].tolist() == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert out["is_most_severe_for_variant"].tolist() == [
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_vcf_regions_splits_matching_contig_only():
+    fake = type(
+        "V", (), {"seqnames": ["chr21", "chr22"], "seqlens": [50, 25]}
+    )()
+
+    assert mod._vcf_regions(fake, 22, 10) == [
+        ("chr22", 1, 10),
+        ("chr22", 11, 20),
+        ("chr22", 21, 25),
+    ]
+
+
+def test_region_worker_keeps_records_starting_in_window(monkeypatch, tmp_path):
+    info = {"AC": 5, "vep": "G|missense_variant|MODERATE|G1|ENSG1|Transcript|ENST1|"}  # noqa E501
+    records = [
+        FakeVariant("22", pos, "A", "G", None, dict(info)) for pos in (9, 10, 15)
+    ]
+
+    class RegionVCF:
+        def __init__(self, path):
+            pass
+
+        def __call__(self, region):
+            # tabix returns records overlapping the window
+            return iter(records)
+
+    monkeypatch.setattr(mod, "VCF", RegionVCF)
+    (tmp_path / "v").mkdir()
+    (tmp_path / "c").mkdir()
+    plan = mod.GnomadTransformPlan(
+        chrom=22,
+        config=mod.GnomadCyvcf2Config(chunk_size=1, transform_workers=2),
+        info_keys=["AC"],
+        info_types={"AC": "Integer"},
+        vep_field_positions=VEP_POSITIONS,
+        variants_dir=str(tmp_path / "v"),
+        consequences_dir=str(tmp_path / "c"),
+    )
+
+    counts = mod._gnomad_region_worker("x.vcf.bgz", ("chr22", 10, 19), 3, plan)
+
+    assert counts["rows"] == 2
+    assert sorted(p.name for p in (tmp_path / "v").iterdir()) == [
+        "variants_part_0003_0000.parquet",
+        "variants_part_0003_0001.parquet",
+    ]
+    cons = pq.read_table(tmp_path / "c" / "consequences_part_0003_0000.parquet")  # noqa E501
+    assert cons.column("variant_key").to_pylist() == ["22:10:A:G"]
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import bz2
+import json
+from dataclasses import dataclass
+
+import pandas as pd
+
+import biofilter.modules.etl.dtps.dtp_variant_ncbi as mod
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, msg: str, level: str = "INFO"):
+        self.messages.append((level, msg))
+
+
+@dataclass
+class FakeSourceSystem:
+    name: str
+
+
+@dataclass
+class FakeDataSource:
+    name: str
+    source_system: FakeSourceSystem
+    source_url: str = "http://example.org/refsnp-chr22.json.bz2"
+    id: int = 31
+
+
+def _refsnp(rs_id: int, pos0: int, variant_type: str = "snv") -> str:
+    seq_id = "NC_000022.11"
+    placement = {
+        "seq_id": seq_id,
+        "placement_annot": {
+            "seq_type": "refseq_chromosome",
+            "seq_id_traits_by_assembly": [{"assembly_name": "GRCh38.p14"}],
+        },
+        "alleles": [
+            {
+                "allele": {
+                    "spdi": {
+                        "seq_id": seq_id,
+                        "position": pos0,
+                        "deleted_sequence": "A",
+                        "inserted_sequence": "A",
+                    }
+                },
+                "hgvs": f"{seq_id}:g.{pos0 + 1}=",
+            },
+            {
+                "allele": {
+                    "spdi": {
+                        "seq_id": seq_id,
+                        "position": pos0,
+                        "deleted_sequence": "A",
+                        "inserted_sequence": "G",
+                    }
+                },
+                "hgvs": f"{seq_id}:g.{pos0 + 1}A>G",
+            },
+        ],
+    }
+    return json.dumps(
+        {
+            "refsnp_id": str(rs_id),
+            "primary_snapshot_data": {
+                "variant_type": variant_type,
+                "placements_with_allele": [placement],
+            },
+            "dbsnp1_merges": [{"merged_rsid": "999"}] if rs_id == 1 else [],
+        }
+    )
+
+
+def _write_input(raw_dir, ds, lines):
+    base = raw_dir / ds.source_system.name / ds.name
+    base.mkdir(parents=True, exist_ok=True)
+    with bz2.open(base / "refsnp-chr22.json.bz2", "wt", encoding="utf-8") as f:  # noqa E501
+        f.write("\n".join(lines) + "\n")
+
+
+def _run_transform(monkeypatch, tmp_path, workers):
+    raw_dir = tmp_path / "raw"
+    processed_dir = tmp_path / f"processed_{workers}"
+    ds = FakeDataSource(name="dbsnp_chr22", source_system=FakeSourceSystem("NCBI"))  # noqa E501
+    _write_input(
+        raw_dir,
+        ds,
+        [_refsnp(i, 1000 + i) for i in range(1, 6)]
+        + [_refsnp(6, 2000, variant_type="delins"), "{not json"],
+    )
+
+    monkeypatch.setattr(mod.DTP, "check_compatibility", lambda self: None)
+    dtp = mod.DTP(logger=DummyLogger(), datasource=ds)
+    dtp.transform_workers = workers
+    dtp.transform_batch_size = 2
+
+    ok, msg = dtp.transform(str(raw_dir), str(processed_dir))
+    assert ok is True, msg
+    return dtp, processed_dir / "NCBI" / "dbsnp_chr22"
+
+
+def test_transform_serial_writes_numbered_parts(monkeypatch, tmp_path):
+    dtp, out_dir = _run_transform(monkeypatch, tmp_path, workers=1)
+
+    parts = sorted(p.name for p in out_dir.glob("processed_part_*.parquet"))
+    # 7 lines / batch of 2 -> 4 batches; the last one has no SNV rows
+    assert parts == [
+        "processed_part_0.parquet",
+        "processed_part_1.parquet",
+        "processed_part_2.parquet",
+    ]
+    df = pd.read_parquet(out_dir / "processed_part_0.parquet")
+    assert df["rs_id"].tolist() == [1, 2]
+    assert df["position_38"].tolist() == [1002, 1003]
+    assert df["alternate_allele"].tolist() == ["G", "G"]
+    assert list(df["merge_log"].iloc[0]) == ["999"]
+    assert any("(serial)" in m for _, m in dtp.logger.messages)
+    assert any("Error in batch 3" in m for _, m in dtp.logger.messages)
+
+
+def test_transform_pool_matches_serial_output(monkeypatch, tmp_path):
+    _, serial_dir = _run_transform(monkeypatch, tmp_path, workers=1)
+    dtp, pool_dir = _run_transform(monkeypatch, tmp_path, workers=2)
+
+    serial = sorted(p.name for p in serial_dir.glob("processed_part_*.parquet"))  # noqa E501
+    pooled = sorted(p.name for p in pool_dir.glob("processed_part_*.parquet"))
+    assert pooled == serial
+    for name in serial:
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(serial_dir / name), pd.read_parquet(pool_dir / name)
+        )
+    assert any("(2 workers)" in m for _, m in dtp.logger.messages)
+    assert not list(pool_dir.glob("*.tmp"))
+
+
+def test_transform_resumes_keeping_finished_parts(monkeypatch, tmp_path):
+    dtp, out_dir = _run_transform(monkeypatch, tmp_path, workers=1)
+
+    # A finished part from the interrupted run and a stale temp file
+    sentinel = pd.DataFrame({"rs_id": [-1]})
+    sentinel.to_parquet(out_dir / "processed_part_0.parquet", index=False)
+    (out_dir / "processed_part_1.parquet").unlink()
+    (out_dir / ".processed_part_1.parquet.tmp").write_bytes(b"partial")
+
+    dtp.logger.messages.clear()
+    ok, msg = dtp.transform(str(tmp_path / "raw"), str(tmp_path / "processed_1"))  # noqa E501
+    assert ok is True, msg
+
+    assert pd.read_parquet(out_dir / "processed_part_0.parquet").equals(sentinel)  # noqa E501
+    assert pd.read_parquet(out_dir / "processed_part_1.parquet")["rs_id"].tolist() == [3, 4]  # noqa E501
+    assert not list(out_dir.glob("*.tmp"))
+    assert any("Skipping existing part 0" in m for _, m in dtp.logger.messages)  # noqa E501
+    assert not any("Skipping existing part 1" in m for _, m in dtp.logger.messages)  # noqa E501
+
+    # A forced transform rebuilds every part
+    dtp.force_transform = True
+    ok, msg = dtp.transform(str(tmp_path / "raw"), str(tmp_path / "processed_1"))  # noqa E501
+    assert ok is True, msg
+    assert pd.read_parquet(out_dir / "processed_part_0.parquet")["rs_id"].tolist() == [1, 2]  # noqa E501
+
+
+def test_transform_discards_parts_of_a_different_input(monkeypatch, tmp_path):
+    dtp, out_dir = _run_transform(monkeypatch, tmp_path, workers=1)
+    pd.DataFrame({"rs_id": [-1]}).to_parquet(
+        out_dir / "processed_part_0.parquet", index=False
+    )
+
+    # New release downloaded: same name, different content
+    _write_input(tmp_path / "raw", dtp.data_source, [_refsnp(40, 4000)])
+    ok, msg = dtp.transform(str(tmp_path / "raw"), str(tmp_path / "processed_1"))  # noqa E501
+    assert ok is True, msg
+
+    parts = sorted(p.name for p in out_dir.glob("processed_part_*.parquet"))
+    assert parts == ["processed_part_0.parquet"]
+    assert pd.read_parquet(out_dir / "processed_part_0.parquet")["rs_id"].tolist() == [40]  # noqa E501
+
+
+def _load_with_fake_db(monkeypatch, tmp_path, defer):
+    from sqlalchemy import create_engine
+
+    dtp, _ = _run_transform(monkeypatch, tmp_path, workers=1)
+    dtp.db = type("DB", (), {"engine": create_engine("sqlite://", future=True)})()  # noqa E501
+    dtp.defer_indexes = defer
+    dtp.index_workers = 3
+    calls = []
+    monkeypatch.setattr(dtp, "db_write_mode", lambda: calls.append("write"))
+    monkeypatch.setattr(dtp, "db_read_mode", lambda: calls.append("read"))
+    monkeypatch.setattr(dtp, "drop_indexes", lambda specs: calls.append("drop"))  # noqa E501
+    monkeypatch.setattr(dtp, "_upsert_snps_from_df", lambda df, conn: None)
+    monkeypatch.setattr(dtp, "_upsert_snpmerge_from_df", lambda df, conn: None)  # noqa E501
+
+    class FakeBuilder:
+        def __init__(self, engine, logger, parallel):
+            calls.append(("build", parallel))
+
+        def build(self, specs):
+            return []
+
+    monkeypatch.setattr(mod, "IndexBuildManager", FakeBuilder)
+    ok, msg = dtp.load(str(tmp_path / "processed_1"))
+    assert ok is True, msg
+    return dtp, calls
+
+
+def test_load_defers_index_creation_by_default(monkeypatch, tmp_path):
+    dtp, calls = _load_with_fake_db(monkeypatch, tmp_path, defer=True)
+
+    assert calls == ["write", "drop"]
+    assert any("Index creation deferred" in m for _, m in dtp.logger.messages)  # noqa E501
+
+
+def test_load_builds_indexes_inline_when_not_deferred(monkeypatch, tmp_path):
+    dtp, calls = _load_with_fake_db(monkeypatch, tmp_path, defer=False)
+
+    assert calls == ["write", "drop", ("build", 3), "read"]
+    assert not any("deferred" in m for _, m in dtp.logger.messages)
+
+
+def test_batch_worker_skips_non_snv_and_reports_errors(tmp_path):
+    result = mod._dbsnp_batch_worker(
+        [_refsnp(7, 10, variant_type="mnv"), "{bad", _refsnp(8, 11)],
+        5,
+        str(tmp_path),
+    )
+
+    assert result["batch_id"] == 5
+    assert result["rows"] == 1
+    assert result["n_errors"] == 1
+    assert result["path"].endswith("processed_part_5.parquet")
+
+
+def test_position_errors_are_counted_per_line(tmp_path):
+    bad = json.dumps(
+        {
+            "refsnp_id": "7",
+            "primary_snapshot_data": {
+                "variant_type": "snv",
+                "placements_with_allele": ["not-a-placement"],
+            },
+        }
+    )
+
+    result = mod._dbsnp_batch_worker(
+        [_refsnp(1, 1000), bad], batch_id=0, output_dir=str(tmp_path)
+    )
+
+    assert (result["rows"], result["n_errors"]) == (1, 1)
+    assert "has no attribute 'get'" in result["errors"][0]
+
+
+def test_transform_workers_default_to_serial(monkeypatch, tmp_path):
+    monkeypatch.delenv("BIOFILTER_DBSNP_WORKERS", raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert mod._default_transform_workers() == 1
+
+    (tmp_path / ".biofilter.toml").write_text("[etl]\ndbsnp_workers = 3\n")
+    assert mod._default_transform_workers() == 3
+
+    monkeypatch.setenv("BIOFILTER_DBSNP_WORKERS", "2")
+    assert mod._default_transform_workers() == 2
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.base import Base
+from biofilter.modules.db.models import Entity, EntityAlias, EntityGroup
+from biofilter.modules.etl.alias_search_index import (
+    alias_search_candidates,
+    has_alias_search_index,
+    qgrams,
+    refresh_alias_search_index,
+    sorted_tokens,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine, future=True)() as session:
+        group = EntityGroup(name="Gene")
+        session.add(group)
+        session.flush()
+        session.add(Entity(id=1, group_id=group.id))
+        session.flush()
+        yield session
+
+
+def _add_aliases(session, values, ds):
+    session.add_all(
+        [
+            EntityAlias(entity_id=1, group_id=1, alias_value=v, data_source_id=ds)
+            for v in values
+        ]
+    )
+    session.flush()
+
+
+def _indexed_keys(session):
+    return {
+        r[0]
+        for r in session.execute(text("SELECT alias_key FROM entity_alias_search_keys"))  # noqa E501
+    }
+
+
+def test_qgrams_are_padded_trigrams_of_token_sorted_keys():
+    assert sorted_tokens("signaling  MAPK") == "MAPK signaling"
+    assert qgrams("ab") == {"  a", " ab", "ab ", "b  "}
+    assert qgrams("") == set()
+
+
+def test_refresh_builds_full_index_then_adds_loaded_data_source_only(session):
+    logger = DummyLogger()
+    _add_aliases(session, ["BRCA1", "TP53"], ds=1)
+    conn = session.connection()
+
+    assert not has_alias_search_index(conn)
+    # First call builds everything even when scoped to one data source
+    assert refresh_alias_search_index(conn, data_source_ids=[2], logger=logger) == 2  # noqa E501
+    assert has_alias_search_index(conn)
+    assert any("all aliases" in msg for _, msg in logger.messages)
+
+    _add_aliases(session, ["BRCA2", "brca1"], ds=2)
+    _add_aliases(session, ["APOE"], ds=3)
+    assert refresh_alias_search_index(conn, data_source_ids=[2]) == 1
+    assert _indexed_keys(session) == {"brca1", "tp53", "brca2"}
+
+    # Full refresh indexes the rest and prunes keys without aliases
+    session.execute(text("DELETE FROM entity_aliases WHERE alias_value = 'TP53'"))
+    assert refresh_alias_search_index(conn) == 1
+    assert _indexed_keys(session) == {"brca1", "brca2", "apoe"}
+    assert session.execute(
+        text(
+            "SELECT COUNT(*) FROM entity_alias_qgrams g "
+            "LEFT JOIN entity_alias_search_keys k ON k.key_id = g.key_id "
+            "WHERE k.key_id IS NULL"
+        )
+    ).scalar() == 0
+
+
+def test_candidates_are_a_superset_of_rapidfuzz_matches(session):
+    fuzz = pytest.importorskip("rapidfuzz.fuzz")
+    keys = [
+        "brca1", "brca2", "bcra1", "tp53", "mapk signaling pathway",
+        "pathway signaling mapk", "apoe", "apoe4", "x",
+    ]
+    _add_aliases(session, keys, ds=1)
+    conn = session.connection()
+    refresh_alias_search_index(conn)
+
+    queries = ["brca1", "signalling mapk pathway", "apo", "zzz"]
+    for threshold in (50, 70, 80, 95):
+        found = alias_search_candidates(conn, queries, threshold)
+        for query in queries:
+            expected = {
+                k for k in keys
+                if fuzz.token_sort_ratio(query, k) >= threshold
+            }
+            assert expected <= found[query]
+    # The bounds do filter: unrelated keys are dropped at a high threshold
+    assert alias_search_candidates(conn, ["brca1"], 80)["brca1"] == {"brca1", "brca2", "bcra1"}  # noqa E501
+    with pytest.raises(ValueError):
+        alias_search_candidates(conn, ["brca1"], 0)
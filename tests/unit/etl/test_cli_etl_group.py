@@ -200,6 +200,10 @@ def test_update_all_calls_facade_and_prints_summary(monkeypatch):
             "--drop-files",
             "--all",
             "--stop-on-error",
+            "--jobs",
+            "4",
+            "--load-jobs",
+            "2",
             "--debug",
         ],
     )
@@ -215,6 +219,8 @@ def test_update_all_calls_facade_and_prints_summary(monkeypatch):
                 "drop_files_on_success": True,
                 "only_active": False,
                 "stop_on_error": True,
+                "jobs": 4,
+                "load_jobs": 2,
             },
         )
     ]
@@ -265,6 +271,8 @@ def test_index_calls_etl_index_and_echoes_message_on_success(monkeypatch):
                 "drop_first": False,
                 "set_write_mode": False,
                 "set_read_mode": False,
+                "parallel": 1,
+                "concurrently": False,
             },
         )
     ]
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.models import Entity, EntityAlias
+from biofilter.modules.etl.mixins.base_dtp import DTPBase
+from biofilter.modules.etl.mixins.entity_query_mixin import EntityQueryMixin
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+class FakeDTP(DTPBase, EntityQueryMixin):
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+        self.logger = DummyLogger()
+        self.alias_schema = {
+            "symbol": ("symbol", "HGNC", True),
+            "hgnc_id": ("code", "HGNC", None),
+            "alias_symbol": ("symbol", "HGNC", None),
+        }
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Entity.metadata.create_all(
+        engine, tables=[Entity.__table__, EntityAlias.__table__]
+    )
+    return sessionmaker(bind=engine, future=True, expire_on_commit=False)()
+
+
+def _aliases(session, entity_id=None):
+    stmt = select(
+        EntityAlias.entity_id,
+        EntityAlias.alias_value,
+        EntityAlias.alias_type,
+        EntityAlias.is_primary,
+    )
+    if entity_id is not None:
+        stmt = stmt.where(EntityAlias.entity_id == entity_id)
+    return session.execute(stmt).all()
+
+
+def test_build_alias_frames_splits_primary_and_secondary():
+    dtp = FakeDTP(session=None)
+    df = pd.DataFrame(
+        {
+            "symbol": ["A1BG", "NAT2", None],
+            "hgnc_id": ["HGNC:5", "HGNC:7517", "HGNC:1"],
+            "alias_symbol": [["A1B", "ABG"], None, ["X"]],
+        }
+    )
+
+    primary, secondary = dtp.build_alias_frames(
+        df, is_active=pd.Series([True, False, True])
+    )
+
+    assert primary["alias_value"].tolist() == ["A1BG", "NAT2"]
+    assert primary["is_active"].tolist() == [True, False]
+    assert secondary.loc[secondary["row_id"] == 0, "alias_value"].tolist() == [
+        "HGNC:5",
+        "A1B",
+        "ABG",
+    ]
+    assert set(secondary["primary_value"]) == {"A1BG", "NAT2"}
+    assert set(secondary["primary_type"]) == {"symbol"}
+    assert set(secondary["primary_source"]) == {"HGNC"}
+    # Row without primary alias is dropped from both frames
+    assert 2 not in set(primary["row_id"]) | set(secondary["row_id"])
+
+
+A1BG = ("A1BG", "symbol", "HGNC")
+NAT2 = ("NAT2", "symbol", "HGNC")
+
+
+def test_bulk_get_or_create_entities_creates_then_reuses():
+    session = _session()
+    dtp = FakeDTP(session)
+    df = pd.DataFrame(
+        {
+            "symbol": ["A1BG", "NAT2", "A1BG"],
+            "hgnc_id": ["HGNC:5", "HGNC:7517", "HGNC:5"],
+            "alias_symbol": [["A1B"], None, ["A1B", "ABG"]],
+        }
+    )
+    primary, secondary = dtp.build_alias_frames(df)
+
+    resolved = dtp.bulk_get_or_create_entities(
+        primary, secondary, group_id=1, data_source_id=3, package_id=9
+    )
+
+    assert sorted(resolved.index) == [
+        ("A1BG", "symbol", "HGNC"),
+        ("NAT2", "symbol", "HGNC"),
+    ]
+    assert resolved["is_new"].all()
+    assert session.query(Entity).count() == 2
+
+    a1bg = int(resolved.at[A1BG, "entity_id"])
+    rows = _aliases(session, a1bg)
+    assert sorted(r.alias_value for r in rows) == ["A1B", "A1BG", "ABG", "HGNC:5"]
+    assert [r.alias_value for r in rows if r.is_primary] == ["A1BG"]
+
+    by_row = dtp.map_entity_ids(primary, resolved)
+    assert by_row.loc[0, "entity_id"] == by_row.loc[2, "entity_id"] == a1bg
+
+    # Second pass resolves existing entities and adds only unseen aliases
+    df2 = pd.DataFrame(
+        {"symbol": ["NAT2"], "hgnc_id": ["HGNC:7517"], "alias_symbol": [["AAC2"]]}
+    )
+    primary2, secondary2 = dtp.build_alias_frames(df2)
+    resolved2 = dtp.bulk_get_or_create_entities(
+        primary2, secondary2, group_id=1, data_source_id=3, package_id=10
+    )
+
+    assert not resolved2.at[NAT2, "is_new"]
+    assert resolved2.at[NAT2, "entity_id"] == resolved.at[NAT2, "entity_id"]
+    assert session.query(Entity).count() == 2
+    nat2_values = sorted(
+        r.alias_value for r in _aliases(session, int(resolved2.at[NAT2, "entity_id"]))
+    )
+    assert nat2_values == ["AAC2", "HGNC:7517", "NAT2"]
+
+
+def test_bulk_get_or_create_entities_matches_per_row_helper():
+    session = _session()
+    dtp = FakeDTP(session)
+    entity_id, is_new = dtp.get_or_create_entity(
+        name="TP53",
+        group_id=1,
+        data_source_id=3,
+        alias_type="symbol",
+        xref_source="HGNC",
+        alias_norm="tp53",
+    )
+    assert is_new
+
+    primary = pd.DataFrame(
+        [
+            {
+                "alias_value": " TP53 ",
+                "alias_type": "symbol",
+                "xref_source": "HGNC",
+                "alias_norm": "tp53",
+            },
+            {
+                "alias_value": "TP53",
+                "alias_type": "symbol",
+                "xref_source": "NCBI",
+                "alias_norm": "tp53",
+            },
+        ]
+    )
+    resolved = dtp.bulk_get_or_create_entities(primary, group_id=1)
+
+    # Same key (value, type, source) resolves; a different xref is a new entity
+    assert len(resolved) == 2
+    assert resolved.at[("TP53", "symbol", "HGNC"), "entity_id"] == entity_id
+    assert not resolved.at[("TP53", "symbol", "HGNC"), "is_new"]
+    ncbi = resolved.loc[("TP53", "symbol", "NCBI")]
+    assert ncbi["is_new"] and ncbi["entity_id"] != entity_id
+    assert session.query(Entity).count() == 2
+
+
+def test_shared_primary_value_keeps_rows_and_secondaries_apart():
+    session = _session()
+    dtp = FakeDTP(session)
+    dtp.alias_schema = {
+        "hgnc_symbol": ("symbol", "HGNC", True),
+        "ncbi_symbol": ("symbol", "NCBI", True),
+        "hgnc_id": ("code", "HGNC", None),
+    }
+    df = pd.DataFrame(
+        {
+            "hgnc_symbol": ["TP53", None],
+            "ncbi_symbol": [None, "TP53"],
+            "hgnc_id": ["HGNC:11998", "HGNC:0000"],
+        }
+    )
+    primary, secondary = dtp.build_alias_frames(df)
+
+    resolved = dtp.bulk_get_or_create_entities(primary, secondary, group_id=1)
+    by_row = dtp.map_entity_ids(primary, resolved)
+
+    hgnc = int(resolved.at[("TP53", "symbol", "HGNC"), "entity_id"])
+    ncbi = int(resolved.at[("TP53", "symbol", "NCBI"), "entity_id"])
+    assert hgnc != ncbi
+    assert by_row["entity_id"].tolist() == [hgnc, ncbi]
+    assert sorted(r.alias_value for r in _aliases(session, hgnc)) == [
+        "HGNC:11998",
+        "TP53",
+    ]
+    assert sorted(r.alias_value for r in _aliases(session, ncbi)) == [
+        "HGNC:0000",
+        "TP53",
+    ]
+
+
+def test_alias_stage_is_a_temp_table_dropped_on_failure(monkeypatch):
+    session = _session()
+    dtp = FakeDTP(session)
+    primary = pd.DataFrame(
+        [{"alias_value": "TP53", "alias_type": "symbol", "xref_source": "HGNC"}]
+    )
+    dtp.bulk_get_or_create_entities(primary, group_id=1, data_source_id=7)
+    engine = session.get_bind()
+    assert inspect(engine).get_table_names() == ["entities", "entity_aliases"]
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("lookup failed")
+
+    monkeypatch.setattr(dtp, "_join_alias_stage", boom)
+    with pytest.raises(RuntimeError, match="lookup failed"):
+        dtp.bulk_get_or_create_entities(primary, group_id=1, data_source_id=7)
+
+    # Nothing permanent is left behind and the next load still works
+    assert inspect(engine).get_table_names() == ["entities", "entity_aliases"]
+    monkeypatch.undo()
+    resolved = dtp.bulk_get_or_create_entities(primary, group_id=1, data_source_id=7)  # noqa E501
+    assert not resolved["is_new"].any()
+
+
+def test_bulk_get_or_create_entities_empty_input():
+    dtp = FakeDTP(session=None)
+    resolved = dtp.bulk_get_or_create_entities(pd.DataFrame(), group_id=1)
+    assert resolved.empty
+    assert list(resolved.columns) == ["entity_id", "is_new"]
+
+
+def test_bad_rows_are_logged_and_skipped_like_the_per_row_helper(monkeypatch):
+    session = _session()
+    dtp = FakeDTP(session)
+    insert_aliases = dtp._insert_alias_records
+
+    def reject_bad(records):
+        if records["alias_value"].eq("BAD").any():
+            raise ValueError("value rejected")
+        insert_aliases(records)
+
+    monkeypatch.setattr(dtp, "_insert_alias_records", reject_bad)
+    df = pd.DataFrame(
+        {"symbol": ["TP53", "BAD", "BRCA1"], "alias_symbol": [["P53"], ["B1"], None]}  # noqa E501
+    )
+    primary, secondary = dtp.build_alias_frames(df)
+
+    resolved = dtp.bulk_get_or_create_entities(primary, secondary, group_id=1)
+    ids = dtp.map_entity_ids(primary, resolved)["entity_id"]
+
+    assert ids.isna().tolist() == [False, True, False]
+    assert sorted(r.alias_value for r in _aliases(session)) == ["BRCA1", "P53", "TP53"]  # noqa E501
+    assert session.query(Entity).count() == 2
+    assert any(
+        level == "WARNING" and "Insert Entity failed for: BAD" in message
+        for level, message in dtp.logger.messages
+    )
+
+
+def test_alias_existing_false_leaves_known_entities_untouched():
+    session = _session()
+    dtp = FakeDTP(session)
+    first = pd.DataFrame({"symbol": ["TP53"]})
+    dtp.bulk_get_or_create_entities(*dtp.build_alias_frames(first), group_id=1)
+
+    df = pd.DataFrame({"symbol": ["TP53", "BRCA1"], "alias_symbol": [["P53"], ["B1"]]})  # noqa E501
+    primary, secondary = dtp.build_alias_frames(df)
+    dtp.bulk_get_or_create_entities(
+        primary, secondary, group_id=1, alias_existing=False
+    )
+
+    assert sorted(r.alias_value for r in _aliases(session)) == ["B1", "BRCA1", "TP53"]  # noqa E501
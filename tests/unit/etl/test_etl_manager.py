@@ -101,6 +101,18 @@ def test_load_dtp_module_uses_cache(monkeypatch):
     assert calls["count"] == 1
 
 
+def test_load_dtp_module_suggests_registered_scripts_for_unknown_name():
+    manager = etl_mgr_mod.ETLManager(debug_mode=False, db=DummyDB(), logger=DummyLogger())
+    ds = SimpleNamespace(name="hgnc", dtp_script="dtp_gene_hgcn")
+
+    try:
+        manager._load_dtp_module(ds)
+        assert False, "Expected ValueError for unknown dtp_script"
+    except ValueError as exc:
+        assert "unknown DTP script 'dtp_gene_hgcn'" in str(exc)
+        assert "dtp_gene_hgnc" in str(exc)
+
+
 def test_start_process_aborts_without_filters():
     logger = DummyLogger()
     manager = etl_mgr_mod.ETLManager(debug_mode=False, db=DummyDB(), logger=logger)
@@ -685,3 +697,120 @@ def test_simple_purge_by_package_deletes_only_non_etl_rows_with_package_id():
 
     assert remaining_entity == [(200, "to_keep")]
     assert remaining_etl == [(100, "running")]
+
+
+def test_start_process_all_with_jobs_routes_pending_sources_to_scheduler(monkeypatch):  # noqa E501
+    logger = DummyLogger()
+    manager = etl_mgr_mod.ETLManager(debug_mode=False, db=DummyDB(), logger=logger)
+
+    status_by_ds = {1: "completed", 2: None, 3: None}
+    captured = {}
+
+    monkeypatch.setattr(manager, "_resolve_datasource_ids", lambda *a, **k: [1, 2, 3])  # noqa E501
+    monkeypatch.setattr(
+        manager,
+        "_load_datasource",
+        lambda session, ds_id: SimpleNamespace(
+            id=ds_id,
+            name=f"ds_{ds_id}",
+            dtp_script=f"dtp_{ds_id}",
+            source_system=SimpleNamespace(name="NCBI"),
+            source_system_id=1,
+        ),
+    )
+    monkeypatch.setattr(manager, "_latest_load_status", lambda session, ds_id: status_by_ds.get(ds_id))  # noqa E501
+
+    def fail_run_one_datasource(**kwargs):
+        raise AssertionError("sequential path must not run with jobs > 1")
+
+    monkeypatch.setattr(manager, "_run_one_datasource", fail_run_one_datasource)
+
+    class FakeScheduler:
+        def run(self, sources, stop_on_error=False):
+            captured["sources"] = [(s.ds_id, s.dtp_script) for s in sources]
+            status_by_ds[2] = "completed"
+            status_by_ds[3] = "failed"
+            return {2: "completed", 3: "failed"}
+
+    def fake_for_manager(mgr, **kwargs):
+        captured["kwargs"] = kwargs
+        return FakeScheduler()
+
+    monkeypatch.setattr(etl_mgr_mod.ETLScheduler, "for_manager", fake_for_manager)  # noqa E501
+
+    summary = manager.start_process_all(
+        download_path="/raw", processed_path="/processed", jobs=4, load_jobs=2
+    )
+
+    assert captured["sources"] == [(2, "dtp_2"), (3, "dtp_3")]
+    assert captured["kwargs"] == {
+        "download_path": "/raw",
+        "processed_path": "/processed",
+        "jobs": 4,
+        "load_jobs": 2,
+    }
+    assert summary == {
+        "selected": 3,
+        "skipped": 1,
+        "processed": 2,
+        "succeeded": 1,
+        "failed": 1,
+    }
+
+
+def test_refresh_alias_search_index_after_load_never_fails_the_load(monkeypatch):
+    logger = DummyLogger()
+    manager = etl_mgr_mod.ETLManager(debug_mode=False, db=DummyDB(), logger=logger)
+    ds = SimpleNamespace(id=3, name="hgnc")
+
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Session = sessionmaker(bind=engine, future=True)
+    calls = []
+    monkeypatch.setattr(
+        etl_mgr_mod,
+        "refresh_alias_search_index",
+        lambda conn, data_source_ids, logger: calls.append(data_source_ids),
+    )
+    with Session() as session:
+        manager._refresh_alias_search_index(session, ds)
+    assert calls == [[3]]
+
+    def boom(conn, data_source_ids, logger):
+        raise RuntimeError("no entity_aliases")
+
+    monkeypatch.setattr(etl_mgr_mod, "refresh_alias_search_index", boom)
+    with Session() as session:
+        manager._refresh_alias_search_index(session, ds)
+    assert any(
+        level == "WARNING" and "Alias search index refresh failed for 'hgnc'" in msg
+        for level, msg in logger.messages
+    )
+
+
+def test_rollbacks_purge_in_one_transaction(monkeypatch):
+    manager = etl_mgr_mod.ETLManager(debug_mode=False, db=DummyDB(), logger=DummyLogger())  # noqa E501
+    ds = SimpleNamespace(id=9, name="hgnc")
+    rollback_pkg = SimpleNamespace(id=500, stats=None)
+    session = SimpleNamespace(commit=lambda: None, rollback=lambda: None)
+    purges = []
+
+    monkeypatch.setattr(manager, "_create_rollback_package", lambda **k: rollback_pkg)  # noqa E501
+    monkeypatch.setattr(manager, "_load_package", lambda *a, **k: rollback_pkg)
+    monkeypatch.setattr(
+        manager,
+        "_find_relationship_conflicts",
+        lambda *a, **k: {"conflict_count": 0},
+    )
+
+    def fake_purge(*args, commit=True, batch_commit=False, **kwargs):
+        purges.append(batch_commit)
+        return {"Entity": 1}
+
+    monkeypatch.setattr(manager, "_simple_purge_by_data_source", fake_purge)
+    monkeypatch.setattr(manager, "_simple_purge_by_package", fake_purge)
+
+    assert manager._rollback_data_source(session, ds, note="n")[0] is True
+    assert manager._rollback_package(
+        session, ds, SimpleNamespace(id=123), note="n"
+    )[0] is True
+    assert purges == [False, False]
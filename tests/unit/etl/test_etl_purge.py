@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select  # noqa E501
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.etl.etl_purge import (
+    PurgeEngine,
+    PurgePlan,
+    PurgeStep,
+    clear_metadata_cache,
+    reflect_metadata,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+def _session_with_rows():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    metadata = MetaData()
+    big = Table(
+        "entity_aliases",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("data_source_id", Integer),
+        Column("alias", String(20)),
+    )
+    small = Table(
+        "entities",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("data_source_id", Integer),
+    )
+    metadata.create_all(engine)
+
+    session = sessionmaker(bind=engine, future=True)()
+    session.execute(
+        big.insert(),
+        [
+            {"id": i, "data_source_id": 7 if i % 3 else 8, "alias": f"a{i}"}
+            for i in range(1, 101)
+        ],
+    )
+    session.execute(
+        small.insert(),
+        [{"id": 1, "data_source_id": 7}, {"id": 2, "data_source_id": 8}],
+    )
+    session.commit()
+    return engine, session, big, small
+
+
+def test_reflect_metadata_is_cached_per_engine():
+    clear_metadata_cache()
+    engine, session, _, _ = _session_with_rows()
+
+    first = reflect_metadata(engine)
+    assert reflect_metadata(engine) is first
+    assert reflect_metadata(engine, refresh=True) is not first
+    assert "entity_aliases" in first.tables
+    session.close()
+
+
+def test_plan_estimates_rows_and_picks_batched_strategy_for_large_tables():
+    clear_metadata_cache()
+    _, session, _, _ = _session_with_rows()
+
+    plan = PurgeEngine(DummyLogger(), batch_rows=10).plan(
+        session, "data_source_id", 7
+    )
+
+    by_table = {s.table: s for s in plan.steps}
+    assert by_table["entity_aliases"].strategy == "batched"
+    assert by_table["entity_aliases"].estimated_rows == 67
+    assert by_table["entity_aliases"].pk_column == "id"
+    assert by_table["entities"].strategy == "delete"
+    assert plan.estimated_rows == 68
+    assert "~68 rows in 2 table(s)" in plan.summary()
+    session.close()
+
+
+def test_purge_deletes_in_pk_batches_with_commits_and_progress():
+    clear_metadata_cache()
+    _, session, big, small = _session_with_rows()
+    logger = DummyLogger()
+
+    deleted = PurgeEngine(logger, batch_rows=10).purge(
+        session, "data_source_id", 7, batch_commit=True
+    )
+
+    assert deleted == {"entity_aliases": 67, "entities": 1}
+    remaining = session.execute(select(big.c.data_source_id)).scalars().all()
+    assert set(remaining) == {8} and len(remaining) == 33
+    assert session.execute(select(small.c.id)).scalars().all() == [2]
+    assert any("📐 Purge plan" in m for _, m in logger.messages)
+    assert any("100% of key range" in m for _, m in logger.messages)
+    session.close()
+
+
+def test_partition_strategy_falls_back_to_deletes_when_refused():
+    clear_metadata_cache()
+    _, session, big, _ = _session_with_rows()
+    logger = DummyLogger()
+    plan = PurgePlan(
+        key_name="data_source_id",
+        key_value=8,
+        steps=[
+            PurgeStep(
+                table="entity_aliases",
+                strategy="truncate",
+                estimated_rows=33,
+                parent="entity_aliases_parent",
+                pk_column="id",
+            )
+        ],
+    )
+
+    # sqlite has no TRUNCATE: the savepoint is rolled back and rows are
+    # deleted by key instead of emptying the whole table
+    deleted = PurgeEngine(logger, batch_rows=10).execute(session, plan)
+
+    assert deleted == {"entity_aliases": 33}
+    assert plan.steps[0].strategy == "batched"
+    assert session.execute(select(big.c.id)).scalars().all()[:2] == [1, 2]
+    assert any("falling back to deletes" in m for _, m in logger.messages)
+    session.close()
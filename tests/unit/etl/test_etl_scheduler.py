@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.models import ETLDataSource, ETLPackage, ETLSourceSystem
+from biofilter.modules.etl.etl_scheduler import (
+    ETLScheduler,
+    ScheduledSource,
+    _prepare_status,
+    build_dependency_graph,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+def _sources():
+    return [
+        ScheduledSource(1, "hgnc", "dtp_gene_hgnc"),
+        ScheduledSource(2, "reactome", "dtp_reactome"),
+        ScheduledSource(3, "reactome_relationships", "dtp_reactome_relationships"),  # noqa E501
+        ScheduledSource(4, "kegg", "dtp_kegg"),
+    ]
+
+
+class RecordingRunner:
+    def __init__(self, fail_load=(), fail_prepare=()):
+        self.events = []
+        self.fail_load = set(fail_load)
+        self.fail_prepare = set(fail_prepare)
+        self.active_loads = 0
+        self.max_active_loads = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ds_id, run_steps):
+        phase = "load" if "load" in run_steps else "prepare"
+        with self._lock:
+            self.events.append(("start", phase, ds_id))
+            if phase == "load":
+                self.active_loads += 1
+                self.max_active_loads = max(
+                    self.max_active_loads, self.active_loads
+                )
+        time.sleep(0.01)
+        with self._lock:
+            self.events.append(("end", phase, ds_id))
+            if phase == "load":
+                self.active_loads -= 1
+        if phase == "load":
+            return "failed" if ds_id in self.fail_load else "completed"
+        return "failed" if ds_id in self.fail_prepare else "completed"
+
+    def index(self, kind, phase, ds_id):
+        return self.events.index((kind, phase, ds_id))
+
+
+def _scheduler(runner, jobs=4, load_jobs=1):
+    return ETLScheduler(
+        step_runner=runner,
+        jobs=jobs,
+        load_jobs=load_jobs,
+        logger=DummyLogger(),
+        executor_factory=lambda n: ThreadPoolExecutor(max_workers=n),
+    )
+
+
+def test_build_dependency_graph_only_links_selected_sources():
+    sources = _sources()
+    graph = build_dependency_graph(sources)
+
+    assert graph[1] == set()
+    assert graph[2] == set()
+    assert graph[3] == {1, 2, 4}
+    assert sources[2].depends_on == {1, 2, 4}
+
+
+def test_build_dependency_graph_rejects_cycles():
+    sources = [
+        ScheduledSource(1, "a", "dtp_a"),
+        ScheduledSource(2, "b", "dtp_b"),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        build_dependency_graph(
+            sources, dependencies={"dtp_a": ("dtp_b",), "dtp_b": ("dtp_a",)}
+        )
+
+
+def test_scheduler_respects_dependencies_and_load_limit():
+    runner = RecordingRunner()
+    results = _scheduler(runner, jobs=4, load_jobs=1).run(_sources())
+
+    assert results == {1: "completed", 2: "completed", 3: "completed", 4: "completed"}  # noqa E501
+    assert runner.max_active_loads == 1
+    for upstream in (1, 2, 4):
+        # relationship transform reads its parent's processed files
+        assert runner.index("end", "prepare", upstream) < runner.index(
+            "start", "prepare", 3
+        )
+        assert runner.index("end", "load", upstream) < runner.index(
+            "start", "load", 3
+        )
+
+
+def test_scheduler_blocks_dependents_of_failed_load():
+    runner = RecordingRunner(fail_load={2})
+    logger = DummyLogger()
+    scheduler = _scheduler(runner, jobs=2, load_jobs=2)
+    scheduler.logger = logger
+
+    results = scheduler.run(_sources())
+
+    assert results[2] == "failed"
+    assert results[3] == "blocked"
+    assert ("start", "load", 3) not in runner.events
+    assert any("Blocking 'reactome_relationships'" in m for _, m in logger.messages)  # noqa E501
+
+
+def test_scheduler_stop_on_error_cancels_pending_sources():
+    runner = RecordingRunner(fail_load={1})
+    sources = [
+        ScheduledSource(1, "hgnc", "dtp_gene_hgnc"),
+        ScheduledSource(2, "ncbi", "dtp_gene_ncbi"),
+    ]
+
+    results = _scheduler(runner, jobs=1).run(sources, stop_on_error=True)
+
+    assert results[1] == "failed"
+    assert results[2] in {"blocked", "cancelled"}
+    assert ("start", "load", 2) not in runner.events
+
+
+def test_scheduler_blocks_dependents_of_failed_transform():
+    runner = RecordingRunner(fail_prepare={2})
+    logger = DummyLogger()
+    scheduler = _scheduler(runner, jobs=2, load_jobs=2)
+    scheduler.logger = logger
+
+    results = scheduler.run(_sources())
+
+    assert results[2] == "failed"
+    assert results[3] == "blocked"
+    assert results[1] == results[4] == "completed"
+    assert ("start", "load", 2) not in runner.events
+    assert ("start", "prepare", 3) not in runner.events
+    assert any("Scheduled prepare failed for 'reactome'" in m for _, m in logger.messages)  # noqa E501
+
+
+def test_prepare_status_reads_the_packages_of_this_run():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    ETLSourceSystem.__table__.create(engine)
+    ETLDataSource.__table__.create(engine)
+    ETLPackage.__table__.create(engine)
+    Session = sessionmaker(bind=engine, future=True)
+
+    with Session() as session:
+        ss = ETLSourceSystem(name="NCBI", active=True)
+        session.add(ss)
+        session.flush()
+        ds = ETLDataSource(
+            name="hgnc",
+            source_system_id=ss.id,
+            data_type="gene",
+            format="tsv",
+            dtp_script="dtp_gene_hgnc",
+            active=True,
+        )
+        session.add(ds)
+        session.flush()
+
+        def add(operation_type, status):
+            pkg = ETLPackage(
+                data_source_id=ds.id, operation_type=operation_type, status=status  # noqa E501
+            )
+            session.add(pkg)
+            session.commit()
+            return pkg.id
+
+        # An earlier good transform does not hide a failure in this run
+        add("transform", "completed")
+        since = add("load", "completed")
+        add("extract", "completed")
+        add("transform", "failed")
+        assert _prepare_status(session, ds.id, since, ("extract", "transform")) == "failed"  # noqa E501
+
+        # A step that raised before recording a package also fails
+        since = add("transform", "completed")
+        add("extract", "up-to-date")
+        assert _prepare_status(session, ds.id, since, ("extract", "transform")) == "failed"  # noqa E501
+
+        add("transform", "not-applicable")
+        assert _prepare_status(session, ds.id, since, ("extract", "transform")) == "not-applicable"  # noqa E501
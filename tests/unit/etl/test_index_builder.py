@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import create_engine, text
+
+from biofilter.modules.etl.index_builder import (
+    PG_MAX_IDENTIFIER,
+    IndexBuildManager,
+    index_name_for,
+    partition_index_name,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idx.db'}", future=True)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE genes (id INTEGER PRIMARY KEY, symbol TEXT, data_source_id INTEGER)"))  # noqa E501
+        conn.execute(text("CREATE TABLE aliases (id INTEGER PRIMARY KEY, alias_norm TEXT, group_id INTEGER)"))  # noqa E501
+    return engine
+
+
+def _index_names(engine):
+    with engine.connect() as conn:
+        return {
+            r[0]
+            for r in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            )
+        }
+
+
+def test_build_creates_deduplicated_indexes_and_records_timings(tmp_path):
+    engine = _engine(tmp_path)
+    logger = DummyLogger()
+    specs = [
+        ("genes", ["symbol"]),
+        ("genes", ["data_source_id"]),
+        ("aliases", ["group_id", "alias_norm"]),
+        ("genes", ["symbol"]),  # duplicated across groups
+    ]
+
+    records = IndexBuildManager(engine, logger, parallel=4).build(specs)
+
+    assert sorted(r.index_name for r in records) == sorted(
+        [
+            "idx_genes_symbol",
+            "idx_genes_data_source_id",
+            "idx_aliases_group_id_alias_norm",
+        ]
+    )
+    assert {r.status for r in records} == {"created"}
+    assert all(r.seconds >= 0 for r in records)
+    assert {r.index_name for r in records} <= _index_names(engine)
+    assert any("created=3 skipped=0 failed=0" in m for _, m in logger.messages)
+
+
+def test_build_resumes_by_skipping_existing_and_reports_failures(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE INDEX {index_name_for('genes', ['symbol'])} ON genes (symbol)"))  # noqa E501
+    logger = DummyLogger()
+
+    records = IndexBuildManager(engine, logger).build(
+        [("genes", ["symbol"]), ("genes", ["data_source_id"]), ("missing", ["x"])]  # noqa E501
+    )
+
+    status = {r.index_name: r.status for r in records}
+    assert status == {
+        "idx_genes_symbol": "skipped",
+        "idx_genes_data_source_id": "created",
+        "idx_missing_x": "failed",
+    }
+    assert any(level == "WARNING" and "idx_missing_x" in m for level, m in logger.messages)  # noqa E501
+
+
+def test_build_state_is_persisted_and_reported_on_resume(tmp_path):
+    engine = _engine(tmp_path)
+    state = tmp_path / "state" / "index-build.json"
+    specs = [("genes", ["symbol"]), ("aliases", ["group_id"])]
+
+    first = IndexBuildManager(engine, DummyLogger(), state_path=state).build(
+        specs[:1]
+    )
+    saved = json.loads(state.read_text(encoding="utf-8"))["indexes"]
+    assert saved["idx_genes_symbol"]["status"] == "created"
+    assert saved["idx_genes_symbol"]["built_at"]
+
+    # Interrupted run resumed: the first index is reported, not rebuilt
+    logger = DummyLogger()
+    manager = IndexBuildManager(engine, logger, state_path=state)
+    records = {r.index_name: r for r in manager.build(specs)}
+
+    genes = records["idx_genes_symbol"]
+    assert genes.status == "skipped"
+    assert genes.seconds == first[0].seconds
+    assert genes.built_at == saved["idx_genes_symbol"]["built_at"]
+    assert records["idx_aliases_group_id"].status == "created"
+    assert set(manager.read_state()) == {"idx_genes_symbol", "idx_aliases_group_id"}  # noqa E501
+    assert any("1 built by an earlier run" in m for _, m in logger.messages)
+
+
+def test_sqlite_builds_are_serialized_and_not_concurrent(tmp_path):
+    manager = IndexBuildManager(
+        _engine(tmp_path), DummyLogger(), parallel=8, concurrently=True
+    )
+
+    assert manager.parallel == 1
+    assert manager.concurrently is False
+
+
+def test_partition_index_name_fits_postgres_identifier_limit():
+    short = partition_index_name("idx_variant_masters_rsid", "variant_masters_chr_1")  # noqa E501
+    assert short == "idx_variant_masters_rsid__variant_masters_chr_1"
+
+    parent = index_name_for("variant_molecular_effects", ["chromosome", "variant_id"])  # noqa E501
+    long_a = partition_index_name(parent, "variant_molecular_effects_chr_1")
+    long_b = partition_index_name(parent, "variant_molecular_effects_chr_11")
+    assert len(long_a) <= PG_MAX_IDENTIFIER
+    assert long_a != long_b
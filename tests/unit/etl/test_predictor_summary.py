@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from sqlalchemy import MetaData, create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.models.model_variants import map_variant_effect_predictions
+from biofilter.modules.etl.etl_purge import PurgeEngine, clear_metadata_cache
+from biofilter.modules.etl.predictor_summary import (
+    has_predictor_summary,
+    refresh_predictor_summary,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+def _engine_with_predictions(rows):
+    engine = create_engine("sqlite:///:memory:", future=True)
+    metadata = MetaData()
+    vep = map_variant_effect_predictions(engine, metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(vep.insert(), [_prediction(*r) for r in rows])
+    return engine, vep
+
+
+def _prediction(chrom, vid, tx, name, score, cls, ds=91):
+    return {
+        "chromosome": chrom,
+        "variant_id": vid,
+        "predictor_key": f"{name.lower()}:na:{tx}",
+        "transcript_id": tx,
+        "predictor_name": name,
+        "score": score,
+        "classification": cls,
+        "data_source_id": ds,
+        "etl_package_id": 7,
+    }
+
+
+def _summary(conn):
+    return {
+        (r.chromosome, r.variant_id, r.predictor_name): (
+            r.max_score,
+            r.max_classification,
+            r.prediction_count,
+        )
+        for r in conn.execute(text("SELECT * FROM variant_predictor_summary"))
+    }
+
+
+def test_refresh_creates_table_and_aggregates_per_variant():
+    engine, _ = _engine_with_predictions(
+        [
+            (1, 10, "ENST1", "AlphaMissense", 0.2, "likely_benign"),
+            (1, 10, "ENST2", "alphamissense", 0.9, "likely_pathogenic"),
+            (1, 11, "ENST1", "alphamissense", None, None),
+            (2, 20, "ENST3", "alphamissense", 0.5, "ambiguous"),
+        ]
+    )
+    logger = DummyLogger()
+
+    with engine.begin() as conn:
+        assert not has_predictor_summary(conn)
+        counts = refresh_predictor_summary(conn, logger=logger)
+        assert has_predictor_summary(conn)
+        summary = _summary(conn)
+
+    assert counts[1] == 2 and counts[2] == 1 and counts[3] == 0
+    assert summary == {
+        (1, 10, "alphamissense"): (0.9, "likely_pathogenic", 2),
+        (1, 11, "alphamissense"): (None, None, 1),
+        (2, 20, "alphamissense"): (0.5, "ambiguous", 1),
+    }
+    assert any("3 rows" in msg for _, msg in logger.messages)
+
+
+def test_refresh_only_rebuilds_requested_chromosomes():
+    engine, vep = _engine_with_predictions(
+        [
+            (1, 10, "ENST1", "alphamissense", 0.2, "likely_benign"),
+            (2, 20, "ENST3", "alphamissense", 0.5, "ambiguous"),
+        ]
+    )
+    with engine.begin() as conn:
+        refresh_predictor_summary(conn)
+        conn.execute(text("DELETE FROM variant_effect_predictions WHERE chromosome = 1"))  # noqa E501
+        conn.execute(vep.insert(), [_prediction(2, 21, "ENST4", "alphamissense", 0.7, "x")])  # noqa E501
+
+        refresh_predictor_summary(conn, chromosomes=[1])
+        summary = _summary(conn)
+
+    # chr1 rebuilt (now empty); chr2 left as it was until its own refresh
+    assert summary == {(2, 20, "alphamissense"): (0.5, "ambiguous", 1)}
+    assert "variant_predictor_summary" in inspect(engine).get_table_names()
+
+
+def test_purge_rebuilds_summary_rows_shared_by_several_sources():
+    clear_metadata_cache()
+    engine, _ = _engine_with_predictions(
+        [
+            (1, 10, "ENST1", "alphamissense", 0.2, "likely_benign", 91),
+            (1, 10, "ENST2", "alphamissense", 0.9, "likely_pathogenic", 92),
+            (2, 20, "ENST3", "alphamissense", 0.5, "ambiguous", 92),
+            (3, 30, "ENST4", "alphamissense", 0.4, "ambiguous", 91),
+        ]
+    )
+    with engine.begin() as conn:
+        refresh_predictor_summary(conn)
+
+    with sessionmaker(bind=engine, future=True)() as session:
+        deleted = PurgeEngine(DummyLogger()).purge(session, "data_source_id", 92)  # noqa E501
+        session.commit()
+
+    with engine.connect() as conn:
+        summary = _summary(conn)
+
+    # The variant scored by both sources keeps the source-91 prediction
+    assert deleted["variant_effect_predictions"] == 2
+    assert summary == {
+        (1, 10, "alphamissense"): (0.2, "likely_benign", 1),
+        (3, 30, "alphamissense"): (0.4, "ambiguous", 1),
+    }
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, text
+
+from biofilter.modules.io import parquet_exporter as exp
+from biofilter.modules.io.parquet_exporter import ExportConfig, export_to_parquet
+from biofilter.utils.file_hash import compute_file_hash
+
+
+@pytest.fixture
+def db_uri(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'src.db'}"
+    engine = create_engine(uri, future=True)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE variants (id INTEGER PRIMARY KEY, chromosome INTEGER, "  # noqa E501
+                "position INTEGER, ref TEXT, score REAL)"
+            )
+        )
+        rows = [
+            {"id": i, "chromosome": chrom, "position": i * 10, "ref": "ACGT"[i % 4], "score": None if i % 3 else i / 2}  # noqa E501
+            for i, chrom in enumerate([1] * 7 + [2] * 5 + [None] * 2)
+        ]
+        conn.execute(
+            text("INSERT INTO variants VALUES (:id, :chromosome, :position, :ref, :score)"),  # noqa E501
+            rows,
+        )
+    engine.dispose()
+    return uri
+
+
+def _cfg(db_uri, out_dir, **kwargs):
+    return ExportConfig(
+        db_uri=db_uri,
+        table="variants",
+        out_dir=str(out_dir),
+        partition_by=["chromosome"],
+        order_by="position",
+        chunksize=3,
+        row_group_size=4,
+        compression="snappy",
+        **kwargs,
+    )
+
+
+def test_export_writes_hive_partitions_with_row_groups_and_checksums(db_uri, tmp_path):  # noqa E501
+    out = tmp_path / "out"
+    summary = export_to_parquet(_cfg(db_uri, out))
+    assert summary == {"rows": 14, "partitions": 3, "exported": 3, "resumed": 0}
+
+    part = out / "chromosome=1" / "part-0.parquet"
+    meta = pq.ParquetFile(str(part)).metadata
+    assert meta.num_rows == 7
+    assert [meta.row_group(i).num_rows for i in range(meta.num_row_groups)] == [4, 3]  # noqa E501
+    assert meta.row_group(0).column(0).compression == "SNAPPY"
+    assert (out / "chromosome=__HIVE_DEFAULT_PARTITION__" / "part-0.parquet").exists()  # noqa E501
+
+    digest, name = (part.parent / "_part-0.parquet.sha256").read_text().split()
+    assert (digest, name) == (compute_file_hash(part), "part-0.parquet")
+
+    # Same schema everywhere (reflected), even for an all-NULL partition
+    dataset = pads.dataset(str(out), partitioning="hive", format="parquet")
+    table = dataset.to_table().sort_by("id")
+    assert table.num_rows == 14
+    assert table.schema.field("score").type == pa.float64()
+    assert table.column("position").to_pylist() == [i * 10 for i in range(14)]
+
+    summary_md = pq.read_metadata(str(out / "_metadata"))
+    assert summary_md.num_rows == 14
+    assert {
+        summary_md.row_group(i).column(0).file_path
+        for i in range(summary_md.num_row_groups)
+    } == {
+        "chromosome=1/part-0.parquet",
+        "chromosome=2/part-0.parquet",
+        "chromosome=__HIVE_DEFAULT_PARTITION__/part-0.parquet",
+    }
+
+    manifest = json.loads((out / "_manifest.json").read_text())
+    assert manifest["rows"] == 14
+    assert [p["partition"] for p in manifest["partitions"]] == [
+        {"chromosome": None}, {"chromosome": 1}, {"chromosome": 2}
+    ]
+    assert "src.db" in manifest["db_uri"]
+
+
+def test_export_resumes_completed_partitions_only(db_uri, tmp_path, monkeypatch):  # noqa E501
+    out = tmp_path / "out"
+    export_to_parquet(_cfg(db_uri, out))
+
+    # Simulate an interrupted partition: marker gone, file half-written
+    (out / "chromosome=2" / "_partition.json").unlink()
+    exported = []
+    real = exp.export_partition
+
+    def spy(cfg, schema, values, fingerprint):
+        exported.append(values)
+        return real(cfg, schema, values, fingerprint)
+
+    monkeypatch.setattr(exp, "export_partition", spy)
+    summary = export_to_parquet(_cfg(db_uri, out))
+    assert exported == [(2,)]
+    assert summary["resumed"] == 2
+
+    # Different settings do not reuse previous files
+    exported.clear()
+    export_to_parquet(_cfg(db_uri, out, columns=["id", "chromosome", "position"]))  # noqa E501
+    assert len(exported) == 3
+    assert pq.read_schema(str(out / "chromosome=1" / "part-0.parquet")).names == ["id", "position"]  # noqa E501
+
+
+def test_export_runs_partitions_in_worker_processes(db_uri, tmp_path):
+    out = tmp_path / "out"
+    summary = export_to_parquet(_cfg(db_uri, out, workers=2))
+    assert summary["rows"] == 14
+    assert pq.read_metadata(str(out / "_metadata")).num_rows == 14
+
+
+def test_custom_sql_schema_is_sampled_and_unpartitioned_export_is_one_file(db_uri, tmp_path):  # noqa E501
+    out = tmp_path / "out"
+    cfg = ExportConfig(
+        db_uri=db_uri,
+        sql="SELECT id, ref, NULL AS empty FROM variants",
+        out_dir=str(out),
+    )
+    export_to_parquet(cfg)
+    table = pq.read_table(str(out / "part-0.parquet"))
+    assert table.num_rows == 14
+    assert table.schema.field("empty").type == pa.string()
+
+
+def test_partition_sql_binds_values_and_handles_null():
+    cfg = ExportConfig(db_uri="sqlite://", table="t", partition_by=["a", "b"], order_by="x")  # noqa E501
+    sql, params = exp.partition_sql(cfg, (1, None))
+    assert sql == "SELECT * FROM (SELECT * FROM t) AS p WHERE a = :p0 AND b IS NULL ORDER BY x"  # noqa E501
+    assert params == {"p0": 1}
+    assert exp.partition_dir("out", cfg, ("x/y", None)) == Path(
+        "out/a=x%2Fy/b=__HIVE_DEFAULT_PARTITION__"
+    )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import MetaData, create_engine, text
+
+from biofilter.modules.db.models.model_variants import (
+    map_variant_effect_predictions,
+    map_variant_masters,
+)
+from biofilter.modules.io import parquet_loader as loader
+from biofilter.modules.io.parquet_exporter import ExportConfig, export_to_parquet
+from biofilter.modules.io.parquet_loader import LoadConfig, load_from_parquet
+
+
+def _variant_db(path, with_rows=True):
+    uri = f"sqlite:///{path}"
+    engine = create_engine(uri, future=True)
+    metadata = MetaData()
+    vm = map_variant_masters(engine, metadata)
+    vep = map_variant_effect_predictions(engine, metadata)
+    metadata.create_all(engine)
+    if with_rows:
+        with engine.begin() as conn:
+            conn.execute(
+                vm.insert(),
+                [
+                    {"variant_id": 10 + i, "chromosome": chrom, "position_start": 100 + i, "position_end": 100 + i, "reference_allele": "A", "alternate_allele": "G", "af": 0.1, "etl_package_id": 1}  # noqa E501
+                    for i, chrom in enumerate([1, 1, 1, 2, 2])
+                ],
+            )
+            conn.execute(
+                vep.insert(),
+                [
+                    {"variant_id": 10 + i, "chromosome": chrom, "predictor_key": "cadd", "predictor_name": "CADD", "score": float(i)}  # noqa E501
+                    for i, chrom in enumerate([1, 1, 1, 2, 2])
+                ],
+            )
+    engine.dispose()
+    return uri
+
+
+def _export(uri, table, out_dir):
+    export_to_parquet(
+        ExportConfig(
+            db_uri=uri,
+            table=table,
+            out_dir=str(out_dir),
+            partition_by=["chromosome"],
+            compression="snappy",
+        )
+    )
+
+
+def _rows(uri, sql):
+    engine = create_engine(uri, future=True)
+    with engine.connect() as conn:
+        rows = conn.execute(text(sql)).all()
+    engine.dispose()
+    return [tuple(r) for r in rows]
+
+
+def test_load_restores_exported_partitions_and_is_idempotent(tmp_path):
+    src = _variant_db(tmp_path / "src.db")
+    dst = _variant_db(tmp_path / "dst.db", with_rows=False)
+    for table in ("variant_masters", "variant_effect_predictions"):
+        _export(src, table, tmp_path / table)
+
+    summary = load_from_parquet(
+        LoadConfig(db_uri=dst, in_dir=str(tmp_path / "variant_masters"), table="variant_masters", batch_rows=2)  # noqa E501
+    )
+    assert summary["rows"] == 5 and summary["merged"] == 5
+    assert [(p["partition"], p["rows"]) for p in sorted(summary["partitions"], key=lambda p: p["partition"]["chromosome"])] == [  # noqa E501
+        ({"chromosome": "1"}, 3),
+        ({"chromosome": "2"}, 2),
+    ]
+    assert all(p["rows_per_second"] > 0 for p in summary["partitions"])
+
+    sql = "SELECT variant_id, chromosome, position_start, af FROM variant_masters ORDER BY variant_id"  # noqa E501
+    assert _rows(dst, sql) == _rows(src, sql)
+
+    # Re-running merges nothing: ON CONFLICT on the natural key
+    again = load_from_parquet(
+        LoadConfig(db_uri=dst, in_dir=str(tmp_path / "variant_masters"), table="variant_masters")  # noqa E501
+    )
+    assert again["rows"] == 5 and again["merged"] == 0
+
+    load_from_parquet(
+        LoadConfig(db_uri=dst, in_dir=str(tmp_path / "variant_effect_predictions"), table="variant_effect_predictions")  # noqa E501
+    )
+    sql = "SELECT chromosome, variant_id, predictor_key, score FROM variant_effect_predictions ORDER BY variant_id"  # noqa E501
+    assert _rows(dst, sql) == _rows(src, sql)
+
+
+def test_on_conflict_update_overwrites_and_plain_files_are_one_partition(tmp_path):  # noqa E501
+    dst = _variant_db(tmp_path / "dst.db")
+    # DTP transform output: plain files, chromosome kept as a column
+    out = tmp_path / "transform"
+    out.mkdir()
+    pq.write_table(
+        pa.table(
+            {
+                "chromosome": [1, 2],
+                "variant_id": [10, 13],
+                "predictor_key": ["cadd", "cadd"],
+                "predictor_name": ["CADD", "CADD"],
+                "score": [9.5, 8.5],
+                "helper_column": ["x", "y"],
+            }
+        ),
+        str(out / "chunk_000.parquet"),
+    )
+    assert [v for v, _ in loader.discover_dataset(str(out))] == [{}]
+
+    summary = load_from_parquet(
+        LoadConfig(db_uri=dst, in_dir=str(out), table="variant_effect_predictions", on_conflict="update")  # noqa E501
+    )
+    assert summary["merged"] == 2
+    assert _rows(dst, "SELECT variant_id, score FROM variant_effect_predictions WHERE variant_id IN (10, 13) ORDER BY variant_id") == [  # noqa E501
+        (10, 9.5),
+        (13, 8.5),
+    ]
+
+
+def test_merge_sql_and_partition_bounds_for_postgres():
+    sql = loader.merge_sql(
+        "variant_masters_chr_22",
+        "variant_masters",
+        ["chromosome", "position_start", "position_end", "reference_allele", "alternate_allele", "af"],  # noqa E501
+        loader.CONFLICT_KEYS["variant_masters"],
+        "update",
+        "postgresql",
+    )
+    assert sql.startswith("INSERT INTO variant_masters_chr_22 (variant_id, chromosome,")  # noqa E501
+    assert "nextval(pg_get_serial_sequence('variant_masters', 'variant_id'))" in sql  # noqa E501
+    assert "DISTINCT ON (chromosome, position_start" in sql
+    assert "alternate_allele, stage_seq DESC) AS s" in sql
+    assert sql.endswith("DO UPDATE SET af = EXCLUDED.af")
+
+    sql = loader.merge_sql(
+        "variant_masters_chr_22",
+        "variant_masters",
+        ["chromosome", "position_start", "position_end", "reference_allele", "alternate_allele", "af"],  # noqa E501
+        loader.CONFLICT_KEYS["variant_masters"],
+        "nothing",
+        "postgresql",
+    )
+    assert "alternate_allele, stage_seq ASC) AS s" in sql
+    assert sql.endswith("DO NOTHING")
+
+    assert loader._bound_values("FOR VALUES IN (22)") == ["22"]
+    assert loader._bound_values("FOR VALUES IN ('X', 'Y')") == ["X", "Y"]
+    assert loader._bound_values("DEFAULT") == []
+
+    with pytest.raises(ValueError):
+        loader.load_from_parquet(
+            LoadConfig(db_uri="sqlite://", in_dir=".", table="t", on_conflict="replace")  # noqa E501
+        )
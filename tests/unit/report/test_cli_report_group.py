@@ -61,6 +61,15 @@ class FakeReportFacade:
             raise self.run_error
         return self.run_result
 
+    def run_to_sink(self, identifier, output, fmt=None, **kwargs):
+        self.calls.append(
+            (
+                "run_to_sink",
+                {"identifier": identifier, "output": output, "fmt": fmt, "kwargs": kwargs},  # noqa E501
+            )
+        )
+        return {"output": output, "format": fmt, "rows": 1234, "chunks": 3}
+
 
 def _patch_biofilter(monkeypatch, facade, capture):
     class FakeBiofilter:
@@ -559,3 +568,81 @@ def test_report_run_invalid_name_prints_friendly_error_without_traceback(monkeyp
     assert "etl_status" in result.output
     assert "biofilter report list" in result.output
     assert "Traceback" not in result.output
+
+
+def test_report_run_stream_writes_through_sink(monkeypatch, tmp_path):
+    runner = CliRunner()
+    facade = FakeReportFacade()
+    _patch_biofilter(monkeypatch, facade, {})
+
+    out_file = tmp_path / "report.parquet"
+    result = runner.invoke(
+        report_cli_mod.report,
+        [
+            "run",
+            "--db-uri",
+            "sqlite:///test.db",
+            "--name",
+            "gene_to_variant_filtering",
+            "--output",
+            str(out_file),
+            "--stream",
+            "--param",
+            "gene_symbols=TP53",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Report streamed to" in result.output
+    assert "1,234 rows in 3 chunk(s)" in result.output
+    assert not any(name == "run" for name, _ in facade.calls)
+    sink_call = [payload for name, payload in facade.calls if name == "run_to_sink"][-1]  # noqa E501
+    assert sink_call == {
+        "identifier": "gene_to_variant_filtering",
+        "output": str(out_file),
+        "fmt": "parquet",
+        "kwargs": {"gene_symbols": "TP53"},
+    }
+
+
+def test_report_run_format_parquet_without_stream_writes_file(monkeypatch, tmp_path):
+    import pandas as pd
+
+    runner = CliRunner()
+    facade = FakeReportFacade()
+    facade.run_result = pd.DataFrame({"col_a": [1, 2]})
+    _patch_biofilter(monkeypatch, facade, {})
+
+    out_file = tmp_path / "report.bin"
+    result = runner.invoke(
+        report_cli_mod.report,
+        [
+            "run",
+            "--db-uri",
+            "sqlite:///test.db",
+            "--name",
+            "etl_status",
+            "--output",
+            str(out_file),
+            "--format",
+            "parquet",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert pd.read_parquet(out_file)["col_a"].tolist() == [1, 2]
+
+
+def test_report_run_stream_requires_output(monkeypatch):
+    runner = CliRunner()
+    facade = FakeReportFacade()
+    _patch_biofilter(monkeypatch, facade, {})
+
+    result = runner.invoke(
+        report_cli_mod.report,
+        ["run", "--db-uri", "sqlite:///test.db", "--name", "etl_status", "--stream"],
+    )
+
+    assert result.exit_code != 0
+    assert "require --output" in result.output
+    assert facade.calls == []
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.base import Base
+from biofilter.modules.db.models import (
+    Entity,
+    EntityAlias,
+    EntityGroup,
+    EntityLocation,
+    ETLPackage,
+    GenomeAssembly,
+)
+from biofilter.modules.report.gene_interval_index import (
+    GeneIntervalIndex,
+    clear_gene_interval_cache,
+    load_gene_interval_index,
+)
+
+
+def _brute_force(records, chrom, start, end):
+    return sorted(
+        r["entity_id"]
+        for r in records
+        if r["chromosome"] == chrom
+        and min(r["start_pos"], r["end_pos"]) <= end
+        and max(r["start_pos"], r["end_pos"]) >= start
+    )
+
+
+def _random_records(rng, n=300):
+    return [
+        {
+            "entity_id": i + 1,
+            "chromosome": int(rng.integers(1, 4)),
+            "start_pos": int(s),
+            "end_pos": int(s + rng.integers(0, 5000)),
+        }
+        for i, s in enumerate(rng.integers(1, 100_000, size=n))
+    ]
+
+
+def test_overlaps_match_brute_force_including_nested_intervals():
+    rng = np.random.default_rng(11)
+    records = _random_records(rng)
+    # A long gene spanning many short ones must not hide them
+    records.append({"entity_id": 999, "chromosome": 1, "start_pos": 1, "end_pos": 100_000})  # noqa E501
+    index = GeneIntervalIndex.from_records(records)
+
+    queries = [
+        (int(c), int(s), int(s + w))
+        for c, s, w in zip(
+            rng.integers(1, 5, size=200),
+            rng.integers(1, 105_000, size=200),
+            rng.integers(0, 3000, size=200),
+        )
+    ]
+    for chrom, start, end in queries:
+        rows = index.overlaps(chrom, start, end)
+        assert sorted(index.entity_id[rows].tolist()) == _brute_force(records, chrom, start, end)  # noqa E501
+
+    query_idx, rows = index.overlaps_batch(*zip(*queries))
+    for i, (chrom, start, end) in enumerate(queries):
+        got = sorted(index.entity_id[rows[query_idx == i]].tolist())
+        assert got == _brute_force(records, chrom, start, end)
+
+
+def test_reversed_coordinates_and_unknown_chromosomes():
+    index = GeneIntervalIndex.from_records(
+        [{"entity_id": 1, "chromosome": 7, "start_pos": 500, "end_pos": 100}]
+    )
+
+    assert index.record(0)["start_pos"] == 100
+    assert index.entity_id[index.overlaps(7, 300, 300)].tolist() == [1]
+    assert index.overlaps(8, 300, 300).tolist() == []
+    assert index.chromosomes == [7]
+
+
+def test_nearest_prefers_containing_then_closest_then_shortest():
+    index = GeneIntervalIndex.from_records(
+        [
+            {"entity_id": 1, "chromosome": 1, "start_pos": 100, "end_pos": 1000},
+            {"entity_id": 2, "chromosome": 1, "start_pos": 400, "end_pos": 600},
+            {"entity_id": 3, "chromosome": 1, "start_pos": 2000, "end_pos": 2100},
+            {"entity_id": 4, "chromosome": 1, "start_pos": 1300, "end_pos": 1400},
+        ]
+    )
+
+    rows, dist = index.nearest([1, 1, 1, 1], [500, 1100, 1150, 5000], max_distance=200)  # noqa E501
+
+    # 1150 is 150 bp from genes 1 and 4: the shorter gene wins the tie
+    assert index.entity_id[rows[:3]].tolist() == [2, 1, 4]
+    assert dist.tolist() == [0, 100, 150, -1]
+    assert rows[3] == -1
+
+    rows, _ = index.nearest([1], [1100], max_distance=0)
+    assert rows.tolist() == [-1]
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, future=True)()
+
+    session.add_all(
+        [
+            GenomeAssembly(id=1, accession="NC_000001.11", assembly_name="GRCh38.p14", chromosome="1"),  # noqa E501
+            GenomeAssembly(id=2, accession="NC_000001.10", assembly_name="GRCh37.p13", chromosome="1"),  # noqa E501
+        ]
+    )
+    genes = EntityGroup(name="Genes")
+    session.add(genes)
+    session.flush()
+    gene = Entity(group_id=genes.id, is_active=True)
+    session.add(gene)
+    session.flush()
+    session.add_all(
+        [
+            EntityAlias(
+                entity_id=gene.id,
+                group_id=genes.id,
+                alias_value="TP53",
+                alias_norm="tp53",
+                alias_type="preferred",
+                is_primary=True,
+            ),
+            EntityLocation(
+                entity_id=gene.id,
+                entity_group_id=genes.id,
+                assembly_id=1,
+                build=38,
+                chromosome=1,
+                start_pos=100,
+                end_pos=200,
+            ),
+            EntityLocation(
+                entity_id=gene.id,
+                entity_group_id=genes.id,
+                assembly_id=2,
+                build=37,
+                chromosome=1,
+                start_pos=900,
+                end_pos=950,
+            ),
+        ]
+    )
+    session.commit()
+    return session, genes, gene
+
+
+def test_load_filters_by_build_and_group_and_caches_per_etl_state():
+    clear_gene_interval_cache()
+    session, genes, gene = _session()
+
+    index = load_gene_interval_index(session, build=38, group_ids=[genes.id])
+    assert index.records(index.overlaps(1, 150, 150)) == [
+        {
+            "entity_id": gene.id,
+            "group_name": "Genes",
+            "primary_name": "TP53",
+            "chromosome": 1,
+            "start_pos": 100,
+            "end_pos": 200,
+        }
+    ]
+    assert len(load_gene_interval_index(session, build=38, group_ids=[genes.id + 1])) == 0  # noqa E501
+    assert load_gene_interval_index(session, build=38, group_ids=[genes.id]) is index  # noqa E501
+
+    # A new ETL package (load or rollback) invalidates the cached index
+    other = Entity(group_id=genes.id, is_active=True)
+    session.add(other)
+    session.flush()
+    session.add(
+        EntityLocation(
+            entity_id=other.id,
+            entity_group_id=genes.id,
+            assembly_id=1,
+            build=38,
+            chromosome=1,
+            start_pos=5000,
+            end_pos=6000,
+        )
+    )
+    session.add(ETLPackage(data_source_id=1))
+    session.commit()
+
+    refreshed = load_gene_interval_index(session, build=38, group_ids=[genes.id])
+    assert refreshed is not index
+    assert len(refreshed) == 2
+    session.close()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import random
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from biofilter.modules.report.pair_engine import (
+    PairChunkWriter,
+    count_cartesian_pairs,
+    count_cross_pairs,
+    count_triu_pairs,
+    iter_cartesian_blocks,
+    iter_triu_blocks,
+)
+
+
+def test_count_cross_pairs_matches_dedup_loop_with_shared_variants():
+    rng = random.Random(3)
+    for _ in range(200):
+        a = set(rng.sample(range(20), rng.randint(0, 10)))
+        b = set(rng.sample(range(20), rng.randint(0, 10)))
+        seeds = set(rng.sample(range(20), rng.randint(0, 8)))
+
+        seen, expected = set(), [0, 0, 0]
+        for x, y in product(a, b):
+            key = (min(x, y), max(x, y))
+            if x == y or key in seen:
+                continue
+            seen.add(key)
+            expected[(x in seeds) + (y in seeds)] += 1
+
+        assert count_cross_pairs(a, b, seeds) == expected
+
+
+def test_triu_and_cartesian_counts_exclude_same_key_pairs():
+    keys = pd.Series(["A", "A", "B", None, None])
+    assert count_triu_pairs(5) == 10
+    # A-A is the only same-key pair; nulls never match
+    assert count_triu_pairs(5, keys) == 9
+    assert count_cartesian_pairs(
+        3, 2, pd.Series(["A", "A", "B"]), pd.Series(["A", None])
+    ) == 4
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 4, 1000])
+def test_blocks_cover_all_pairs_in_order_with_bounded_size(chunk_rows):
+    blocks = list(iter_triu_blocks(9, chunk_rows))
+    idx_a = np.concatenate([a for a, _ in blocks])
+    idx_b = np.concatenate([b for _, b in blocks])
+    expected_a, expected_b = np.triu_indices(9, k=1)
+    assert idx_a.tolist() == expected_a.tolist()
+    assert idx_b.tolist() == expected_b.tolist()
+    # A block only exceeds chunk_rows when a single row has more pairs
+    assert all(len(a) <= max(chunk_rows, 8) for a, _ in blocks)
+
+    cart = list(iter_cartesian_blocks(4, 3, chunk_rows))
+    pairs = [
+        (int(x), int(y)) for a, b in cart for x, y in zip(a, b)
+    ]
+    assert pairs == list(product(range(4), range(3)))
+    assert list(iter_cartesian_blocks(0, 3)) == []
+
+
+def test_chunk_writer_keeps_one_schema_across_chunks(tmp_path):
+    writer = PairChunkWriter(
+        tmp_path / "pairs", prefix="pairs", dtypes={"id": "Int64", "name": "string"}
+    )
+    writer.write(pd.DataFrame({"id": [1, 2], "name": [None, None]}))
+    writer.write(pd.DataFrame({"id": [None], "name": ["x"]}))
+    writer.write(pd.DataFrame(columns=["id", "name"]))
+    manifest = writer.close(estimated_pairs=3)
+
+    assert manifest["rows"] == 3
+    assert [f["file"] for f in manifest["files"]] == [
+        "pairs-00000.parquet",
+        "pairs-00001.parquet",
+    ]
+    assert json.loads((tmp_path / "pairs" / "_pairs_manifest.json").read_text()) == manifest  # noqa E501
+    df = pd.read_parquet(tmp_path / "pairs")
+    assert df["name"].tolist()[-1] == "x"
+    assert len(df) == 3
+
+    with pytest.raises(ValueError):
+        PairChunkWriter(tmp_path / "bad", output_format="xlsx")
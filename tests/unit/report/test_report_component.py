@@ -63,6 +63,9 @@ def test_component_methods_delegate_to_manager(monkeypatch):
         def run(self, identifier, **kwargs):
             return ("run", identifier, kwargs)
 
+        def run_to_sink(self, identifier, output, fmt=None, **kwargs):
+            return ("run_to_sink", identifier, output, fmt, kwargs)
+
         def run_example(self, identifier, **kwargs):
             return ("run_example", identifier, kwargs)
 
@@ -78,6 +81,13 @@ def test_component_methods_delegate_to_manager(monkeypatch):
     assert comp.example_input("etl_status") == {"id": "etl_status"}
     assert comp.available_columns("etl_status") == ["a", "etl_status"]
     assert comp.run("etl_status", p=1) == ("run", "etl_status", {"p": 1})
+    assert comp.run_to_sink("etl_status", "out.parquet", p=1) == (
+        "run_to_sink",
+        "etl_status",
+        "out.parquet",
+        None,
+        {"p": 1},
+    )
     assert comp.run_example("etl_status", p=2) == (
         "run_example",
         "etl_status",
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pandas as pd
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from biofilter.modules.db.base import Base
 from biofilter.modules.db.models import Entity, EntityAlias, EntityGroup
+from biofilter.modules.etl.alias_search_index import refresh_alias_search_index
 from biofilter.modules.report.reports.report_entity_filter import EntityFilterReport
 
 
@@ -252,6 +254,33 @@ def test_entity_filter_fuzzy_mode_adds_similarity_score_column():
     assert all(matched["similarity_score"] >= 60)
 
 
+
+def test_entity_filter_fuzzy_mode_same_results_with_alias_search_index():
+    pytest.importorskip("rapidfuzz")
+
+    engine = _make_engine()
+    Session = sessionmaker(bind=engine, future=True)
+    params = dict(
+        input_data=["MAPK signalling pathway", "apoptosis", "BRAC1", "zzz"],
+        match_mode="fuzzy",
+        similarity_threshold=60,
+    )
+
+    with Session() as session:
+        _seed_entities(session)
+        _seed_pathways(session)
+        scanned = _report(session, **params).run()
+
+        refresh_alias_search_index(session.connection())
+        session.commit()
+        indexed = _report(session, **params).run()
+        grouped = _report(session, group_filter="Gene", **params).run()
+
+    pd.testing.assert_frame_equal(scanned, indexed)
+    assert "BRCA1" in indexed["primary_name"].tolist()
+    # Index candidates are still restricted to the requested group
+    assert set(grouped["group_name"].dropna()) == {"Gene"}
+
 def test_entity_filter_group_filter_restricts_results():
     engine = _make_engine()
     Session = sessionmaker(bind=engine, future=True)
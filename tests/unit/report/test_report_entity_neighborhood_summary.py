@@ -15,6 +15,7 @@ from biofilter.modules.db.models import (
     EntityRelationship,
     EntityRelationshipType,
 )
+from biofilter.modules.etl.alias_search_index import refresh_alias_search_index
 from biofilter.modules.report.reports.report_entity_neighborhood_summary import (  # noqa: E501
     EntityNeighborhoodSummaryReport,
 )
@@ -348,6 +349,28 @@ def test_fuzzy_mode_resolves_with_score():
     assert df.iloc[0]["Resolve Score"] >= 70
 
 
+def test_fuzzy_mode_uses_alias_search_index_with_same_result():
+    pytest.importorskip("rapidfuzz")
+    engine = _make_engine()
+    Session = sessionmaker(bind=engine, future=True)
+
+    with Session() as session:
+        _seed_basic_graph(session)
+        params = dict(
+            items=["pathway:DNA repare", "DNA repare"],
+            match_mode="fuzzy",
+            similarity_threshold=70,
+        )
+        scanned = _report(session, **params).run()
+
+        refresh_alias_search_index(session.connection())
+        indexed = _report(session, **params).run()
+
+    assert len(indexed) >= 2
+    assert indexed.equals(scanned)
+    assert set(indexed["Primary Alias"]) == {"DNA repair"}
+
+
 def test_dynamic_neighbor_columns_include_all_groups():
     engine = _make_engine()
     Session = sessionmaker(bind=engine, future=True)
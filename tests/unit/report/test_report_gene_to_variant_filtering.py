@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.models.model_variants import (
+    map_variant_effect_predictions,
+    map_variant_masters,
+    map_variant_molecular_effects,
+)
+from biofilter.modules.etl.predictor_summary import refresh_predictor_summary
+from biofilter.modules.report.reports.report_gene_to_variant_filtering import (
+    GeneToVariantFilteringReport,
+)
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append((level, message))
+
+
+GENES = {10: "GENE_A", 20: "GENE_B", 30: "GENE_C"}
+LOCI = {
+    10: {"chromosome": 1, "start_pos": 100, "end_pos": 200},
+    20: {"chromosome": 2, "start_pos": 100, "end_pos": 300},
+    30: {"chromosome": 1, "start_pos": 150, "end_pos": 400},
+}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # File-backed so worker connections see the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'g2v.db'}", future=True)
+    metadata = MetaData()
+    vm = map_variant_masters(engine, metadata)
+    vme = map_variant_molecular_effects(engine, metadata)
+    vep = map_variant_effect_predictions(engine, metadata)
+    metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        vid = 0
+        for chrom in (1, 2):
+            for pos in range(110, 420, 40):
+                vid += 1
+                conn.execute(vm.insert(), dict(
+                    variant_id=vid, chromosome=chrom, position_start=pos,
+                    position_end=pos, reference_allele="A", alternate_allele="G",
+                    af=0.01 * vid,
+                ))
+                for t in range(2):
+                    conn.execute(vme.insert(), dict(
+                        variant_id=vid, chromosome=chrom, variant_key=f"k{vid}",
+                        transcript_id=f"ENST{t}", consequence_id=1 + t,
+                        impact_id=1, is_most_severe_for_variant=True,
+                    ))
+                if vid % 3 == 0:
+                    conn.execute(vep.insert(), dict(
+                        variant_id=vid, chromosome=chrom, predictor_key="alphamissense",  # noqa E501
+                        predictor_name="AlphaMissense", score=0.5,
+                        classification="ambiguous",
+                    ))
+
+    yield sessionmaker(bind=engine, future=True)
+    engine.dispose()
+
+
+def _report(session, monkeypatch, **params):
+    report = GeneToVariantFilteringReport(
+        session=session,
+        db=object(),
+        logger=DummyLogger(),
+        gene_symbols=list(GENES.values()),
+        **params,
+    )
+    monkeypatch.setattr(report, "_resolve_gene_symbols", lambda symbols: GENES)
+    monkeypatch.setattr(report, "resolve_assembly_map", lambda build: {"1": 1})
+    monkeypatch.setattr(report, "_resolve_gene_loci", lambda *a: LOCI)
+    monkeypatch.setattr(report, "_build_consequence_labels", lambda: {})
+    monkeypatch.setattr(report, "_build_impact_labels", lambda: {1: "HIGH"})
+    return report
+
+
+def test_parallel_chromosomes_matches_sequential_output(session_factory, monkeypatch):
+    with session_factory() as session:
+        sequential = _report(session, monkeypatch).run()
+
+    with session_factory() as session:
+        report = _report(session, monkeypatch, parallel_chromosomes=2)
+        monkeypatch.setattr(report, "_supports_parallel_chromosomes", lambda: True)
+        chunks = list(report.iter_chunks())
+        assert [c["chromosome"].unique().tolist() for c in chunks] == [[1], [2]]
+        assert any("on 2 connections" in m for _, m in report.logger.messages)
+
+    with session_factory() as session:
+        report = _report(session, monkeypatch, parallel_chromosomes=True)
+        monkeypatch.setattr(report, "_supports_parallel_chromosomes", lambda: True)
+        parallel = report.run()
+
+    assert len(sequential) == 15  # 3 + 7 on chr1 (GENE_A/GENE_C overlap), 5 on chr2
+    assert set(sequential["gene_symbol"]) == set(GENES.values())
+    pd.testing.assert_frame_equal(sequential, parallel)
+
+
+def test_parallel_chromosomes_falls_back_outside_postgres(session_factory, monkeypatch):
+    with session_factory() as session:
+        report = _report(session, monkeypatch, parallel_chromosomes=4)
+        out = report.run()
+
+    assert len(out) == 15
+    assert any(
+        level == "WARNING" and "only used on PostgreSQL" in msg
+        for level, msg in report.logger.messages
+    )
+
+
+def test_alphamissense_columns_come_from_predictor_summary(session_factory, monkeypatch):
+    with session_factory() as session:
+        report = _report(session, monkeypatch)
+        raw = report.run()
+    assert any("aggregating AlphaMissense" in m for _, m in report.logger.messages)
+
+    with session_factory() as session:
+        refresh_predictor_summary(session.connection())
+        session.commit()
+
+    with session_factory() as session:
+        report = _report(session, monkeypatch)
+        summarized = report.run()
+    assert not any("aggregating AlphaMissense" in m for _, m in report.logger.messages)
+
+    pd.testing.assert_frame_equal(raw, summarized)
+    scored = summarized.dropna(subset=["alphamissense_score"])
+    assert sorted(scored["variant_id"].unique().tolist()) == [3, 6, 9, 12]
+    assert set(scored["alphamissense_classification"]) == {"ambiguous"}
@@ -73,6 +73,29 @@ def test_index_builds_sorted_cache_and_list_reports(monkeypatch):
     assert listed[1]["module"] == "report_b"
 
 
+def test_index_is_read_from_registry_manifest_by_next_manager(monkeypatch):
+    class AReport(ReportBase):
+        name = "A Report"
+        description = "aaa"
+
+    first = _manager_with(DummySession())
+    monkeypatch.setattr(first, "iter_modules", lambda: iter(["report_a"]))
+    monkeypatch.setattr(first, "_load_class", lambda module_name: AReport)
+    assert [x.name for x in first.index()] == ["A Report"]
+
+    # A new process (new manager) lists reports without importing them
+    second = _manager_with(DummySession())
+    monkeypatch.setattr(second, "iter_modules", lambda: iter(["report_a"]))
+
+    def no_import(module_name):
+        raise AssertionError("report module imported")
+
+    monkeypatch.setattr(second, "_load_class", no_import)
+    assert second.list_reports() == [
+        {"module": "report_a", "name": "A Report", "description": "aaa"}
+    ]
+
+
 def test_refresh_clears_caches():
     session = DummySession()
     manager = _manager_with(session)
@@ -260,3 +283,41 @@ def test_explain_falls_back_to_class_when_guide_missing(monkeypatch, tmp_path):
 
     out = manager.explain("alpha")
     assert out == "Class explain fallback"
+
+
+def test_run_to_sink_streams_chunks_and_falls_back_to_run(monkeypatch, tmp_path):
+    import pandas as pd
+
+    session = DummySession()
+    manager = _manager_with(session)
+
+    class ChunkedReport:
+        name = "chunked"
+
+        def run(self):
+            raise AssertionError("run() should not be called when streaming")
+
+        def iter_chunks(self):
+            yield pd.DataFrame({"chrom": [1, 1], "pos": [10, 20]})
+            yield pd.DataFrame({"chrom": [2], "pos": [5]})
+
+    class PlainReport(ReportBase):
+        def __init__(self):
+            pass
+
+        def run(self):
+            return pd.DataFrame({"chrom": [3], "pos": [7]})
+
+    monkeypatch.setattr(manager, "get", lambda *a, **k: ChunkedReport())
+    out = tmp_path / "chunked.parquet"
+    summary = manager.run_to_sink("alpha", out)
+
+    assert summary == {"output": str(out), "format": "parquet", "rows": 3, "chunks": 2}  # noqa E501
+    assert pd.read_parquet(out)["pos"].tolist() == [10, 20, 5]
+    assert session.rollback_calls == 1
+
+    monkeypatch.setattr(manager, "get", lambda *a, **k: PlainReport())
+    summary = manager.run_to_sink("alpha", tmp_path / "plain.out", fmt="csv")
+
+    assert summary["chunks"] == 1
+    assert (tmp_path / "plain.out").read_text() == "chrom,pos\n3,7\n"
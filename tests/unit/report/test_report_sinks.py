@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from biofilter.modules.report.report_sinks import (
+    ArrowIpcSink,
+    CsvSink,
+    ParquetSink,
+    infer_sink_format,
+    open_sink,
+)
+
+
+def _chunks():
+    return [
+        pd.DataFrame({"gene": ["A", "B"], "score": [1.5, 2.0], "note": [None, None]}),
+        pd.DataFrame(columns=["gene", "score", "note"]),
+        pd.DataFrame({"gene": ["C"], "score": [None], "note": ["x"]}),
+    ]
+
+
+@pytest.mark.parametrize(
+    "fmt,reader",
+    [
+        ("csv", pd.read_csv),
+        ("parquet", pd.read_parquet),
+        ("arrow", lambda p: pa.ipc.open_file(p).read_all().to_pandas()),
+    ],
+)
+def test_sinks_write_chunks_to_one_file(tmp_path, fmt, reader):
+    path = tmp_path / f"out.{fmt}"
+    with open_sink(path, fmt) as sink:
+        for chunk in _chunks():
+            sink.write(chunk)
+
+    assert (sink.rows, sink.chunks) == (3, 2)
+    assert not (tmp_path / f"out.{fmt}.partial").exists()
+    df = reader(path)
+    assert df["gene"].tolist() == ["A", "B", "C"]
+    assert df["note"].tolist()[-1] == "x"
+    assert pd.isna(df["score"].tolist()[-1])
+
+
+def test_arrow_sinks_keep_first_schema_and_reject_incompatible_chunks(tmp_path):
+    sink = ParquetSink(tmp_path / "out.parquet")
+    sink.write(pd.DataFrame({"id": [1, 2], "label": [None, None]}))
+    with pytest.raises(ValueError, match="schema"):
+        sink.write(pd.DataFrame({"id": ["not-an-int"], "label": ["a"]}))
+    with pytest.raises(ValueError, match="columns"):
+        sink.write(pd.DataFrame({"other": [1]}))
+    sink.close()
+
+    schema = pq.read_schema(tmp_path / "out.parquet")
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("label").type == pa.string()
+
+
+def test_empty_report_still_writes_columns_and_abort_removes_partial(tmp_path):
+    with CsvSink(tmp_path / "empty.csv") as sink:
+        sink.write(pd.DataFrame(columns=["a", "b"]))
+    assert (tmp_path / "empty.csv").read_text() == "a,b\n"
+
+    with pytest.raises(RuntimeError):
+        with ArrowIpcSink(tmp_path / "broken.arrow") as sink:
+            sink.write(pd.DataFrame({"a": [1]}))
+            raise RuntimeError("boom")
+    assert list(tmp_path.glob("broken.arrow*")) == []
+
+
+def test_format_is_inferred_from_suffix_and_validated(tmp_path):
+    assert infer_sink_format("x.parquet") == "parquet"
+    assert infer_sink_format("x.feather") == "arrow"
+    assert infer_sink_format("x.tsv") == "csv"
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        open_sink(tmp_path / "x.csv", "xlsx")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pandas as pd
 import pytest
 from sqlalchemy import (
     BigInteger,
@@ -542,6 +543,62 @@ def test_disable_variant_expansion_for_expanded_genes_removes_snp_pairs():
     assert len(snp_rows) == 0
 
 
+def test_pair_estimate_and_max_pairs_guard_skip_snp_expansion():
+    params = dict(
+        input_data=["chr17:150"],
+        group_entity_groups=["Pathway"],
+        relationship_types=["in_pathway"],
+    )
+    session, vm = _make_session()
+    with session:
+        _seed(session)
+        _seed_variants(session, vm)
+
+        estimate = _report(session, estimate_pairs_only=True, **params).run()
+        guarded = _report(session, max_pairs=1, **params).run()
+
+    for df in (estimate, guarded):
+        assert len(df[df["row_type"] == "gene_pair"]) == 2
+        assert len(df[df["row_type"] == "snp_pair"]) == 0
+
+    summary = estimate[estimate["row_type"] == "summary"].iloc[0]
+    assert summary["observation"] == "pair_estimate"
+    assert summary["note"] == "Exact SNP-SNP pair count: 2."
+    summary = guarded[guarded["row_type"] == "summary"].iloc[0]
+    assert summary["observation"] == "pair_limit_exceeded"
+
+
+def test_snp_pairs_stream_to_part_files(tmp_path):
+    params = dict(
+        input_data=["chr17:150"],
+        group_entity_groups=["Pathway"],
+        relationship_types=["in_pathway"],
+    )
+    session, vm = _make_session()
+    with session:
+        _seed(session)
+        _seed_variants(session, vm)
+
+        in_memory = _report(session, **params).run()
+        df = _report(
+            session, output_path=str(tmp_path / "pairs"), chunk_rows=1, **params
+        ).run()
+
+    assert len(df[df["row_type"] == "snp_pair"]) == 0
+    assert df[df["row_type"] == "summary"]["observation"].tolist() == ["written"]
+
+    streamed = pd.read_parquet(tmp_path / "pairs")
+    assert sorted(p.name for p in (tmp_path / "pairs").glob("*.parquet")) == [
+        "snp_pairs-00000.parquet",
+        "snp_pairs-00001.parquet",
+    ]
+    expected = in_memory[in_memory["row_type"] == "snp_pair"]
+    assert sorted(streamed["variant_2_rsid"].tolist()) == sorted(
+        expected["variant_2_rsid"].tolist()
+    )
+    assert list(streamed.columns) == list(expected.columns)
+
+
 def test_invalid_and_not_found_inputs_are_reported():
     session, vm = _make_session()
     with session:
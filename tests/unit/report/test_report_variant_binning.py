@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("cyvcf2")
+
+from biofilter.modules.report.gene_interval_index import GeneIntervalIndex  # noqa E402
+from biofilter.modules.report.reports.report_variant_binning import (  # noqa E402
+    VariantBinningReport,
+    _SampleBinCounts,
+)
+
+VCF_HEADER = """##fileformat=VCFv4.2
+##contig=<ID=1>
+##contig=<ID=2>
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tA\tB\tC\tD
+"""
+CHR1_RECORDS = """1\t120\trs1\tA\tC\t.\tPASS\t.\tGT\t0/1\t1/1\t0/0\t./.
+1\t160\trs2\tA\tG,T\t.\tPASS\t.\tGT\t0|2\t0/1\t0/0\t2/2
+1\t900\trs3\tA\tC\t.\tPASS\t.\tGT\t0/1\t0/0\t0/0\t0/0
+"""
+CHR2_RECORDS = """2\t110\trs4\tA\tC\t.\tPASS\t.\tGT\t0/0\t0/1\t1/1\t0/0
+"""
+VCF_TEXT = VCF_HEADER + CHR1_RECORDS
+
+
+class DummyLogger:
+    def log(self, message, level="INFO"):
+        pass
+
+
+def _genes(**kwargs):
+    index = GeneIntervalIndex.from_records(
+        [
+            {"entity_id": 2, "chromosome": 1, "start_pos": 150, "end_pos": 300, "primary_name": "G2"},  # noqa E501
+            {"entity_id": 1, "chromosome": 1, "start_pos": 100, "end_pos": 200, "primary_name": "G1"},  # noqa E501
+            {"entity_id": 3, "chromosome": 2, "start_pos": 100, "end_pos": 200, "primary_name": "G3"},  # noqa E501
+        ]
+    )
+    genes_by_row = [
+        {
+            "entity_id": int(index.entity_id[row]),
+            "start": int(index.start[row]),
+            "end": int(index.end[row]),
+            "symbol": index.primary_name[row],
+            "gene_groups": [],
+        }
+        for row in range(len(index))
+    ]
+    return index, genes_by_row, {}
+
+
+def _run(tmp_path, monkeypatch, out_name="out", vcf_path=None, **params):
+    if vcf_path is None:
+        vcf_path = tmp_path / "cohort.vcf"
+        vcf_path.write_text(VCF_TEXT)
+        vcf_path = str(vcf_path)
+    out = tmp_path / out_name
+
+    report = VariantBinningReport(
+        session=None,
+        db=SimpleNamespace(engine=None),
+        logger=DummyLogger(),
+        vcf_path=vcf_path,
+        output_dir=str(out),
+        group_by="gene",
+        maf_cutoff=0.5,
+        **params,
+    )
+    monkeypatch.setattr(report, "_load_gene_intervals", _genes)
+    report.run()
+    return out
+
+
+def test_sample_bin_counts_reduce_sums_duplicates_in_sorted_bin_order():
+    acc = _SampleBinCounts()
+    acc.add("B", np.array([0, 2]), np.array([1, 2], dtype=np.int8))
+    acc.add("A", np.array([2]), np.array([1], dtype=np.int8))
+    acc.add("B", np.array([2]), np.array([1], dtype=np.int8))
+    acc.add("A", np.array([], dtype=np.int64), np.array([], dtype=np.int8))
+
+    samples, bins, alt, variants = acc.reduce(["A", "B"])
+
+    assert samples.tolist() == [0, 2, 2]
+    assert bins.tolist() == [1, 0, 1]
+    assert alt.tolist() == [1, 1, 3]
+    assert variants.tolist() == [1, 1, 2]
+
+
+def test_counts_per_sample_and_bin(tmp_path, monkeypatch):
+    out = _run(tmp_path, monkeypatch, include_zero_counts=False)
+
+    long_df = pd.read_csv(out / "sample_bin_long.csv")
+    assert list(zip(long_df.sample_id, long_df.bin_name, long_df.variant_count, long_df.alt_allele_count)) == [  # noqa E501
+        ("A", "G1", 2, 2),
+        ("A", "G2", 1, 1),
+        ("B", "G1", 2, 3),
+        ("B", "G2", 1, 1),
+        ("D", "G1", 1, 2),
+        ("D", "G2", 1, 2),
+    ]
+
+    matrix = pd.read_csv(out / "bin_counts.csv")
+    assert matrix.sample_id.tolist() == ["A", "B", "C", "D"]
+    assert matrix.G1.tolist() == [2, 3, 0, 2]
+
+    variants = pd.read_csv(out / "variant_to_bin.csv")
+    rs1 = variants[variants.variant_id_in_vcf == "rs1"].iloc[0]
+    assert (rs1.ac_overall, rs1.an_overall) == (3, 6)
+    alts = variants[(variants.variant_id_in_vcf == "rs2") & (variants.bin_name == "G2")]  # noqa E501
+    assert alts.alternate_allele.tolist() == ["G", "T"]
+    assert alts.ac_overall.tolist() == [1, 3]
+
+
+def test_case_control_counts_use_phenotype_classes(tmp_path, monkeypatch):
+    pheno = tmp_path / "pheno.tsv"
+    pheno.write_text("SampleID\tPhenotype\nA\t1\nB\t1\nC\t0\nD\t0\n")
+
+    out = _run(tmp_path, monkeypatch, phenotype_path=str(pheno))
+
+    variants = pd.read_csv(out / "variant_to_bin.csv")
+    rs1 = variants[variants.variant_id_in_vcf == "rs1"].iloc[0]
+    assert (rs1.ac_case, rs1.an_case, rs1.ac_control, rs1.an_control) == (3, 4, 0, 2)  # noqa E501
+    assert rs1.maf_case == pytest.approx(0.25)
+
+    long_df = pd.read_csv(out / "sample_bin_long.csv")
+    assert len(long_df) == 8  # 4 samples x 2 bins, zero rows included
+    c_row = long_df[(long_df.sample_id == "C") & (long_df.bin_name == "G1")].iloc[0]  # noqa E501
+    assert (c_row.sample_class, c_row.variant_count) == ("control", 0)
+
+
+def test_workers_merge_per_chromosome_files_like_a_serial_scan(tmp_path, monkeypatch):  # noqa E501
+    paths = []
+    for name, records in (("chr1.vcf", CHR1_RECORDS), ("chr2.vcf", CHR2_RECORDS)):  # noqa E501
+        path = tmp_path / name
+        path.write_text(VCF_HEADER + records)
+        paths.append(str(path))
+
+    serial = _run(tmp_path, monkeypatch, out_name="serial", vcf_path=paths)
+    parallel = _run(tmp_path, monkeypatch, out_name="parallel", vcf_path=paths, workers=2)  # noqa E501
+
+    for artifact in ("variant_to_bin.csv", "sample_bin_long.csv", "bin_counts.csv"):  # noqa E501
+        assert (serial / artifact).read_bytes() == (parallel / artifact).read_bytes()  # noqa E501
+    assert sorted(p.name for p in parallel.iterdir()) == sorted(
+        p.name for p in serial.iterdir()
+    )
+    matrix = pd.read_csv(parallel / "bin_counts.csv")
+    assert matrix.G3.tolist() == [0, 1, 2, 0]
+
+
+def test_vcf_tasks_split_indexed_vcfs_into_regions(tmp_path, monkeypatch):
+    indexed = tmp_path / "cohort.vcf.gz"
+    (tmp_path / "cohort.vcf.gz.tbi").write_bytes(b"")
+    plain = tmp_path / "extra.vcf"
+
+    report = VariantBinningReport(
+        session=None, db=SimpleNamespace(engine=None), logger=DummyLogger()
+    )
+    monkeypatch.setattr(
+        report,
+        "_load_vcf",
+        lambda path: SimpleNamespace(
+            seqnames=["chr1", "chrUn_gl000220", "chr2"],
+            seqlens=[25, 10, 0],
+            close=lambda: None,
+        ),
+    )
+
+    tasks = report._vcf_tasks([str(indexed), str(plain)], workers=4, region_size=10)  # noqa E501
+
+    assert tasks == [
+        (str(indexed), ("chr1", 1, 10)),
+        (str(indexed), ("chr1", 11, 20)),
+        (str(indexed), ("chr1", 21, 25)),
+        (str(indexed), ("chr2", 1, None)),
+        (str(plain), None),
+    ]
+    assert report._vcf_tasks([str(indexed)], workers=1, region_size=10) == [
+        (str(indexed), None)
+    ]
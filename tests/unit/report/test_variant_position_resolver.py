@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from sqlalchemy import MetaData, create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from biofilter.modules.db.models.model_variants import map_variant_masters
+from biofilter.modules.report.variant_position_resolver import (
+    resolve_variants_at_positions,
+)
+
+
+def _session_with_variants():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    metadata = MetaData()
+    vm = map_variant_masters(engine, metadata)
+    metadata.create_all(engine)
+    session = sessionmaker(bind=engine, future=True)()
+
+    rows = [
+        (1, 1, 100, 100, "A", "G", "rs1", "SNV"),
+        (2, 1, 100, 100, "A", "T", "rs1", "SNV"),
+        (3, 1, 95, 105, "ACGT", "A", "rs2", "DEL"),
+        (4, 1, 300, 300, "C", "T", None, "snv"),
+        (5, 2, 100, 100, "G", "C", "rs5", "SNV"),
+    ]
+    session.execute(
+        vm.insert(),
+        [
+            {
+                "variant_id": vid,
+                "chromosome": chrom,
+                "position_start": start,
+                "position_end": end,
+                "reference_allele": ref,
+                "alternate_allele": alt,
+                "rsid": rsid,
+                "allele_type": allele_type,
+            }
+            for vid, chrom, start, end, ref, alt, rsid, allele_type in rows
+        ],
+    )
+    session.commit()
+    return session, vm
+
+
+def test_resolves_all_positions_with_one_join_per_chromosome():
+    session, vm = _session_with_variants()
+
+    found = resolve_variants_at_positions(
+        session,
+        vm,
+        [(1, 100), (2, 100), (1, 300), (1, 100), (3, 100)],
+        columns=["variant_id", "chromosome", "position_start"],
+    )
+
+    assert sorted(found) == [(1, 100), (1, 300), (2, 100), (3, 100)]
+    assert [r["variant_id"] for r in found[(1, 100)]] == [1, 2]
+    assert found[(1, 300)] == [{"variant_id": 4, "chromosome": 1, "position_start": 300}]  # noqa E501
+    assert [r["variant_id"] for r in found[(2, 100)]] == [5]
+    assert found[(3, 100)] == []
+
+    # The staging table is dropped again
+    tables = inspect(session.connection()).get_temp_table_names()
+    assert not [t for t in tables if t.startswith("_bf_seed_positions")]
+    session.close()
+
+
+def test_snv_filter_can_be_disabled_and_empty_input_skips_staging():
+    session, vm = _session_with_variants()
+
+    found = resolve_variants_at_positions(session, vm, [(1, 96)], snv_only=False)
+    assert [r["variant_id"] for r in found[(1, 96)]] == [3]
+    assert found[(1, 96)][0]["allele_type"] == "DEL"
+    assert resolve_variants_at_positions(session, vm, [(1, 96)])[(1, 96)] == []
+
+    assert resolve_variants_at_positions(session, vm, []) == {}
+    session.close()
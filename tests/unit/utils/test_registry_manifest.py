@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+
+import biofilter.utils.registry_manifest as regmod
+from biofilter.utils.lazy_import import lazy_attr
+
+
+def test_cached_registry_builds_once_and_rebuilds_when_modules_change(tmp_path, monkeypatch):  # noqa E501
+    monkeypatch.setenv("BIOFILTER_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def build(modules):
+        calls.append(list(modules))
+        return [{"module": m, "name": m.upper(), "description": ""} for m in modules]  # noqa E501
+
+    pkg = regmod.DTPS_PACKAGE
+    first = regmod.cached_registry("unit", pkg, ["dtp_go"], build)
+    second = regmod.cached_registry("unit", pkg, ["dtp_go"], build)
+    assert first == second == [{"module": "dtp_go", "name": "DTP_GO", "description": ""}]  # noqa E501
+    assert calls == [["dtp_go"]]
+
+    manifest = json.loads(regmod.manifest_path("unit").read_text(encoding="utf-8"))  # noqa E501
+    assert manifest["version"] == regmod.__version__
+    assert manifest["entries"] == first
+
+    # A new module changes the signature
+    regmod.cached_registry("unit", pkg, ["dtp_go", "dtp_kegg"], build)
+    assert calls[-1] == ["dtp_go", "dtp_kegg"]
+
+
+def test_cached_registry_works_without_a_writable_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("", encoding="utf-8")
+    monkeypatch.setenv("BIOFILTER_CACHE_DIR", str(blocker / "cache"))
+
+    entries = regmod.cached_registry(
+        "unit", regmod.DTPS_PACKAGE, ["dtp_go"], lambda mods: [{"module": "dtp_go"}]  # noqa E501
+    )
+    assert entries == [{"module": "dtp_go"}]
+
+
+def test_dtp_registry_reads_name_and_version_without_importing():
+    entries = {e["module"]: e for e in regmod.dtp_registry()}
+
+    assert entries["dtp_gene_hgnc"]["name"] == "dtp_gene_hgnc"
+    assert entries["dtp_gene_hgnc"]["version"] == "1.0.0"
+    assert entries["dtp_gene_hgnc"]["description"]
+
+
+def test_lazy_attr_imports_on_first_call():
+    compute = lazy_attr("biofilter.utils.file_hash", "compute_file_hash")
+    assert "file_hash" in repr(compute)
+    assert compute.__name__ == "compute_file_hash"
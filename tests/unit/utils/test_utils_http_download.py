@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from biofilter.modules.etl.mixins.base_dtp import DTPBase
+from biofilter.utils.http_download import DownloadError, HTTPDownloader
+
+PAYLOAD = bytes(range(256)) * 400  # 102,400 bytes
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, msg: str, level: str = "INFO"):
+        self.messages.append((level, msg))
+
+
+class FileServer:
+    """
+    Minimal local HTTP stand-in: HEAD, GET and single `Range` requests over
+    one in-memory file. `truncate_next` makes the next N GET responses
+    drop the connection half way through the body.
+    """
+
+    def __init__(self, payload=PAYLOAD, ranges=True):
+        self.payload = payload
+        self.ranges = ranges
+        self.truncate_next = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _headers(self, status, length, extra=None):
+                self.send_response(status)
+                self.send_header("Content-Length", str(length))
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", '"v1"')
+                for k, v in (extra or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+
+            def do_HEAD(self):
+                if self.path.endswith(".md5"):
+                    self._headers(200, 0)
+                    return
+                self._headers(200, len(server.payload))
+
+            def do_GET(self):
+                if self.path.endswith(".md5"):
+                    body = f"{hashlib.md5(server.payload).hexdigest()}  file.bin\n".encode()  # noqa E501
+                    self._headers(200, len(body))
+                    self.wfile.write(body)
+                    return
+
+                rng = self.headers.get("Range")
+                with server._lock:
+                    server.requests.append(rng)
+                    truncate = server.truncate_next > 0
+                    server.truncate_next -= 1 if truncate else 0
+
+                start, end = 0, len(server.payload)
+                status, extra = 200, {}
+                if rng and server.ranges:
+                    first, _, last = rng.split("=", 1)[1].partition("-")
+                    start = int(first)
+                    end = int(last) + 1 if last else len(server.payload)
+                    status = 206
+                    extra = {"Content-Range": f"bytes {start}-{end - 1}/{len(server.payload)}"}  # noqa E501
+
+                body = server.payload[start:end]
+                self._headers(status, len(body), extra)
+                if truncate:
+                    self.wfile.write(body[: len(body) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/file.bin"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)  # noqa E501
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _downloader(**kwargs):
+    opts = dict(
+        segments=4, backoff=0, timeout=5, chunk_size=4096, min_segment_size=10_000  # noqa E501
+    )
+    opts.update(kwargs)
+    return HTTPDownloader(**opts)
+
+
+def test_segmented_download_hashes_while_streaming(tmp_path):
+    dest = tmp_path / "file.bin"
+    with FileServer() as server:
+        result = _downloader().download(
+            server.url, dest, expected_md5=hashlib.md5(PAYLOAD).hexdigest()
+        )
+
+    assert dest.read_bytes() == PAYLOAD
+    assert result.segments == 4
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert result.md5 == hashlib.md5(PAYLOAD).hexdigest()
+    assert sorted(server.requests) == sorted(
+        f"bytes={s}-{min(s + 25_600, len(PAYLOAD)) - 1}"
+        for s in range(0, len(PAYLOAD), 25_600)
+    )
+    assert not (tmp_path / "file.bin.part").exists()
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+
+def test_segments_retry_from_current_offset(tmp_path):
+    dest = tmp_path / "file.bin"
+    with FileServer() as server:
+        server.truncate_next = 2
+        result = _downloader(segments=2).download(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    # 2 segments + 2 retries that continue inside their segment
+    assert len(server.requests) == 4
+    starts = sorted(int(r[6:].split("-")[0]) for r in server.requests[2:])
+    assert 0 < starts[0] <= 25_600
+    assert 51_200 < starts[1] <= 76_800
+
+
+def test_segmented_download_resumes_from_sidecar_state(tmp_path):
+    dest = tmp_path / "file.bin"
+    part = tmp_path / "file.bin.part"
+    half = len(PAYLOAD) // 2
+    part.write_bytes(PAYLOAD[:30_000] + b"\0" * (len(PAYLOAD) - 30_000))
+    (tmp_path / "file.bin.part.json").write_text(
+        json.dumps(
+            {
+                "size": len(PAYLOAD),
+                "etag": '"v1"',
+                "segments": [
+                    {"start": 0, "end": half, "done": 30_000},
+                    {"start": half, "end": len(PAYLOAD), "done": 0},
+                ],
+            }
+        )
+    )
+
+    with FileServer() as server:
+        result = _downloader().download(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert result.resumed_bytes == 30_000
+    assert result.md5 == hashlib.md5(PAYLOAD).hexdigest()
+    assert sorted(server.requests) == [
+        f"bytes=30000-{half - 1}",
+        f"bytes={half}-{len(PAYLOAD) - 1}",
+    ]
+
+
+def test_single_stream_resumes_part_file(tmp_path):
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD[:1000])
+
+    with FileServer() as server:
+        result = _downloader(segments=1).download(server.url, dest)
+
+    assert server.requests == ["bytes=1000-"]
+    assert result.resumed_bytes == 1000
+    assert dest.read_bytes() == PAYLOAD
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_no_range_support_restarts_from_scratch(tmp_path):
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(b"garbage")
+
+    with FileServer(ranges=False) as server:
+        server.truncate_next = 1
+        result = _downloader().download(server.url, dest)
+
+    assert server.requests == [None, None]
+    assert result.segments == 1
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_checksum_mismatch_discards_part(tmp_path):
+    dest = tmp_path / "file.bin"
+    with FileServer() as server:
+        with pytest.raises(DownloadError, match="Checksum mismatch"):
+            _downloader().download(server.url, dest, expected_md5="0" * 32)
+
+    assert not dest.exists()
+    assert not (tmp_path / "file.bin.part").exists()
+
+
+def test_dtp_http_download_verifies_remote_md5(tmp_path):
+    dtp = DTPBase()
+    dtp.logger = DummyLogger()
+
+    with FileServer() as server:
+        remote_md5 = dtp.get_md5_from_url_file(f"{server.url}.md5")
+        ok, msg = dtp.http_download(
+            server.url, str(tmp_path), expected_md5=remote_md5
+        )
+        assert dtp.get_md5_from_url_file(f"{server.url}.md5", verify=True) == remote_md5  # noqa E501
+
+    assert ok is True, msg
+    assert (tmp_path / "file.bin").read_bytes() == PAYLOAD
+    assert dtp.last_download.md5 == remote_md5
+    assert dtp.last_download.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_dtp_http_download_keeps_the_requested_file_name(tmp_path):
+    dtp = DTPBase()
+    dtp.logger = DummyLogger()
+
+    with FileServer() as server:
+        ok, msg = dtp.http_download(
+            server.url, str(tmp_path), filename="renamed.bin",
+            headers={"Accept": "application/octet-stream"},
+        )
+
+    assert ok is True, msg
+    assert (tmp_path / "renamed.bin").read_bytes() == PAYLOAD
+    assert not (tmp_path / "file.bin").exists()
+    assert dtp.last_download.path == tmp_path / "renamed.bin"
+
+
+@pytest.mark.parametrize("body", ["", "<html>Not Found</html>\n", "abc123  file.bin"])  # noqa E501
+def test_dtp_ignores_invalid_remote_md5(monkeypatch, body):
+    class Response:
+        status_code = 200
+        text = body
+
+    monkeypatch.setattr(
+        "biofilter.modules.etl.mixins.base_dtp.requests.get", lambda url: Response()  # noqa E501
+    )
+    dtp = DTPBase()
+    dtp.logger = DummyLogger()
+
+    assert dtp.get_md5_from_url_file("http://host/file.bin.md5") is None
+    assert any(
+        level == "WARNING" and "Ignoring invalid MD5" in msg
+        for level, msg in dtp.logger.messages
+    )
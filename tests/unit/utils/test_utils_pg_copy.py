@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import create_engine, text
+
+from biofilter.modules.etl.mixins.base_dtp import DTPBase
+from biofilter.utils.pg_copy import (
+    ArrowCSVStream,
+    copy_batches_to_postgres,
+    iter_record_batches,
+)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.sql = None
+        self.payload = b""
+        self.closed = False
+
+    def copy_expert(self, sql, stream):
+        self.sql = sql
+        while True:
+            chunk = stream.read(7)
+            if not chunk:
+                break
+            self.payload += chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriverConnection:
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self):
+        cur = FakeCursor()
+        self.cursors.append(cur)
+        return cur
+
+
+class FakePoolConnection:
+    def __init__(self):
+        self.driver_connection = FakeDriverConnection()
+
+
+class FakeConn:
+    def __init__(self):
+        self.connection = FakePoolConnection()
+
+
+def test_stream_encodes_nulls_and_empty_strings_for_copy_csv():
+    df = pd.DataFrame(
+        {
+            "chromosome": [1, 2, 3],
+            "rsid": ["rs1", "", None],
+            "af": [0.5, None, 1.0],
+            "ac": pd.array([10, None, 3], dtype="Int64"),
+            "lof_flag": [True, None, False],
+            "lof_info": ['a"b', "c,d", None],
+        }
+    )
+
+    payload = ArrowCSVStream(iter_record_batches(df, batch_rows=2)).read()
+
+    assert payload.decode().splitlines() == [
+        '1,"rs1",0.5,10,true,"a""b"',
+        '2,"",,,,"c,d"',
+        "3,,1,3,false,",
+    ]
+
+
+def test_iter_record_batches_reads_parquet_in_batches(tmp_path):
+    path = tmp_path / "part.parquet"
+    pq.write_table(pa.table({"a": list(range(5)), "b": list("abcde")}), path)
+
+    batches = list(iter_record_batches(path, columns=["b"], batch_rows=2))
+
+    assert [b.num_rows for b in batches] == [2, 2, 1]
+    assert batches[0].schema.names == ["b"]
+
+
+def test_copy_batches_to_postgres_streams_through_copy_expert():
+    conn = FakeConn()
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "z"]})
+
+    rows = copy_batches_to_postgres(
+        conn, "tmp_stage", ["b", "a"], iter_record_batches(df, ["b", "a"], 2)
+    )
+
+    cursor = conn.connection.driver_connection.cursors[0]
+    assert rows == 3
+    assert cursor.sql == "COPY tmp_stage (b, a) FROM STDIN WITH (FORMAT CSV)"
+    assert cursor.payload == b'"x",1\n,2\n"z",3\n'
+    assert cursor.closed
+
+
+def test_copy_to_table_falls_back_to_to_sql_on_sqlite():
+    engine = create_engine("sqlite:///:memory:")
+    dtp = DTPBase()
+    df = pd.DataFrame(
+        {"chromosome": [1, 1, 2], "position_start": [10, 20, 30], "x": ["a", None, "c"]}  # noqa E501
+    )
+
+    with engine.begin() as conn:
+        rows = dtp.copy_to_table(conn, "tmp_stage", df, create=True, batch_rows=2)  # noqa E501
+        out = pd.read_sql(text("SELECT * FROM tmp_stage"), conn)
+
+    assert rows == 3
+    assert out["position_start"].tolist() == [10, 20, 30]
+    assert out["x"].tolist() == ["a", None, "c"]